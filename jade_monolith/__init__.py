@@ -0,0 +1,5 @@
+"""jade-monolith tooling — shared helpers for the agent-teams test suite and scripts.
+
+Submodules are imported on demand; keep this package import free of heavy
+dependencies so command-line entry points stay fast.
+"""
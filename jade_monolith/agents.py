@@ -0,0 +1,282 @@
+"""Shared, cached loader for ``.claude/agents/*.md`` definitions.
+
+Every fixture and test that needs agent frontmatter goes through this module,
+so each file is parsed at most once per process.  Parsed frontmatter is also
+persisted to an on-disk cache keyed by path, size, mtime and frontmatter hash,
+so warm runs over an unchanged catalogue do no YAML parsing at all.
+
+Loading memory-maps each file and reads only up to the closing ``---`` line.
+Agents are held as compact AgentRecords; a body (the system prompt, often
+most of the file) is read from disk the first time ``agent["_body"]`` is
+asked for, starting where the frontmatter ended, and then kept, so records
+that are never asked for their body never hold it.
+
+Usage:
+    from jade_monolith.agents import load_agent, load_agents
+
+    meta = load_agent(Path(".claude/agents/architect.md"))
+    agents = load_agents(sorted(Path(".claude/agents").glob("*.md")))
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import mmap
+import os
+import pickle
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from .cache import atomic_write_bytes, cache_dir
+
+_CACHE_VERSION = 3  # 3: an empty frontmatter block parses as {}
+_CACHE_FILENAME = "agents.pickle"
+
+
+class AgentParseError(ValueError):
+    """Raised when an agent file's frontmatter is not a valid YAML mapping."""
+
+
+def _frontmatter_span(buf: bytes | mmap.mmap) -> tuple[int, int, int] | None:
+    """Locate a ``---`` delimited block at the start of ``buf``.
+
+    Returns ``(start, end, body_start)`` byte offsets, or None when there is
+    none.  Delimiters must be whole lines, so a ``---`` inside a YAML value
+    does not end the frontmatter.  Only the frontmatter lines are scanned.
+    """
+    size = len(buf)
+    pos = 3 if buf[:3] == b"\xef\xbb\xbf" else 0  # UTF-8 BOM
+    start = None
+    while pos < size:
+        eol = buf.find(b"\n", pos)
+        next_pos = size if eol < 0 else eol + 1
+        if buf[pos:next_pos].rstrip() == b"---":
+            if start is not None:
+                return start, pos, next_pos
+            start = next_pos
+        elif start is None:
+            return None  # the first line is not a delimiter
+        pos = next_pos
+    return None
+
+
+def split_frontmatter(content: str) -> tuple[str | None, str]:
+    """Split an agent file into ``(frontmatter, body)``.
+
+    Returns ``(None, content)`` when the file has no ``---`` delimited block.
+    """
+    raw = content.encode()
+    span = _frontmatter_span(raw)
+    if span is None:
+        return None, content
+    start, end, body_start = span
+    return raw[start:end].decode(), raw[body_start:].decode().strip()
+
+
+def _read_frontmatter(path: Path) -> tuple[bytes | None, int]:
+    """The raw frontmatter of ``path`` and the offset its body starts at.
+
+    Reads no further than the closing ``---`` line.  Without frontmatter the
+    body is the whole file.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            span = _frontmatter_span(buf)
+            return (None, 0) if span is None else (buf[span[0]:span[1]], span[2])
+
+
+class AgentRecord(Mapping):
+    """One loaded agent, read like the dict of its frontmatter.
+
+    Besides the frontmatter keys it answers ``_path``, ``_has_frontmatter``
+    and ``_body``.  The body is read from ``body_start`` on the first
+    ``_body`` lookup and kept for the record's lifetime, so the body rules
+    share one read.  Records are read-only.
+    """
+
+    __slots__ = ("path", "meta", "has_frontmatter", "body_start", "_cached_body")
+    _EXTRA = ("_path", "_body", "_has_frontmatter")
+
+    def __init__(
+        self, path: Path, meta: dict[str, Any], has_frontmatter: bool, body_start: int = 0,
+    ) -> None:
+        self.path = path
+        self.meta = meta
+        self.has_frontmatter = has_frontmatter
+        self.body_start = body_start
+        self._cached_body: str | None = None
+
+    @property
+    def body(self) -> str:
+        if self._cached_body is None:
+            with open(self.path, "rb") as f:
+                f.seek(self.body_start)
+                text = f.read().decode()
+            self._cached_body = text.strip() if self.has_frontmatter else text
+        return self._cached_body
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "_path":
+            return self.path
+        if key == "_body":
+            return self.body
+        if key == "_has_frontmatter":
+            return self.has_frontmatter
+        return self.meta[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.meta or key in self._EXTRA
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.meta
+        yield from self._EXTRA
+
+    def __len__(self) -> int:
+        return len(self.meta) + len(self._EXTRA)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, AgentRecord):
+            return (self.path, self.has_frontmatter, self.meta) == (
+                other.path, other.has_frontmatter, other.meta)
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def copy(self) -> AgentRecord:
+        return AgentRecord(self.path, self.meta, self.has_frontmatter, self.body_start)
+
+    def __repr__(self) -> str:
+        return f"AgentRecord({str(self.path)!r}, {self.meta!r})"
+
+
+def _parse_frontmatter(text: str) -> dict[str, Any]:
+    # PyYAML is imported on first parse: warm runs are served from the cache
+    # and never pay for it.
+    import yaml
+
+    # libyaml bindings are ~10x faster; fall back to pure Python when absent
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        meta = yaml.load(text, Loader=loader)  # noqa: S506 - safe loader
+    except yaml.YAMLError as e:
+        raise AgentParseError(f"invalid YAML frontmatter: {e}") from e
+    if meta is None:
+        return {}  # empty block: reported per test as missing fields, not a parse error
+    if not isinstance(meta, dict):
+        raise AgentParseError("YAML frontmatter must be a mapping")
+    return meta
+
+
+class AgentLoader:
+    """Parse agent definitions once, backed by a persistent cache file.
+
+    Results are memoised in-process on ``(size, mtime)`` so repeated lookups of
+    the same file never touch the disk again.  Across processes, the cache file
+    maps each path to ``(size, mtime_ns, digest of the frontmatter)`` plus the
+    parsed frontmatter (or the parse error), and is only rewritten when
+    something changed.
+    """
+
+    def __init__(self, cache_path: Path | None = None) -> None:
+        self._cache_path = cache_path
+        self._entries: dict[str, tuple] | None = None
+        self._memo: dict[str, tuple[tuple[int, int], AgentRecord | str]] = {}
+        self._dirty = False
+
+    @property
+    def cache_path(self) -> Path:
+        if self._cache_path is None:
+            self._cache_path = cache_dir() / _CACHE_FILENAME
+        return self._cache_path
+
+    def _load_entries(self) -> dict[str, tuple]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                version, entries = pickle.loads(self.cache_path.read_bytes())
+                if version == _CACHE_VERSION:
+                    self._entries = entries
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+                pass
+        return self._entries
+
+    def load(self, path: Path) -> AgentRecord:
+        """Return the agent at ``path`` as a read-only AgentRecord.
+
+        Raises AgentParseError if the frontmatter is invalid YAML or not a
+        mapping.  Every call returns a fresh record; records of an unchanged
+        file share one parsed frontmatter dict.
+        """
+        key = str(path)
+        st = os.stat(path)
+        stat_key = (st.st_size, st.st_mtime_ns)
+
+        memo = self._memo.get(key)
+        if memo is None or memo[0] != stat_key:
+            memo = (stat_key, self._load_uncached(path, key, stat_key))
+            self._memo[key] = memo
+        result = memo[1]
+        if isinstance(result, str):
+            raise AgentParseError(result)
+        return result.copy()
+
+    def _load_uncached(
+        self, path: Path, key: str, stat_key: tuple[int, int],
+    ) -> AgentRecord | str:
+        frontmatter, body_start = _read_frontmatter(path)
+        digest = hashlib.blake2b(frontmatter or b"", digest_size=16).digest()
+
+        entries = self._load_entries()
+        entry = entries.get(key)
+        if entry is not None and entry[:3] == (*stat_key, digest):
+            parsed = entry[3]
+        else:
+            if frontmatter is None:
+                parsed = {}
+            else:
+                try:
+                    parsed = _parse_frontmatter(frontmatter.decode())
+                except AgentParseError as e:
+                    parsed = str(e)
+            entries[key] = (*stat_key, digest, parsed)
+            self._dirty = True
+
+        if isinstance(parsed, str):
+            return parsed
+        return AgentRecord(path, parsed, frontmatter is not None, body_start)
+
+    def load_many(self, paths: Iterable[Path]) -> list[AgentRecord]:
+        """Load each of ``paths`` in order, then persist the cache once."""
+        try:
+            return [self.load(path) for path in paths]
+        finally:
+            self.flush()
+
+    def flush(self) -> None:
+        """Persist the cache file if any entry changed since it was read."""
+        if not self._dirty or self._entries is None:
+            return
+        data = pickle.dumps((_CACHE_VERSION, self._entries), pickle.HIGHEST_PROTOCOL)
+        try:
+            atomic_write_bytes(self.cache_path, data)
+        except OSError:
+            return  # read-only cache dir: stay correct, just slower next run
+        self._dirty = False
+
+
+_default_loader = AgentLoader()
+atexit.register(_default_loader.flush)
+
+
+def load_agent(path: Path) -> AgentRecord:
+    """Load one agent definition through the shared, cached loader."""
+    return _default_loader.load(path)
+
+
+def load_agents(paths: Iterable[Path]) -> list[AgentRecord]:
+    """Load several agent definitions through the shared loader."""
+    return _default_loader.load_many(paths)
@@ -0,0 +1,360 @@
+"""Scale benchmarks for agent-definition validation.
+
+Synthesises agent catalogues of realistic shape (full frontmatter, multi-KB
+system-prompt bodies) and measures, per catalogue size:
+
+  parse_cold   the parsed_agents fixture path with an empty loader cache
+  parse_warm   the same in a fresh process with a warm on-disk cache
+  index        building the AgentIndex the team-scope rules query
+  rules        each rule from jade_monolith.rules: per-agent rules over every
+               agent, team rules once over the index; these are the checks
+               the schema, smoke and compat tests call
+  peak_rss_mb  peak resident memory of the measuring process
+
+Each size is measured in its own subprocess so RSS numbers do not bleed into
+each other.  Results are written as JSON; with --thresholds, any metric over
+its budget fails the run (exit 1).
+
+Time budgets are relative: a metric fails when it is more than ``margin``
+times its per-agent time in a recorded baseline (benchmarks/baseline.json),
+plus ``slack_us`` so that tiny metrics do not trip on timer noise.  Times are
+per agent, so one baseline serves every size.  Re-record the baseline with
+--record-baseline after an intended change in cost.  The baseline only holds
+for machines like the one that recorded it: on others (shared CI runners),
+--advisory-timings reports timing regressions and fails on memory only.
+
+Run with:  python -m jade_monolith.bench --sizes 10,1000 \\
+               --thresholds benchmarks/thresholds.json --output bench_output.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from . import rules
+
+DEFAULT_SIZES = (10, 1_000, 10_000)
+
+# The first agents are the team itself, so the team rules pass as well.
+_ROLES = [*rules.TEAM, "planner", "auditor"]
+_WORDS = [
+    "analyze", "module", "interface", "contract", "boundary", "dependency", "regression",
+    "coverage", "invariant", "migration", "rollout", "schema", "endpoint", "latency",
+    "throughput", "fixture", "refactor", "review", "acceptance", "criteria", "handoff",
+    "artifact", "telemetry",
+]
+
+
+# --------------------------------------------------------------------------- #
+# Catalogue synthesis                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def agent_name(index: int) -> str:
+    if index < len(rules.TEAM):
+        return _ROLES[index]
+    return f"{_ROLES[index % len(_ROLES)]}-{index:06d}"
+
+
+def synthesize_agent(index: int, rng: random.Random, body_kb: float = 4.0) -> str:
+    """Return one agent file that passes every schema rule."""
+    role = _ROLES[index % len(_ROLES)]
+    name = agent_name(index)
+    readonly = role in {"architect", "reviewer", "auditor"}
+    tools = ["Read", "Glob", "Grep", "Bash", "TaskCreate", "TaskList", "TaskUpdate", "TaskGet"]
+    description = (f"{'Read-only ' if readonly else ''}{role} agent for "
+                   f"{rng.choice(_WORDS)} work in project {index // 100}")
+    model = rng.choice(["opus", "sonnet", "haiku", "inherit"])
+    if name in rules.TEAM:
+        model = rules.TEAM[name]["model"]
+    lines = ["---", f"name: {name}", f"description: {description}", f"model: {model}"]
+    if readonly:
+        lines += ["permissionMode: plan", "disallowedTools:",
+                  "  - Write", "  - Edit", "  - NotebookEdit"]
+    else:
+        tools += ["Write", "Edit"]
+    lines += ["tools:"] + [f"  - {tool}" for tool in tools] + ["---", ""]
+
+    body = [f"# {role.title()} {index}", "", "## Responsibilities", ""]
+    target = int(body_kb * 1024)
+    size = 0
+    section = 0
+    while size < target:
+        paragraph = _paragraph(rng, rng.randint(40, 120))
+        body.append(paragraph)
+        body.append("")
+        size += len(paragraph) + 1
+        section += 1
+        if section % 6 == 0:
+            body += [f"### Step {section // 6}", ""]
+    body += ["## Constraints", "", "- MUST NOT modify files outside the assigned scope.", ""]
+    return "\n".join(lines + body)
+
+
+def synthesize_catalogue(
+    directory: Path, count: int, *, body_kb: float = 4.0, seed: int = 0,
+) -> list[Path]:
+    """Write ``count`` agent files into ``directory`` (deterministic per seed)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = directory / f"{agent_name(i)}.md"
+        path.write_text(synthesize_agent(i, rng, body_kb))
+        paths.append(path)
+    return paths
+
+
+# --------------------------------------------------------------------------- #
+# Measurement                                                                  #
+# --------------------------------------------------------------------------- #
+
+
+def benched_rules() -> list[rules.Rule]:
+    return rules.rules_for("agent") + rules.rules_for("team")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(agents_dir: Path, cache_path: Path, mode: str) -> dict[str, Any]:
+    """Run inside the worker subprocess; ``mode`` is "cold" or "warm"."""
+    from .agents import AgentLoader
+    from .index import AgentIndex
+
+    loader = AgentLoader(cache_path)
+    start = time.perf_counter()
+    agents = loader.load_many(sorted(agents_dir.glob("*.md")))
+    parse = time.perf_counter() - start
+    result: dict[str, Any] = {"agents": len(agents), f"parse_{mode}_s": parse}
+    if mode == "cold":
+        start = time.perf_counter()
+        index = AgentIndex(agents)
+        result["index_s"] = time.perf_counter() - start
+        timings = {}
+        failures = 0
+        for rule in benched_rules():
+            subjects = agents if rule.scope == "agent" else [index]
+            start = time.perf_counter()
+            for subject in subjects:
+                failures += bool(rule.check(subject))
+            timings[rule.nodeid] = time.perf_counter() - start
+        result["rules_s"] = timings
+        result["rule_failures"] = failures
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _worker(agents_dir: Path, cache_path: Path, mode: str) -> dict[str, Any]:
+    package_root = str(Path(__file__).resolve().parents[1])
+    pythonpath = os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))
+    out = subprocess.run(
+        [sys.executable, "-m", "jade_monolith.bench", "--worker", mode,
+         str(agents_dir), str(cache_path)],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": pythonpath},
+    )
+    return json.loads(out.stdout)
+
+
+def run_size(size: int, workdir: Path, *, body_kb: float = 4.0) -> dict[str, Any]:
+    agents_dir = workdir / f"catalogue-{size}"
+    if not agents_dir.is_dir() or len(list(agents_dir.glob("*.md"))) != size:
+        synthesize_catalogue(agents_dir, size, body_kb=body_kb)
+    cache_path = workdir / f"cache-{size}.pickle"
+    cache_path.unlink(missing_ok=True)
+    cold = _worker(agents_dir, cache_path, "cold")
+    warm = _worker(agents_dir, cache_path, "warm")
+    return {
+        "agents": size,
+        "parse_cold_s": cold["parse_cold_s"],
+        "parse_warm_s": warm["parse_warm_s"],
+        "index_s": cold["index_s"],
+        "rules_s": cold["rules_s"],
+        "rules_total_s": sum(cold["rules_s"].values()),
+        "rule_failures": cold["rule_failures"],
+        "peak_rss_mb": max(cold["peak_rss_mb"], warm["peak_rss_mb"]),
+    }
+
+
+def run_benchmarks(
+    sizes: list[int], workdir: Path | None = None, *, body_kb: float = 4.0,
+) -> dict[str, Any]:
+    import yaml
+
+    with tempfile.TemporaryDirectory(prefix="jade-bench-") as tmp:
+        root = workdir or Path(tmp)
+        results = {str(size): run_size(size, root, body_kb=body_kb) for size in sizes}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "libyaml": bool(getattr(yaml, "__with_libyaml__", False)),
+            "body_kb": body_kb,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Regression thresholds                                                        #
+# --------------------------------------------------------------------------- #
+
+
+def per_agent_us(result: dict[str, Any]) -> dict[str, float]:
+    """One size's timings in µs per agent, keyed by metric or rule node id."""
+    n = result["agents"]
+    times = {
+        "parse_cold": result["parse_cold_s"],
+        "parse_warm": result["parse_warm_s"],
+        "index": result.get("index_s", 0.0),
+        "rules_total": result["rules_total_s"],
+        **result["rules_s"],
+    }
+    return {metric: seconds / n * 1e6 for metric, seconds in times.items()}
+
+
+def record_baseline(report: dict[str, Any], min_agents: int = 100) -> dict[str, Any]:
+    """A baseline holding each metric's slowest per-agent time across the sizes.
+
+    Sizes under ``min_agents`` are left out unless nothing else was measured.
+    """
+    results = [r for r in report["results"].values() if r["agents"] >= min_agents]
+    baseline: dict[str, float] = {}
+    for result in results or report["results"].values():
+        for metric, us in per_agent_us(result).items():
+            baseline[metric] = max(baseline.get(metric, 0.0), round(us, 3))
+    return {"meta": report["meta"], "per_agent_us": baseline}
+
+
+def check_timings(
+    report: dict[str, Any], thresholds: dict[str, Any], baseline: dict[str, Any] | None,
+) -> list[str]:
+    """Return a message for every per-agent timing over its budget.
+
+    A timing's budget is ``margin`` x its per-agent time in ``baseline`` plus
+    ``slack_us``; timings missing from the baseline are not checked.
+    Catalogues smaller than ``min_agents`` are too noisy for per-agent budgets.
+    """
+    violations = []
+    base = (baseline or {}).get("per_agent_us", {})
+    margin = thresholds.get("margin", 2.0)
+    slack = thresholds.get("slack_us", 5.0)
+    min_agents = thresholds.get("min_agents", 100)
+    for size, result in report["results"].items():
+        if result["agents"] < min_agents:
+            continue
+        for metric, us in per_agent_us(result).items():
+            if metric not in base:
+                continue
+            budget = base[metric] * margin + slack
+            if us > budget:
+                violations.append(
+                    f"{size}: {metric} {us:.2f} µs/agent > budget {budget:.2f} µs/agent "
+                    f"(baseline {base[metric]:.2f} x {margin} + {slack})"
+                )
+    return violations
+
+
+def check_thresholds(
+    report: dict[str, Any], thresholds: dict[str, Any], baseline: dict[str, Any] | None = None,
+    *, timings: bool = True,
+) -> list[str]:
+    """Return a message for every metric that exceeds its budget.
+
+    ``thresholds["peak_rss_mb"]`` maps a catalogue size to a memory budget,
+    and the synthetic catalogue must pass every rule.  With ``timings`` the
+    check_timings() budgets apply too; they are only meaningful on the kind
+    of machine the baseline was recorded on.
+    """
+    violations = []
+    for size, result in report["results"].items():
+        if result["rule_failures"]:
+            violations.append(f"{size}: synthetic catalogue failed "
+                              f"{result['rule_failures']} rule checks")
+        rss_budget = thresholds.get("peak_rss_mb", {}).get(size)
+        if rss_budget is not None and result["peak_rss_mb"] > rss_budget:
+            violations.append(
+                f"{size}: peak RSS {result['peak_rss_mb']:.0f} MB > budget {rss_budget} MB"
+            )
+    if timings:
+        violations += check_timings(report, thresholds, baseline)
+    return violations
+
+
+def _print_summary(report: dict[str, Any]) -> None:
+    print(f"{'AGENTS':>8} {'COLD':>10} {'WARM':>10} {'RULES':>10} {'RSS MB':>8}")
+    for result in report["results"].values():
+        print(f"{result['agents']:>8} {result['parse_cold_s']:>9.3f}s "
+              f"{result['parse_warm_s']:>9.3f}s {result['rules_total_s']:>9.3f}s "
+              f"{result['peak_rss_mb']:>8.0f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        mode, agents_dir, cache_path = argv[1:4]
+        print(json.dumps(measure(Path(agents_dir), Path(cache_path), mode)))
+        return 0
+
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.bench")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated catalogue sizes (default: %(default)s)")
+    parser.add_argument("--body-kb", type=float, default=4.0,
+                        help="approximate system-prompt body size per agent")
+    parser.add_argument("--workdir", type=Path,
+                        help="keep synthesized catalogues here between runs")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--thresholds", type=Path, help="fail if a budget is exceeded")
+    parser.add_argument("--advisory-timings", action="store_true",
+                        help="with --thresholds, report timing regressions without failing "
+                             "(for machines unlike the one the baseline was recorded on)")
+    parser.add_argument("--record-baseline", type=Path, metavar="PATH",
+                        help="write this run's per-agent timings as the new baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s.replace("_", "")) for s in args.sizes.split(",") if s]
+    report = run_benchmarks(sizes, args.workdir, body_kb=args.body_kb)
+    _print_summary(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.record_baseline:
+        args.record_baseline.write_text(json.dumps(record_baseline(report), indent=2) + "\n")
+    if args.thresholds:
+        thresholds = json.loads(args.thresholds.read_text())
+        baseline = None
+        if "baseline" in thresholds:
+            baseline_path = args.thresholds.parent / thresholds["baseline"]
+            baseline = json.loads(baseline_path.read_text())
+        violations = check_thresholds(report, thresholds, baseline,
+                                      timings=not args.advisory_timings)
+        if args.advisory_timings:
+            for slower in check_timings(report, thresholds, baseline):
+                print(f"SLOWER {slower}", file=sys.stderr)
+        for violation in violations:
+            print(f"REGRESSION {violation}", file=sys.stderr)
+        return 1 if violations else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
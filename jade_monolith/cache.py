@@ -0,0 +1,40 @@
+"""On-disk cache location shared by the jade_monolith helpers.
+
+The cache lives in ``$JADE_CACHE_DIR`` when set, otherwise under
+``$XDG_CACHE_HOME/jade-monolith`` (default ``~/.cache/jade-monolith``).
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """Return the cache directory, creating it if needed."""
+    override = os.environ.get("JADE_CACHE_DIR")
+    if override:
+        path = Path(override)
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        path = Path(base) / "jade-monolith"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temp file + rename.
+
+    Concurrent writers (pytest workers, CI jobs sharing a cache) never observe
+    a half-written file; the last writer wins.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
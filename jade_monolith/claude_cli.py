@@ -0,0 +1,328 @@
+"""Helpers for driving the ``claude`` CLI from tests and scripts.
+
+Introspection commands (``--version``, ``--help``) are cached: each runs once
+per installed binary and the result is stored on disk, keyed by the resolved
+binary path, its mtime/inode and the command line.  Every fixture reads from
+that cache, so repeat runs against an unchanged install spawn nothing.
+
+Agent-loading probes (``claude -p ... --agent <name>``) spend nearly all their
+time waiting on a subprocess, so they run concurrently under asyncio with a
+bounded number in flight: wall time is set by the slowest agent rather than
+the sum of all of them.
+
+Run with:  python -m jade_monolith.claude_cli probe-agents architect reviewer ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .cache import atomic_write_bytes, cache_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_CONCURRENCY = int(os.environ.get("JADE_PROBE_CONCURRENCY", "8"))
+PROBE_PROMPT = "Respond with exactly: OK"
+_PROBE_CACHE_FILENAME = "cli-probes.json"
+
+# --------------------------------------------------------------------------- #
+# Cached introspection probes                                                  #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+def resolve_binary(claude: str = "claude") -> Path | None:
+    """Resolve ``claude`` on PATH to the real file behind any npm symlinks."""
+    found = shutil.which(claude)
+    return Path(os.path.realpath(found)) if found else None
+
+
+class ProbeCache:
+    """Disk-backed cache of CLI introspection results.
+
+    Only successful runs are stored, so a transient failure is retried next
+    time.  Entries for a binary that is gone or has since been replaced are
+    dropped whenever the cache is written.  Misses are serialised through a
+    lock file, so concurrent pytest workers sharing the cache spawn each
+    command once between them.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._memo: dict[str, CommandResult] = {}
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = cache_dir() / _PROBE_CACHE_FILENAME
+        return self._path
+
+    def _read(self) -> dict[str, dict]:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def key(binary: Path, args: list[str]) -> str:
+        st = binary.stat()
+        return json.dumps([str(binary), st.st_mtime_ns, st.st_ino, list(args)])
+
+    @staticmethod
+    def _current(key: str) -> bool:
+        """Whether ``key``'s binary still exists, unchanged."""
+        try:
+            binary, mtime_ns, ino, _ = json.loads(key)
+            st = Path(binary).stat()
+        except (OSError, ValueError, TypeError):
+            return False
+        return (st.st_mtime_ns, st.st_ino) == (mtime_ns, ino)
+
+    def run(self, binary: Path, args: list[str], timeout: float) -> CommandResult:
+        """Return the cached result of ``binary *args``, running it on a miss.
+
+        Raises subprocess.TimeoutExpired if the command has to run and hangs.
+        """
+        key = self.key(binary, args)
+        if key in self._memo:
+            return self._memo[key]
+        entry = self._read().get(key)
+        if entry is None:
+            with self._locked():
+                entries = self._read()
+                entry = entries.get(key)
+                if entry is None:
+                    proc = subprocess.run(
+                        [str(binary), *args],
+                        capture_output=True, text=True, timeout=timeout,
+                        stdin=subprocess.DEVNULL,
+                    )
+                    result = CommandResult(proc.returncode, proc.stdout, proc.stderr)
+                    if result.returncode != 0:
+                        return result
+                    entries = {k: v for k, v in entries.items() if self._current(k)}
+                    entries[key] = entry = asdict(result)
+                    with contextlib.suppress(OSError):
+                        atomic_write_bytes(self.path, json.dumps(entries).encode())
+        result = CommandResult(**entry)
+        self._memo[key] = result
+        return result
+
+
+_probe_cache = ProbeCache()
+
+
+def cli_probe(
+    args: list[str], *, claude: str = "claude", timeout: float = 30.0,
+) -> CommandResult | None:
+    """Run a ``claude`` introspection command through the shared cache.
+
+    Returns None when the binary is not installed.  Raises
+    subprocess.TimeoutExpired if a cold run exceeds ``timeout``.
+    """
+    binary = resolve_binary(claude)
+    if binary is None:
+        return None
+    return _probe_cache.run(binary, args, timeout)
+
+
+def cli_version(claude: str = "claude", timeout: float = 10.0) -> str | None:
+    """``claude --version`` via the probe cache, or None if unavailable."""
+    try:
+        result = cli_probe(["--version"], claude=claude, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result is None or result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+# --------------------------------------------------------------------------- #
+# Agent-loading probes                                                         #
+# --------------------------------------------------------------------------- #
+
+# Called as on_line(agent, stream, line) for every line a probe prints.
+LineCallback = Callable[[str, str, str], None]
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one ``claude -p --agent`` run."""
+
+    agent: str
+    returncode: int | None
+    stdout: str
+    stderr: str
+    elapsed: float
+    timed_out: bool = False
+    missing: bool = False  # the claude binary was not found
+
+    @property
+    def combined(self) -> str:
+        return self.stdout + self.stderr
+
+
+def agent_probe_command(agent: str, claude: str = "claude") -> list[str]:
+    """The command TestAgentLoading uses to check an agent loads."""
+    return [
+        claude, "-p", PROBE_PROMPT,
+        "--agent", agent,
+        "--max-turns", "1",
+        "--output-format", "json",
+    ]
+
+
+async def _pump(
+    stream: asyncio.StreamReader, agent: str, name: str,
+    sink: list[str], on_line: LineCallback | None,
+) -> None:
+    while line := await stream.readline():
+        text = line.decode(errors="replace")
+        sink.append(text)
+        if on_line is not None:
+            on_line(agent, name, text.rstrip("\n"))
+
+
+async def probe_agent(
+    agent: str,
+    *,
+    cwd: Path | None = None,
+    timeout: float = 60.0,
+    claude: str = "claude",
+    on_line: LineCallback | None = None,
+) -> ProbeResult:
+    """Run one agent-loading probe, streaming its output as it arrives."""
+    start = time.perf_counter()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *agent_probe_command(agent, claude),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=True,  # so a timeout can kill Node's children too
+        )
+    except FileNotFoundError:
+        return ProbeResult(agent, None, "", "", 0.0, missing=True)
+
+    out: list[str] = []
+    err: list[str] = []
+
+    async def communicate() -> None:
+        await asyncio.gather(
+            _pump(proc.stdout, agent, "stdout", out, on_line),
+            _pump(proc.stderr, agent, "stderr", err, on_line),
+        )
+        await proc.wait()
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(communicate(), timeout)
+    except TimeoutError:
+        timed_out = True
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+    return ProbeResult(
+        agent, proc.returncode, "".join(out), "".join(err),
+        time.perf_counter() - start, timed_out=timed_out,
+    )
+
+
+async def probe_agents(
+    agents: Iterable[str],
+    *,
+    cwd: Path | None = None,
+    timeout: float = 60.0,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    claude: str = "claude",
+    on_line: LineCallback | None = None,
+) -> dict[str, ProbeResult]:
+    """Probe every agent at once, at most ``concurrency`` in flight."""
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(agent: str) -> ProbeResult:
+        async with gate:
+            return await probe_agent(
+                agent, cwd=cwd, timeout=timeout, claude=claude, on_line=on_line,
+            )
+
+    names = list(dict.fromkeys(agents))
+    results = await asyncio.gather(*(bounded(name) for name in names))
+    return dict(zip(names, results, strict=True))
+
+
+def run_agent_probes(agents: Iterable[str], **kwargs) -> dict[str, ProbeResult]:
+    """Synchronous wrapper around probe_agents() for fixtures and scripts."""
+    return asyncio.run(probe_agents(agents, **kwargs))
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.claude_cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+    probe = sub.add_parser("probe-agents", help="load agents concurrently via claude -p")
+    probe.add_argument("agents", nargs="+")
+    probe.add_argument("--timeout", type=float, default=60.0)
+    probe.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    def echo(agent: str, stream: str, line: str) -> None:
+        print(f"[{agent}:{stream}] {line}", flush=True)
+
+    results = run_agent_probes(
+        args.agents, timeout=args.timeout, concurrency=args.concurrency, on_line=echo,
+    )
+    failed = 0
+    for name, result in results.items():
+        if result.missing:
+            status = "claude not found"
+        elif result.timed_out:
+            status = "timed out"
+        else:
+            status = f"exit {result.returncode}"
+        failed += result.missing or result.timed_out or result.returncode != 0
+        print(f"{name}: {status} in {result.elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
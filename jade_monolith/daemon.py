@@ -0,0 +1,440 @@
+"""Local ecosystem state daemon shared by statusline, health-check and git-status-all.
+
+Holds ecosystem state in memory and serves it over a Unix socket:
+
+  github    open issue / PR counts per repo (pooled, ETag-revalidated requests)
+  git       branch, HEAD and origin/main of every packages/* checkout, fetched
+  services  whether PostgreSQL, MongoDB and Dragonfly complete a protocol
+            handshake, with connect / handshake latency
+
+Each section refreshes on its own schedule with stale-while-revalidate: a
+lookup always answers from memory at once, and a stale section is refreshed in
+the background.  Refreshes are single-flight, so any number of concurrent
+lookups, the scheduler and callers waiting on fresh data share one run.
+
+The statusline never touches the socket: after every GitHub refresh the
+daemon writes a one-line snapshot (``<epoch> <ttl> <issues>i <prs>pr``) that
+``scripts/statusline.sh`` reads with the ``read`` builtin; a snapshot much
+older than its ``<ttl>`` means the daemon is gone.  Each render also touches
+a heartbeat file, which counts as activity: the daemon only exits after
+``IDLE_TIMEOUT`` with neither socket requests nor statusline renders.
+
+Protocol: one JSON object per line in each direction, e.g.
+``{"op": "get", "sections": ["github"], "max_age": 300}``.  Ops are ping, get,
+fetch and stop.
+
+Run with:  python -m jade_monolith.daemon serve [--root PATH] [--detach]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from . import health, service_probe
+from .cache import atomic_write_bytes, cache_dir
+from .github import GitHub
+from .http import ETagCache, HTTPClient
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_TTLS = {"github": 300.0, "git": 120.0, "services": 15.0}
+FETCH_TTL = 120.0
+IDLE_TIMEOUT = 3600.0
+_TICK = 1.0
+
+
+def socket_path() -> Path:
+    override = os.environ.get("JADE_DAEMON_SOCKET")
+    return Path(override) if override else cache_dir() / "state.sock"
+
+
+def snapshot_path() -> Path:
+    return cache_dir() / "statusline"
+
+
+def heartbeat_path() -> Path:
+    return cache_dir() / "statusline.heartbeat"
+
+
+# --------------------------------------------------------------------------- #
+# State                                                                        #
+# --------------------------------------------------------------------------- #
+
+
+class Section:
+    """One piece of cached state with a TTL and a single-flight refresher."""
+
+    def __init__(self, name: str, ttl: float, refresh: Callable[[], Awaitable[Any]]) -> None:
+        self.name = name
+        self.ttl = ttl
+        self._refresh = refresh
+        self.value: Any = None
+        self.updated: float | None = None  # wall clock of the last successful refresh
+        self.error: str | None = None
+        self.refreshes = 0
+        self._task: asyncio.Task | None = None
+
+    def age(self) -> float | None:
+        return None if self.updated is None else time.time() - self.updated
+
+    def stale(self, max_age: float | None = None) -> bool:
+        age = self.age()
+        return age is None or age > (self.ttl if max_age is None else max_age)
+
+    def refresh(self) -> asyncio.Task:
+        """Start a refresh, or join the one already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        self.refreshes += 1
+        try:
+            self.value = await self._refresh()
+        except Exception as e:  # keep serving the last good value
+            self.error = f"{type(e).__name__}: {e}"
+        else:
+            self.updated = time.time()
+            self.error = None
+
+    async def get(self, *, max_age: float | None = None, wait: bool = False) -> Any:
+        """Answer from memory; refresh in the background if stale.
+
+        With ``wait``, a section that is empty or older than ``max_age``
+        is refreshed before answering.
+        """
+        if self.stale(max_age):
+            task = self.refresh()
+            if wait:
+                await asyncio.shield(task)
+        return self.value
+
+    def describe(self) -> dict[str, Any]:
+        return {"value": self.value, "updated": self.updated, "error": self.error}
+
+
+class StateDaemon:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        api: str = health.GITHUB_API,
+        token: str | None = None,
+        ttls: dict[str, float] | None = None,
+        concurrency: int = health.DEFAULT_CONCURRENCY,
+        etag_cache: ETagCache | None = None,
+        snapshot: Path | None = None,
+        heartbeat: Path | None = None,
+        latency_history: Path | None = None,
+    ) -> None:
+        self.root = root
+        self.api = api
+        self.token = token
+        self.concurrency = concurrency
+        self.snapshot = snapshot
+        self.heartbeat = heartbeat
+        self.latency_history = latency_history
+        self._etag_cache = etag_cache
+        self._client: HTTPClient | None = None
+        self._github: GitHub | None = None
+        ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.sections = {
+            "github": Section("github", ttls["github"], self._refresh_github),
+            "git": Section("git", ttls["git"], self._refresh_git),
+            "services": Section("services", ttls["services"], self._refresh_services),
+        }
+        self._fetched: dict[str, float] = {}
+        self._fetching: dict[str, asyncio.Task] = {}
+        self._fetch_gate = asyncio.Semaphore(max(1, concurrency))
+        self.last_request = time.monotonic()
+        self._stop = asyncio.Event()
+        self._clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def client(self) -> HTTPClient:
+        if self._client is None:
+            self._client = HTTPClient(headers=health.github_headers(self.token),
+                                      etag_cache=self._etag_cache)
+        return self._client
+
+    @property
+    def github(self) -> GitHub:
+        if self._github is None:
+            # No response reuse: each refresh must see the API, revalidated by ETag.
+            self._github = GitHub(self.client, api=self.api, cache_ttl=0)
+        return self._github
+
+    async def _refresh_github(self) -> dict[str, dict[str, int]]:
+        counts = self.sections["github"].value  # re-stamped on failure: still alive
+        try:
+            counts = await health.repo_counts(self.github, api=self.api)
+        finally:
+            if self._etag_cache is not None:
+                self._etag_cache.flush()
+            self.write_snapshot(counts)
+        return counts
+
+    async def _refresh_services(self) -> dict[str, dict[str, Any]]:
+        return await health.check_services(latency_history=self.latency_history)
+
+    async def _refresh_git(self) -> dict[str, dict[str, Any]]:
+        return await health.collect_checkouts(self.root, concurrency=self.concurrency)
+
+    def write_snapshot(self, counts: dict[str, dict[str, int]] | None) -> None:
+        if self.snapshot is None or counts is None:
+            return
+        totals = health.summarize_github(counts)
+        ttl = int(self.sections["github"].ttl)
+        line = f"{int(time.time())} {ttl} {totals['issues']}i {totals['prs']}pr\n"
+        with contextlib.suppress(OSError):
+            atomic_write_bytes(self.snapshot, line.encode())
+
+    async def fetch(self, paths: list[str], max_age: float = FETCH_TTL) -> dict[str, list[str]]:
+        """``git fetch origin`` in each path unless done within ``max_age`` (single-flight)."""
+        now = time.monotonic()
+        fetched, skipped, tasks = [], [], []
+        for path in dict.fromkeys(paths):
+            if now - self._fetched.get(path, float("-inf")) <= max_age:
+                skipped.append(path)
+                continue
+            task = self._fetching.get(path)
+            if task is None or task.done():
+                task = self._fetching[path] = asyncio.get_running_loop().create_task(
+                    self._fetch_one(path))
+            tasks.append(task)
+            fetched.append(path)
+        await asyncio.gather(*tasks)
+        return {"fetched": fetched, "skipped": skipped}
+
+    async def _fetch_one(self, path: str) -> None:
+        async with self._fetch_gate:
+            await health.run_git(Path(path), "fetch", "--quiet", "origin")
+        self._fetched[path] = time.monotonic()
+
+    # -- requests ---------------------------------------------------------- #
+
+    async def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.last_request = time.monotonic()
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "root": str(self.root)}
+        if op == "get":
+            names = request.get("sections") or list(self.sections)
+            unknown = [n for n in names if n not in self.sections]
+            if unknown:
+                return {"ok": False, "error": f"unknown sections: {unknown}"}
+            max_age, wait = request.get("max_age"), bool(request.get("wait"))
+            await asyncio.gather(*(self.sections[n].get(max_age=max_age, wait=wait)
+                                   for n in names))
+            return {"ok": True, "root": str(self.root),
+                    "sections": {n: self.sections[n].describe() for n in names}}
+        if op == "fetch":
+            result = await self.fetch(list(request.get("paths") or []),
+                                      float(request.get("max_age", FETCH_TTL)))
+            return {"ok": True, **result}
+        if op == "stop":
+            self._stop.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    async def _serve_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle(json.loads(line))
+                except ValueError as e:
+                    response = {"ok": False, "error": f"bad request: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._clients.pop(task, None)
+
+    def idle_for(self) -> float:
+        """Seconds since the last socket request or statusline heartbeat."""
+        idle = time.monotonic() - self.last_request
+        if self.heartbeat is not None:
+            with contextlib.suppress(OSError):
+                idle = min(idle, time.time() - self.heartbeat.stat().st_mtime)
+        return idle
+
+    async def _schedule(self, idle_timeout: float) -> None:
+        """Refresh each section as its TTL runs out; exit once idle for too long."""
+        while not self._stop.is_set():
+            for section in self.sections.values():
+                if section.stale():
+                    section.refresh()
+            if self.idle_for() > idle_timeout:
+                self._stop.set()
+                break
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), _TICK)
+
+    async def serve(self, path: Path, *, idle_timeout: float = IDLE_TIMEOUT) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self._serve_client, path=str(path))
+        os.chmod(path, 0o600)
+        scheduler = asyncio.get_running_loop().create_task(self._schedule(idle_timeout))
+        try:
+            await self._stop.wait()
+        finally:
+            scheduler.cancel()
+            server.close()
+            path.unlink(missing_ok=True)
+            for writer in self._clients.values():
+                writer.close()  # connected clients see EOF and their handlers return
+            if self._clients:
+                await asyncio.wait(list(self._clients), timeout=1.0)
+            if self._client is not None:
+                await self._client.close()
+
+
+# --------------------------------------------------------------------------- #
+# Client                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+def query(
+    request: dict[str, Any], *, path: Path | None = None, timeout: float = 2.0,
+) -> dict[str, Any] | None:
+    """Send one request to the running daemon; None if there is no daemon."""
+    path = path or socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    return None
+                buf += chunk
+    except OSError:
+        return None
+    response = json.loads(buf)
+    return response if response.get("ok") else None
+
+
+def spawn(root: Path, *, path: Path | None = None, api: str | None = None) -> None:
+    """Start a detached daemon for ``root``; harmless if one is already running."""
+    package_root = str(Path(__file__).resolve().parents[1])
+    pythonpath = os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))
+    args = [sys.executable, "-m", "jade_monolith.daemon"]
+    if path is not None:
+        args += ["--socket", str(path)]
+    args += ["serve", "--root", str(root)]
+    if api is not None:
+        args += ["--api", api]
+    with open(cache_dir() / "daemon.log", "ab") as log:
+        subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+            start_new_session=True, env={**os.environ, "PYTHONPATH": pythonpath},
+        )
+
+
+@contextlib.contextmanager
+def _single_instance(path: Path):
+    """Hold an exclusive lock beside the socket for the daemon's lifetime."""
+    if fcntl is None:
+        yield True
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix(".lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _default_root() -> Path:
+    return Path(os.environ.get("MONOLITH_DIR") or Path.cwd())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.daemon")
+    parser.add_argument("--socket", type=Path, help="Unix socket (default: $JADE_DAEMON_SOCKET)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the daemon")
+    serve.add_argument("--root", type=Path, default=_default_root())
+    serve.add_argument("--detach", action="store_true", help="start in the background")
+    serve.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    serve.add_argument("--api", default=os.environ.get("JADE_GITHUB_API", health.GITHUB_API))
+    get = sub.add_parser("get", help="print sections as JSON")
+    get.add_argument("sections", nargs="*")
+    get.add_argument("--max-age", type=float)
+    get.add_argument("--wait", action="store_true", help="refresh stale sections first")
+    fetch = sub.add_parser("fetch", help="git fetch paths unless fetched recently")
+    fetch.add_argument("paths", nargs="+")
+    fetch.add_argument("--max-age", type=float, default=FETCH_TTL)
+    sub.add_parser("ping", help="exit 0 if the daemon is running")
+    sub.add_parser("stop", help="stop the daemon")
+    args = parser.parse_args(argv)
+    path = args.socket or socket_path()
+
+    if args.command == "serve":
+        root = args.root.resolve()
+        if query({"op": "ping"}, path=path) is not None:
+            return 0
+        if args.detach:
+            spawn(root, path=args.socket, api=args.api)
+            return 0
+        with _single_instance(path) as acquired:
+            if not acquired:
+                return 0
+            daemon = StateDaemon(root, api=args.api, token=health.github_token(),
+                                 etag_cache=ETagCache(), snapshot=snapshot_path(),
+                                 heartbeat=heartbeat_path(),
+                                 latency_history=service_probe.history_path())
+            asyncio.run(daemon.serve(path, idle_timeout=args.idle_timeout))
+        return 0
+
+    if args.command == "get":
+        request = {"op": "get", "sections": args.sections, "max_age": args.max_age,
+                   "wait": args.wait}
+    elif args.command == "fetch":
+        request = {"op": "fetch", "paths": [str(Path(p).resolve()) for p in args.paths],
+                   "max_age": args.max_age}
+    else:
+        request = {"op": args.command}
+    response = query(request, path=path, timeout=120.0)
+    if response is None:
+        print("jade daemon is not running", file=sys.stderr)
+        return 1
+    if args.command in ("get", "fetch"):
+        print(json.dumps(response, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Validate the agent definitions of every package in the ecosystem at once.
+
+The schema and smoke suites only look at the monolith's own ``.claude/``.
+This finds every ``.claude/agents`` directory and ``.claude/settings.json``
+under ``packages/`` (the submodules, at any depth below them) and checks each
+with the rules in jade_monolith.rules, the same ones behind
+test_agent_schema.py and test_team_smoke.py.  Packages are validated in a
+process pool, one package per task, so the whole ecosystem takes about as
+long as its largest package.
+
+The monolith itself is checked too, with the team rules.  Packages get the
+per-agent and settings rules only, since they do not have to ship the
+four-agent team (``--team`` applies the team rules to them as well), and
+settings.json is optional for them.  Each package keeps its own parse cache
+in the cache dir, so workers never overwrite each other's cache file; the
+caches of package roots that no longer exist are removed on the next run.
+
+Run with:  python -m jade_monolith.ecosystem [--json] [--workers N] [--team]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .agents import AgentLoader
+from .cache import atomic_write_bytes, cache_dir
+from .watch import Workspace
+
+PACKAGES_DIR = "packages"
+_PRUNE = {".git", "node_modules", ".venv", "venv", "__pycache__", "dist", "build"}
+_CACHE_SUBDIR = "ecosystem"
+_ROOTS_FILENAME = "roots.json"  # cache digest -> the package root it belongs to
+
+
+@dataclass
+class PackageReport:
+    package: str  # path relative to the ecosystem root, "." for the monolith
+    agents: int = 0
+    rules_run: int = 0
+    failures: list[tuple[str, str]] = field(default_factory=list)  # (rule node id, message)
+    elapsed_ms: float = 0.0
+    error: str | None = None  # the package could not be validated at all
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures and self.error is None
+
+    def to_json(self) -> dict:
+        return {**asdict(self), "failures": [list(f) for f in self.failures]}
+
+
+def discover(root: Path, packages_dir: str = PACKAGES_DIR) -> list[Path]:
+    """Directories under ``root/packages_dir`` that have ``.claude/agents`` or
+    ``.claude/settings.json``, sorted."""
+    found = []
+    for dirpath, dirnames, _filenames in os.walk(root / packages_dir):
+        if ".claude" in dirnames:
+            claude = Path(dirpath, ".claude")
+            if (claude / "agents").is_dir() or (claude / "settings.json").is_file():
+                found.append(Path(dirpath))
+        dirnames[:] = [d for d in dirnames if d not in _PRUNE and d != ".claude"]
+    return sorted(found)
+
+
+def _digest(package_root: str) -> str:
+    return hashlib.blake2b(package_root.encode(), digest_size=8).hexdigest()
+
+
+def _loader_for(package_root: Path) -> AgentLoader:
+    return AgentLoader(cache_dir() / _CACHE_SUBDIR / f"{_digest(str(package_root))}.pickle")
+
+
+def prune_caches(package_roots: list[str]) -> None:
+    """Register ``package_roots``' parse caches; delete the caches of roots now gone.
+
+    Runs in the parent process only, before any worker writes a cache.
+    """
+    directory = cache_dir() / _CACHE_SUBDIR
+    try:
+        roots = json.loads((directory / _ROOTS_FILENAME).read_text())
+    except (OSError, ValueError):
+        roots = {}
+    roots.update({_digest(root): root for root in package_roots})
+    roots = {digest: root for digest, root in roots.items() if Path(root).is_dir()}
+    for path in directory.glob("*.pickle"):
+        if path.stem not in roots:
+            path.unlink(missing_ok=True)
+    with contextlib.suppress(OSError):
+        atomic_write_bytes(directory / _ROOTS_FILENAME, json.dumps(roots, indent=1).encode())
+
+
+def validate_package(
+    package_root: str, name: str, team: bool, settings_required: bool,
+) -> PackageReport:
+    """Run every applicable rule over one package.  Runs in a worker process."""
+    start = time.perf_counter()
+    root = Path(package_root)
+    workspace = Workspace(root, loader=_loader_for(root))
+    try:
+        report = workspace.full_check(team=team, settings_required=settings_required)
+    except (OSError, UnicodeDecodeError) as e:
+        return PackageReport(name, error=f"{type(e).__name__}: {e}",
+                             elapsed_ms=(time.perf_counter() - start) * 1000)
+    return PackageReport(name, len(report.changed), report.rules_run, report.failures,
+                         (time.perf_counter() - start) * 1000)
+
+
+def validate_all(
+    root: Path,
+    *,
+    packages_dir: str = PACKAGES_DIR,
+    include_root: bool = True,
+    team: bool = False,
+    workers: int | None = None,
+) -> Iterator[PackageReport]:
+    """Yield a report per package as each finishes.
+
+    ``workers=1`` validates in this process, without a pool.
+    """
+    targets = [(str(path), path.relative_to(root).as_posix(), team, False)
+               for path in discover(root, packages_dir)]
+    if include_root and (root / ".claude").is_dir():
+        targets.insert(0, (str(root), ".", True, True))
+    prune_caches([target[0] for target in targets])
+    if workers == 1 or len(targets) <= 1:
+        for target in targets:
+            yield validate_package(*target)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1,
+                                             len(targets))) as pool:
+        futures = {pool.submit(validate_package, *target): target[1] for target in targets}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # a crashed worker fails its package, not the run
+                yield PackageReport(futures[future], error=f"{type(e).__name__}: {e}")
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _print_report(report: PackageReport) -> None:
+    if report.error:
+        print(f"{report.package}: ERROR {report.error}")
+        return
+    status = "ok" if report.ok else f"{len(report.failures)} failing"
+    print(f"{report.package}: {report.agents} agents, {report.rules_run} rules, {status} "
+          f"({report.elapsed_ms:.1f} ms)")
+    for nodeid, message in report.failures:
+        print(f"  FAILED {nodeid} - {message}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.ecosystem",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=Path.cwd(),
+                        help="monolith root containing packages/ (default: cwd)")
+    parser.add_argument("--packages-dir", default=PACKAGES_DIR)
+    parser.add_argument("--packages-only", action="store_true",
+                        help="skip the monolith's own .claude/")
+    parser.add_argument("--team", action="store_true",
+                        help="also require every package to define the four-agent team")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print one JSON report at the end")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    reports = []
+    for report in validate_all(args.root.resolve(), packages_dir=args.packages_dir,
+                               include_root=not args.packages_only, team=args.team,
+                               workers=args.workers):
+        reports.append(report)
+        if not args.json:
+            _print_report(report)
+    reports.sort(key=lambda r: (r.package != ".", r.package))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    failing = [r.package for r in reports if not r.ok]
+    if args.json:
+        print(json.dumps({"packages": [r.to_json() for r in reports], "failing": failing,
+                          "elapsed_ms": round(elapsed_ms, 1)}, indent=2))
+    else:
+        print(f"{len(reports)} packages, {sum(r.agents for r in reports)} agents: "
+              f"{len(failing)} failing ({elapsed_ms:.0f} ms)")
+    if not reports:
+        print(f"error: no .claude/ directories found under {args.root}", file=sys.stderr)
+        return 2
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Local stand-ins for external services and binaries, for offline tests and benchmarks."""
@@ -0,0 +1,325 @@
+"""Local stand-in for the Anthropic Messages and Message Batches API.
+
+Serves the endpoints jade_monolith.sdk_runner calls:
+
+  POST /v1/messages                          one message, answered at once
+  POST /v1/messages/batches                  create a batch
+  GET  /v1/messages/batches/{id}             status; "ended" after ``batch_latency``
+  GET  /v1/messages/batches/{id}/results     JSONL, streamed one line per result
+
+Replies are deterministic (``reply`` is formatted with ``{model}`` and
+``{prompt}``, the last user message).  Usage simulates prompt caching: the
+first request whose system prompt carries a ``cache_control`` breakpoint is
+billed as ``cache_creation_input_tokens`` for that prefix, later requests
+with the same model and prefix as ``cache_read_input_tokens``.  Requests
+without the ``x-api-key`` / ``anthropic-version`` headers get a 401 or 400,
+and every request is recorded.
+
+Run with:  python -m jade_monolith.fakes.anthropic --port 8789
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import itertools
+import json
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+DEFAULT_API_KEY = "test-key"
+_BATCH_PATH = re.compile(r"^/v1/messages/batches/(?P<id>[\w-]+)(?P<results>/results)?$")
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    status: int
+    body: Any = None
+
+
+@dataclass
+class _Batch:
+    id: str
+    requests: list[dict[str, Any]]
+    created: float
+    results: list[dict[str, Any]] | None = None
+
+
+@dataclass
+class _State:
+    api_key: str
+    reply: str
+    latency: float
+    batch_latency: float
+    result_interval: float
+    errored: set[str] = field(default_factory=set)  # custom_ids whose batch request fails
+    cached_prefixes: set[str] = field(default_factory=set)
+    batches: dict[str, _Batch] = field(default_factory=dict)
+    requests: list[RecordedRequest] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    ids: itertools.count = field(default_factory=lambda: itertools.count(1))
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content or ()
+                   if isinstance(block, dict))
+
+
+def _usage(state: _State, params: dict[str, Any]) -> dict[str, int]:
+    """Token usage for ``params``, with prompt caching up to the last breakpoint."""
+    system = params.get("system") or []
+    if isinstance(system, str):
+        system = [{"type": "text", "text": system}]
+    cacheable = ""
+    for i, block in enumerate(system):
+        if block.get("cache_control"):
+            cacheable = "".join(b.get("text", "") for b in system[: i + 1])
+    rest = "".join(b.get("text", "") for b in system)[len(cacheable):]
+    rest += "".join(_text(m.get("content")) for m in params.get("messages", []))
+    usage = {"input_tokens": _tokens(rest), "cache_creation_input_tokens": 0,
+             "cache_read_input_tokens": 0}
+    if cacheable:
+        key = hashlib.sha256(f"{params.get('model')}\0{cacheable}".encode()).hexdigest()
+        if key in state.cached_prefixes:
+            usage["cache_read_input_tokens"] = _tokens(cacheable)
+        else:
+            state.cached_prefixes.add(key)
+            usage["cache_creation_input_tokens"] = _tokens(cacheable)
+    return usage
+
+
+def _message(state: _State, params: dict[str, Any]) -> dict[str, Any]:
+    messages = params.get("messages") or [{}]
+    prompt = _text(messages[-1].get("content"))
+    text = state.reply.format(model=params.get("model", ""), prompt=prompt)
+    usage = _usage(state, params)
+    usage["output_tokens"] = _tokens(text)
+    return {
+        "id": f"msg_{next(state.ids):06d}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": usage,
+    }
+
+
+def _error(kind: str, message: str) -> dict[str, Any]:
+    return {"type": "error", "error": {"type": kind, "message": message}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: Any, body: Any = None) -> None:
+        data = json.dumps(payload).encode()
+        with self.server.state.lock:
+            self.server.state.requests.append(
+                RecordedRequest(self.command, self.path, status, body))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        if self.headers.get("x-api-key") != self.server.state.api_key:
+            self._send_json(401, _error("authentication_error", "invalid x-api-key"))
+            return False
+        if not self.headers.get("anthropic-version"):
+            self._send_json(400, _error("invalid_request_error",
+                                        "anthropic-version header is required"))
+            return False
+        return True
+
+    def do_POST(self) -> None:
+        state = self.server.state
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            body = None
+        if not self._authorized():
+            return
+        time.sleep(state.latency)
+        path = urlsplit(self.path).path
+        if not isinstance(body, dict):
+            self._send_json(400, _error("invalid_request_error", "body must be a JSON object"))
+        elif path == "/v1/messages":
+            with state.lock:
+                message = _message(state, body)
+            self._send_json(200, message, body)
+        elif path == "/v1/messages/batches":
+            with state.lock:
+                batch = _Batch(f"msgbatch_{next(state.ids):06d}", body.get("requests", []),
+                               time.monotonic())
+                state.batches[batch.id] = batch
+            self._send_json(200, self._batch_status(batch), body)
+        else:
+            self._send_json(404, _error("not_found_error", f"{path} not found"))
+
+    def do_GET(self) -> None:
+        state = self.server.state
+        if not self._authorized():
+            return
+        match = _BATCH_PATH.match(urlsplit(self.path).path)
+        with state.lock:
+            batch = state.batches.get(match["id"]) if match else None
+        if batch is None:
+            self._send_json(404, _error("not_found_error", f"{self.path} not found"))
+        elif not match["results"]:
+            self._send_json(200, self._batch_status(batch))
+        elif batch.results is None:
+            self._send_json(400, _error("invalid_request_error",
+                                        f"batch {batch.id} has not ended yet"))
+        else:
+            self._stream_results(batch)
+
+    def _batch_status(self, batch: _Batch) -> dict[str, Any]:
+        state = self.server.state
+        with state.lock:
+            ended = time.monotonic() - batch.created >= state.batch_latency
+            if ended and batch.results is None:
+                batch.results = [self._result(request) for request in batch.requests]
+        counts = {"processing": 0 if ended else len(batch.requests), "succeeded": 0,
+                  "errored": 0, "canceled": 0, "expired": 0}
+        for result in batch.results or ():
+            counts[result["result"]["type"]] += 1
+        host, port = self.server.server_address[:2]
+        return {
+            "id": batch.id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts,
+            "results_url": (f"http://{host}:{port}/v1/messages/batches/{batch.id}/results"
+                            if ended else None),
+        }
+
+    def _result(self, request: dict[str, Any]) -> dict[str, Any]:
+        state = self.server.state
+        custom_id = request.get("custom_id", "")
+        if custom_id in state.errored:
+            result = {"type": "errored",
+                      "error": _error("invalid_request_error", f"{custom_id} failed")}
+        else:
+            result = {"type": "succeeded", "message": _message(state, request.get("params", {}))}
+        return {"custom_id": custom_id, "result": result}
+
+    def _stream_results(self, batch: _Batch) -> None:
+        with self.server.state.lock:
+            self.server.state.requests.append(RecordedRequest("GET", self.path, 200))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/binary")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, result in enumerate(batch.results or ()):
+            if i:
+                time.sleep(self.server.state.result_interval)
+            line = json.dumps(result).encode() + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    state: _State
+
+
+class FakeAnthropic:
+    """Run the stand-in API on 127.0.0.1 in a background thread.
+
+    Use as a context manager; ``url`` is the base URL to point clients at
+    (``ANTHROPIC_BASE_URL``), ``api_key`` the key it accepts.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: str = DEFAULT_API_KEY,
+        reply: str = "{model}: {prompt}",
+        latency: float = 0.0,
+        batch_latency: float = 0.0,
+        result_interval: float = 0.0,
+        port: int = 0,
+    ) -> None:
+        self.api_key = api_key
+        self.state = _State(api_key, reply, latency, batch_latency, result_interval)
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.state = self.state
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> list[RecordedRequest]:
+        with self.state.lock:
+            return list(self.state.requests)
+
+    def fail(self, *custom_ids: str) -> None:
+        """Make these batch requests come back ``errored``."""
+        with self.state.lock:
+            self.state.errored.update(custom_ids)
+
+    def start(self) -> FakeAnthropic:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeAnthropic:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.fakes.anthropic")
+    parser.add_argument("--port", type=int, default=8789)
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--batch-latency", type=float, default=0.0)
+    parser.add_argument("--result-interval", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    fake = FakeAnthropic(api_key=args.api_key, latency=args.latency,
+                         batch_latency=args.batch_latency,
+                         result_interval=args.result_interval, port=args.port)
+    print(f"fake Anthropic API on {fake.url} (x-api-key: {args.api_key})", flush=True)
+    with contextlib.suppress(KeyboardInterrupt):
+        fake._server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
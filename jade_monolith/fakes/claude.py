@@ -0,0 +1,291 @@
+"""Offline stand-in for the ``claude`` CLI (and ``npm view``), with latency and
+failure injection.
+
+Implements the surface the contract and compat suites touch:
+
+  claude --version
+  claude --help
+  claude -p PROMPT --agent NAME [--output-format text|json|stream-json] ...
+  claude --agent NAME               an interactive session on a terminal
+  npm view @anthropic-ai/claude-code version
+
+Behaviour comes from a JSON config file (see FakeClaudeConfig) so a test or
+benchmark can dial in startup latency, response latency, streaming cadence,
+hangs and error strings, per agent if needed.  FakeClaude writes executable
+``claude``/``npm`` shims into a directory you put first on PATH.
+
+Run the whole contract + compat suites against it with:
+    pytest tests/test_team_contract.py tests/test_version_compat.py --fake-claude
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+CONFIG_ENV = "FAKE_CLAUDE_CONFIG"
+PACKAGE = "@anthropic-ai/claude-code"
+
+_HELP = """\
+Usage: claude [options] [command] [prompt]
+
+Claude Code - starts an interactive session by default, use -p/--print for
+non-interactive output
+
+Options:
+  -p, --print                      Print response and exit (useful for pipes)
+  --output-format <format>         Output format (only works with --print):
+                                   "text", "json", or "stream-json"
+  --agent <name>                   Run as the named project agent
+  --max-turns <n>                  Maximum agentic turns in print mode
+  --permission-mode <mode>         Permission mode for the session
+  --model <model>                  Model for the current session
+  -v, --version                    Output the version number
+  -h, --help                       Display help for command
+
+Tools: {tools}
+"""
+
+
+@dataclass
+class FakeClaudeConfig:
+    """Knobs for the fake CLI.  Times are in seconds.
+
+    ``agents`` maps an agent name to overrides of any other field, e.g.
+    ``{"reviewer": {"hang": true}}`` makes only the reviewer probe time out.
+    ``result`` may contain ``{agent}`` and ``{prompt}`` placeholders.
+    """
+
+    version: str = "2.1.34"
+    latest_version: str | None = None  # npm view answer; defaults to version
+    startup_latency: float = 0.0       # every invocation, before anything else
+    response_latency: float = 0.0      # -p: before the first output; interactive: until ready
+    chunk_interval: float = 0.0        # stream-json: between assistant chunks
+    chunks: int = 3                    # stream-json: assistant chunks per reply
+    linger: float = 0.0                # -p: keep running this long after the result
+    result: str = "OK"
+    hang: bool = False                 # -p: never answer (exercise timeouts)
+    error: str | None = None           # -p: print to stderr and fail
+    exit_code: int = 1                 # exit status used with ``error``
+    help_tools: list[str] = field(default_factory=lambda: ["Read", "Write", "Bash"])
+    agents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    log: str | None = None             # append one JSON line per invocation
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FakeClaudeConfig:
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def for_agent(self, agent: str | None) -> FakeClaudeConfig:
+        overrides = self.agents.get(agent or "", {})
+        return FakeClaudeConfig.from_dict({**asdict(self), **overrides}) if overrides else self
+
+
+def _load_config() -> FakeClaudeConfig:
+    path = os.environ.get(CONFIG_ENV)
+    if not path:
+        return FakeClaudeConfig()
+    return FakeClaudeConfig.from_dict(json.loads(Path(path).read_text()))
+
+
+def _emit(line: str) -> None:
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+def _print_mode(cfg: FakeClaudeConfig, args: argparse.Namespace) -> int:
+    agent = args.agent
+    if agent is not None and not (Path.cwd() / ".claude" / "agents" / f"{agent}.md").exists():
+        print(f"Error: Agent '{agent}' not found", file=sys.stderr)
+        return 1
+    cfg = cfg.for_agent(agent)
+    time.sleep(cfg.response_latency)
+    if cfg.hang:
+        time.sleep(3600)
+    if cfg.error:
+        print(cfg.error, file=sys.stderr)
+        return cfg.exit_code
+
+    prompt = args.prompt or sys.stdin.read()
+    text = cfg.result.replace("{agent}", agent or "").replace("{prompt}", prompt)
+    session_id = str(uuid.uuid4())
+    result = {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "duration_ms": int(cfg.response_latency * 1000),
+        "num_turns": 1,
+        "result": text,
+        "session_id": session_id,
+        "total_cost_usd": 0.0,
+    }
+    fmt = args.output_format
+    if fmt == "json":
+        _emit(json.dumps(result))
+    elif fmt == "stream-json":
+        _emit(json.dumps({
+            "type": "system", "subtype": "init", "session_id": session_id,
+            "agent": agent, "model": args.model or "opus",
+        }))
+        n = max(1, cfg.chunks)
+        step = -(-len(text) // n) or 1
+        for i in range(0, max(len(text), 1), step):
+            if i:
+                time.sleep(cfg.chunk_interval)
+            _emit(json.dumps({
+                "type": "assistant", "session_id": session_id,
+                "message": {"role": "assistant",
+                            "content": [{"type": "text", "text": text[i:i + step]}]},
+            }))
+        time.sleep(cfg.chunk_interval)
+        _emit(json.dumps(result))
+    else:
+        _emit(text)
+    time.sleep(cfg.linger)
+    return 0
+
+
+def _interactive(cfg: FakeClaudeConfig, args: argparse.Namespace) -> int:
+    """A line-oriented stand-in for the interactive UI.
+
+    Draws an input prompt and the "? for shortcuts" hint once it is ready
+    (after ``response_latency``), answers each line with ``result`` and
+    exits on ``/exit`` or end of input.
+    """
+    agent = args.agent
+    if agent is not None and not (Path.cwd() / ".claude" / "agents" / f"{agent}.md").exists():
+        print(f"Error: Agent '{agent}' not found", file=sys.stderr)
+        return 1
+    cfg = cfg.for_agent(agent)
+    time.sleep(cfg.response_latency)
+    _emit(f"fake claude {cfg.version} - agent: {agent or 'default'}")
+    while True:
+        _emit(">  \n  ? for shortcuts")
+        line = sys.stdin.readline()
+        if not line or line.strip() == "/exit":
+            return 0
+        _emit(cfg.result.replace("{agent}", agent or "").replace("{prompt}", line.strip()))
+
+
+def claude_main(argv: list[str]) -> int:
+    cfg = _load_config()
+    time.sleep(cfg.startup_latency)
+    parser = argparse.ArgumentParser(prog="claude", add_help=False)
+    parser.add_argument("-h", "--help", action="store_true")
+    parser.add_argument("-v", "--version", action="store_true")
+    parser.add_argument("-p", "--print", dest="print_mode", action="store_true")
+    parser.add_argument("--agent")
+    parser.add_argument("--output-format", default="text",
+                        choices=["text", "json", "stream-json"])
+    parser.add_argument("--max-turns", type=int)
+    parser.add_argument("--permission-mode")
+    parser.add_argument("--model")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("prompt", nargs="?")
+    args, _unknown = parser.parse_known_args(argv)
+
+    if args.version:
+        _emit(f"{cfg.version} (Claude Code)")
+        return 0
+    if args.help:
+        sys.stdout.write(_HELP.format(tools=", ".join(cfg.help_tools)))
+        return 0
+    if args.print_mode:
+        return _print_mode(cfg, args)
+    return _interactive(cfg, args)
+
+
+def npm_main(argv: list[str]) -> int:
+    cfg = _load_config()
+    time.sleep(cfg.startup_latency)
+    if argv[:1] == ["view"] and len(argv) >= 2 and argv[1] == PACKAGE:
+        _emit(cfg.latest_version or cfg.version)
+        return 0
+    print(f"fake npm: unsupported command: {' '.join(argv)}", file=sys.stderr)
+    return 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    tool = "claude"
+    if argv[:1] == ["--as-npm"]:
+        tool, argv = "npm", argv[1:]
+    log = _load_config().log
+    if log:
+        with open(log, "a") as fh:
+            env = {k: v for k, v in os.environ.items() if k.startswith("CLAUDE_CODE_")}
+            fh.write(json.dumps({"tool": tool, "argv": argv, "cwd": os.getcwd(),
+                                 "env": env, "time": time.time()}) + "\n")
+    return npm_main(argv) if tool == "npm" else claude_main(argv)
+
+
+# --------------------------------------------------------------------------- #
+# Shim installer                                                               #
+# --------------------------------------------------------------------------- #
+
+
+class FakeClaude:
+    """Install ``claude`` and ``npm`` shims backed by this module into ``bin_dir``.
+
+    Put ``bin_dir`` first on PATH (or use ``env()``), then tune behaviour with
+    ``configure()``.  Reconfiguring bumps the shims' mtime, so cached CLI
+    probes (jade_monolith.claude_cli) are invalidated too.
+    """
+
+    def __init__(self, bin_dir: Path, config: FakeClaudeConfig | None = None) -> None:
+        self.bin_dir = bin_dir
+        self.config = config or FakeClaudeConfig()
+        self.config_path = bin_dir / "fake-claude.json"
+        self.log_path = bin_dir / "fake-claude.log"
+        if self.config.log is None:
+            self.config.log = str(self.log_path)
+        bin_dir.mkdir(parents=True, exist_ok=True)
+        repo_root = Path(__file__).resolve().parents[2]
+        for name, extra in (("claude", ""), ("npm", " --as-npm")):
+            shim = bin_dir / name
+            shim.write_text(
+                "#!/bin/sh\n"
+                f"export {CONFIG_ENV}={shlex.quote(str(self.config_path))}\n"
+                f"export PYTHONPATH={shlex.quote(str(repo_root))}${{PYTHONPATH:+:$PYTHONPATH}}\n"
+                f"exec {shlex.quote(sys.executable)} -m jade_monolith.fakes.claude{extra} \"$@\"\n"
+            )
+            shim.chmod(0o755)
+        self._write_config()
+
+    def _write_config(self) -> None:
+        self.config_path.write_text(json.dumps(asdict(self.config)))
+        now = time.time_ns()
+        for name in ("claude", "npm"):
+            shim = self.bin_dir / name
+            now += 1_000_000_000  # distinct mtime even on coarse filesystems
+            os.utime(shim, ns=(now, now))
+
+    def configure(self, **changes: Any) -> None:
+        for key, value in changes.items():
+            if not hasattr(self.config, key):
+                raise TypeError(f"unknown fake claude option: {key}")
+            setattr(self.config, key, value)
+        self._write_config()
+
+    def env(self, base: dict[str, str] | None = None) -> dict[str, str]:
+        env = dict(os.environ if base is None else base)
+        env["PATH"] = f"{self.bin_dir}{os.pathsep}{env.get('PATH', '')}"
+        return env
+
+    def calls(self) -> list[dict[str, Any]]:
+        """Every invocation so far, oldest first."""
+        if not self.log_path.exists():
+            return []
+        return [json.loads(line) for line in self.log_path.read_text().splitlines()]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""Local stand-in for the GitHub REST API endpoints the scripts call.
+
+Serves ``/repos/{org}/{repo}/issues`` and ``/repos/{org}/{repo}/pulls`` from an
+in-memory table of repos, over HTTP/1.1 with keep-alive, with GitHub's ETag
+and rate-limit behaviour: every response carries an ETag, a matching
+``If-None-Match`` gets a 304 that does not spend rate limit, and running out
+of rate limit answers 403 until the window resets.  Secondary rate limits can
+be switched on for the next N requests.  Requests, connections and the peak
+number of requests in flight are recorded so tests can assert on pooling,
+revalidation and pacing.
+
+``rate_limit=None`` serves like a GitHub Enterprise Server with rate
+limiting disabled: no limit, and no ``X-RateLimit-*`` headers.
+
+Renamed or transferred repos answer ``301 Moved Permanently`` with a
+``Location`` to the new repo, as GitHub does.
+
+For the release workflow it also serves single pulls (with ``mergeable``),
+``PUT .../pulls/{n}/merge`` and the ``main`` / ``pre-main`` git refs.
+
+Run with:  python -m jade_monolith.fakes.github --port 8787 claude-objects=2:1 ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+_REPO_PATH = re.compile(r"^/repos/(?P<org>[^/]+)/(?P<repo>[^/]+)/(?P<rest>.+)$")
+_PULL = re.compile(r"^pulls/(?P<number>\d+)(?P<merge>/merge)?$")
+_REF = re.compile(r"^git/refs?/heads/(?P<branch>.+)$")
+RELEASE_BRANCH = "release-please--branches--main"
+
+
+@dataclass
+class FakeRepo:
+    issues: int = 0  # open issues, not counting PRs
+    prs: int = 0
+    release_prs: int = 0  # open release-please PRs, numbered after the other PRs
+    conflicting: frozenset[int] = frozenset()  # PR numbers that are not mergeable
+    pre_main: bool = False  # whether a pre-main branch exists
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    status: int
+    conditional: bool
+    authorization: str | None
+
+
+@dataclass
+class _State:
+    org: str
+    repos: dict[str, FakeRepo]
+    latency: float
+    rate_limit: int | None  # None: rate limiting disabled
+    rate_remaining: int
+    rate_window: float
+    rate_reset: float = 0.0
+    secondary: int = 0  # answer this many more requests with a secondary limit
+    retry_after: int | None = None
+    merged: dict[str, set[int]] = field(default_factory=dict)
+    refs: dict[tuple[str, str], str] = field(default_factory=dict)  # (repo, branch) -> sha
+    moved: dict[str, str] = field(default_factory=dict)  # old repo -> new repo's API URL
+    requests: list[RecordedRequest] = field(default_factory=list)
+    connections: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _pulls(repo: str, spec: FakeRepo, merged: set[int]) -> list[dict[str, Any]]:
+    prs = [{"number": n, "title": f"PR {n} in {repo}", "state": "open", "body": "",
+            "head": {"ref": f"feature-{n}"}, "base": {"ref": "main"}}
+           for n in range(1, spec.prs + 1)]
+    prs += [{"number": n, "title": f"chore(main): release {repo} 1.{n}.0", "state": "open",
+             "body": "Release notes", "head": {"ref": RELEASE_BRANCH}, "base": {"ref": "main"}}
+            for n in range(spec.prs + 1, spec.prs + spec.release_prs + 1)]
+    return [pr for pr in prs if pr["number"] not in merged]
+
+
+def _items(repo: str, kind: str, spec: FakeRepo, merged: set[int]) -> list[dict[str, Any]]:
+    prs = _pulls(repo, spec, merged)
+    if kind == "pulls":
+        return prs
+    first_issue = spec.prs + spec.release_prs
+    issues = [{"number": first_issue + n, "title": f"Issue {n} in {repo}", "state": "open"}
+              for n in range(1, spec.issues + 1)]
+    as_issues = [{"number": pr["number"], "title": pr["title"], "state": "open",
+                  "pull_request": {"url": f"/repos/x/{repo}/pulls/{pr['number']}"}}
+                 for pr in prs]
+    return issues + as_issues  # like GitHub, the issues endpoint includes PRs
+
+
+def _main_sha(repo: str, merged: set[int]) -> str:
+    return hashlib.sha1(f"{repo}:{sorted(merged)}".encode()).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.state.lock:
+            self.server.state.connections += 1
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def _route(self, method: str, path: str, query: dict[str, list[str]],
+               body: Any) -> tuple[int, Any]:
+        """(status, payload) for one request; called with the state lock held."""
+        state = self.server.state
+        match = _REPO_PATH.match(path)
+        if match is not None and match["org"] == state.org and match["repo"] in state.moved:
+            return 301, {"message": "Moved Permanently",
+                         "url": f"{state.moved[match['repo']]}/{match['rest']}"}
+        if match is None or match["org"] != state.org or match["repo"] not in state.repos:
+            return 404, {"message": "Not Found"}
+        repo, rest = match["repo"], match["rest"]
+        spec, merged = state.repos[repo], state.merged.setdefault(repo, set())
+        if rest in ("issues", "pulls") and method == "GET":
+            per_page = int(query.get("per_page", ["30"])[0])
+            return 200, _items(repo, rest, spec, merged)[:per_page]
+        if pull := _PULL.match(rest):
+            number = int(pull["number"])
+            pr = next((p for p in _pulls(repo, spec, merged) if p["number"] == number), None)
+            if pr is None:
+                return 404, {"message": "Not Found"}
+            mergeable = number not in spec.conflicting
+            if method == "GET" and not pull["merge"]:
+                return 200, {**pr, "mergeable": mergeable}
+            if method == "PUT" and pull["merge"]:
+                if not mergeable:
+                    return 405, {"message": "Pull Request is not mergeable"}
+                merged.add(number)
+                return 200, {"merged": True, "sha": _main_sha(repo, merged)}
+        if ref := _REF.match(rest):
+            branch = ref["branch"]
+            if branch == "main":
+                sha = _main_sha(repo, merged)
+            elif branch == "pre-main" and spec.pre_main:
+                sha = state.refs.setdefault((repo, branch), "0" * 40)
+            else:
+                return 404, {"message": "Not Found"}
+            if method == "PATCH" and rest.startswith("git/refs/"):
+                if not isinstance(body, dict) or "sha" not in body:
+                    return 422, {"message": "Invalid request"}
+                sha = state.refs[(repo, branch)] = body["sha"]
+            elif method != "GET" or not rest.startswith("git/ref/"):
+                return 404, {"message": "Not Found"}
+            return 200, {"ref": f"refs/heads/{branch}", "object": {"sha": sha}}
+        return 404, {"message": "Not Found"}
+
+    def _handle(self, method: str) -> None:
+        state = self.server.state
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        with state.lock:
+            state.in_flight += 1
+            state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+        time.sleep(state.latency)
+        url = urlsplit(self.path)
+        conditional = "If-None-Match" in self.headers
+
+        with state.lock:
+            state.in_flight -= 1
+            now = time.time()
+            if now >= state.rate_reset:
+                state.rate_remaining = state.rate_limit or 0
+                state.rate_reset = now + state.rate_window
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                body = None
+            status, payload = self._route(method, url.path, parse_qs(url.query), body)
+            body = json.dumps(payload).encode()
+            etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+            headers = {"ETag": etag}
+            if status == 301:
+                headers["Location"] = payload["url"] + (f"?{url.query}" if url.query else "")
+            if status == 200 and method == "GET" and self.headers.get("If-None-Match") == etag:
+                status = 304  # free: does not count against the rate limit
+            elif state.secondary > 0:
+                state.secondary -= 1
+                status = 403
+                body = json.dumps({"message": "You have exceeded a secondary rate limit. "
+                                              "Please wait a few minutes before you try again."}
+                                  ).encode()
+                if state.retry_after is not None:
+                    headers["Retry-After"] = str(state.retry_after)
+            elif state.rate_limit is None:
+                pass  # limits disabled: nothing to spend
+            elif state.rate_remaining <= 0:
+                status = 403
+                body = json.dumps({"message": "API rate limit exceeded"}).encode()
+            else:
+                state.rate_remaining -= 1
+            if state.rate_limit is not None:
+                headers.update({
+                    "X-RateLimit-Limit": str(state.rate_limit),
+                    "X-RateLimit-Remaining": str(state.rate_remaining),
+                    "X-RateLimit-Used": str(state.rate_limit - state.rate_remaining),
+                    "X-RateLimit-Reset": str(int(state.rate_reset)),
+                    "X-RateLimit-Resource": "core",
+                })
+            state.requests.append(RecordedRequest(
+                method, self.path, status, conditional, self.headers.get("Authorization"),
+            ))
+        self._send(status, body, headers)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    state: _State
+
+
+class FakeGitHub:
+    """Run the stand-in API on 127.0.0.1 in a background thread.
+
+    Use as a context manager; ``url`` is the API base to point clients at.
+    """
+
+    def __init__(
+        self,
+        repos: dict[str, FakeRepo] | None = None,
+        *,
+        org: str = "jadecli",
+        latency: float = 0.0,
+        rate_limit: int | None = 5000,
+        rate_window: float = 3600.0,
+        port: int = 0,
+    ) -> None:
+        self.state = _State(org, dict(repos or {}), latency, rate_limit, rate_limit or 0,
+                            rate_window)
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.state = self.state
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> list[RecordedRequest]:
+        with self.state.lock:
+            return list(self.state.requests)
+
+    @property
+    def connections(self) -> int:
+        return self.state.connections
+
+    @property
+    def peak_in_flight(self) -> int:
+        return self.state.peak_in_flight
+
+    def set_repo(self, name: str, *, issues: int = 0, prs: int = 0, **spec: Any) -> None:
+        with self.state.lock:
+            self.state.repos[name] = FakeRepo(issues, prs, **spec)
+
+    def rename(self, old: str, new: str, *, api: str | None = None) -> None:
+        """Answer requests for ``old`` with a 301 to ``new``, on ``api`` if given."""
+        with self.state.lock:
+            self.state.moved[old] = f"{api or self.url}/repos/{self.state.org}/{new}"
+
+    def secondary_limit(self, requests: int, *, retry_after: int | None = None) -> None:
+        """Answer the next ``requests`` requests with a secondary rate limit 403."""
+        with self.state.lock:
+            self.state.secondary = requests
+            self.state.retry_after = retry_after
+
+    def ref(self, repo: str, branch: str) -> str | None:
+        with self.state.lock:
+            if branch == "main":
+                return _main_sha(repo, self.state.merged.get(repo, set()))
+            return self.state.refs.get((repo, branch))
+
+    def start(self) -> FakeGitHub:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeGitHub:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.fakes.github")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("repos", nargs="*", metavar="REPO=ISSUES:PRS")
+    args = parser.parse_args(argv)
+    repos = {}
+    for spec in args.repos:
+        name, _, counts = spec.partition("=")
+        issues, _, prs = counts.partition(":")
+        repos[name] = FakeRepo(int(issues or 0), int(prs or 0))
+    fake = FakeGitHub(repos, latency=args.latency, port=args.port)
+    print(f"fake GitHub API on {fake.url}", flush=True)
+    with contextlib.suppress(KeyboardInterrupt):
+        fake._server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Local stand-in for the npm registry endpoints jade_monolith.releases calls.
+
+Serves ``/-/package/{name}/dist-tags`` and the packument ``/{name}`` from an
+in-memory table of packages, over HTTP/1.1 with keep-alive.  Responses carry
+an ETag and a matching ``If-None-Match`` gets a 304.  Latency and outages can
+be dialled in, and requests are recorded so tests can assert on what was
+actually fetched.
+
+Run with:  python -m jade_monolith.fakes.registry --port 8788 @anthropic-ai/claude-code=2.1.34
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+_DIST_TAGS_PATH = re.compile(r"^/-/package/(?P<name>.+)/dist-tags$")
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    status: int
+    conditional: bool
+
+
+@dataclass
+class _State:
+    packages: dict[str, dict[str, str]]  # name -> dist-tags
+    latency: float
+    down: bool = False  # answer 503 to everything
+    requests: list[RecordedRequest] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _packument(name: str, tags: dict[str, str]) -> dict[str, Any]:
+    return {"name": name, "dist-tags": tags,
+            "versions": {v: {"name": name, "version": v} for v in sorted(set(tags.values()))}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        state = self.server.state
+        time.sleep(state.latency)
+        path = unquote(urlsplit(self.path).path)
+        conditional = "If-None-Match" in self.headers
+
+        with state.lock:
+            match = _DIST_TAGS_PATH.match(path)
+            name = match["name"] if match else path.lstrip("/")
+            if state.down:
+                status, payload = 503, {"error": "service unavailable"}
+            elif name not in state.packages:
+                status, payload = 404, {"error": "Not found"}
+            elif match:
+                status, payload = 200, state.packages[name]
+            else:
+                status, payload = 200, _packument(name, state.packages[name])
+            body = json.dumps(payload).encode()
+            etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                status = 304
+            state.requests.append(RecordedRequest("GET", self.path, status, conditional))
+
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    state: _State
+
+
+class FakeRegistry:
+    """Run the stand-in registry on 127.0.0.1 in a background thread.
+
+    Use as a context manager; ``url`` is the registry base to point clients at.
+    ``packages`` maps a package name to its latest version.
+    """
+
+    def __init__(
+        self, packages: dict[str, str] | None = None, *, latency: float = 0.0, port: int = 0,
+    ) -> None:
+        self.state = _State({name: {"latest": v} for name, v in (packages or {}).items()},
+                            latency)
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.state = self.state
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> list[RecordedRequest]:
+        with self.state.lock:
+            return list(self.state.requests)
+
+    def publish(self, name: str, version: str, tag: str = "latest") -> None:
+        with self.state.lock:
+            self.state.packages.setdefault(name, {})[tag] = version
+
+    def set_down(self, down: bool = True) -> None:
+        with self.state.lock:
+            self.state.down = down
+
+    def start(self) -> FakeRegistry:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeRegistry:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.fakes.registry")
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("packages", nargs="*", metavar="NAME=VERSION")
+    args = parser.parse_args(argv)
+    packages = dict(spec.rpartition("=")[::2] for spec in args.packages)
+    fake = FakeRegistry(packages, latency=args.latency, port=args.port)
+    print(f"fake npm registry on {fake.url}", flush=True)
+    with contextlib.suppress(KeyboardInterrupt):
+        fake._server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
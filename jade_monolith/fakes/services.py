@@ -0,0 +1,213 @@
+"""Local stand-ins for PostgreSQL, MongoDB and Dragonfly, at the wire-protocol level.
+
+Each fake answers exactly the handshake jade_monolith.service_probe sends,
+after an optional delay, in one of several modes:
+
+  ready     the real server's answer (authentication request, ``hello`` ok,
+            ``+PONG``)
+  starting  the service's own "not yet" answer (SQLSTATE 57P03,
+            ``ok: 0``, ``-LOADING``)
+  silent    accept the connection and never answer, like a port held by
+            some other process
+  garbage   answer with an HTTP error page
+
+The postgres fake answers the SSLRequest with ``S`` and upgrades to TLS when
+given a server ``tls`` context, ``N`` otherwise.  Connections are counted so
+tests can assert on what was actually probed.
+
+Run with:  python -m jade_monolith.fakes.services --port 55432 postgres
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import socketserver
+import ssl
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+from ..service_probe import (
+    MONGO_OP_MSG,
+    PG_SSL_REQUEST,
+    REDIS_PING,
+    bson_decode,
+    mongo_op_msg,
+)
+
+MODES = ("ready", "starting", "silent", "garbage")
+PROTOCOLS = ("postgres", "mongodb", "redis")
+_HTTP_ERROR = b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+@dataclass
+class _State:
+    protocol: str
+    mode: str
+    latency: float
+    tls: ssl.SSLContext | None = None
+    connections: int = 0
+    handshakes: int = 0  # requests fully read and answered
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _read_exact(sock: socketserver.BaseRequestHandler, n: int) -> bytes:
+    data = b""
+    while len(data) < n:
+        chunk = sock.request.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("peer closed")
+        data += chunk
+    return data
+
+
+def _pg_error(severity: str, code: str, message: str) -> bytes:
+    fields = f"S{severity}\0V{severity}\0C{code}\0M{message}\0\0".encode()
+    return b"E" + struct.pack("!i", 4 + len(fields)) + fields
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        state = self.server.state
+        with state.lock:
+            state.connections += 1
+        try:
+            self._serve(state)
+        finally:
+            if isinstance(self.request, ssl.SSLSocket):  # the upgraded postgres connection
+                self.request.close()
+
+    def _serve(self, state: _State) -> None:
+        try:
+            reply = getattr(self, f"_{state.protocol}")(state.mode)
+        except (ConnectionError, ssl.SSLError):
+            return
+        if state.mode == "silent":
+            self.request.recv(1)  # hold the connection until the client gives up
+            return
+        time.sleep(state.latency)
+        self.request.sendall(_HTTP_ERROR if state.mode == "garbage" else reply)
+        with state.lock:
+            state.handshakes += 1
+
+    def _postgres(self, mode: str) -> bytes:
+        if _read_exact(self, 8) != PG_SSL_REQUEST:
+            return _pg_error("FATAL", "08P01", "expected SSLRequest")
+        if mode in ("silent", "garbage"):
+            return b""
+        tls = self.server.state.tls
+        if tls is None:
+            self.request.sendall(b"N")
+        else:
+            self.request.sendall(b"S")
+            self.request = tls.wrap_socket(self.request, server_side=True)
+        (length,) = struct.unpack("!i", _read_exact(self, 4))
+        _read_exact(self, length - 4)
+        if mode == "starting":
+            return _pg_error("FATAL", "57P03", "the database system is starting up")
+        return b"R" + struct.pack("!ii", 8, 3)  # AuthenticationCleartextPassword
+
+    def _mongodb(self, mode: str) -> bytes:
+        length, request_id, _, opcode = struct.unpack("<iiii", _read_exact(self, 16))
+        body = _read_exact(self, length - 16)
+        if opcode != MONGO_OP_MSG or "hello" not in bson_decode(body[5:]):
+            return mongo_op_msg({"ok": 0.0, "errmsg": "unsupported"}, 1, request_id)
+        if mode == "starting":
+            return mongo_op_msg({"ok": 0.0, "errmsg": "node is recovering", "code": 91},
+                                1, request_id)
+        return mongo_op_msg({"isWritablePrimary": True, "maxWireVersion": 21, "ok": 1.0},
+                            1, request_id)
+
+    def _redis(self, mode: str) -> bytes:
+        if _read_exact(self, len(REDIS_PING)) != REDIS_PING:
+            return b"-ERR unknown command\r\n"
+        if mode == "starting":
+            return b"-LOADING Dragonfly is loading the dataset in memory\r\n"
+        return b"+PONG\r\n"
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    block_on_close = False
+    state: _State
+
+
+class FakeService:
+    """Serve one protocol on 127.0.0.1 from a background thread.
+
+    Use as a context manager; ``port`` is where to point the probe.
+    """
+
+    def __init__(
+        self, protocol: str, *, mode: str = "ready", latency: float = 0.0, port: int = 0,
+        tls: ssl.SSLContext | None = None,
+    ) -> None:
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"unknown protocol {protocol!r}; expected one of {PROTOCOLS}")
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+        self.state = _State(protocol, mode, latency, tls)
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.state = self.state
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def connections(self) -> int:
+        with self.state.lock:
+            return self.state.connections
+
+    @property
+    def handshakes(self) -> int:
+        with self.state.lock:
+            return self.state.handshakes
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}")
+        with self.state.lock:
+            self.state.mode = mode
+
+    def start(self) -> FakeService:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeService:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.fakes.services")
+    parser.add_argument("protocol", choices=PROTOCOLS)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--mode", choices=MODES, default="ready")
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    fake = FakeService(args.protocol, mode=args.mode, latency=args.latency, port=args.port)
+    print(f"fake {args.protocol} ({args.mode}) on 127.0.0.1:{fake.port}", flush=True)
+    with contextlib.suppress(KeyboardInterrupt):
+        fake._server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
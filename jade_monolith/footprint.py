@@ -0,0 +1,368 @@
+"""System-prompt footprint — estimated tokens per agent, checked against budgets.
+
+An agent's markdown body is its system prompt, resent on every turn of every
+teammate (see the cost table in docs/api-usage.md).  This estimates the
+tokens of each body plus every file it pulls in with an ``@path`` import,
+checks the total against the agent's budget and reports the largest
+sections, so a prompt that has quietly grown is caught before it costs
+time-to-first-token on every turn.
+
+Token counts come from a local approximation, not the real tokenizer: ASCII
+letter runs count one token per four letters, digits one per three, a run
+of newlines one, and any other non-space character one.  For English prose
+and markdown that lands within ~10% of the API's count; it never needs the
+network and does a multi-KB prompt in well under a millisecond.
+
+Budgets, most specific first:
+
+  promptBudget: 6000                       agent frontmatter, any model
+  promptBudget: {opus: 8000, haiku: 3000}  agent frontmatter, per model
+  benchmarks/prompt-budgets.json           {"agents": {name: n}, "models":
+                                           {model: n}, "default": n}
+  DEFAULT_BUDGET                           when nothing else applies
+
+Run with:  python -m jade_monolith.footprint [--root PATH] [--top N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .agents import AgentLoader, AgentParseError
+
+DEFAULT_BUDGET = 8000  # tokens
+BUDGETS_FILE = Path("benchmarks") / "prompt-budgets.json"
+MAX_INCLUDE_DEPTH = 5  # as Claude Code resolves @imports
+PARALLEL_MIN_AGENTS = 500  # per worker; below that a pool costs more than it saves
+
+_TOKEN = re.compile(r"[A-Za-z]{1,4}|\d{1,3}|\n+|\S")
+_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_CODE_SPAN = re.compile(r"`+[^`]*`+")
+# @path imports: not part of an e-mail address or a longer word
+_INCLUDE = re.compile(r"(?<![\w@])@((?:~|\.{1,2})?/?[\w.~-]+(?:/[\w.~-]+)*)")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text`` (see the module docstring)."""
+    return len(_TOKEN.findall(text))
+
+
+# --------------------------------------------------------------------------- #
+# Sections and includes                                                        #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass(frozen=True)
+class Section:
+    """One heading's worth of a prompt, or one included file."""
+
+    source: str  # agent file name, or the path of an included file
+    heading: str  # "" for text before the first heading
+    tokens: int
+    included: bool = False
+
+
+def _prose_lines(text: str) -> Iterable[tuple[str, bool]]:
+    """Yield ``(line, in_code_block)`` for each line of ``text``."""
+    in_code = False
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            in_code = not in_code
+            yield line, True
+            continue
+        yield line, in_code
+
+
+def split_sections(text: str, source: str) -> list[Section]:
+    """Split a markdown prompt on its headings (ignoring those in code blocks)."""
+    sections = []
+    heading, lines = "", []
+    for line, in_code in _prose_lines(text):
+        match = None if in_code else _HEADING.match(line)
+        if match:
+            if lines or heading:
+                sections.append(Section(source, heading, estimate_tokens("\n".join(lines))))
+            heading, lines = match.group(1), []
+        lines.append(line)
+    if lines:
+        sections.append(Section(source, heading, estimate_tokens("\n".join(lines))))
+    return sections
+
+
+def find_includes(text: str) -> list[str]:
+    """``@path`` imports in ``text``, outside code blocks and code spans."""
+    if "@" not in text:
+        return []
+    found = []
+    for line, in_code in _prose_lines(text):
+        if not in_code and "@" in line:
+            found += _INCLUDE.findall(_CODE_SPAN.sub("", line))
+    return list(dict.fromkeys(found))
+
+
+def resolve_includes(path: Path, text: str) -> tuple[list[tuple[Path, str]], list[str]]:
+    """Read every file ``text`` (the contents of ``path``) imports, recursively.
+
+    Relative imports resolve against the importing file's directory.
+    Returns the ``(path, text)`` of each file read, once each, and the
+    imports that could not be read.
+    """
+    included: dict[Path, str] = {}
+    missing: list[str] = []
+
+    def visit(base: Path, body: str, depth: int) -> None:
+        if depth > MAX_INCLUDE_DEPTH:
+            return
+        for ref in find_includes(body):
+            target = Path(ref).expanduser()
+            target = (target if target.is_absolute() else base.parent / target).resolve()
+            if target in included or target == path.resolve():
+                continue
+            try:
+                included[target] = target.read_text(errors="replace")
+            except OSError:
+                missing.append(ref)
+                continue
+            visit(target, included[target], depth + 1)
+
+    visit(path, text, 1)
+    return list(included.items()), missing
+
+
+# --------------------------------------------------------------------------- #
+# Budgets                                                                      #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class Budgets:
+    models: dict[str, int] = field(default_factory=dict)
+    agents: dict[str, int] = field(default_factory=dict)
+    default: int = DEFAULT_BUDGET
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Budgets:
+        return cls(
+            models={k: int(v) for k, v in (data.get("models") or {}).items()},
+            agents={k: int(v) for k, v in (data.get("agents") or {}).items()},
+            default=int(data.get("default", DEFAULT_BUDGET)),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Budgets:
+        """Budgets from a JSON file; the defaults when it does not exist."""
+        try:
+            return cls.from_json(json.loads(path.read_text()))
+        except FileNotFoundError:
+            return cls()
+
+    def for_agent(self, agent: dict[str, Any]) -> int:
+        model = agent.get("model") or "inherit"
+        declared = agent.get("promptBudget")
+        if isinstance(declared, dict):
+            declared = declared.get(model)
+        if isinstance(declared, int) and not isinstance(declared, bool):
+            return declared
+        name = agent.get("name") or Path(agent["_path"]).stem
+        if name in self.agents:
+            return self.agents[name]
+        return self.models.get(model, self.default)
+
+
+def budgets_for_root(root: Path) -> Budgets:
+    """``root``'s budgets file, re-read only when it changes."""
+    path = root / BUDGETS_FILE
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    return _load_budgets(path, mtime)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_budgets(path: Path, mtime: int | None) -> Budgets:
+    return Budgets.load(path)
+
+
+def _repo_root(agent_path: Path) -> Path | None:
+    """The repo an agent belongs to, when it lives in ``<root>/.claude/agents``."""
+    parent = agent_path.parent
+    if parent.name == "agents" and parent.parent.name == ".claude":
+        return parent.parent.parent
+    return None
+
+
+def budgets_for_agent(agent: dict[str, Any]) -> Budgets:
+    root = _repo_root(Path(agent["_path"]))
+    return Budgets() if root is None else budgets_for_root(root)
+
+
+# --------------------------------------------------------------------------- #
+# Measuring                                                                    #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class Footprint:
+    agent: str
+    path: str
+    model: str
+    tokens: int
+    budget: int
+    sections: list[Section]
+    missing_includes: list[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.tokens > self.budget
+
+    def to_json(self) -> dict[str, Any]:
+        return {**asdict(self), "over_budget": self.over_budget}
+
+
+def measure(agent: dict[str, Any], budgets: Budgets | None = None) -> Footprint:
+    """Estimate one parsed agent's system prompt, includes and all."""
+    path = Path(agent["_path"])
+    body = agent["_body"]
+    sections = split_sections(body, path.name)
+    included, missing = resolve_includes(path, body)
+    sections += [Section(str(p), "", estimate_tokens(text), included=True)
+                 for p, text in included]
+    budgets = budgets or budgets_for_agent(agent)
+    return Footprint(
+        agent=str(agent.get("name") or path.stem), path=str(path),
+        model=str(agent.get("model") or "inherit"),
+        tokens=sum(s.tokens for s in sections), budget=budgets.for_agent(agent),
+        sections=sections, missing_includes=missing,
+    )
+
+
+def budget_problem(agent: dict[str, Any]) -> str | None:
+    """Why ``agent``'s prompt is over budget, or None.
+
+    Cheap for prompts that are obviously within budget: every token covers
+    at least one character, so a body shorter than the budget with no
+    imports cannot exceed it and is not tokenized at all.
+    """
+    budgets = budgets_for_agent(agent)
+    budget = budgets.for_agent(agent)
+    body = agent["_body"]
+    if len(body) <= budget and not find_includes(body):
+        return None
+    footprint = measure(agent, budgets)
+    if not footprint.over_budget:
+        return None
+    return (f"{Path(footprint.path).name}: system prompt is ~{footprint.tokens} tokens, "
+            f"over its {footprint.model} budget of {footprint.budget}")
+
+
+def _measure_chunk(agents: list[dict[str, Any]], budgets: Budgets | None) -> list[Footprint]:
+    return [measure(agent, budgets) for agent in agents]
+
+
+def analyze(
+    agents: Iterable[dict[str, Any]],
+    budgets: Budgets | None = None,
+    *,
+    workers: int | None = None,
+) -> list[Footprint]:
+    """Measure every agent, in input order.
+
+    Catalogues of PARALLEL_MIN_AGENTS or more are split across ``workers``
+    processes (default: CPU count); ``workers=1`` always measures here.
+    """
+    agents = list(agents)
+    workers = min(workers or os.cpu_count() or 1, len(agents) // PARALLEL_MIN_AGENTS)
+    if workers <= 1:
+        return _measure_chunk(agents, budgets)
+    from concurrent.futures import ProcessPoolExecutor  # not needed by the schema rule
+
+    size = -(-len(agents) // workers)
+    chunks = [agents[i:i + size] for i in range(0, len(agents), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_measure_chunk, chunks, [budgets] * len(chunks))
+        return [footprint for chunk in results for footprint in chunk]
+
+
+def largest_sections(footprints: list[Footprint], top: int) -> list[tuple[str, Section]]:
+    ranked = [(f.agent, s) for f in footprints for s in f.sections]
+    ranked.sort(key=lambda item: -item[1].tokens)
+    return ranked[:top]
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _print_report(footprints: list[Footprint], top: int, elapsed_s: float) -> None:
+    print(f"{'AGENT':<24} {'MODEL':<8} {'TOKENS':>8} {'BUDGET':>8}")
+    for f in sorted(footprints, key=lambda f: -f.tokens):
+        flag = "  OVER" if f.over_budget else ""
+        print(f"{f.agent:<24} {f.model:<8} {f.tokens:>8} {f.budget:>8}{flag}")
+        for ref in f.missing_includes:
+            print(f"  missing include: @{ref}")
+    if top and footprints:
+        print("\nLargest sections:")
+        for agent, section in largest_sections(footprints, top):
+            where = f"@{section.source}" if section.included else section.heading
+            print(f"{section.tokens:>8}  {agent}: {where or '(before the first heading)'}")
+    over = sum(f.over_budget for f in footprints)
+    print(f"\n{len(footprints)} agents, {sum(f.tokens for f in footprints)} tokens, "
+          f"{over} over budget ({elapsed_s * 1000:.0f} ms)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.footprint",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=Path.cwd(),
+                        help="repo root containing .claude/agents (default: cwd)")
+    parser.add_argument("--budgets", type=Path,
+                        help=f"budgets JSON (default: ROOT/{BUDGETS_FILE})")
+    parser.add_argument("--top", type=int, default=10,
+                        help="how many of the largest sections to list (default: 10)")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    try:
+        budgets = Budgets.load(args.budgets or root / BUDGETS_FILE)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"error: cannot read budgets: {e}", file=sys.stderr)
+        return 2
+    paths = sorted((root / ".claude" / "agents").glob("*.md"))
+    loader = AgentLoader()
+    try:
+        footprints = analyze(loader.load_many(paths), budgets, workers=args.workers)
+    except AgentParseError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        json.dump({
+            "agents": [f.to_json() for f in footprints],
+            "largest_sections": [{"agent": agent, **asdict(section)}
+                                 for agent, section in largest_sections(footprints, args.top)],
+        }, sys.stdout, indent=2)
+        print()
+    else:
+        _print_report(footprints, args.top, elapsed)
+    return 1 if any(f.over_budget for f in footprints) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Git status for every jadecli checkout, in parallel, two git calls per repo.
+
+Replaces the ten-command-per-repo loop in ``scripts/git-status-all.sh``:
+
+  git status --porcelain=v2 --branch --show-stash --untracked-files=all
+      branch, upstream, ahead/behind, HEAD, stash count, and every changed
+      or untracked path
+  git for-each-ref refs/heads refs/remotes/origin/main
+      local branches without an upstream, and origin/main
+
+Both run at once, worktrees are counted from the git directory without
+spawning anything, and repos are spread over a worker pool.  Fetches go
+through the state daemon (jade_monolith.daemon) when it is running, so repos
+it fetched recently are not fetched again.
+
+Output is the script's JSON schema; ``--ndjson`` streams one object per repo
+as soon as that repo finishes.
+
+Run with:  python -m jade_monolith.git_status [--json|--table|--ndjson]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+DEFAULT_WORKERS = 8
+
+# The repos git-status-all.sh reports on, under $HOME/projects.
+STATUS_REPOS: tuple[str, ...] = (
+    "claude-objects", "dotfiles", "jade-claude-settings", "jade-cli", "jade-dev-assist",
+    "jade-docker", "jade-ecosystem-assist", "jade-ide", "jade-index", "jade-swarm",
+    "jadecli-codespaces", "jadecli-infra", "jadecli-roadmap-and-architecture",
+    "jadeflow-dev-scaffold",
+)
+
+_STATUS_ARGS = ("status", "--porcelain=v2", "--branch", "--show-stash",
+                "--untracked-files=all")
+_REFS_ARGS = ("for-each-ref", "--format=%(refname)%00%(upstream)%00%(objectname)",
+              "refs/heads", "refs/remotes/origin/main")
+
+
+@dataclass
+class RepoStatus:
+    repo: str
+    branch: str = "DETACHED"
+    upstream: str = "none"
+    ahead: int = 0
+    behind: int = 0
+    untracked: int = 0
+    modified: int = 0
+    staged: int = 0
+    stash: int = 0
+    untracked_branches: str = ""
+    worktrees: int = 0
+    # Not part of the JSON schema; used by the health check.
+    head: str | None = None
+    origin_main: str | None = None
+
+    def to_json(self) -> dict[str, object]:
+        """The git-status-all.sh object, keys in the script's order."""
+        return {f.name: getattr(self, f.name) for f in fields(self)
+                if f.name not in ("head", "origin_main")}
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.untracked or self.modified or self.staged)
+
+
+def parse_status(text: str, status: RepoStatus) -> None:
+    """Fill ``status`` from ``git status --porcelain=v2 --branch --show-stash``."""
+    upstream_exists = False
+    for line in text.splitlines():
+        if line.startswith("# "):
+            key, _, value = line[2:].partition(" ")
+            if key == "branch.head":
+                status.branch = "DETACHED" if value == "(detached)" else value
+            elif key == "branch.oid":
+                status.head = None if value == "(initial)" else value
+            elif key == "branch.upstream":
+                status.upstream = value
+            elif key == "branch.ab":  # omitted when the upstream branch is gone
+                upstream_exists = True
+                ahead, behind = value.split()
+                status.ahead, status.behind = int(ahead), -int(behind)
+            elif key == "stash":
+                status.stash = int(value)
+        elif line.startswith("? "):
+            status.untracked += 1
+        elif line.startswith(("1 ", "2 ")):
+            xy = line[2:4]
+            status.staged += xy[0] != "."
+            status.modified += xy[1] != "."
+        elif line.startswith("u "):  # unmerged: listed by both diffs
+            status.staged += 1
+            status.modified += 1
+    if not upstream_exists:  # as `git rev-parse @{u}` failing did in the script
+        status.upstream = "none"
+
+
+def parse_refs(text: str, status: RepoStatus) -> None:
+    """Fill untracked_branches and origin_main from the for-each-ref output."""
+    untracked = []
+    for line in text.splitlines():
+        refname, upstream, oid = line.split("\0")
+        if refname == "refs/remotes/origin/main":
+            status.origin_main = oid
+        elif not upstream:
+            untracked.append(refname.removeprefix("refs/heads/"))
+    status.untracked_branches = ",".join(untracked)
+
+
+def _git_dir(path: Path) -> Path | None:
+    dot_git = path / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():  # submodules and linked worktrees: "gitdir: <path>"
+        target = dot_git.read_text().strip().removeprefix("gitdir:").strip()
+        return (path / target).resolve()
+    return None
+
+
+def count_worktrees(git_dir: Path) -> int:
+    """Linked worktrees, as ``git worktree list`` minus the main one."""
+    try:
+        return sum(1 for entry in (git_dir / "worktrees").iterdir() if entry.is_dir())
+    except OSError:
+        return 0
+
+
+def repo_status(path: Path, name: str | None = None, *, fetch: bool = False) -> RepoStatus | None:
+    """Status of the checkout at ``path``; None if it is not a git checkout."""
+    git_dir = _git_dir(path)
+    if git_dir is None:
+        return None
+    if fetch:
+        subprocess.run(["git", "fetch", "--quiet", "origin"], cwd=path,
+                       stdin=subprocess.DEVNULL, capture_output=True)
+    procs = [
+        subprocess.Popen(["git", *args], cwd=path, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for args in (_STATUS_ARGS, _REFS_ARGS)
+    ]
+    status_out, refs_out = (proc.communicate()[0] for proc in procs)
+    status = RepoStatus(repo=name or path.name)
+    parse_status(status_out, status)
+    parse_refs(refs_out, status)
+    status.worktrees = count_worktrees(git_dir)
+    return status
+
+
+def _daemon_fetch(paths: list[Path]) -> bool:
+    """Let the state daemon fetch ``paths`` (deduplicated); False if none is running."""
+    from .daemon import query
+
+    request = {"op": "fetch", "paths": [str(p.resolve()) for p in paths]}
+    return query(request, timeout=300.0) is not None
+
+
+def collect(
+    paths: dict[str, Path], *, workers: int = DEFAULT_WORKERS, fetch: bool = False,
+) -> Iterator[tuple[str, RepoStatus | None]]:
+    """Yield (name, status) for each repo as soon as it is done, in completion order."""
+    existing = [p for p in paths.values() if _git_dir(p) is not None]
+    if fetch and existing and _daemon_fetch(existing):
+        fetch = False
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(repo_status, path, name, fetch=fetch): name
+                   for name, path in paths.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+_TABLE_ROW = "%-30s %-20s %-18s %3s %3s %3s %3s %3s %3s %-30s %s"
+
+
+def _table_row(status: RepoStatus) -> str:
+    marker = ("*" if status.dirty else "") + ("^" if status.ahead > 0 else "")
+    return _TABLE_ROW % (
+        status.repo + marker, status.branch, status.upstream, status.ahead, status.behind,
+        status.untracked, status.modified, status.staged, status.stash,
+        status.untracked_branches, status.worktrees,
+    )
+
+
+def _compact(obj: object) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="git-status-all.sh",
+                                     description="git status for all jadecli repos")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--json", dest="format", action="store_const", const="json")
+    mode.add_argument("--table", dest="format", action="store_const", const="table")
+    mode.add_argument("--ndjson", dest="format", action="store_const", const="ndjson",
+                      help="stream one JSON object per repo as each finishes")
+    parser.add_argument("--projects-dir", type=Path,
+                        default=Path(os.environ.get("PROJECTS_DIR") or Path.home() / "projects"))
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--no-fetch", action="store_true", help="skip git fetch")
+    parser.add_argument("repos", nargs="*", help="repo names (default: all jadecli repos)")
+    args = parser.parse_args(argv)
+
+    names = args.repos or list(STATUS_REPOS)
+    paths = {name: args.projects_dir / name for name in names}
+    results = collect(paths, workers=args.workers, fetch=not args.no_fetch)
+
+    if args.format == "ndjson":
+        for _name, status in results:
+            if status is not None:
+                print(_compact(status.to_json()), flush=True)
+        return 0
+
+    done = dict(results)
+    ordered = [(name, done[name]) for name in names]
+    if args.format == "json":
+        body = ",\n".join(_compact(s.to_json() if s else {}) for _, s in ordered)
+        print(f"[\n{body}\n]")
+        return 0
+
+    print(_TABLE_ROW % ("REPO", "BRANCH", "UPSTREAM", "AHD", "BHD", "UNT", "MOD", "STG",
+                        "STH", "UNTRACKED BRANCHES", "WT"))
+    print("-" * 160)
+    for _name, status in ordered:
+        if status is not None:
+            print(_table_row(status))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,558 @@
+"""Rate-limit-aware GitHub request scheduler shared by the ecosystem scripts.
+
+The scripts that sweep every jadecli repo make the same kinds of calls.
+Running them one after another, or side by side with no shared state,
+either crawls or trips GitHub's limits.  GitHub sits on top of one pooled
+HTTPClient and adds:
+
+  token bucket   one per host and rate-limit resource (core, search, ...),
+                 filled from ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset``
+                 on every response.  Requests wait for the reset instead of
+                 spending the last of the budget on 403s.
+  concurrency    bounded per host by the client's connection pool
+  dedupe         identical GETs in flight share one request, and answers are
+                 reused for ``cache_ttl`` seconds.  Mutations bypass the cache
+                 and drop the cached reads for their repo.
+  backoff        secondary rate limits (403/429 with ``Retry-After``, or
+                 GitHub's "secondary rate limit" message) are retried after
+                 the advertised delay, else exponentially.  Mutations are
+                 spaced ``mutation_interval`` apart, as GitHub asks.
+
+The commands below replace the serial ``gh`` loops in ``scripts/pr-health.sh``
+and ``scripts/merge-releases.sh``; the scripts delegate here and keep their
+output.
+
+Run with:  python -m jade_monolith.github {pr-health,merge-releases} [--json|--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from .http import ETagCache, HTTPClient, HTTPError, Response
+from .repos import ORG, REPOS
+
+GITHUB_API = "https://api.github.com"
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_MAX_WAIT = 120.0
+DEFAULT_BACKOFF = 60.0  # GitHub: without Retry-After, wait at least a minute
+DEFAULT_RETRIES = 3
+DEFAULT_MUTATION_INTERVAL = 1.0
+_RESET_SKEW = 1.0  # seconds past X-RateLimit-Reset before trusting the refill
+_MUTATIONS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_REPO_PREFIX = re.compile(r"^(/repos/[^/]+/[^/]+)(?:/|$)")
+
+
+class RateLimitExceededError(HTTPError):
+    """The budget will not come back within ``max_wait``, or retries ran out."""
+
+
+def github_token() -> str | None:
+    """GH_TOKEN / GITHUB_TOKEN, else whatever ``gh auth token`` prints."""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token or shutil.which("gh") is None:
+        return token
+    try:
+        proc = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True,
+                              timeout=10, stdin=subprocess.DEVNULL)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return proc.stdout.strip() or None
+
+
+def github_headers(token: str | None) -> dict[str, str]:
+    headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+# --------------------------------------------------------------------------- #
+# Token bucket                                                                 #
+# --------------------------------------------------------------------------- #
+
+
+def resource_for(path: str) -> str:
+    """The rate-limit resource GitHub will charge a request to ``path`` against."""
+    if path.startswith("/search/code"):
+        return "code_search"
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+class TokenBucket:
+    """Request budget for one host and resource, as GitHub last reported it.
+
+    Until the first response the budget is unknown, and only one request
+    at a time goes out to find it.  After that, requests in flight are
+    subtracted from the reported ``remaining``; callers that find it taken
+    wait for the next response, and once it is spent they sleep until
+    ``reset``.  If that first request comes back without rate-limit headers
+    (a GHES with limits disabled, a proxy, a transport error) the bucket
+    stops gating and only the client's connection pool bounds concurrency,
+    until some later response reports a budget.
+    """
+
+    def __init__(
+        self, *, clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset = 0.0  # epoch seconds
+        self.in_flight = 0
+        self.unmetered = False  # a response came back without a budget to follow
+        self._clock = clock
+        self._sleep = sleep
+        self._reported: asyncio.Event | None = None  # set by the next release()
+
+    async def acquire(self, max_wait: float) -> float:
+        """Take one request's worth of budget; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            now = self._clock()
+            if self.remaining is not None and now >= self.reset + _RESET_SKEW:
+                self.remaining = self.limit  # a new window
+            if self.remaining is None and self.unmetered:
+                self.in_flight += 1
+                return waited
+            budget = 1 if self.remaining is None else self.remaining
+            if budget - self.in_flight > 0:
+                self.in_flight += 1
+                return waited
+            if self.in_flight and budget > 0:  # taken by requests that will report back
+                if self._reported is None:
+                    self._reported = asyncio.Event()
+                await self._reported.wait()
+                waited += self._clock() - now
+                continue
+            delay = self.reset + _RESET_SKEW - now
+            if waited + delay > max_wait:
+                until = time.strftime("%H:%M:%S", time.localtime(self.reset))
+                raise RateLimitExceededError(f"rate limit exhausted until {until}")
+            await self._sleep(delay)
+            waited += delay
+
+    def release(self, headers: dict[str, str] | None) -> None:
+        """Return the in-flight slot and take in the response's rate-limit headers."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if self._reported is not None:
+            self._reported.set()
+            self._reported = None
+        try:
+            remaining = int((headers or {})["x-ratelimit-remaining"])
+            reset = float((headers or {})["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            self.unmetered = self.remaining is None
+            return
+        with_limit = headers.get("x-ratelimit-limit", "")
+        if with_limit.isdigit():
+            self.limit = int(with_limit)
+        if self.remaining is not None and reset == self.reset:
+            remaining = min(remaining, self.remaining)  # responses can arrive out of order
+        elif reset < self.reset:
+            return  # a straggler from the previous window
+        self.remaining, self.reset = remaining, reset
+
+
+# --------------------------------------------------------------------------- #
+# Scheduler                                                                    #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0  # sent, including retries
+    deduplicated: int = 0  # joined an identical request already in flight
+    cached: int = 0  # answered from the response cache
+    retries: int = 0
+    waited_s: float = 0.0  # sleeping on the rate limit, backoff and mutation spacing
+
+
+def is_secondary_limit(response: Response) -> bool:
+    if response.status not in (403, 429):
+        return False
+    if "retry-after" in response.headers or response.status == 429:
+        return True
+    return b"secondary rate limit" in response.body.lower()
+
+
+def is_primary_limit(response: Response) -> bool:
+    return (response.status in (403, 429)
+            and response.headers.get("x-ratelimit-remaining") == "0")
+
+
+class GitHub:
+    """Schedules GitHub API calls over ``client``.
+
+    ``get`` and ``request`` return the same Response the client would, so
+    a GitHub can stand in wherever an HTTPClient's ``get`` is used.
+    """
+
+    def __init__(
+        self,
+        client: HTTPClient,
+        *,
+        api: str = GITHUB_API,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        backoff: float = DEFAULT_BACKOFF,
+        retries: int = DEFAULT_RETRIES,
+        mutation_interval: float = DEFAULT_MUTATION_INTERVAL,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.client = client
+        self.api = api.rstrip("/")
+        self.cache_ttl = cache_ttl
+        self.max_wait = max_wait
+        self.backoff = backoff
+        self.retries = retries
+        self.mutation_interval = mutation_interval
+        self.stats = SchedulerStats()
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._cache: dict[str, tuple[float, Response]] = {}  # url -> (expires, response)
+        self._in_flight: dict[str, asyncio.Future[Response]] = {}
+        self._mutation_gate = asyncio.Lock()
+        self._last_mutation = float("-inf")
+
+    def url(self, path: str) -> str:
+        return path if "://" in path else f"{self.api}/{path.lstrip('/')}"
+
+    def bucket(self, url: str) -> TokenBucket:
+        parts = urlsplit(url)
+        key = (parts.netloc, resource_for(parts.path))
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(clock=self._clock, sleep=self._sleep)
+        return self._buckets[key]
+
+    async def _wait(self, seconds: float) -> None:
+        await self._sleep(seconds)
+        self.stats.waited_s += seconds
+
+    async def _send(self, method: str, url: str, body: bytes | None,
+                    headers: dict[str, str] | None) -> Response:
+        """One logical request: budget, retries on rate limits, backoff."""
+        bucket = self.bucket(url)
+        for attempt in range(self.retries + 1):
+            self.stats.waited_s += await bucket.acquire(self.max_wait)
+            response_headers = None
+            try:
+                if method == "GET" and body is None:
+                    response = await self.client.get(url, headers=headers)
+                else:
+                    response = await self.client.request(method, url, headers=headers,
+                                                         body=body)
+                response_headers = response.headers
+            finally:
+                bucket.release(response_headers)
+                self.stats.requests += 1
+            if is_primary_limit(response):
+                delay = 0.0  # the bucket is empty now: acquire() sleeps until the reset
+            elif is_secondary_limit(response):
+                retry_after = response.headers.get("retry-after", "")
+                delay = (float(retry_after) if retry_after.isdigit()
+                         else self.backoff * 2 ** attempt)
+            else:
+                return response
+            if attempt == self.retries:
+                break
+            if delay > self.max_wait:
+                raise RateLimitExceededError(f"{method} {url}: secondary rate limit, "
+                                             f"retry in {delay:.0f}s")
+            self.stats.retries += 1
+            if delay:
+                await self._wait(delay)
+        raise RateLimitExceededError(f"{method} {url}: still rate limited after "
+                                     f"{self.retries} retries")
+
+    async def get(self, url: str, *, headers: dict[str, str] | None = None) -> Response:
+        """GET through the dedupe cache."""
+        url = self.url(url)
+        key = url if not headers else f"{url} {sorted(headers.items())}"
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > self._clock():
+            self.stats.cached += 1
+            return cached[1]
+        if key in self._in_flight:
+            self.stats.deduplicated += 1
+            return await asyncio.shield(self._in_flight[key])
+        future: asyncio.Future[Response] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await self._send("GET", url, None, headers)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # retrieved: waiters re-raise it, nobody else has to
+            raise
+        finally:
+            del self._in_flight[key]
+        if response.ok and self.cache_ttl > 0:
+            self._cache[key] = (self._clock() + self.cache_ttl, response)
+        future.set_result(response)
+        return response
+
+    async def request(
+        self, method: str, url: str, *, json_body: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Any method; mutations are spaced out and invalidate their repo's reads."""
+        if method == "GET" and json_body is None:
+            return await self.get(url, headers=headers)
+        url = self.url(url)
+        body = None if json_body is None else json.dumps(json_body).encode()
+        if body is not None:
+            headers = {"Content-Type": "application/json", **(headers or {})}
+        if method not in _MUTATIONS:
+            return await self._send(method, url, body, headers)
+        async with self._mutation_gate:
+            gap = self._last_mutation + self.mutation_interval - self._clock()
+            if gap > 0:
+                await self._wait(gap)
+            try:
+                return await self._send(method, url, body, headers)
+            finally:
+                self._last_mutation = self._clock()
+                self._invalidate(url)
+
+    def _invalidate(self, url: str) -> None:
+        match = _REPO_PREFIX.match(urlsplit(url).path)
+        if match is None:
+            self._cache.clear()
+            return
+        prefix = f"{self.api}{match[1]}"
+        for key in [k for k in self._cache if k.startswith(prefix)]:
+            del self._cache[key]
+
+    async def json(self, url: str) -> Any:
+        """GET and decode; HTTPError on a non-2xx status."""
+        response = await self.get(url)
+        if not response.ok:
+            raise HTTPError(f"GET {self.url(url)}: HTTP {response.status}")
+        return response.json()
+
+
+# --------------------------------------------------------------------------- #
+# PR health (scripts/pr-health.sh)                                             #
+# --------------------------------------------------------------------------- #
+
+_ISSUE_REF = re.compile(r"#[0-9]+|[Cc]loses|[Ff]ixes|[Rr]esolves")
+RELEASE_PREFIX = "release-please"
+
+
+def _is_release(pr: dict[str, Any]) -> bool:
+    return pr["head"]["ref"].startswith(RELEASE_PREFIX)
+
+
+async def open_pulls(gh: GitHub, org: str, repo: str) -> list[dict[str, Any]]:
+    return await gh.json(f"/repos/{org}/{repo}/pulls?state=open&per_page=100")
+
+
+def pr_health_entry(repo: str, prs: list[dict[str, Any]]) -> dict[str, Any]:
+    unlinked = [pr for pr in prs if not _is_release(pr)
+                and not _ISSUE_REF.search(pr.get("body") or "")
+                and not _ISSUE_REF.search(pr.get("title") or "")]
+    return {
+        "repo": repo,
+        "total": len(prs),
+        "unlinked": len(unlinked),
+        "release_please": sum(1 for pr in prs if _is_release(pr)),
+        "prs": [{"number": pr["number"], "title": (pr.get("title") or "")[:60],
+                 "head": pr["head"]["ref"], "base": pr["base"]["ref"]} for pr in prs],
+    }
+
+
+async def pr_health(
+    gh: GitHub, *, org: str = ORG, repos: tuple[str, ...] = REPOS,
+) -> list[dict[str, Any]]:
+    """One entry per repo, fetched concurrently; ``{}`` for a repo that failed."""
+    async def entry(repo: str) -> dict[str, Any]:
+        try:
+            return pr_health_entry(repo, await open_pulls(gh, org, repo))
+        except (HTTPError, ValueError, KeyError, TypeError):
+            return {}
+
+    return list(await asyncio.gather(*(entry(repo) for repo in repos)))
+
+
+def render_pr_health(entries: list[dict[str, Any]]) -> str:
+    rule = "-" * 60
+    lines = [f"{'REPO':<35} {'TOTAL':>5} {'UNLINKED':>8} {'REL-PLS':>8}", rule]
+    total = unlinked = 0
+    for entry in entries:
+        if not entry:
+            continue
+        total += entry["total"]
+        unlinked += entry["unlinked"]
+        if entry["total"]:
+            marker = " !" if entry["unlinked"] else ""
+            lines.append(f"{entry['repo']:<35} {entry['total']:>5} {entry['unlinked']:>8} "
+                         f"{entry['release_please']:>8}{marker}")
+    lines += [rule, f"{'TOTALS':<35} {total:>5} {unlinked:>8}"]
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------- #
+# Release merges (scripts/merge-releases.sh)                                   #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class MergeReport:
+    repo: str
+    lines: list[str]
+    merged: int = 0
+    failed: int = 0
+
+
+def _mergeable_state(pr: dict[str, Any]) -> str:
+    """gh's MERGEABLE / CONFLICTING / UNKNOWN from the REST ``mergeable`` field."""
+    return {True: "MERGEABLE", False: "CONFLICTING"}.get(pr.get("mergeable"), "UNKNOWN")
+
+
+async def sync_pre_main(gh: GitHub, org: str, repo: str) -> str:
+    base = f"/repos/{org}/{repo}/git"
+    try:
+        main_sha = (await gh.json(f"{base}/ref/heads/main"))["object"]["sha"]
+    except (HTTPError, ValueError, KeyError, TypeError):
+        return f"  Warning: Could not get main branch SHA for {repo}, skipping pre-main sync"
+    try:
+        pre_main = await gh.get(f"{base}/ref/heads/pre-main")
+    except HTTPError:
+        pre_main = None
+    if pre_main is None or not pre_main.ok:
+        return f"  Info: pre-main branch does not exist in {repo}, skipping sync"
+    try:
+        response = await gh.request("PATCH", f"{base}/refs/heads/pre-main",
+                                    json_body={"sha": main_sha, "force": True})
+    except HTTPError:
+        response = None
+    if response is None or not response.ok:
+        return f"  Warning: Failed to sync pre-main for {repo}"
+    return "  ✓ Synced pre-main to match main"
+
+
+async def merge_repo(gh: GitHub, org: str, repo: str, *, dry_run: bool) -> MergeReport:
+    """Merge every mergeable release-please PR of ``repo``, then sync pre-main."""
+    report = MergeReport(repo, [])
+    try:
+        releases = [pr for pr in await open_pulls(gh, org, repo) if _is_release(pr)]
+        details = await asyncio.gather(
+            *(gh.json(f"/repos/{org}/{repo}/pulls/{pr['number']}") for pr in releases))
+    except (HTTPError, ValueError, KeyError, TypeError):
+        return report  # like `gh pr list ... || echo ""`: nothing to do
+    for pr in details:
+        number, title, state = pr["number"], pr.get("title", ""), _mergeable_state(pr)
+        if state != "MERGEABLE":
+            report.lines.append(f"⚠ {repo} PR#{number}: Not mergeable (state: {state})")
+            report.failed += 1
+        elif dry_run:
+            report.lines.append(f"Would merge {repo} PR#{number}: {title}")
+            report.merged += 1
+        else:
+            try:
+                response = await gh.request("PUT", f"/repos/{org}/{repo}/pulls/{number}/merge",
+                                            json_body={"merge_method": "merge"})
+                merged = response.ok
+            except HTTPError:
+                merged = False
+            if merged:
+                report.lines.append(f"✓ {repo} PR#{number}: {title}")
+                report.merged += 1
+            else:
+                report.lines.append(f"✗ {repo} PR#{number}: merge failed")
+                report.failed += 1
+    if report.merged and not dry_run:
+        report.lines.append(await sync_pre_main(gh, org, repo))
+    return report
+
+
+async def merge_releases(
+    gh: GitHub, *, org: str = ORG, repos: tuple[str, ...] = REPOS, dry_run: bool = False,
+) -> list[MergeReport]:
+    """merge_repo() for every repo at once; the scheduler paces the merges."""
+    return list(await asyncio.gather(
+        *(merge_repo(gh, org, repo, dry_run=dry_run) for repo in repos)))
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+async def _run(args: argparse.Namespace) -> int:
+    async with HTTPClient(headers=github_headers(github_token()),
+                          max_per_host=args.concurrency,
+                          etag_cache=None if args.no_etag_cache else ETagCache()) as client:
+        gh = GitHub(client, api=args.api, mutation_interval=args.mutation_interval,
+                    max_wait=args.max_wait)
+        if args.command == "pr-health":
+            entries = await pr_health(gh)
+            if args.json:
+                print(json.dumps(entries, indent=2))
+            else:
+                print(render_pr_health(entries))
+            return 0
+
+        if args.dry_run:
+            print("DRY RUN MODE - no merges will be performed\n")
+        reports = await merge_releases(gh, dry_run=args.dry_run)
+        for report in reports:
+            for line in report.lines:
+                print(line)
+        merged = sum(r.merged for r in reports)
+        failed = sum(r.failed for r in reports)
+        with_merges = sum(1 for r in reports if r.merged)
+        print(f"\nMerged: {merged} release PRs across {with_merges} repos. Failed: {failed}")
+        return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.github",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--api", default=os.environ.get("JADE_GITHUB_API", GITHUB_API),
+                        help="GitHub API base URL (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="requests in flight to the API at once (default: %(default)s)")
+    parser.add_argument("--mutation-interval", type=float, default=DEFAULT_MUTATION_INTERVAL,
+                        help="seconds between merges and other writes (default: %(default)s)")
+    parser.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT,
+                        help="longest wait for the rate limit to reset (default: %(default)s)")
+    parser.add_argument("--no-etag-cache", action="store_true",
+                        help="always send unconditional GitHub requests")
+    sub = parser.add_subparsers(dest="command", required=True)
+    prs = sub.add_parser("pr-health", help="open PRs, unlinked PRs and release PRs per repo")
+    prs.add_argument("--json", action="store_true", help="print one entry per repo as JSON")
+    prs.add_argument("--table", action="store_false", dest="json", help="print a table")
+    merge = sub.add_parser("merge-releases", help="merge every mergeable release-please PR")
+    merge.add_argument("--dry-run", action="store_true", help="report, merge nothing")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_run(args))
+    except RateLimitExceededError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""Ecosystem health check engine behind ``scripts/health-check.sh``.
+
+Runs every check concurrently instead of one after another:
+
+  submodules  ``git fetch origin main`` in every packages/* checkout at once,
+              bounded by --concurrency
+  github      open issue/PR counts for every repo through the rate-limit-aware
+              scheduler (jade_monolith.github) over one pooled keep-alive
+              HTTP client; with the ETag cache, repos that have not changed
+              since the last run answer 304 and spend no rate limit
+  docker      protocol handshakes with PostgreSQL, MongoDB and Dragonfly in
+              parallel (jade_monolith.service_probe); connect and handshake
+              latencies go into histograms under ``services``
+  gpu         nvidia-smi, when installed
+
+When the state daemon (jade_monolith.daemon) is running for the same checkout,
+the report is assembled from its in-memory state instead, so nothing is
+fetched twice.  ``--json`` prints the same document the shell script always
+has, and the exit status is 0 when healthy and 1 when degraded.
+
+Run with:  python -m jade_monolith.health [--json] [--root PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import service_probe
+from .github import GITHUB_API, GitHub, github_headers, github_token
+from .http import ETagCache, HTTPClient, HTTPError
+from .repos import CORE_REPOS, ORG, REPOS
+
+DEFAULT_CONCURRENCY = 8
+DOCKER_SERVICES = service_probe.DEFAULT_SERVICES
+
+
+# --------------------------------------------------------------------------- #
+# Submodules                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class SubmoduleReport:
+    total: int = 0
+    on_main: int = 0
+    behind: int = 0
+    detached: list[str] = field(default_factory=list)  # not on main
+    behind_list: list[str] = field(default_factory=list)
+
+
+async def run_git(cwd: Path, *args: str) -> tuple[int, str]:
+    proc = await asyncio.create_subprocess_exec(
+        "git", *args, cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    return proc.returncode or 0, out.decode().strip()
+
+
+async def checkout_state(path: Path, *, fetch: bool = True) -> dict[str, Any]:
+    """Branch, HEAD and origin/main of one checkout, fetching main first if on it."""
+    rc, branch = await run_git(path, "rev-parse", "--abbrev-ref", "HEAD")
+    state: dict[str, Any] = {"branch": branch if rc == 0 else None,
+                             "head": None, "origin_main": None}
+    if state["branch"] != "main":
+        return state
+    if fetch:
+        await run_git(path, "fetch", "origin", "main", "--quiet")
+    (rc_local, local), (rc_remote, remote) = await asyncio.gather(
+        run_git(path, "rev-parse", "HEAD"), run_git(path, "rev-parse", "origin/main"),
+    )
+    state["head"] = local if rc_local == 0 and local else None
+    state["origin_main"] = remote if rc_remote == 0 and remote else None
+    return state
+
+
+def classify(state: dict[str, Any]) -> str:
+    """"on_main", "behind" or "detached" (not on main), as the shell script reports."""
+    if state["branch"] != "main":
+        return "detached"
+    if state["head"] and state["head"] == state["origin_main"]:
+        return "on_main"
+    return "behind"
+
+
+def submodule_paths(root: Path) -> list[Path]:
+    packages = root / "packages"
+    return sorted(p for p in packages.iterdir() if p.is_dir()) if packages.is_dir() else []
+
+
+async def collect_checkouts(
+    root: Path, *, concurrency: int = DEFAULT_CONCURRENCY, fetch: bool = True,
+) -> dict[str, dict[str, Any]]:
+    """checkout_state() for every packages/* directory, ``concurrency`` at a time."""
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(path: Path) -> dict[str, Any]:
+        async with gate:
+            return await checkout_state(path, fetch=fetch)
+
+    paths = submodule_paths(root)
+    states = await asyncio.gather(*(bounded(p) for p in paths))
+    return {path.name: state for path, state in zip(paths, states, strict=True)}
+
+
+def summarize_submodules(states: dict[str, dict[str, Any]]) -> SubmoduleReport:
+    report = SubmoduleReport(total=len(states))
+    for name, state in states.items():
+        kind = classify(state)
+        if kind == "on_main":
+            report.on_main += 1
+        elif kind == "behind":
+            report.behind += 1
+            report.behind_list.append(name)
+        else:
+            report.detached.append(name)
+    return report
+
+
+async def check_submodules(
+    root: Path, *, concurrency: int = DEFAULT_CONCURRENCY, fetch: bool = True,
+) -> SubmoduleReport:
+    return summarize_submodules(
+        await collect_checkouts(root, concurrency=concurrency, fetch=fetch)
+    )
+
+
+# --------------------------------------------------------------------------- #
+# GitHub                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+async def _open_count(client: HTTPClient | GitHub, url: str) -> int:
+    """Length of the JSON list at ``url``; 0 on any failure, like ``gh api || echo 0``."""
+    try:
+        response = await client.get(url)
+        body = response.json() if response.ok else []
+    except (HTTPError, ValueError):
+        return 0
+    return len(body) if isinstance(body, list) else 0
+
+
+async def repo_counts(
+    client: HTTPClient | GitHub,
+    *,
+    api: str = GITHUB_API,
+    org: str = ORG,
+    repos: tuple[str, ...] = REPOS,
+) -> dict[str, dict[str, int]]:
+    """Open issue (excluding PRs) and PR counts for every repo, fetched concurrently."""
+    api = api.rstrip("/")
+
+    async def counts(repo: str) -> dict[str, int]:
+        base = f"{api}/repos/{org}/{repo}"
+        issues, prs = await asyncio.gather(
+            _open_count(client, f"{base}/issues?state=open&per_page=100"),
+            _open_count(client, f"{base}/pulls?state=open&per_page=100"),
+        )
+        return {"issues": issues - prs, "prs": prs}  # the issues endpoint counts PRs too
+
+    results = await asyncio.gather(*(counts(repo) for repo in repos))
+    return dict(zip(repos, results, strict=True))
+
+
+def summarize_github(
+    counts: dict[str, dict[str, int]], core: frozenset[str] = CORE_REPOS,
+) -> dict[str, int]:
+    report = {"issues": 0, "prs": 0, "core_issues": 0, "core_prs": 0}
+    for repo, counted in counts.items():
+        report["issues"] += counted["issues"]
+        report["prs"] += counted["prs"]
+        if repo in core:
+            report["core_issues"] += counted["issues"]
+            report["core_prs"] += counted["prs"]
+    return report
+
+
+async def check_github(
+    client: HTTPClient | GitHub,
+    *,
+    api: str = GITHUB_API,
+    org: str = ORG,
+    repos: tuple[str, ...] = REPOS,
+    core: frozenset[str] = CORE_REPOS,
+) -> dict[str, int]:
+    return summarize_github(await repo_counts(client, api=api, org=org, repos=repos), core)
+
+
+# --------------------------------------------------------------------------- #
+# Docker services and GPU                                                      #
+# --------------------------------------------------------------------------- #
+
+
+async def check_services(
+    host: str = "localhost",
+    services: dict[str, int] | None = None,
+    timeout: float = service_probe.DEFAULT_TIMEOUT,
+    *,
+    latency_history: Path | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Handshake with every service at once; per-service probe JSON."""
+    return await service_probe.check_services(host, services, timeout=timeout,
+                                              history=latency_history)
+
+
+def docker_status(services: dict[str, dict[str, Any]]) -> dict[str, bool]:
+    """The shell script's ``docker`` booleans, from check_services()."""
+    return {name: bool(probe["ok"]) for name, probe in services.items()}
+
+
+async def check_gpu() -> dict[str, Any]:
+    if shutil.which("nvidia-smi") is None:
+        return {"available": False, "name": "none"}
+
+    async def query(field_name: str) -> str:
+        proc = await asyncio.create_subprocess_exec(
+            "nvidia-smi", f"--query-gpu={field_name}", "--format=csv,noheader,nounits",
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise OSError("nvidia-smi failed")
+        lines = out.decode().splitlines()
+        return lines[0].strip() if lines else ""
+
+    try:
+        name, memory = await asyncio.gather(query("name"), query("memory.total"))
+    except OSError:
+        return {"available": False, "name": "none"}
+    name = name or "unknown"
+    if memory.isdigit() and int(memory):
+        name = f"{name} ({int(memory) // 1024}GB)"
+    return {"available": True, "name": name}
+
+
+# --------------------------------------------------------------------------- #
+# Report                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+def build_report(
+    submodules: SubmoduleReport,
+    github: dict[str, int],
+    services: dict[str, dict[str, Any]],
+    gpu: dict[str, Any],
+) -> dict[str, Any]:
+    """The --json document, in the shell script's key order.
+
+    ``docker`` keeps the script's booleans; ``services`` adds the probe
+    details and latency summaries behind them.
+    """
+    healthy = (submodules.on_main == submodules.total
+               and github["core_issues"] == 0 and github["core_prs"] == 0)
+    return {
+        "submodules": {
+            "total": submodules.total,
+            "on_main": submodules.on_main,
+            "behind": submodules.behind,
+        },
+        "github": github,
+        "docker": docker_status(services),
+        "services": services,
+        "gpu": gpu,
+        "healthy": healthy,
+    }
+
+
+async def run_health(
+    root: Path,
+    *,
+    api: str = GITHUB_API,
+    token: str | None = None,
+    etag_cache: ETagCache | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    fetch: bool = True,
+    docker_host: str = "localhost",
+    latency_history: Path | None = None,
+) -> tuple[dict[str, Any], SubmoduleReport]:
+    """Run all checks concurrently; returns (the --json document, submodule details)."""
+    async with HTTPClient(headers=github_headers(token), etag_cache=etag_cache) as client:
+        submodules, github, services, gpu = await asyncio.gather(
+            check_submodules(root, concurrency=concurrency, fetch=fetch),
+            check_github(GitHub(client, api=api), api=api),
+            check_services(docker_host, latency_history=latency_history),
+            check_gpu(),
+        )
+    return build_report(submodules, github, services, gpu), submodules
+
+
+def health_from_daemon(root: Path) -> tuple[dict[str, Any], SubmoduleReport] | None:
+    """Build the report from the state daemon's sections, if one serves ``root``.
+
+    Sections older than their TTL are refreshed (single-flight) before the
+    daemon answers, so this is never staler than a scheduled refresh.
+    """
+    from .daemon import query
+
+    response = query({"op": "get", "sections": ["github", "git", "services"], "wait": True},
+                     timeout=120.0)
+    if response is None or Path(response["root"]) != root.resolve():
+        return None
+    values = {name: section["value"] for name, section in response["sections"].items()}
+    if any(value is None for value in values.values()):
+        return None
+    submodules = summarize_submodules(values["git"])
+    report = build_report(submodules, summarize_github(values["github"]),
+                          values["services"], asyncio.run(check_gpu()))
+    return report, submodules
+
+
+def _mark(ok: bool) -> str:
+    return "✓" if ok else "✗"
+
+
+def render_text(report: dict[str, Any], submodules: SubmoduleReport) -> str:
+    sub, gh, docker, gpu = (report[k] for k in ("submodules", "github", "docker", "gpu"))
+    lines = ["=== Ecosystem Health Check ===", ""]
+    lines.append(f"Submodules: {sub['on_main']}/{sub['total']} on main "
+                 f"{_mark(sub['on_main'] == sub['total'])}")
+    if sub["on_main"] != sub["total"]:
+        if submodules.detached:
+            lines.append(f"  Detached: {' '.join(submodules.detached)}")
+        if submodules.behind_list:
+            lines.append(f"  Behind: {' '.join(submodules.behind_list)}")
+    core_clean = gh["core_issues"] == 0 and gh["core_prs"] == 0
+    lines.append(f"Issues/PRs: {gh['core_issues']} issues, {gh['core_prs']} PRs (core) "
+                 f"{_mark(core_clean)}")
+    lines.append(f"Docker:     PostgreSQL {_mark(docker['postgres'])}  "
+                 f"MongoDB {_mark(docker['mongodb'])}  Dragonfly {_mark(docker['dragonfly'])}")
+    for name, probe in report["services"].items():
+        if not probe["ok"]:
+            lines.append(f"  {name}: {probe['error']}")
+    if gpu["available"]:
+        lines.append(f"GPU:        {gpu['name']} ✓")
+    else:
+        lines.append("GPU:        Not available")
+    lines += ["", f"Overall: {'HEALTHY' if report['healthy'] else 'DEGRADED'}"]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="health-check.sh",
+                                     description="jade-monolith ecosystem health check")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--root", type=Path,
+                        default=Path(os.environ.get("MONOLITH_DIR") or Path.cwd()),
+                        help="monolith checkout containing packages/ (default: $MONOLITH_DIR)")
+    parser.add_argument("--api", default=os.environ.get("JADE_GITHUB_API", GITHUB_API),
+                        help="GitHub API base URL (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="parallel git fetches (default: %(default)s)")
+    parser.add_argument("--no-fetch", action="store_true",
+                        help="compare against the last fetched origin/main")
+    parser.add_argument("--no-etag-cache", action="store_true",
+                        help="always send unconditional GitHub requests")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="check directly even if the state daemon is running")
+    parser.add_argument("--no-latency-history", action="store_true",
+                        help="do not add service probe latencies to the histograms")
+    args = parser.parse_args(argv)
+
+    from_daemon = None
+    if not (args.no_daemon or args.no_fetch or args.api != GITHUB_API):
+        from_daemon = health_from_daemon(args.root)
+    report, submodules = from_daemon or asyncio.run(run_health(
+        args.root,
+        api=args.api,
+        token=github_token(),
+        etag_cache=None if args.no_etag_cache else ETagCache(),
+        concurrency=args.concurrency,
+        fetch=not args.no_fetch,
+        latency_history=None if args.no_latency_history else service_probe.history_path(),
+    ))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(render_text(report, submodules))
+    return 0 if report["healthy"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
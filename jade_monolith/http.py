@@ -0,0 +1,475 @@
+"""Small asyncio HTTP/1.1 client with keep-alive pooling and ETag revalidation.
+
+Written against the standard library only, so the scripts keep working on a
+bare Python install.  One HTTPClient holds a pool of persistent connections
+per (scheme, host, port), bounded by ``max_per_host``, and reuses them across
+requests and tasks: fifteen API calls to one host cost one TLS handshake per
+pooled connection, not fifteen.
+
+With an ETagCache attached, GETs send ``If-None-Match`` for URLs seen before
+and a ``304 Not Modified`` is answered from the cache.  GitHub does not count
+conditional requests that return 304 against the rate limit.
+
+``HTTPClient.request`` follows 301/302/307/308 redirects, as ``gh api`` does
+for renamed and transferred repos, for at most ``MAX_REDIRECTS`` hops; the
+Authorization header is only sent again when the hop stays on the same
+scheme, host and port.
+
+``HTTPClient.lines`` streams a response body line by line as it arrives,
+for JSONL results that should be processed before the download finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import gzip
+import hashlib
+import json
+import ssl
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+from .cache import atomic_write_bytes, cache_dir
+
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_MAX_PER_HOST = 6
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = frozenset({301, 302, 307, 308})
+USER_AGENT = "jade-monolith-scripts"
+_ETAG_CACHE_FILENAME = "http-etags.json"
+_FRAMING_HEADERS = {"content-length", "transfer-encoding", "content-encoding", "connection"}
+
+
+class HTTPError(Exception):
+    """A request could not be completed (connection, protocol or timeout)."""
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]  # lower-cased names
+    body: bytes
+    url: str = ""
+    from_cache: bool = False  # answered from the ETag cache after a 304
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+# --------------------------------------------------------------------------- #
+# ETag cache                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+class ETagCache:
+    """Disk-backed store of the last 200 response for every URL that had an ETag.
+
+    Entries are keyed by URL plus a digest of the credentials used, so two
+    tokens with different visibility never share a cached body.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = cache_dir() / _ETAG_CACHE_FILENAME
+        return self._path
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def key(url: str, headers: dict[str, str]) -> str:
+        auth = headers.get("Authorization", "")
+        return f"{url} {hashlib.blake2b(auth.encode(), digest_size=8).hexdigest()}"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        return self._load().get(key)
+
+    def put(self, key: str, response: Response) -> None:
+        self._load()[key] = {
+            "etag": response.headers["etag"],
+            "status": response.status,
+            "headers": response.headers,
+            "body": base64.b64encode(response.body).decode(),
+        }
+        self._dirty = True
+
+    def response(self, entry: dict[str, Any], url: str) -> Response:
+        return Response(entry["status"], dict(entry["headers"]),
+                        base64.b64decode(entry["body"]), url=url, from_cache=True)
+
+    def flush(self) -> None:
+        if self._dirty and self._entries is not None:
+            with contextlib.suppress(OSError):
+                atomic_write_bytes(self.path, json.dumps(self._entries).encode())
+            self._dirty = False
+
+
+# --------------------------------------------------------------------------- #
+# Connection pool                                                              #
+# --------------------------------------------------------------------------- #
+
+_Conn = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class _HostPool:
+    def __init__(self, scheme: str, host: str, port: int, limit: int,
+                 ssl_context: ssl.SSLContext | None) -> None:
+        self.scheme, self.host, self.port = scheme, host, port
+        self.idle: list[_Conn] = []
+        self.gate = asyncio.Semaphore(limit)
+        self._ssl = ssl_context
+
+    async def connect(self, timeout: float) -> _Conn:
+        kwargs: dict[str, Any] = {}
+        if self.scheme == "https":
+            kwargs = {"ssl": self._ssl or ssl.create_default_context(),
+                      "server_hostname": self.host}
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, **kwargs), timeout,
+        )
+
+    def take_idle(self) -> _Conn | None:
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return None
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before response")
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise HTTPError(f"malformed status line: {status_line!r}")
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        value = value.strip()
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return int(parts[1]), headers
+
+
+async def _read_body(
+    reader: asyncio.StreamReader, status: int, headers: dict[str, str], method: str,
+) -> tuple[bytes, bool]:
+    """Return (body, reusable): reusable is False when the body ran to EOF."""
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return b"", True
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return b"".join(chunks), True
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"])), True
+    return await reader.read(), False
+
+
+async def _iter_body(
+    reader: asyncio.StreamReader, headers: dict[str, str], timeout: float,
+) -> AsyncIterator[bytes]:
+    """Yield a response body as it arrives; ``timeout`` bounds each read."""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await asyncio.wait_for(reader.readline(), timeout)
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return
+            yield await asyncio.wait_for(reader.readexactly(size), timeout)
+            await reader.readline()
+    remaining = int(headers["content-length"]) if "content-length" in headers else None
+    while remaining is None or remaining > 0:
+        chunk = await asyncio.wait_for(
+            reader.read(65536 if remaining is None else min(65536, remaining)), timeout)
+        if not chunk:
+            if remaining is not None:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            return
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+
+def _decode(body: bytes, headers: dict[str, str]) -> bytes:
+    encoding = headers.get("content-encoding", "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
+
+
+# --------------------------------------------------------------------------- #
+# Client                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    connections: int = 0
+    revalidated: int = 0  # 304s answered from the ETag cache
+    by_status: dict[int, int] = field(default_factory=dict)
+
+
+class HTTPClient:
+    """Pooled keep-alive HTTP/1.1 client.  Use as ``async with HTTPClient() as c``."""
+
+    def __init__(
+        self,
+        *,
+        headers: dict[str, str] | None = None,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        etag_cache: ETagCache | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self.headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", **(headers or {})}
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.etag_cache = etag_cache
+        self.stats = ClientStats()
+        self._ssl = ssl_context
+        self._pools: dict[tuple[str, str, int], _HostPool] = {}
+
+    async def __aenter__(self) -> HTTPClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    def _pool(self, scheme: str, host: str, port: int) -> _HostPool:
+        key = (scheme, host, port)
+        if key not in self._pools:
+            self._pools[key] = _HostPool(scheme, host, port, self.max_per_host, self._ssl)
+        return self._pools[key]
+
+    def _prepare(
+        self, method: str, url: str, headers: dict[str, str] | None, body: bytes | None,
+        *, send_auth: bool = True,
+    ) -> tuple[_HostPool, bytes]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HTTPError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{port}"
+        merged = {"Host": host_header, **self.headers, **(headers or {})}
+        if not send_auth:
+            merged = {k: v for k, v in merged.items() if k.lower() != "authorization"}
+        if body is not None:
+            merged["Content-Length"] = str(len(body))
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(
+            f"{k}: {v}\r\n" for k, v in merged.items()
+        ) + "\r\n"
+        payload = head.encode("latin-1") + (body or b"")
+        return self._pool(parts.scheme, parts.hostname, port), payload
+
+    async def _send(
+        self, pool: _HostPool, payload: bytes, method: str, url: str,
+    ) -> tuple[_Conn, int, dict[str, str]]:
+        """Write the request on a pooled connection and read the response head."""
+        for attempt in range(2):
+            conn = pool.take_idle()
+            reused = conn is not None
+            try:
+                if conn is None:
+                    conn = await pool.connect(self.timeout)
+                    self.stats.connections += 1
+                reader, writer = conn
+                writer.write(payload)
+                await writer.drain()
+                status, resp_headers = await asyncio.wait_for(
+                    _read_headers(reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                if conn is not None:
+                    conn[1].close()
+                if reused and attempt == 0:
+                    continue  # the server dropped an idle keep-alive connection
+                raise HTTPError(f"{method} {url}: {e}") from e
+            except (OSError, TimeoutError, ValueError) as e:
+                if conn is not None:
+                    conn[1].close()
+                raise HTTPError(f"{method} {url}: {e or type(e).__name__}") from e
+            except BaseException:  # cancellation
+                if conn is not None:
+                    conn[1].close()
+                raise
+            return conn, status, resp_headers
+        raise AssertionError("unreachable")
+
+    def _finish(self, pool: _HostPool, conn: _Conn, status: int, headers: dict[str, str],
+                reusable: bool) -> None:
+        if reusable and headers.get("connection", "").lower() != "close":
+            pool.idle.append(conn)
+        else:
+            conn[1].close()
+        self.stats.requests += 1
+        self.stats.by_status[status] = self.stats.by_status.get(status, 0) + 1
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        body: bytes | None = None,
+    ) -> Response:
+        """Send one request, following redirects; the Response's url is the final one."""
+        origin = urlsplit(url)[:2]
+        send_auth = True
+        for _hop in range(MAX_REDIRECTS + 1):
+            response = await self._request_once(
+                method, url, headers=headers, body=body, send_auth=send_auth)
+            location = response.headers.get("location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+            # Credentials only go back to the scheme, host and port they were given for
+            send_auth = send_auth and urlsplit(url)[:2] == origin
+            if response.status in (301, 302) and method not in ("GET", "HEAD"):
+                method, body = "GET", None
+        raise HTTPError(f"{method} {url}: more than {MAX_REDIRECTS} redirects")
+
+    async def _request_once(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None,
+        body: bytes | None,
+        send_auth: bool,
+    ) -> Response:
+        pool, payload = self._prepare(method, url, headers, body, send_auth=send_auth)
+        async with pool.gate:
+            conn, status, resp_headers = await self._send(pool, payload, method, url)
+            try:
+                raw, reusable = await asyncio.wait_for(
+                    _read_body(conn[0], status, resp_headers, method), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError,
+                    TimeoutError, ValueError) as e:
+                conn[1].close()
+                raise HTTPError(f"{method} {url}: {e or type(e).__name__}") from e
+            except BaseException:
+                conn[1].close()
+                raise
+            self._finish(pool, conn, status, resp_headers, reusable)
+        return Response(status, resp_headers, _decode(raw, resp_headers), url=url)
+
+    async def lines(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        body: bytes | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the response body line by line (without the newline) as it arrives.
+
+        For JSONL and event streams that should be processed before the
+        server has finished writing them.  The body is requested uncompressed;
+        a non-2xx status raises HTTPError.  The connection goes back to the
+        pool only if the body was read to its end.
+        """
+        pool, payload = self._prepare(
+            method, url, {**(headers or {}), "Accept-Encoding": "identity"}, body)
+        async with pool.gate:
+            conn, status, resp_headers = await self._send(pool, payload, method, url)
+            reader, writer = conn
+            if not 200 <= status < 300:
+                try:
+                    raw, reusable = await asyncio.wait_for(
+                        _read_body(reader, status, resp_headers, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError,
+                        TimeoutError, ValueError):
+                    raw, reusable = b"", False
+                self._finish(pool, conn, status, resp_headers, reusable)
+                raise HTTPError(f"{method} {url}: HTTP {status}: {raw[:200]!r}")
+            complete = False
+            try:
+                pending = b""
+                async for chunk in _iter_body(reader, resp_headers, self.timeout):
+                    pending += chunk
+                    *complete_lines, pending = pending.split(b"\n")
+                    for line in complete_lines:
+                        yield line.rstrip(b"\r")
+                if pending:
+                    yield pending
+                complete = True
+            except (ConnectionError, asyncio.IncompleteReadError, OSError,
+                    TimeoutError, ValueError) as e:
+                raise HTTPError(f"{method} {url}: {e or type(e).__name__}") from e
+            finally:
+                framed = "content-length" in resp_headers or "chunked" in resp_headers.get(
+                    "transfer-encoding", "").lower()
+                if complete:
+                    self._finish(pool, conn, status, resp_headers, framed)
+                else:
+                    writer.close()
+
+    async def get(self, url: str, *, headers: dict[str, str] | None = None) -> Response:
+        """GET, revalidating through the ETag cache when one is attached."""
+        cache = self.etag_cache
+        if cache is None:
+            return await self.request("GET", url, headers=headers)
+        key = cache.key(url, {**self.headers, **(headers or {})})
+        entry = cache.get(key)
+        conditional = dict(headers or {})
+        if entry is not None:
+            conditional["If-None-Match"] = entry["etag"]
+        response = await self.request("GET", url, headers=conditional)
+        if response.status == 304 and entry is not None:
+            self.stats.revalidated += 1
+            cached = cache.response(entry, url)
+            cached.headers.update(  # fresh rate-limit headers, not the 304's framing
+                (k, v) for k, v in response.headers.items() if k not in _FRAMING_HEADERS
+            )
+            return cached
+        if response.status == 200 and "etag" in response.headers:
+            cache.put(key, response)
+        return response
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            for _reader, writer in pool.idle:
+                writer.close()
+            pool.idle.clear()
+        if self.etag_cache is not None:
+            self.etag_cache.flush()
@@ -0,0 +1,169 @@
+"""Change-impact test selection: which tests does a diff actually affect?
+
+A dependency map records, for every test node id, the repo paths it read
+during a run (``pytest --impact-record``, see jade_monolith.pytest_impact):
+files it opened or stat'ed, and directories it listed (stored with a
+trailing ``/``, so adding or removing an agent file reaches every test that
+globbed ``.claude/agents``).  A test's own module is always a dependency.
+
+Selecting against a diff keeps a test when any changed path is one of its
+dependencies or lies under one of its listed directories, plus every test
+the map does not know yet.  Changes to shared test infrastructure or to the
+jade_monolith package itself (FULL_RUN_PATHS) select everything.
+
+Run with:  python -m jade_monolith.impact select --since origin/main
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import subprocess
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from .cache import atomic_write_bytes, cache_dir
+
+MAP_FILENAME = "impact-map.json"
+MAP_VERSION = 1
+
+# Changes here can affect any test: run the whole suite.
+FULL_RUN_PATHS = (
+    "pyproject.toml",
+    "tests/__init__.py",
+    "tests/conftest.py",
+    "jade_monolith/",
+)
+
+
+def default_map_path() -> Path:
+    return cache_dir() / MAP_FILENAME
+
+
+def _matches(path: str, deps: Iterable[str]) -> bool:
+    return any(path == dep or (dep.endswith("/") and path.startswith(dep)) for dep in deps)
+
+
+def full_run_reason(changed: Iterable[str]) -> str | None:
+    """The first changed path that forces a full run, or None."""
+    for path in changed:
+        if _matches(path, FULL_RUN_PATHS):
+            return path
+    return None
+
+
+class ImpactMap:
+    """Test node id -> repo-relative paths (``dir/`` for listed directories)."""
+
+    def __init__(self, tests: dict[str, set[str]] | None = None) -> None:
+        self.tests: dict[str, set[str]] = tests or {}
+
+    @classmethod
+    def load(cls, path: Path) -> ImpactMap:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != MAP_VERSION:
+            return cls()
+        return cls({nodeid: set(deps) for nodeid, deps in data["tests"].items()})
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version": MAP_VERSION,
+            "updated": time.time(),
+            "tests": {nodeid: sorted(deps) for nodeid, deps in sorted(self.tests.items())},
+        }
+        with contextlib.suppress(OSError):
+            atomic_write_bytes(path, (json.dumps(data, indent=1) + "\n").encode())
+
+    def update(self, nodeid: str, deps: Iterable[str]) -> None:
+        self.tests[nodeid] = set(deps)
+
+    def affected(self, changed: Iterable[str]) -> set[str]:
+        """Node ids in the map that depend on any of ``changed``."""
+        changed = list(changed)
+        return {nodeid for nodeid, deps in self.tests.items()
+                if any(_matches(path, deps) for path in changed)}
+
+    def select(self, nodeids: Iterable[str], changed: Iterable[str]) -> tuple[list[str], str]:
+        """(node ids to run, reason), preserving the order of ``nodeids``."""
+        nodeids, changed = list(nodeids), list(changed)
+        reason = full_run_reason(changed)
+        if reason is not None:
+            return nodeids, f"{reason} changed: running everything"
+        if not self.tests:
+            return nodeids, "no impact map recorded yet: running everything"
+        affected = self.affected(changed)
+        selected = [n for n in nodeids if n in affected or n not in self.tests]
+        unknown = sum(1 for n in nodeids if n not in self.tests)
+        reason = f"{len(changed)} changed path(s)"
+        if unknown:
+            reason += f", {unknown} test(s) not in the map yet"
+        return selected, reason
+
+
+def changed_paths(root: Path, since: str) -> list[str]:
+    """Paths changed on this branch since ``since``, plus uncommitted and untracked ones.
+
+    Paths are relative to ``root``, like the map's.
+    """
+
+    def git(*args: str) -> list[str]:
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            error = (result.stderr.strip().splitlines() or ["failed"])[0]
+            raise ValueError(f"git {' '.join(args)}: {error}")
+        return result.stdout.splitlines()
+
+    paths = set(git("diff", "--name-only", "--relative", f"{since}...HEAD"))
+    paths.update(git("diff", "--name-only", "--relative", "HEAD"))
+    paths.update(git("ls-files", "--others", "--exclude-standard"))
+    return sorted(p for p in paths if p)
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.impact")
+    parser.add_argument("--map", type=Path, help=f"dependency map (default: cache dir/"
+                                                 f"{MAP_FILENAME})")
+    parser.add_argument("--root", type=Path, default=Path.cwd())
+    sub = parser.add_subparsers(dest="command", required=True)
+    select = sub.add_parser("select", help="print the tests a diff affects")
+    source = select.add_mutually_exclusive_group(required=True)
+    source.add_argument("--since", metavar="REF", help="diff against this git ref")
+    source.add_argument("--paths", nargs="+", metavar="PATH", help="changed paths")
+    show = sub.add_parser("show", help="print the recorded dependencies of matching tests")
+    show.add_argument("pattern", help="substring of a test node id")
+    args = parser.parse_args(argv)
+
+    impact = ImpactMap.load(args.map or default_map_path())
+    if args.command == "show":
+        for nodeid, deps in sorted(impact.tests.items()):
+            if args.pattern in nodeid:
+                print(nodeid)
+                for dep in sorted(deps):
+                    print(f"  {dep}")
+        return 0
+
+    try:
+        changed = args.paths or changed_paths(args.root, args.since)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    selected, reason = impact.select(sorted(impact.tests), changed)
+    print(f"# {len(selected)} of {len(impact.tests)} tests: {reason}", file=sys.stderr)
+    for nodeid in selected:
+        print(nodeid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
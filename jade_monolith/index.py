@@ -0,0 +1,184 @@
+"""Precomputed, indexed view of a parsed agent catalogue.
+
+Built once per session from the parsed agents, AgentIndex answers lookups by
+name, tool, model and permission mode without scanning, and stores tool
+capabilities as bitsets in both directions:
+
+  per agent   an int with one bit per tool (declared, disallowed, effective)
+  per tool    an int with one bit per agent that has it
+
+so team invariants such as "no agent has web and write access" reduce to a
+handful of big-int AND/OR operations however large the team is.
+
+Effective capabilities are the declared ``tools`` minus ``disallowedTools``.
+Tool bits are allocated on first sight while the index is built, so MCP
+tools (``mcp__server__tool``) take part in every query exactly like the
+built-in ones.  Queries never allocate: a tool no agent mentions is simply
+held by nobody.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+DECLARED = "declared"
+DISALLOWED = "disallowed"
+EFFECTIVE = "effective"
+_KINDS = (DECLARED, DISALLOWED, EFFECTIVE)
+
+
+def tool_list(value: Any) -> list[str]:
+    """Tool names from a ``tools``/``disallowedTools`` value.
+
+    Accepts a YAML list or a comma-separated string, as Claude Code does.
+    """
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(",") if t.strip()]
+    return [t for t in (value or []) if isinstance(t, str)]
+
+
+class AgentIndex:
+    """Lookup tables and capability bitsets over a list of parsed agent dicts."""
+
+    def __init__(self, agents: Iterable[dict[str, Any]]) -> None:
+        self.agents: list[dict[str, Any]] = list(agents)
+        self._bit: dict[str, int] = {}
+        self._by_name: dict[str, int] = {}
+        self._by_stem: dict[str, int] = {}
+        self._pos: dict[int, int] = {}
+        self._by_model: dict[Any, list[int]] = defaultdict(list)
+        self._by_mode: dict[Any, list[int]] = defaultdict(list)
+        self._masks: dict[str, list[int]] = {kind: [] for kind in _KINDS}
+        self._holders: dict[str, dict[str, int]] = {kind: defaultdict(int) for kind in _KINDS}
+
+        for i, agent in enumerate(self.agents):
+            self._pos[id(agent)] = i
+            name = agent.get("name")
+            if name is not None:
+                self._by_name.setdefault(name, i)
+            if "_path" in agent:
+                self._by_stem[Path(agent["_path"]).stem] = i
+            self._by_model[agent.get("model")].append(i)
+            self._by_mode[agent.get("permissionMode")].append(i)
+
+            declared = tool_list(agent.get("tools"))
+            disallowed = tool_list(agent.get("disallowedTools"))
+            masks = {DECLARED: self._allocate(declared), DISALLOWED: self._allocate(disallowed)}
+            masks[EFFECTIVE] = masks[DECLARED] & ~masks[DISALLOWED]
+            agent_bit = 1 << i
+            for kind, mask in masks.items():
+                self._masks[kind].append(mask)
+                for tool in self._tools_in(mask):
+                    self._holders[kind][tool] |= agent_bit
+
+        self.all: int = (1 << len(self.agents)) - 1
+
+    # -- bit helpers ------------------------------------------------------- #
+
+    def _allocate(self, tools: Iterable[str]) -> int:
+        """Tool bitset for ``tools``, allocating a bit to any tool not seen yet."""
+        mask = 0
+        for tool in tools:
+            bit = self._bit.get(tool)
+            if bit is None:
+                bit = self._bit[tool] = len(self._bit)
+            mask |= 1 << bit
+        return mask
+
+    def mask(self, tools: Iterable[str]) -> int | None:
+        """Tool bitset for ``tools``; None if one of them is unknown to every agent."""
+        mask = 0
+        for tool in tools:
+            bit = self._bit.get(tool)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def _tools_in(self, mask: int) -> Iterator[str]:
+        for tool, bit in self._bit.items():
+            if mask >> bit & 1:
+                yield tool
+
+    def members(self, agent_set: int) -> list[dict[str, Any]]:
+        """The agents whose bits are set in ``agent_set``, in catalogue order."""
+        out = []
+        while agent_set:
+            low = agent_set & -agent_set
+            out.append(self.agents[low.bit_length() - 1])
+            agent_set ^= low
+        return out
+
+    # -- lookups ----------------------------------------------------------- #
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        i = self._by_name.get(name)
+        return None if i is None else self.agents[i]
+
+    def for_file(self, stem: str) -> dict[str, Any] | None:
+        """The agent defined in ``<stem>.md``, whatever its ``name`` says."""
+        i = self._by_stem.get(stem)
+        return None if i is None else self.agents[i]
+
+    @property
+    def stems(self) -> set[str]:
+        return set(self._by_stem)
+
+    def by_model(self, model: str | None) -> list[dict[str, Any]]:
+        return [self.agents[i] for i in self._by_model.get(model, [])]
+
+    def by_permission_mode(self, mode: str | None) -> list[dict[str, Any]]:
+        return [self.agents[i] for i in self._by_mode.get(mode, [])]
+
+    def with_tool(self, tool: str, kind: str = EFFECTIVE) -> list[dict[str, Any]]:
+        return self.members(self._holders[kind].get(tool, 0))
+
+    def tools(self, agent: dict[str, Any], kind: str = EFFECTIVE) -> set[str]:
+        return set(self._tools_in(self._mask_of(agent, kind)))
+
+    # -- set algebra ------------------------------------------------------- #
+
+    def _mask_of(self, agent: dict[str, Any], kind: str) -> int:
+        return self._masks[kind][self._pos[id(agent)]]
+
+    def has_all(self, agent: dict[str, Any], tools: Iterable[str], kind: str = EFFECTIVE) -> bool:
+        want = self.mask(tools)
+        return want is not None and self._mask_of(agent, kind) & want == want
+
+    def has_any(self, agent: dict[str, Any], tools: Iterable[str], kind: str = EFFECTIVE) -> bool:
+        held = self._mask_of(agent, kind)
+        return any(held >> self._bit[tool] & 1 for tool in tools if tool in self._bit)
+
+    def agents_with_any(self, tools: Iterable[str], kind: str = EFFECTIVE) -> int:
+        """Bitset of agents holding at least one of ``tools``."""
+        holders = self._holders[kind]
+        result = 0
+        for tool in tools:
+            result |= holders.get(tool, 0)
+        return result
+
+    def agents_with_all(self, tools: Iterable[str], kind: str = EFFECTIVE) -> int:
+        """Bitset of agents holding every one of ``tools``."""
+        holders = self._holders[kind]
+        result = self.all
+        for tool in tools:
+            result &= holders.get(tool, 0)
+        return result
+
+    def overlap(self, agent: dict[str, Any], kind_a: str, kind_b: str) -> set[str]:
+        """Tools in both of one agent's ``kind_a`` and ``kind_b`` sets."""
+        return set(self._tools_in(self._mask_of(agent, kind_a) & self._mask_of(agent, kind_b)))
+
+    def agents_with_overlap(self, kind_a: str, kind_b: str) -> list[dict[str, Any]]:
+        """Agents whose ``kind_a`` and ``kind_b`` tool sets intersect."""
+        a, b = self._masks[kind_a], self._masks[kind_b]
+        return [agent for i, agent in enumerate(self.agents) if a[i] & b[i]]
@@ -0,0 +1,422 @@
+"""Permission rules from settings.json, compiled for auditing real trees.
+
+Parses ``permissions.allow`` / ``ask`` / ``deny`` entries such as
+``Read(./.env*)``, ``Edit(/docs/**)`` and ``Bash(git:*)`` and answers what
+Claude Code would decide for a tool call: deny beats ask beats allow, and no
+matching rule leaves the decision to the permission mode.
+
+File rules follow gitignore semantics, as Claude Code's do: ``*`` stays
+within one path segment, ``**`` spans directories, a pattern without a slash
+matches at any depth, ``/x`` and ``./x`` are anchored at the project root.
+All file patterns of a settings file, plus the SENSITIVE patterns, are
+compiled into one trie of path segments and run as an NFA.  An audit walks
+the tree once, stepping each directory's NFA state set one segment down, so
+shared prefixes are matched once rather than once per file and rule.  Any
+sensitive file the rules do not deny is reported.
+
+``packages/*`` submodules with their own ``.claude/settings.json`` are
+audited against their own rules in the same walk, as well as against the
+monolith's.
+
+Run with:  python -m jade_monolith.permissions audit [--root PATH] [--json]
+           python -m jade_monolith.permissions check Bash "git push"
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+ALLOW, ASK, DENY = "allow", "ask", "deny"
+EFFECTS = (DENY, ASK, ALLOW)  # precedence order
+SENSITIVE = "sensitive"
+
+# Files nobody's agent should read.  gitignore-style, like Read() rules.
+SENSITIVE_PATTERNS = (
+    ".env", ".env.*", "*.pem", "*.key", "*.p12", "*.pfx", "id_rsa", "id_ecdsa", "id_ed25519",
+    "secrets/", ".netrc", ".npmrc", ".pypirc", "credentials.json", "*.keystore",
+)
+
+# Tools whose calls are checked against Read(...) / Edit(...) path rules.
+PATH_RULE_TOOL = {"Read": "Read", "Glob": "Read", "Grep": "Read",
+                  "Edit": "Edit", "Write": "Edit", "NotebookEdit": "Edit"}
+
+_RULE = re.compile(r"^(?P<tool>[A-Za-z][\w-]*)(?:\((?P<spec>.*)\))?$")
+_COMMAND_SEPARATORS = re.compile(r"\s*(?:&&|\|\||[;|\n])\s*")
+_SKIP_DIRS = {".git"}
+
+
+class PermissionRuleError(ValueError):
+    """A permission rule could not be parsed."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    effect: str  # allow, ask or deny
+    tool: str
+    specifier: str | None  # None: every call of the tool
+    raw: str
+
+
+def parse_rule(text: str, effect: str) -> Rule:
+    match = _RULE.match(text.strip())
+    if match is None:
+        raise PermissionRuleError(f"malformed permission rule {text!r}")
+    return Rule(effect, match["tool"], match["spec"] or None, text)
+
+
+# --------------------------------------------------------------------------- #
+# Glob trie                                                                    #
+# --------------------------------------------------------------------------- #
+
+
+class _Node:
+    __slots__ = ("literal", "wild", "globstar", "loops", "accept")
+
+    def __init__(self, loops: bool = False) -> None:
+        self.literal: dict[str, _Node] = {}
+        self.wild: list[tuple[re.Pattern[str], _Node]] = []
+        self.globstar: _Node | None = None  # the ``**`` node below this one
+        self.loops = loops  # a ``**`` node: consumes any number of segments
+        self.accept: list[int] = []  # ids of the patterns that end here
+
+
+def _normalize(pattern: str) -> str | None:
+    """``pattern`` as a glob anchored at the project root, or None if it can
+    never match inside the project (``~/...`` or absolute ``//...``)."""
+    if pattern.startswith(("//", "~")):
+        return None
+    anchored = pattern.startswith(("/", "./"))
+    body = pattern[2:] if pattern.startswith("./") else pattern.lstrip("/")
+    directory = body.endswith("/")
+    body = body.rstrip("/") or "**"
+    if not anchored and "/" not in body:
+        body = f"**/{body}"  # no slash: matches at any depth
+    if directory:
+        body += "/**"
+    if body.endswith("/**") or body == "**":
+        body += "/*"  # the files inside, not the directory itself
+    return body
+
+
+class GlobTrie:
+    """Gitignore-style path patterns compiled into one segment trie.
+
+    Matching runs the trie as an NFA over path segments: ``start()`` gives
+    the state set at the root, ``step(states, segment)`` moves it one segment
+    down, and ``accepted(states)`` lists the patterns matched there.  States
+    for a directory are computed once and shared by everything below it.
+    """
+
+    def __init__(self) -> None:
+        self.root = _Node()
+        self._wild: dict[str, re.Pattern[str]] = {}
+
+    def add(self, pattern: str, pattern_id: int) -> bool:
+        """Add ``pattern``; False if it can never match a project path."""
+        normalized = _normalize(pattern)
+        if normalized is None:
+            return False
+        node = self.root
+        for segment in normalized.split("/"):
+            if segment == "**":
+                if node.globstar is None:
+                    node.globstar = _Node(loops=True)
+                node = node.globstar
+            elif not any(c in segment for c in "*?["):
+                node = node.literal.setdefault(segment, _Node())
+            else:
+                regex = self._wild.get(segment)
+                if regex is None:
+                    regex = self._wild[segment] = re.compile(fnmatch.translate(segment))
+                for existing, child in node.wild:
+                    if existing is regex:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.wild.append((regex, child))
+                    node = child
+        node.accept.append(pattern_id)
+        return True
+
+    @staticmethod
+    def _closure(nodes: list[_Node]) -> tuple[_Node, ...]:
+        seen: dict[int, _Node] = {}
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen[id(node)] = node
+            if node.globstar is not None:
+                stack.append(node.globstar)  # ``**`` may match zero segments
+        return tuple(seen.values())
+
+    def start(self) -> tuple[_Node, ...]:
+        return self._closure([self.root])
+
+    def step(self, states: tuple[_Node, ...], segment: str) -> tuple[_Node, ...]:
+        nxt = []
+        for node in states:
+            child = node.literal.get(segment)
+            if child is not None:
+                nxt.append(child)
+            for regex, wild_child in node.wild:
+                if regex.match(segment):
+                    nxt.append(wild_child)
+            if node.loops:
+                nxt.append(node)
+        return self._closure(nxt) if nxt else ()
+
+    @staticmethod
+    def accepted(states: tuple[_Node, ...]) -> set[int]:
+        return {pattern_id for node in states for pattern_id in node.accept}
+
+    def match(self, path: str) -> set[int]:
+        """Ids of the patterns that match the root-relative ``path``."""
+        states = self.start()
+        for segment in path.strip("/").split("/"):
+            states = self.step(states, segment)
+            if not states:
+                return set()
+        return self.accepted(states)
+
+
+# --------------------------------------------------------------------------- #
+# Rule sets                                                                    #
+# --------------------------------------------------------------------------- #
+
+
+def _command_matches(spec: str, command: str) -> bool:
+    if spec.endswith(":*"):
+        prefix = spec[:-2]
+        return command == prefix or command.startswith(prefix + " ")
+    if "*" in spec:
+        regex = ".*".join(re.escape(part) for part in spec.split("*"))
+        return re.fullmatch(regex, command, re.DOTALL) is not None
+    return command == spec
+
+
+class Permissions:
+    """The compiled allow/ask/deny rules of one settings file."""
+
+    def __init__(self, rules: list[Rule], sensitive: tuple[str, ...] = SENSITIVE_PATTERNS,
+                 ) -> None:
+        self.rules = rules
+        self.trie = GlobTrie()
+        self.labels: list[tuple[str, Rule | None]] = []  # pattern id -> (kind, rule)
+        self.unmatchable: list[Rule] = []  # path rules outside the project
+        for rule in rules:
+            if rule.tool in ("Read", "Edit"):
+                self.labels.append((rule.tool, rule))
+                if not self.trie.add(rule.specifier or "**", len(self.labels) - 1):
+                    self.unmatchable.append(rule)
+        for pattern in sensitive:
+            self.labels.append((SENSITIVE, None))
+            self.trie.add(pattern, len(self.labels) - 1)
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> Permissions:
+        """Parse the ``permissions`` block of a settings.json document."""
+        block = settings.get("permissions", {}) if isinstance(settings, dict) else {}
+        rules = [parse_rule(text, effect) for effect in EFFECTS
+                 for text in block.get(effect, []) or []]
+        return cls(rules, **kwargs)
+
+    @classmethod
+    def load(cls, path: Path, **kwargs: Any) -> Permissions:
+        return cls.from_settings(json.loads(path.read_text()), **kwargs)
+
+    def _decide(self, rules: list[Rule]) -> tuple[str | None, Rule | None]:
+        for effect in EFFECTS:
+            for rule in rules:
+                if rule.effect == effect:
+                    return effect, rule
+        return None, None
+
+    def path_matches(self, ids: set[int], tool: str = "Read") -> tuple[str | None, Rule | None]:
+        """The decision for a path the trie matched as ``ids``."""
+        return self._decide([rule for i in sorted(ids)
+                             for kind, rule in (self.labels[i],)
+                             if kind == tool and rule is not None])
+
+    def is_sensitive(self, ids: set[int]) -> bool:
+        return any(self.labels[i][0] == SENSITIVE for i in ids)
+
+    def decide(self, tool: str, target: str | None = None) -> tuple[str | None, Rule | None]:
+        """(effect, deciding rule) for calling ``tool`` on ``target``.
+
+        ``target`` is a root-relative path for file tools, the command line for
+        Bash (compound commands are split on ``&&``, ``||``, ``;`` and ``|``,
+        without regard to quoting, and the strictest part decides) and the
+        raw specifier otherwise.  (None, None) when no rule applies.
+        """
+        path_tool = PATH_RULE_TOOL.get(tool)
+        if path_tool is not None and target is not None:
+            path = target[2:] if target.startswith("./") else target
+            return self.path_matches(self.trie.match(path), path_tool)
+        if tool == "Bash" and target is not None:
+            parts = [p for p in _COMMAND_SEPARATORS.split(target.strip()) if p] or [""]
+            decisions = [self._decide([r for r in self.rules if r.tool == "Bash" and (
+                r.specifier is None or _command_matches(r.specifier, part))]) for part in parts]
+            for effect in (DENY, ASK):
+                for decision in decisions:
+                    if decision[0] == effect:
+                        return decision
+            if all(effect == ALLOW for effect, _ in decisions):
+                return decisions[0]
+            return None, None
+        return self._decide([r for r in self.rules if r.tool == (path_tool or tool) and (
+            r.specifier is None or target is None or fnmatch.fnmatchcase(target, r.specifier))])
+
+
+# --------------------------------------------------------------------------- #
+# Tree audit                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class Finding:
+    settings: str  # settings file whose rules let the path through
+    path: str  # relative to that settings file's project root
+    effect: str | None  # allow or ask; None when no rule applies at all
+    rule: str | None = None  # the rule behind ``effect``
+
+
+@dataclass
+class AuditReport:
+    files: int = 0
+    findings: list[Finding] = field(default_factory=list)
+    unmatchable: list[str] = field(default_factory=list)  # rules that can never apply
+    elapsed_s: float = 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Scope:
+    settings: str
+    permissions: Permissions
+    states: tuple[_Node, ...]
+    prefix: str  # the scope root, relative to the walk root ("" or "packages/x/")
+
+
+def _settings_scope(project: Path, root: Path) -> _Scope | None:
+    path = project / ".claude" / "settings.json"
+    try:
+        permissions = Permissions.load(path)
+    except (OSError, ValueError):
+        return None
+    rel = project.relative_to(root).as_posix()
+    prefix = "" if rel == "." else f"{rel}/"
+    return _Scope(f"{prefix}.claude/settings.json", permissions, permissions.trie.start(),
+                  prefix)
+
+
+def audit(root: Path, tool: str = "Read", packages_dir: str = "packages") -> AuditReport:
+    """Walk ``root`` once and report sensitive files that ``tool`` may read.
+
+    Every file is checked against the monolith's settings and, below
+    ``packages_dir/<name>``, against that package's own settings too.
+    """
+    start = time.perf_counter()
+    report = AuditReport()
+    root_scope = _settings_scope(root, root)
+    if root_scope is None:
+        raise PermissionRuleError(f"cannot read {root / '.claude' / 'settings.json'}")
+    packages_root = (root / packages_dir).as_posix()
+    stack: list[tuple[str, list[_Scope]]] = [(root.as_posix(), [root_scope])]
+    seen_scopes = [root_scope]
+    while stack:
+        directory, scopes = stack.pop()
+        if os.path.dirname(directory) == packages_root:
+            package = _settings_scope(Path(directory), root)
+            if package is not None:
+                scopes = [*scopes, package]
+                seen_scopes.append(package)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if is_dir and entry.name in _SKIP_DIRS:
+                continue
+            stepped = [(scope, scope.permissions.trie.step(scope.states, entry.name))
+                       for scope in scopes]
+            if is_dir:
+                stack.append((entry.path, [_Scope(s.settings, s.permissions, states, s.prefix)
+                                           for s, states in stepped]))
+                continue
+            report.files += 1
+            for scope, states in stepped:
+                ids = scope.permissions.trie.accepted(states)
+                if not ids or not scope.permissions.is_sensitive(ids):
+                    continue
+                effect, rule = scope.permissions.path_matches(ids, tool)
+                if effect != DENY:
+                    rel = Path(entry.path).relative_to(root).as_posix()[len(scope.prefix):]
+                    report.findings.append(Finding(scope.settings, rel, effect,
+                                                   rule.raw if rule else None))
+    for scope in seen_scopes:
+        report.unmatchable += [f"{scope.settings}: {r.raw}"
+                               for r in scope.permissions.unmatchable]
+    report.findings.sort(key=lambda f: (f.settings, f.path))
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.permissions")
+    parser.add_argument("--root", type=Path, default=Path.cwd(),
+                        help="project root containing .claude/settings.json (default: cwd)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    audit_cmd = sub.add_parser("audit", help="report sensitive files the rules do not deny")
+    audit_cmd.add_argument("--tool", choices=("Read", "Edit"), default="Read")
+    audit_cmd.add_argument("--json", action="store_true")
+    check = sub.add_parser("check", help="print the decision for one tool call")
+    check.add_argument("tool")
+    check.add_argument("target", nargs="?", help="path, command or specifier")
+    args = parser.parse_args(argv)
+    root = args.root.resolve()
+
+    try:
+        if args.command == "check":
+            effect, rule = Permissions.load(root / ".claude" / "settings.json").decide(
+                args.tool, args.target)
+            print(f"{effect or 'no rule'}" + (f" ({rule.raw})" if rule else ""))
+            return 0 if effect == ALLOW else 1
+        report = audit(root, args.tool)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(report.to_json(), indent=2))
+    else:
+        for finding in report.findings:
+            how = f"{finding.effect} by {finding.rule}" if finding.rule else "no rule"
+            print(f"NOT DENIED {finding.path} [{finding.settings}: {how}]")
+        for rule in report.unmatchable:
+            print(f"note: {rule} can never match a project path")
+        print(f"{report.files} files, {len(report.findings)} sensitive path(s) not denied "
+              f"({report.elapsed_s:.2f}s)")
+    return 1 if report.findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
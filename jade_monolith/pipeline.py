@@ -0,0 +1,384 @@
+"""Headless team pipeline: a DAG of ``claude -p --agent`` stages, streamed.
+
+The ``run-team.sh`` recipe in docs/api-usage.md runs architect, test-writer,
+implementer and reviewer strictly one after another and buffers each agent's
+whole ``stream-json`` output through ``jq | tail -1``.  Here each stage's
+stdout is parsed event by event as it arrives; the moment a stage's
+``result`` event lands its text is handed to the stages that need it, while
+the finished CLI process winds down in the background.  Stages whose
+dependencies are met run concurrently (bounded by ``max_parallel``), and a
+stage can fan out over the items of an upstream plan, one agent run per item.
+
+Prompts are templates: ``{task}``, ``{item}`` (fan-out stages) and
+``{<stage name>}`` for any stage listed in ``needs``.
+
+Run with:  python -m jade_monolith.pipeline "Add JWT auth" [--pipeline stages.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import signal
+import sys
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_TIMEOUT = 900.0
+DEFAULT_MAX_PARALLEL = 4
+EXIT_GRACE = 30.0  # how long a process may keep running after its result event
+STREAM_LIMIT = 16 * 1024 * 1024  # longest stream-json line (one event can be large)
+
+_PLACEHOLDER = re.compile(r"\{([A-Za-z][\w-]*)\}")
+_PLAN_ITEM = re.compile(r"^ ?(?:\d+[.)]|[-*])\s+(?P<item>\S.*)$")
+
+# Called as on_event(stage, event) for every stream-json event, in arrival order.
+EventCallback = Callable[[str, dict[str, Any]], None]
+
+
+class PipelineError(ValueError):
+    """The declared stages do not form a valid DAG."""
+
+
+@dataclass
+class Stage:
+    name: str
+    agent: str
+    prompt: str
+    needs: tuple[str, ...] = ()
+    for_each: str | None = None  # fan out over the plan items of this stage's result
+    permission_mode: str | None = None
+    model: str | None = None
+    timeout: float = DEFAULT_TIMEOUT
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Stage:
+        data = dict(data)
+        data["needs"] = tuple(data.get("needs", ()))
+        return cls(**data)
+
+
+# The four-agent TDD workflow from docs/team-setup.md: tests for every plan
+# item are written in parallel.
+TEAM_PIPELINE: tuple[Stage, ...] = (
+    Stage("architect", "architect", "{task}", permission_mode="plan"),
+    Stage("test-writer", "test-writer",
+          "Write failing tests for this plan item:\n\n{item}\n\nFull plan:\n\n{architect}",
+          needs=("architect",), for_each="architect"),
+    Stage("implementer", "implementer",
+          "Implement this plan. Tests already exist:\n\n{architect}\n\nTests:\n\n{test-writer}",
+          needs=("architect", "test-writer")),
+    Stage("reviewer", "reviewer",
+          "Review all changes against this plan:\n\n{architect}\n\nImplementer notes:\n\n"
+          "{implementer}",
+          needs=("architect", "implementer"), permission_mode="plan"),
+)
+
+
+@dataclass
+class RunResult:
+    """One ``claude -p`` invocation (a stage runs one, or one per plan item)."""
+
+    item: str | None
+    status: str = "ok"  # ok | failed | timeout
+    result: str = ""
+    session_id: str | None = None
+    error: str | None = None
+    started: float = 0.0    # seconds since pipeline start
+    result_at: float = 0.0  # when the result event arrived
+    exited_at: float | None = None
+    cost_usd: float = 0.0
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str = "skipped"  # ok | failed | timeout | skipped
+    result: str = ""
+    runs: list[RunResult] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def started(self) -> float | None:
+        return min((r.started for r in self.runs), default=None)
+
+    @property
+    def finished(self) -> float | None:
+        return max((r.result_at for r in self.runs), default=None)
+
+
+def validate(stages: Iterable[Stage]) -> list[Stage]:
+    """Return the stages in a dependency order, or raise PipelineError."""
+    by_name: dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise PipelineError(f"duplicate stage {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in by_name.values():
+        for dep in (*stage.needs, *([stage.for_each] if stage.for_each else [])):
+            if dep not in by_name:
+                raise PipelineError(f"stage {stage.name!r} needs unknown stage {dep!r}")
+        if stage.for_each and stage.for_each not in stage.needs:
+            stage.needs = (*stage.needs, stage.for_each)
+
+    ordered: list[Stage] = []
+    state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(stage: Stage, path: tuple[str, ...]) -> None:
+        if state.get(stage.name) == 2:
+            return
+        if state.get(stage.name) == 1:
+            raise PipelineError(f"dependency cycle: {' -> '.join((*path, stage.name))}")
+        state[stage.name] = 1
+        for dep in stage.needs:
+            visit(by_name[dep], (*path, stage.name))
+        state[stage.name] = 2
+        ordered.append(stage)
+
+    for stage in by_name.values():
+        visit(stage, ())
+    return ordered
+
+
+def plan_items(text: str) -> list[str]:
+    """Top-level numbered or bulleted items of a plan; the whole plan if it has none."""
+    items = [m["item"].strip() for line in text.splitlines() if (m := _PLAN_ITEM.match(line))]
+    return items or [text]
+
+
+def render(template: str, values: dict[str, str]) -> str:
+    """Fill ``{name}`` placeholders that have a value; leave any other braces alone."""
+    return _PLACEHOLDER.sub(lambda m: values.get(m[1], m[0]), template)
+
+
+def stage_command(stage: Stage, prompt: str, claude: str = "claude") -> list[str]:
+    command = [claude, "-p", prompt, "--agent", stage.agent,
+               "--output-format", "stream-json", "--verbose"]
+    if stage.permission_mode:
+        command += ["--permission-mode", stage.permission_mode]
+    if stage.model:
+        command += ["--model", stage.model]
+    return command
+
+
+# --------------------------------------------------------------------------- #
+# Runner                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+class PipelineRunner:
+    """Run a validated stage DAG against the ``claude`` CLI (or a stand-in)."""
+
+    def __init__(
+        self,
+        stages: Iterable[Stage] = TEAM_PIPELINE,
+        *,
+        cwd: Path | None = None,
+        claude: str = "claude",
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+        on_event: EventCallback | None = None,
+    ) -> None:
+        self.stages = validate(Stage(**asdict(s)) for s in stages)
+        self.cwd = cwd
+        self.claude = claude
+        self.max_parallel = max_parallel
+        self.on_event = on_event
+        self._start = 0.0
+        self._gate: asyncio.Semaphore | None = None
+        self._drains: list[asyncio.Task] = []
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._start
+
+    async def _drain(self, proc: asyncio.subprocess.Process, run: RunResult,
+                     stderr: asyncio.Task) -> None:
+        """Let a process that already delivered its result exit on its own."""
+        try:
+            await asyncio.wait_for(asyncio.gather(proc.stdout.read(), stderr, proc.wait()),
+                                   EXIT_GRACE)
+        except TimeoutError:
+            _kill(proc)
+            await proc.wait()
+        run.exited_at = self._now()
+
+    async def _run_one(self, stage: Stage, prompt: str, item: str | None) -> RunResult:
+        run = RunResult(item)
+        assert self._gate is not None
+        async with self._gate:
+            run.started = self._now()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *stage_command(stage, prompt, self.claude),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=self.cwd,
+                    start_new_session=True,  # a timeout kills Node's children too
+                    limit=STREAM_LIMIT,
+                )
+            except FileNotFoundError:
+                run.status, run.error = "failed", f"{self.claude}: command not found"
+                return run
+            stderr = asyncio.ensure_future(proc.stderr.read())
+
+            async def until_result() -> dict[str, Any] | None:
+                while line := await proc.stdout.readline():
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # not an event: progress noise
+                    if self.on_event is not None:
+                        self.on_event(stage.name, event)
+                    if event.get("type") == "result":
+                        return event
+                return None
+
+            try:
+                event = await asyncio.wait_for(until_result(), stage.timeout)
+            except TimeoutError:
+                _kill(proc)
+                await proc.wait()
+                stderr.cancel()
+                run.status, run.error = "timeout", f"no result within {stage.timeout:g}s"
+                run.result_at = run.exited_at = self._now()
+                return run
+            except ValueError:  # readline(): a line longer than STREAM_LIMIT
+                _kill(proc)
+                await proc.wait()
+                stderr.cancel()
+                run.status, run.error = "failed", f"stream-json line over {STREAM_LIMIT} bytes"
+                run.result_at = run.exited_at = self._now()
+                return run
+
+            run.result_at = self._now()
+            if event is None:  # stdout closed without a result
+                await proc.wait()
+                run.exited_at = self._now()
+                err = (await stderr).decode(errors="replace").strip()
+                run.status = "failed"
+                run.error = err.splitlines()[-1] if err else f"exit status {proc.returncode}"
+                return run
+            self._drains.append(asyncio.ensure_future(self._drain(proc, run, stderr)))
+
+        run.result = event.get("result") or ""
+        run.session_id = event.get("session_id")
+        run.cost_usd = float(event.get("total_cost_usd") or 0.0)
+        if event.get("is_error") or event.get("subtype", "success") != "success":
+            run.status, run.error = "failed", run.result or event.get("subtype")
+        return run
+
+    async def _run_stage(self, stage: Stage, task: str,
+                         done: dict[str, asyncio.Future]) -> StageResult:
+        deps = [await done[name] for name in stage.needs]
+        result = StageResult(stage.name)
+        failed = [d.name for d in deps if d.status != "ok"]
+        if failed:
+            result.error = f"skipped: {', '.join(failed)} did not succeed"
+            return result
+
+        values = {"task": task, **{d.name: d.result for d in deps}}
+        items: list[str | None] = [None]
+        if stage.for_each:
+            items = list(plan_items(values[stage.for_each]))
+        runs = await asyncio.gather(*(
+            self._run_one(stage, render(stage.prompt, {**values, "item": item or ""}), item)
+            for item in items
+        ))
+        result.runs = list(runs)
+        bad = [r for r in runs if r.status != "ok"]
+        if bad:
+            result.status = "timeout" if any(r.status == "timeout" for r in bad) else "failed"
+            result.error = bad[0].error
+        else:
+            result.status = "ok"
+        result.result = "\n\n".join(r.result for r in runs if r.result)
+        return result
+
+    async def run(self, task: str) -> dict[str, StageResult]:
+        """Run every stage; results in dependency order."""
+        self._start = time.perf_counter()
+        self._gate = asyncio.Semaphore(max(1, self.max_parallel))
+        self._drains = []
+        done: dict[str, asyncio.Future] = {}
+        for stage in self.stages:  # dependency order: every needed future exists
+            done[stage.name] = asyncio.ensure_future(self._run_stage(stage, task, done))
+        results = {name: await future for name, future in done.items()}
+        if self._drains:
+            await asyncio.gather(*self._drains)
+        return results
+
+
+def _kill(proc: asyncio.subprocess.Process) -> None:
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+def run_pipeline(task: str, stages: Iterable[Stage] = TEAM_PIPELINE,
+                 **kwargs: Any) -> dict[str, StageResult]:
+    """Synchronous wrapper around PipelineRunner.run() for scripts."""
+    return asyncio.run(PipelineRunner(stages, **kwargs).run(task))
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def load_stages(path: Path) -> list[Stage]:
+    """Stages from a JSON file: ``{"stages": [{"name", "agent", "prompt", ...}]}``."""
+    data = json.loads(path.read_text())
+    if not data["stages"]:
+        raise PipelineError("no stages")
+    return [Stage.from_dict(s) for s in data["stages"]]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.pipeline",
+                                     description="run the agent team headlessly")
+    parser.add_argument("task")
+    parser.add_argument("--pipeline", type=Path, help="JSON stage file (default: the "
+                                                      "architect/test-writer/implementer/"
+                                                      "reviewer team)")
+    parser.add_argument("--cwd", type=Path)
+    parser.add_argument("--claude", default="claude")
+    parser.add_argument("--max-parallel", type=int, default=DEFAULT_MAX_PARALLEL)
+    parser.add_argument("--timeout", type=float, help="override every stage's timeout")
+    parser.add_argument("--json", action="store_true", help="print every stage result as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        stages = load_stages(args.pipeline) if args.pipeline else list(TEAM_PIPELINE)
+        if args.timeout is not None:
+            stages = [Stage(**{**asdict(s), "timeout": args.timeout}) for s in stages]
+        runner = PipelineRunner(stages, cwd=args.cwd, claude=args.claude,
+                                max_parallel=args.max_parallel)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"error: invalid pipeline: {e}", file=sys.stderr)
+        return 2
+
+    def progress(stage: str, event: dict[str, Any]) -> None:
+        if event.get("type") == "result":
+            print(f"[{runner._now():7.1f}s] {stage}: result", file=sys.stderr, flush=True)
+
+    runner.on_event = progress
+    results = asyncio.run(runner.run(args.task))
+    if args.json:
+        print(json.dumps({name: asdict(r) for name, r in results.items()}, indent=2))
+    else:
+        for name, r in results.items():
+            print(f"=== {name}: {r.status}" + (f" ({r.error})" if r.error else ""))
+        last = list(results.values())[-1]
+        if last.result:
+            print(last.result)
+    return 0 if all(r.status == "ok" for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""pytest plugin: record which repo paths each test reads, and run only the
+tests a diff affects.
+
+  --impact-record         record every test's dependencies into the map
+  --impact-since REF      deselect tests that no change since REF can affect
+  --impact-map PATH       map location (default: cache dir/impact-map.json)
+
+Recording hooks ``open``, ``os.stat``, ``os.scandir`` and ``os.listdir`` and
+keeps paths under the rootdir.  Reads made while a fixture is being set up
+are charged to the fixture, and every test that uses the fixture inherits
+them, so session-scoped fixtures (parsed_agents, agent_index) count for all
+of their users, not just the first.  See jade_monolith.impact for how a diff
+is matched against the map.
+
+Registered from tests/conftest.py; run with:
+    pytest --impact-record               # full run, refresh the map
+    pytest --impact-since origin/main    # only what this branch affects
+"""
+
+from __future__ import annotations
+
+import builtins
+import io
+import os
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from .cache import cache_dir
+from .impact import ImpactMap, changed_paths, default_map_path
+
+_IGNORED_PARTS = {".git", "__pycache__", ".pytest_cache"}
+
+
+class PathRecorder:
+    """Charge repo paths touched by open/stat/listdir to the current owner."""
+
+    def __init__(self, root: Path, ignore: list[Path] | None = None) -> None:
+        self.root = os.path.abspath(root) + os.sep
+        self.ignore = [os.path.abspath(p) + os.sep for p in ignore or []]
+        self.reads: dict[str, set[str]] = {}
+        self._owners: list[str] = []
+        self._lock = threading.Lock()
+        self._originals: list[tuple[Any, str, Callable]] = []
+
+    def push(self, owner: str) -> None:
+        self._owners.append(owner)
+
+    def pop(self) -> None:
+        self._owners.pop()
+
+    def record(self, path: Any, *, directory: bool = False) -> None:
+        if not self._owners or isinstance(path, int):
+            return
+        try:
+            absolute = os.path.abspath(os.fsdecode(path))
+        except TypeError:
+            return
+        if directory:
+            absolute += os.sep
+        if not absolute.startswith(self.root) or any(absolute.startswith(p)
+                                                     for p in self.ignore):
+            return
+        relative = absolute[len(self.root):].replace(os.sep, "/")
+        if not relative or _IGNORED_PARTS.intersection(relative.split("/")):
+            return
+        with self._lock:
+            self.reads.setdefault(self._owners[-1], set()).add(relative)
+
+    def _wrap(self, func: Callable, directory: bool) -> Callable:
+        record = self.record
+
+        def wrapper(path: Any = ".", *args: Any, **kwargs: Any) -> Any:
+            record(path, directory=directory)
+            return func(path, *args, **kwargs)
+
+        return wrapper
+
+    def install(self) -> None:
+        targets = [(builtins, "open", False), (io, "open", False), (os, "stat", False),
+                   (os, "scandir", True), (os, "listdir", True)]
+        for owner, attr, directory in targets:
+            original = getattr(owner, attr)
+            self._originals.append((owner, attr, original))
+            setattr(owner, attr, self._wrap(original, directory))
+
+    def uninstall(self) -> None:
+        for owner, attr, original in reversed(self._originals):
+            setattr(owner, attr, original)
+        self._originals.clear()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("jade", "jade-monolith options")
+    group.addoption("--impact-record", action="store_true",
+                    help="record the repo paths each test reads into the impact map")
+    group.addoption("--impact-since", metavar="REF",
+                    help="run only tests affected by changes since git REF")
+    group.addoption("--impact-map", metavar="PATH", type=Path,
+                    help="impact map location (default: cache dir/impact-map.json)")
+
+
+class ImpactPlugin:
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.root = config.rootpath
+        self.map_path: Path = config.getoption("impact_map") or default_map_path()
+        self.map = ImpactMap.load(self.map_path)
+        self.since: str | None = config.getoption("impact_since")
+        self.recorder = (PathRecorder(self.root, ignore=[cache_dir()])
+                         if config.getoption("impact_record") else None)
+        self.summary: str | None = None
+        self.deselected_all = False
+
+    # -- selection --------------------------------------------------------- #
+
+    def pytest_collection_modifyitems(self, config: pytest.Config,
+                                      items: list[pytest.Item]) -> None:
+        if self.since is None:
+            return
+        try:
+            changed = changed_paths(self.root, self.since)
+        except ValueError as e:
+            self.summary = f"cannot diff against {self.since} ({e}): running everything"
+            return
+        keep, reason = self.map.select([item.nodeid for item in items], changed)
+        kept = set(keep)
+        deselected = [item for item in items if item.nodeid not in kept]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in kept]
+        self.deselected_all = bool(deselected) and not items
+        self.summary = f"{len(items)} of {len(items) + len(deselected)} tests selected: {reason}"
+
+    # -- recording --------------------------------------------------------- #
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef: pytest.FixtureDef, request: Any) -> Iterator[None]:
+        if self.recorder is None:
+            return (yield)
+        self.recorder.push(f"fixture:{fixturedef.argname}")
+        try:
+            return (yield)
+        finally:
+            self.recorder.pop()
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem: Any) -> Iterator[None]:
+        if self.recorder is None:
+            return (yield)
+        self.recorder.push(item.nodeid)
+        try:
+            return (yield)
+        finally:
+            self.recorder.pop()
+            self._store(item)
+
+    def _store(self, item: pytest.Item) -> None:
+        reads = self.recorder.reads
+        deps = set(reads.get(item.nodeid, ()))
+        for name in item.fixturenames:
+            deps |= reads.get(f"fixture:{name}", set())
+        deps.add(item.path.relative_to(self.root).as_posix())
+        self.map.update(item.nodeid, deps)
+
+    def pytest_sessionstart(self) -> None:
+        if self.recorder is not None:
+            self.recorder.install()
+
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int) -> None:
+        if self.recorder is not None:
+            self.recorder.uninstall()
+            self.map.save(self.map_path)
+        if self.deselected_all and exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+            session.exitstatus = pytest.ExitCode.OK  # nothing affected is a pass
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self.summary:
+            terminalreporter.write_line(f"impact: {self.summary}")
+        if self.recorder is not None:
+            terminalreporter.write_line(
+                f"impact: recorded {len(self.map.tests)} tests into {self.map_path}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("impact_record") or config.getoption("impact_since"):
+        config.pluginmanager.register(ImpactPlugin(config), "jade-impact")
@@ -0,0 +1,73 @@
+"""pytest plugin: the worker side of jade_monolith.shard.
+
+  --shard-collect PATH    write the collected node ids to PATH (coordinator)
+  --shard-ids PATH        run only the node ids listed in PATH (a JSON list)
+  --shard-report PATH     write each test's duration (setup + call + teardown)
+
+It also provides the ``shared_fixtures`` FixtureStore, through which session
+fixtures are computed once per sharded run instead of once per worker:
+
+    @pytest.fixture(scope="session")
+    def parsed_agents(agent_files, shared_fixtures):
+        return shared_fixtures.get("parsed_agents", lambda: load_agents(agent_files))
+
+Registered from tests/conftest.py; the coordinator also passes it with -p.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from .shard import FixtureStore
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("jade", "jade-monolith options")
+    group.addoption("--shard-collect", metavar="PATH", type=Path,
+                    help="write the collected node ids to PATH as JSON")
+    group.addoption("--shard-ids", metavar="PATH", type=Path,
+                    help="run only the node ids listed in PATH (JSON list)")
+    group.addoption("--shard-report", metavar="PATH", type=Path,
+                    help="write per-test durations to PATH as JSON")
+
+
+@pytest.fixture(scope="session")
+def shared_fixtures() -> FixtureStore:
+    """Values computed once per sharded run (a pass-through in a plain run)."""
+    return FixtureStore.from_env()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    ids_path = config.getoption("shard_ids")
+    if ids_path is not None:
+        wanted = set(json.loads(ids_path.read_text()))
+        deselected = [item for item in items if item.nodeid not in wanted]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in wanted]
+    collect_path = config.getoption("shard_collect")
+    if collect_path is not None:
+        collect_path.write_text(json.dumps([item.nodeid for item in items]))
+
+
+class _DurationReport:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.durations: dict[str, float] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session: pytest.Session, exitstatus: Any) -> None:
+        self.path.write_text(json.dumps(self.durations, indent=1))
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    report_path = config.getoption("shard_report")
+    if report_path is not None:
+        config.pluginmanager.register(_DurationReport(report_path), "jade-shard-report")
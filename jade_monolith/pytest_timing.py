@@ -0,0 +1,404 @@
+"""pytest plugin: where does the suite's time go?
+
+Records wall time per test and per phase (setup / call / teardown), grouped
+by the suite markers (schema, contract, compat, smoke, tooling), and
+attributes time inside each phase to the expensive calls the suites make:
+
+  subprocess:<name>   spawning and waiting on a child (claude, npm, git,
+                      shellcheck, ...), sync or asyncio
+  read                Path.read_text / Path.read_bytes
+  yaml                yaml.load / yaml.safe_load
+
+Attributed time is summed per call, so it can exceed wall time when calls
+overlap (thread pools, asyncio.gather).  For subprocesses, "calls" counts
+processes spawned; waiting on them adds time but not calls.  Instrumentation is only installed
+when one of the options below is given:
+
+  --timing                     print a summary at the end of the run
+  --timing-json PATH           write the full report as JSON
+  --timing-openmetrics PATH    write it in OpenMetrics text format
+
+Registered from tests/conftest.py; run with:  pytest --timing
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import json
+import pathlib
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+GROUP_MARKERS = ("schema", "contract", "compat", "smoke", "tooling")
+UNMARKED = "unmarked"
+REPORT_VERSION = 1
+
+# Nesting guard: Popen.communicate() calls wait(), yaml.safe_load() calls
+# load(); only the outermost instrumented call is counted.
+_active: contextvars.ContextVar[bool] = contextvars.ContextVar("jade_timing_active",
+                                                              default=False)
+
+
+@dataclass
+class Attribution:
+    seconds: float = 0.0
+    calls: int = 0
+
+    def to_json(self) -> dict[str, Any]:
+        return {"seconds": round(self.seconds, 6), "calls": self.calls}
+
+
+@dataclass
+class TimedTest:
+    nodeid: str
+    markers: list[str]
+    outcome: str = "passed"
+    phases: dict[str, float] = field(default_factory=dict)
+    attributed: dict[str, dict[str, Attribution]] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return sum(self.phases.values())
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "nodeid": self.nodeid,
+            "markers": self.markers,
+            "outcome": self.outcome,
+            "duration": round(self.duration, 6),
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "attributed": {phase: {cat: a.to_json() for cat, a in sorted(cats.items())}
+                           for phase, cats in self.attributed.items()},
+        }
+
+
+class Recorder:
+    """Collects attributed time for whichever test phase is currently running."""
+
+    def __init__(self) -> None:
+        self.tests: list[TimedTest] = []
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.wall = 0.0
+        self._lock = threading.Lock()
+        self._current: TimedTest | None = None
+        self._phase = "setup"
+
+    def begin(self, test: TimedTest, phase: str) -> None:
+        with self._lock:
+            self._current, self._phase = test, phase
+
+    def end(self) -> None:
+        with self._lock:
+            self._current = None
+
+    def add(self, category: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            if self._current is None:
+                return  # collection, session fixtures' finalizers, ...
+            cats = self._current.attributed.setdefault(self._phase, {})
+            entry = cats.setdefault(category, Attribution())
+            entry.seconds += seconds
+            entry.calls += calls
+
+    def finish(self) -> None:
+        self.wall = time.perf_counter() - self._start
+
+    # -- aggregates -------------------------------------------------------- #
+
+    def by_marker(self) -> dict[str, Attribution]:
+        groups: dict[str, Attribution] = {}
+        for test in self.tests:
+            for marker in test.markers:
+                entry = groups.setdefault(marker, Attribution())
+                entry.seconds += test.duration
+                entry.calls += 1
+        return groups
+
+    def by_category(self) -> dict[str, Attribution]:
+        totals: dict[str, Attribution] = {}
+        for test in self.tests:
+            for cats in test.attributed.values():
+                for category, a in cats.items():
+                    entry = totals.setdefault(category, Attribution())
+                    entry.seconds += a.seconds
+                    entry.calls += a.calls
+        return totals
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": REPORT_VERSION,
+            "started": self.started,
+            "wall": round(self.wall, 6),
+            "markers": {m: {"tests": a.calls, "seconds": round(a.seconds, 6)}
+                        for m, a in sorted(self.by_marker().items())},
+            "attributed": {c: a.to_json() for c, a in sorted(self.by_category().items())},
+            "tests": [t.to_json() for t in self.tests],
+        }
+
+
+# --------------------------------------------------------------------------- #
+# Instrumentation                                                              #
+# --------------------------------------------------------------------------- #
+
+
+def _command_name(args: Any) -> str:
+    if isinstance(args, (str, bytes, Path)):
+        args = str(args).split()
+    try:
+        first = args[0]
+    except (IndexError, TypeError, KeyError):
+        return "subprocess:?"
+    return f"subprocess:{Path(str(first)).name}"
+
+
+def _timed(
+    recorder: Recorder, func: Callable, category: Callable[..., str], *, calls: int = 1,
+) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _active.get():
+            return func(*args, **kwargs)
+        token = _active.set(True)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _active.reset(token)
+            recorder.add(category(*args, **kwargs), time.perf_counter() - start, calls)
+
+    return wrapper
+
+
+def _timed_async(
+    recorder: Recorder, func: Callable, category: Callable[..., str], *, calls: int = 1,
+) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _active.get():
+            return await func(*args, **kwargs)
+        token = _active.set(True)
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _active.reset(token)
+            recorder.add(category(*args, **kwargs), time.perf_counter() - start, calls)
+
+    return wrapper
+
+
+def _patches(recorder: Recorder) -> list[tuple[Any, str, Callable]]:
+    """(owner, attribute, wrapper) for every instrumented call."""
+    popen_name = lambda self, *a, **kw: _command_name(self.args)  # noqa: E731
+    read = lambda *a, **kw: "read"  # noqa: E731
+    patches: list[tuple[Any, str, Callable]] = [
+        (subprocess.Popen, "__init__", _timed(
+            recorder, subprocess.Popen.__init__,
+            lambda self, *a, **kw: _command_name(a[0] if a else kw.get("args")))),
+        (subprocess.Popen, "wait",
+         _timed(recorder, subprocess.Popen.wait, popen_name, calls=0)),
+        (subprocess.Popen, "communicate",
+         _timed(recorder, subprocess.Popen.communicate, popen_name, calls=0)),
+        (pathlib.Path, "read_text", _timed(recorder, pathlib.Path.read_text, read)),
+        (pathlib.Path, "read_bytes", _timed(recorder, pathlib.Path.read_bytes, read)),
+    ]
+
+    create = asyncio.create_subprocess_exec
+
+    async def create_subprocess_exec(program: Any, *args: Any, **kwargs: Any) -> Any:
+        proc = await create(program, *args, **kwargs)
+        proc._jade_timing_name = _command_name([program])
+        return proc
+
+    async_name = lambda self, *a, **kw: getattr(  # noqa: E731
+        self, "_jade_timing_name", "subprocess:?")
+    patches += [
+        (asyncio, "create_subprocess_exec", _timed_async(
+            recorder, create_subprocess_exec,
+            lambda program, *a, **kw: _command_name([program]))),
+        (asyncio.subprocess.Process, "wait",
+         _timed_async(recorder, asyncio.subprocess.Process.wait, async_name, calls=0)),
+        (asyncio.subprocess.Process, "communicate",
+         _timed_async(recorder, asyncio.subprocess.Process.communicate, async_name, calls=0)),
+    ]
+
+    try:
+        import yaml
+    except ImportError:  # pragma: no cover - yaml is a test dependency
+        return patches
+    parse = lambda *a, **kw: "yaml"  # noqa: E731
+    patches += [(yaml, name, _timed(recorder, getattr(yaml, name), parse))
+                for name in ("load", "safe_load")]
+    return patches
+
+
+class _Instrumentation:
+    def __init__(self, recorder: Recorder) -> None:
+        self._patches = _patches(recorder)
+        self._originals = [(owner, attr, getattr(owner, attr))
+                           for owner, attr, _ in self._patches]
+
+    def install(self) -> None:
+        for owner, attr, wrapper in self._patches:
+            setattr(owner, attr, wrapper)
+
+    def uninstall(self) -> None:
+        for owner, attr, original in self._originals:
+            setattr(owner, attr, original)
+
+
+# --------------------------------------------------------------------------- #
+# Export                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric(lines: list[str], name: str, kind: str, help_text: str, unit: str = "") -> None:
+    lines.append(f"# TYPE {name} {kind}")
+    if unit:
+        lines.append(f"# UNIT {name} {unit}")
+    lines.append(f"# HELP {name} {help_text}")
+
+
+def to_openmetrics(recorder: Recorder) -> str:
+    lines: list[str] = []
+    _metric(lines, "jade_test_duration_seconds", "gauge",
+            "Wall time of one test phase.", "seconds")
+    for test in recorder.tests:
+        for phase, seconds in test.phases.items():
+            lines.append(
+                f'jade_test_duration_seconds{{test="{_label(test.nodeid)}",'
+                f'markers="{",".join(test.markers)}",phase="{phase}",'
+                f'outcome="{test.outcome}"}} {seconds:.6f}')
+    _metric(lines, "jade_marker_duration_seconds", "gauge",
+            "Wall time of all tests carrying a marker.", "seconds")
+    markers = recorder.by_marker()
+    for marker, a in sorted(markers.items()):
+        lines.append(f'jade_marker_duration_seconds{{marker="{marker}"}} {a.seconds:.6f}')
+    _metric(lines, "jade_marker_tests", "gauge", "Tests carrying a marker.")
+    for marker, a in sorted(markers.items()):
+        lines.append(f'jade_marker_tests{{marker="{marker}"}} {a.calls}')
+    _metric(lines, "jade_attributed_duration_seconds", "gauge",
+            "Time spent inside instrumented calls, summed per call.", "seconds")
+    categories = recorder.by_category()
+    for category, a in sorted(categories.items()):
+        lines.append(f'jade_attributed_duration_seconds{{category="{_label(category)}"}} '
+                     f"{a.seconds:.6f}")
+    _metric(lines, "jade_attributed_calls", "counter", "Instrumented calls made.")
+    for category, a in sorted(categories.items()):
+        lines.append(f'jade_attributed_calls_total{{category="{_label(category)}"}} {a.calls}')
+    _metric(lines, "jade_session_duration_seconds", "gauge",
+            "Wall time of the whole session.", "seconds")
+    lines.append(f"jade_session_duration_seconds {recorder.wall:.6f}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+# --------------------------------------------------------------------------- #
+# pytest hooks                                                                 #
+# --------------------------------------------------------------------------- #
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("jade", "jade-monolith options")
+    group.addoption("--timing", action="store_true",
+                    help="attribute test time to subprocesses, reads and YAML parses")
+    group.addoption("--timing-json", metavar="PATH", type=Path,
+                    help="write the --timing report as JSON")
+    group.addoption("--timing-openmetrics", metavar="PATH", type=Path,
+                    help="write the --timing report in OpenMetrics text format")
+
+
+class TimingPlugin:
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.recorder = Recorder()
+        self._instrumentation = _Instrumentation(self.recorder)
+        self._by_nodeid: dict[str, TimedTest] = {}
+
+    def _test(self, item: pytest.Item) -> TimedTest:
+        test = self._by_nodeid.get(item.nodeid)
+        if test is None:
+            names = {m.name for m in item.iter_markers()}
+            markers = [m for m in GROUP_MARKERS if m in names] or [UNMARKED]
+            test = self._by_nodeid[item.nodeid] = TimedTest(item.nodeid, markers)
+            self.recorder.tests.append(test)
+        return test
+
+    def _phase(self, item: pytest.Item, phase: str) -> Iterator[None]:
+        self.recorder.begin(self._test(item), phase)
+        try:
+            return (yield)
+        finally:
+            self.recorder.end()
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> Iterator[None]:
+        return (yield from self._phase(item, "setup"))
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item) -> Iterator[None]:
+        return (yield from self._phase(item, "call"))
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(self, item: pytest.Item) -> Iterator[None]:
+        return (yield from self._phase(item, "teardown"))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        test = self._by_nodeid.get(report.nodeid)
+        if test is None:
+            return
+        test.phases[report.when] = report.duration
+        if report.failed:
+            test.outcome = "failed" if report.when == "call" else "error"
+        elif report.skipped and test.outcome == "passed":
+            test.outcome = "xfailed" if hasattr(report, "wasxfail") else "skipped"
+
+    def pytest_sessionstart(self) -> None:
+        self._instrumentation.install()
+
+    def pytest_sessionfinish(self) -> None:
+        self._instrumentation.uninstall()
+        self.recorder.finish()
+        json_path = self.config.getoption("timing_json")
+        if json_path:
+            json_path.write_text(json.dumps(self.recorder.to_json(), indent=2) + "\n")
+        metrics_path = self.config.getoption("timing_openmetrics")
+        if metrics_path:
+            metrics_path.write_text(to_openmetrics(self.recorder))
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.config.getoption("timing"):
+            return
+        write = terminalreporter.write_line
+        terminalreporter.write_sep("=", "timing")
+        write(f"{'wall':<40} {self.recorder.wall:9.3f}s")
+        for marker, a in sorted(self.recorder.by_marker().items(),
+                                key=lambda kv: -kv[1].seconds):
+            write(f"{'marker ' + marker:<40} {a.seconds:9.3f}s  {a.calls:5d} tests")
+        for category, a in sorted(self.recorder.by_category().items(),
+                                  key=lambda kv: -kv[1].seconds):
+            write(f"{category:<40} {a.seconds:9.3f}s  {a.calls:5d} calls")
+        slowest = sorted(self.recorder.tests, key=lambda t: -t.duration)[:10]
+        if slowest:
+            write("slowest tests:")
+        for test in slowest:
+            write(f"  {test.duration:8.3f}s  {test.nodeid}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if any(config.getoption(name) for name in ("timing", "timing_json", "timing_openmetrics")):
+        config.pluginmanager.register(TimingPlugin(config), "jade-timing")
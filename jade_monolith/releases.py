@@ -0,0 +1,202 @@
+"""Claude Code release metadata from the npm registry, cached on disk.
+
+``npm view @anthropic-ai/claude-code version`` costs a Node startup plus a
+registry round trip, several seconds, every time it is asked.  ReleaseSource
+fetches the package's dist-tags document once and keeps it in the cache
+directory with its ETag:
+
+  fresher than the TTL     answered from disk, no network
+  older than the TTL       revalidated with If-None-Match (a 304 has no body)
+  registry unreachable     the last cached answer, however old
+  offline                  the cached answer only; never touches the network
+
+``JADE_NPM_REGISTRY`` points lookups at another registry (a mirror, or
+jade_monolith.fakes.registry in tests); ``JADE_OFFLINE=1`` forces offline mode.
+
+Run with:  python -m jade_monolith.releases [--tag latest] [--offline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from .cache import atomic_write_bytes, cache_dir
+from .http import HTTPClient, HTTPError
+
+REGISTRY = "https://registry.npmjs.org"
+PACKAGE = "@anthropic-ai/claude-code"
+DEFAULT_TTL = 3600.0
+DEFAULT_TIMEOUT = 10.0
+REGISTRY_ENV = "JADE_NPM_REGISTRY"
+OFFLINE_ENV = "JADE_OFFLINE"
+_CACHE_FILENAME = "npm-releases.json"
+
+
+class ReleaseLookupError(Exception):
+    """No release metadata could be fetched and none was cached."""
+
+
+@dataclass
+class ReleaseInfo:
+    package: str
+    dist_tags: dict[str, str]
+    fetched: float  # when the registry last confirmed this document
+    source: str     # "cache", "network", "revalidated" or "stale"
+
+    @property
+    def latest(self) -> str | None:
+        return self.dist_tags.get("latest")
+
+
+def _env_offline() -> bool:
+    return os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+
+
+class ReleaseSource:
+    """dist-tags lookups against one registry, through a TTL + ETag disk cache."""
+
+    def __init__(
+        self,
+        registry: str | None = None,
+        *,
+        ttl: float = DEFAULT_TTL,
+        offline: bool | None = None,
+        path: Path | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.registry = (registry or os.environ.get(REGISTRY_ENV) or REGISTRY).rstrip("/")
+        self.ttl = ttl
+        self.offline = _env_offline() if offline is None else offline
+        self.timeout = timeout
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = cache_dir() / _CACHE_FILENAME
+        return self._path
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, key: str, entry: dict[str, Any]) -> None:
+        entries = self._read()  # re-read: another process may have added entries
+        entries[key] = entry
+        with contextlib.suppress(OSError):
+            atomic_write_bytes(self.path, json.dumps(entries, indent=2).encode())
+
+    def url(self, package: str) -> str:
+        return f"{self.registry}/-/package/{quote(package, safe='@')}/dist-tags"
+
+    async def _fetch(self, url: str, etag: str | None) -> tuple[int, str | None, bytes]:
+        headers = {"Accept": "application/json"}
+        if etag:
+            headers["If-None-Match"] = etag
+        async with HTTPClient(timeout=self.timeout) as client:
+            response = await client.request("GET", url, headers=headers)
+        return response.status, response.headers.get("etag"), response.body
+
+    def dist_tags(self, package: str = PACKAGE, *, max_age: float | None = None) -> ReleaseInfo:
+        """Synchronous wrapper around fetch_dist_tags() for fixtures and scripts."""
+        return asyncio.run(self.fetch_dist_tags(package, max_age=max_age))
+
+    async def fetch_dist_tags(
+        self, package: str = PACKAGE, *, max_age: float | None = None,
+    ) -> ReleaseInfo:
+        """The package's dist-tags, from cache when fresher than ``max_age`` (default TTL).
+
+        Awaitable from a running event loop, where dist_tags() cannot be used.
+        """
+        url = self.url(package)
+        entry = self._read().get(url)
+        max_age = self.ttl if max_age is None else max_age
+
+        def cached(source: str) -> ReleaseInfo:
+            return ReleaseInfo(package, entry["dist_tags"], entry["fetched"], source)
+
+        if entry is not None and (self.offline or time.time() - entry["fetched"] < max_age):
+            return cached("cache")
+        if self.offline:
+            raise ReleaseLookupError(f"{package}: offline and no cached release metadata")
+
+        try:
+            status, etag, body = await self._fetch(url, entry.get("etag") if entry else None)
+        except HTTPError as e:
+            if entry is not None:
+                return cached("stale")
+            raise ReleaseLookupError(f"{package}: {e}") from e
+
+        if status == 304 and entry is not None:
+            entry["fetched"] = time.time()
+            self._store(url, entry)
+            return cached("revalidated")
+        if status != 200:
+            if entry is not None:
+                return cached("stale")
+            raise ReleaseLookupError(f"{package}: registry answered HTTP {status}")
+        try:
+            tags = json.loads(body)
+        except ValueError as e:
+            raise ReleaseLookupError(f"{package}: malformed dist-tags document") from e
+        entry = {"fetched": time.time(), "etag": etag, "dist_tags": tags}
+        self._store(url, entry)
+        return cached("network")
+
+
+def latest_release(package: str = PACKAGE, **kwargs: Any) -> str | None:
+    """The ``latest`` dist-tag of ``package``; see ReleaseSource for the options."""
+    return ReleaseSource(**kwargs).dist_tags(package).latest
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.releases",
+                                     description="cached npm dist-tag lookup")
+    parser.add_argument("package", nargs="?", default=PACKAGE)
+    parser.add_argument("--tag", default="latest")
+    parser.add_argument("--registry", help=f"registry base URL (default: ${REGISTRY_ENV} "
+                                           f"or {REGISTRY})")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_TTL,
+                        help="serve the cached answer if younger than this many seconds")
+    parser.add_argument("--offline", action="store_true", default=None,
+                        help="answer from the cache only")
+    parser.add_argument("--json", action="store_true", help="print the dist-tags document")
+    args = parser.parse_args(argv)
+
+    source = ReleaseSource(args.registry, ttl=args.max_age, offline=args.offline)
+    try:
+        info = source.dist_tags(args.package)
+    except ReleaseLookupError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps({"package": info.package, "dist-tags": info.dist_tags,
+                          "fetched": info.fetched, "source": info.source}))
+        return 0
+    version = info.dist_tags.get(args.tag)
+    if version is None:
+        print(f"error: {args.package} has no dist-tag {args.tag!r}", file=sys.stderr)
+        return 1
+    print(version)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
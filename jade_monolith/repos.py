@@ -0,0 +1,26 @@
+"""The jadecli repositories the ecosystem scripts report on."""
+
+from __future__ import annotations
+
+ORG = "jadecli"
+
+REPOS: tuple[str, ...] = (
+    "claude-objects",
+    "dotfiles",
+    "jade-claude-settings",
+    "jade-cli",
+    "jade-dev-assist",
+    "jade-docker",
+    "jade-ecosystem-assist",
+    "jade-ide",
+    "jade-index",
+    "jade-monolith",
+    "jade-swarm",
+    "jadecli-codespaces",
+    "jadecli-infra",
+    "jadecli-roadmap-and-architecture",
+    "jadeflow-dev-scaffold",
+)
+
+# Open issues or PRs in these repos mark the ecosystem as degraded.
+CORE_REPOS: frozenset[str] = frozenset(REPOS) - {"jadeflow-dev-scaffold"}
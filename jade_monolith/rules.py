@@ -0,0 +1,427 @@
+"""Agent schema and smoke rules as plain functions — the one implementation.
+
+Each rule is the check behind one test in ``tests/test_agent_schema.py``,
+``tests/test_team_smoke.py`` or ``tests/test_version_compat.py``: the test
+calls the rule and fails with its messages, and the rule is registered under
+that test's node id, so reports from the watch mode, smoke runner and other
+runners line up with pytest output.  Change a check here, never in the test.
+
+Rules come in four scopes:
+
+  agent     check(agent) for one parsed agent dict (see jade_monolith.agents)
+  team      check(index) across the whole catalogue, given as an AgentIndex
+  settings  check(settings) for the parsed .claude/settings.json
+  repo      check(root) for the files around the catalogue (docs)
+
+Every check returns a list of failure messages; an empty list means it passed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .footprint import budget_problem
+from .index import DECLARED, DISALLOWED, EFFECTIVE, AgentIndex, tool_list
+
+# --------------------------------------------------------------------------- #
+# Claude Code known tool/model/mode contracts (update when Claude Code ships  #
+# breaking changes — the compat tests will catch drift automatically).        #
+# tests/conftest.py re-exports these for the pytest suite.                    #
+# --------------------------------------------------------------------------- #
+
+KNOWN_TOOLS: set[str] = {
+    # Core read
+    "Read", "Glob", "Grep",
+    # Core write
+    "Write", "Edit", "NotebookEdit",
+    # Execution
+    "Bash",
+    # Web
+    "WebSearch", "WebFetch",
+    # Task / subagent
+    "Task",
+    # Agent Teams task management
+    "TaskCreate", "TaskList", "TaskUpdate", "TaskGet",
+    # User interaction
+    "AskUserQuestion",
+    # MCP tools are dynamic — validated separately
+}
+
+KNOWN_MODELS: set[str] = {"opus", "sonnet", "haiku", "inherit"}
+
+KNOWN_PERMISSION_MODES: set[str] = {
+    "default", "acceptEdits", "dontAsk", "bypassPermissions", "plan",
+}
+
+REQUIRED_FRONTMATTER_FIELDS: set[str] = {"name", "description"}
+
+# The four-agent team checked by TestTeamCompleteness.
+TEAM: dict[str, dict[str, Any]] = {
+    "architect": {"readonly": True, "model": "opus"},
+    "implementer": {"readonly": False, "model": "opus"},
+    "test-writer": {"readonly": False, "model": "opus"},
+    "reviewer": {"readonly": True, "model": "opus"},
+}
+
+WRITE_TOOLS = frozenset({"Write", "Edit", "NotebookEdit"})
+TASK_TOOLS = frozenset({"TaskCreate", "TaskList", "TaskUpdate", "TaskGet"})
+WEB_TOOLS = frozenset({"WebSearch", "WebFetch"})
+
+SCHEMA = "tests/test_agent_schema.py"
+SMOKE = "tests/test_team_smoke.py"
+COMPAT = "tests/test_version_compat.py"
+
+# Node id reported when an agent file cannot be parsed at all.
+PARSE_RULE = f"{SMOKE}::TestFileIntegrity::test_agent_files_have_valid_yaml"
+
+
+@dataclass(frozen=True)
+class Rule:
+    nodeid: str
+    scope: str
+    check: Callable[[Any], list[str]]
+
+
+RULES: list[Rule] = []
+
+
+def _rule(nodeid: str, scope: str) -> Callable[[Callable], Callable]:
+    def register(check: Callable[[Any], list[str]]) -> Callable[[Any], list[str]]:
+        RULES.append(Rule(nodeid, scope, check))
+        return check
+    return register
+
+
+def rules_for(scope: str) -> list[Rule]:
+    return [rule for rule in RULES if rule.scope == scope]
+
+
+def _tool_entries(value: Any) -> list[Any]:
+    # Entries as written, blanks and non-strings included, so the "known"
+    # rules report them instead of dropping them.
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(",")]
+    return list(value or [])
+
+
+def _tools(agent: dict, field: str = "tools") -> set[str]:
+    # Parsed exactly as AgentIndex parses them, so both paths agree.
+    return set(tool_list(agent.get(field)))
+
+
+def _fname(agent: dict) -> str:
+    return Path(agent["_path"]).name
+
+
+# --------------------------------------------------------------------------- #
+# Per-agent rules                                                              #
+# --------------------------------------------------------------------------- #
+
+
+@_rule(PARSE_RULE, "agent")
+def has_frontmatter(agent: dict) -> list[str]:
+    if not agent.get("_has_frontmatter", True):
+        return [f"{_fname(agent)}: must have YAML frontmatter delimited by ---"]
+    return []
+
+
+@_rule(f"{SMOKE}::TestFileIntegrity::test_no_trailing_whitespace_in_agent_names", "agent")
+def name_has_no_whitespace(agent: dict) -> list[str]:
+    name = agent.get("name", "")
+    if isinstance(name, str) and name != name.strip():
+        return [f"{_fname(agent)}: agent name has trailing whitespace: '{name}'"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestFrontmatterSchema::test_has_yaml_frontmatter", "agent")
+def has_name(agent: dict) -> list[str]:
+    if "name" not in agent:
+        return [f"{_fname(agent)}: missing YAML frontmatter (no 'name' field)"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestFrontmatterSchema::test_required_fields_present", "agent")
+def required_fields_present(agent: dict) -> list[str]:
+    return [
+        f"{_fname(agent)}: missing required field '{field}'"
+        for field in sorted(REQUIRED_FRONTMATTER_FIELDS)
+        if field not in agent
+    ]
+
+
+@_rule(f"{SCHEMA}::TestFrontmatterSchema::test_name_matches_filename", "agent")
+def name_matches_filename(agent: dict) -> list[str]:
+    stem = Path(agent["_path"]).stem
+    if agent.get("name") != stem:
+        return [f"{_fname(agent)}: name '{agent.get('name')}' != filename stem '{stem}'"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestFrontmatterSchema::test_description_is_nonempty_string", "agent")
+def description_is_nonempty(agent: dict) -> list[str]:
+    desc = agent.get("description", "")
+    if not (isinstance(desc, str) and len(desc.strip()) > 10):
+        return [f"{_fname(agent)}: description must be a meaningful string (>10 chars)"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestFrontmatterSchema::test_model_is_valid", "agent")
+def model_is_valid(agent: dict) -> list[str]:
+    model = agent.get("model")
+    if model is not None and model not in KNOWN_MODELS:
+        return [f"{_fname(agent)}: model '{model}' not in {KNOWN_MODELS}"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestFrontmatterSchema::test_permission_mode_is_valid", "agent")
+def permission_mode_is_valid(agent: dict) -> list[str]:
+    mode = agent.get("permissionMode")
+    if mode is not None and mode not in KNOWN_PERMISSION_MODES:
+        return [
+            f"{_fname(agent)}: permissionMode '{mode}' not in {KNOWN_PERMISSION_MODES}"
+        ]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestToolPermissions::test_tools_are_known", "agent")
+def tools_are_known(agent: dict) -> list[str]:
+    unknown = set(_tool_entries(agent.get("tools", []))) - KNOWN_TOOLS
+    if unknown:
+        return [
+            f"{_fname(agent)}: unknown tools {unknown}. "
+            f"Update KNOWN_TOOLS in jade_monolith/rules.py if Claude Code added new tools."
+        ]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestToolPermissions::test_disallowed_tools_are_known", "agent")
+def disallowed_tools_are_known(agent: dict) -> list[str]:
+    unknown = set(_tool_entries(agent.get("disallowedTools", []))) - KNOWN_TOOLS
+    if unknown:
+        return [
+            f"{_fname(agent)}: unknown disallowedTools {unknown}. "
+            f"Update KNOWN_TOOLS in jade_monolith/rules.py if Claude Code added new tools."
+        ]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestToolPermissions::test_no_tool_in_both_allowed_and_disallowed", "agent")
+def no_tool_both_allowed_and_disallowed(agent: dict) -> list[str]:
+    overlap = _tools(agent) & _tools(agent, "disallowedTools")
+    if overlap:
+        return [f"{_fname(agent)}: tools in BOTH allowed and disallowed: {overlap}"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestToolPermissions::test_readonly_agents_cannot_write", "agent")
+def readonly_cannot_write(agent: dict) -> list[str]:
+    desc = (agent.get("description") or "").lower()
+    if "read-only" not in desc and "read only" not in desc:
+        return []
+    tools = _tools(agent)
+    disallowed = _tools(agent, "disallowedTools")
+    unblocked = (tools & WRITE_TOOLS) - (disallowed & WRITE_TOOLS)
+    if unblocked:
+        return [
+            f"{_fname(agent)}: described as read-only but has unblocked write tools: "
+            f"{unblocked}"
+        ]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestAgentBody::test_body_is_nonempty", "agent")
+def body_is_nonempty(agent: dict) -> list[str]:
+    if len(agent["_body"]) <= 50:
+        return [f"{_fname(agent)}: system prompt body is too short (<50 chars)"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestAgentBody::test_body_contains_responsibilities", "agent")
+def body_contains_responsibilities(agent: dict) -> list[str]:
+    body = agent["_body"].lower()
+    if "responsibilit" not in body and "workflow" not in body:
+        return [f"{_fname(agent)}: body should contain 'Responsibilities' or 'Workflow' section"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestAgentBody::test_body_contains_constraints", "agent")
+def body_contains_constraints(agent: dict) -> list[str]:
+    body = agent["_body"].lower()
+    if "constraint" not in body and "must not" not in body:
+        return [f"{_fname(agent)}: body should contain 'Constraints' or 'MUST NOT' rules"]
+    return []
+
+
+@_rule(f"{SCHEMA}::TestAgentBody::test_prompt_within_token_budget", "agent")
+def prompt_within_token_budget(agent: dict) -> list[str]:
+    problem = budget_problem(agent)
+    return [problem] if problem else []
+
+
+# --------------------------------------------------------------------------- #
+# Team rules                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+@_rule(f"{SCHEMA}::TestAgentDiscovery::test_at_least_one_agent_defined", "team")
+def at_least_one_agent(index: AgentIndex) -> list[str]:
+    return [] if len(index) else ["No agent .md files found in .claude/agents/"]
+
+
+@_rule(f"{SCHEMA}::TestAgentDiscovery::test_expected_team_agents_exist", "team")
+def expected_team_agents_exist(index: AgentIndex) -> list[str]:
+    missing = {f"{name}.md" for name in TEAM.keys() - index.stems}
+    return [f"Missing team agents: {missing}"] if missing else []
+
+
+@_rule(f"{SMOKE}::TestTeamCompleteness::test_all_four_agents_defined", "team")
+def all_four_agents_defined(index: AgentIndex) -> list[str]:
+    return [f"Missing agent definition: {name}.md" for name in TEAM if name not in index.stems]
+
+
+@_rule(
+    f"{SMOKE}::TestTeamCompleteness::test_readonly_agents_have_correct_disallowed_tools",
+    "team",
+)
+def readonly_agents_disallow_writes(index: AgentIndex) -> list[str]:
+    problems = []
+    for name, spec in TEAM.items():
+        agent = index.for_file(name)
+        if (spec["readonly"] and agent is not None
+                and not index.has_all(agent, WRITE_TOOLS, DISALLOWED)):
+            problems.append(
+                f"{name}: read-only agent must disallow {set(WRITE_TOOLS)}, "
+                f"has {index.tools(agent, DISALLOWED)}"
+            )
+    return problems
+
+
+@_rule(f"{SMOKE}::TestTeamCompleteness::test_writable_agents_have_write_tools", "team")
+def writable_agents_have_write_tools(index: AgentIndex) -> list[str]:
+    problems = []
+    for name, spec in TEAM.items():
+        agent = index.for_file(name)
+        if (not spec["readonly"] and agent is not None
+                and not index.has_all(agent, {"Write", "Edit"}, DECLARED)):
+            problems.append(f"{name}: writable agent must have Write and Edit tools")
+    return problems
+
+
+@_rule(f"{SMOKE}::TestTeamCompleteness::test_all_agents_use_expected_model", "team")
+def team_uses_expected_model(index: AgentIndex) -> list[str]:
+    problems = []
+    for name, spec in TEAM.items():
+        agent = index.for_file(name)
+        if agent is not None:
+            model = agent.get("model", "inherit")
+            if model != spec["model"]:
+                problems.append(f"{name}: expected model '{spec['model']}', got '{model}'")
+    return problems
+
+
+@_rule(f"{COMPAT}::TestAgentTeamWorkflow::test_all_agents_have_read_access", "team")
+def has_read_access(index: AgentIndex) -> list[str]:
+    lacking = index.all & ~index.agents_with_all({"Read"}, EFFECTIVE)
+    return [f"{agent.get('name')}: every agent must have Read tool access"
+            for agent in index.members(lacking)]
+
+
+@_rule(f"{COMPAT}::TestAgentTeamWorkflow::test_all_agents_have_task_tools", "team")
+def has_task_tools(index: AgentIndex) -> list[str]:
+    lacking = index.all & ~index.agents_with_all(TASK_TOOLS, EFFECTIVE)
+    return [f"{agent.get('name')}: missing task coordination tools "
+            f"{set(TASK_TOOLS - index.tools(agent))}"
+            for agent in index.members(lacking)]
+
+
+@_rule(f"{COMPAT}::TestAgentTeamWorkflow::test_no_agent_has_web_and_write", "team")
+def no_web_and_write(index: AgentIndex) -> list[str]:
+    both = index.agents_with_any(WEB_TOOLS, EFFECTIVE) & index.agents_with_any(
+        {"Write", "Edit"}, EFFECTIVE)
+    problems = []
+    for agent in index.members(both):
+        tools = index.tools(agent)
+        problems.append(
+            f"{agent.get('name')}: has both web access ({tools & WEB_TOOLS}) and write "
+            f"access ({tools & {'Write', 'Edit'}}). This is a prompt injection risk."
+        )
+    return problems
+
+
+def _role_rule(
+    role: str, kind: str, required: frozenset[str], message: str,
+) -> Callable[[AgentIndex], list[str]]:
+    def rule(index: AgentIndex) -> list[str]:
+        agent = index.get(role)
+        if agent is None:
+            return [f"{role} agent not found"]
+        return [] if index.has_all(agent, required, kind) else [message]
+
+    test = "is_readonly" if kind == DISALLOWED else "can_write"
+    rule.__name__ = f"{role.replace('-', '_')}_{test}"
+    nodeid = f"{COMPAT}::TestAgentTeamWorkflow::test_{rule.__name__}"
+    return _rule(nodeid, "team")(rule)
+
+
+architect_is_readonly = _role_rule(
+    "architect", DISALLOWED, WRITE_TOOLS, "architect must disallow Write, Edit, NotebookEdit")
+reviewer_is_readonly = _role_rule(
+    "reviewer", DISALLOWED, WRITE_TOOLS, "reviewer must disallow Write, Edit, NotebookEdit")
+implementer_can_write = _role_rule(
+    "implementer", DECLARED, frozenset({"Write", "Edit"}),
+    "implementer must have Write and Edit tools")
+test_writer_can_write = _role_rule(
+    "test-writer", DECLARED, frozenset({"Write", "Edit"}),
+    "test-writer must have Write and Edit tools")
+
+
+# --------------------------------------------------------------------------- #
+# Settings rules                                                               #
+# --------------------------------------------------------------------------- #
+
+SETTINGS_RULE = f"{SMOKE}::TestFileIntegrity::test_settings_json_is_valid"
+
+
+@_rule(SETTINGS_RULE, "settings")
+def settings_is_object(settings: Any) -> list[str]:
+    return [] if isinstance(settings, dict) else ["settings.json root must be an object"]
+
+
+# --------------------------------------------------------------------------- #
+# Repository rules                                                             #
+# --------------------------------------------------------------------------- #
+
+AGENTS_DIR = Path(".claude") / "agents"
+TEAM_SETUP_DOC = Path("docs") / "team-setup.md"
+API_USAGE_DOC = Path("docs") / "api-usage.md"
+
+
+@_rule(f"{SCHEMA}::TestAgentDiscovery::test_agents_directory_exists", "repo")
+def agents_directory_exists(root: Path) -> list[str]:
+    agents_dir = root / AGENTS_DIR
+    return [] if agents_dir.is_dir() else [f"Missing directory: {agents_dir}"]
+
+
+@_rule(f"{SMOKE}::TestDocumentation::test_team_setup_doc_exists", "repo")
+def team_setup_doc_exists(root: Path) -> list[str]:
+    return [] if (root / TEAM_SETUP_DOC).exists() else ["docs/team-setup.md missing"]
+
+
+@_rule(f"{SMOKE}::TestDocumentation::test_team_setup_references_all_agents", "repo")
+def team_setup_references_all_agents(root: Path) -> list[str]:
+    try:
+        content = (root / TEAM_SETUP_DOC).read_text().lower()
+    except FileNotFoundError:
+        return []  # skipped in pytest; reported by the rule above
+    return [
+        f"docs/team-setup.md missing reference to '{agent}'"
+        for agent in TEAM if agent not in content
+    ]
+
+
+@_rule(f"{SMOKE}::TestDocumentation::test_api_usage_doc_exists", "repo")
+def api_usage_doc_exists(root: Path) -> list[str]:
+    return [] if (root / API_USAGE_DOC).exists() else ["docs/api-usage.md missing"]
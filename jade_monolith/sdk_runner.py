@@ -0,0 +1,327 @@
+"""Run the agent definitions directly against the Anthropic Messages API.
+
+The API-side counterpart of ``claude -p --agent``: an agent's markdown body
+becomes the system prompt, its ``model`` frontmatter picks the model.
+
+- Agent files go through the shared AgentLoader (jade_monolith.agents), so
+  each is parsed once per process and re-read only when it changes.
+- Every call goes through one pooled HTTPClient: fifty reviews cost one TLS
+  handshake per pooled connection, not fifty.
+- The agent instructions are sent as a ``cache_control`` prompt prefix.  The
+  same agent's instructions are then billed as cache reads (a tenth of the
+  input price) on every call after the first within the cache lifetime.
+  Prompts shorter than the model's minimum cacheable length are simply not
+  cached.
+- Batch mode submits many jobs (e.g. one reviewer job per diff) as a single
+  Message Batch, at half the per-token price.  Results are streamed back from
+  the results file line by line as they arrive.
+
+The standard library is all it needs: no SDK install on CI runners.  Point
+``ANTHROPIC_BASE_URL`` at jade_monolith.fakes.anthropic to run offline.
+
+Run with:  python -m jade_monolith.sdk_runner run reviewer "Review this diff: ..."
+           python -m jade_monolith.sdk_runner batch jobs.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .agents import AgentParseError, load_agent
+from .http import HTTPClient, HTTPError
+
+API_URL = "https://api.anthropic.com"
+API_VERSION = "2023-06-01"
+DEFAULT_MODEL = "sonnet"
+DEFAULT_MAX_TOKENS = 16384
+DEFAULT_POLL_INTERVAL = 30.0
+AGENTS_DIR = Path(".claude/agents")
+
+# Agent frontmatter model names -> API model ids (see docs/api-usage.md).
+MODEL_MAP = {
+    "opus": "claude-opus-4-6",
+    "sonnet": "claude-sonnet-4-5-20250929",
+    "haiku": "claude-haiku-4-5-20251001",
+}
+
+_CUSTOM_ID = re.compile(r"^[a-zA-Z0-9_-]{1,64}$")
+
+
+class APIError(Exception):
+    """The API rejected a request, or could not be reached."""
+
+
+@dataclass(frozen=True)
+class Job:
+    """One agent invocation; ``custom_id`` names its result in a batch."""
+
+    custom_id: str
+    agent: str
+    task: str
+    model: str | None = None  # overrides the agent's frontmatter
+    max_tokens: int | None = None
+
+
+@dataclass
+class Completion:
+    custom_id: str
+    text: str = ""
+    model: str = ""
+    stop_reason: str | None = None
+    usage: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @classmethod
+    def from_message(cls, custom_id: str, message: dict[str, Any]) -> Completion:
+        text = "".join(block.get("text", "") for block in message.get("content", [])
+                       if block.get("type") == "text")
+        return cls(custom_id, text, message.get("model", ""), message.get("stop_reason"),
+                   dict(message.get("usage") or {}))
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _error_message(status: int, body: bytes) -> str:
+    try:
+        error = json.loads(body)["error"]
+        return f"HTTP {status} {error['type']}: {error['message']}"
+    except (ValueError, KeyError, TypeError):
+        return f"HTTP {status}: {body[:200]!r}"
+
+
+class AgentRunner:
+    """Run agents from ``agents_dir`` through one pooled API client.
+
+    Use as ``async with AgentRunner() as runner``.  ``api_key`` and
+    ``base_url`` default to ``ANTHROPIC_API_KEY`` and ``ANTHROPIC_BASE_URL``.
+    """
+
+    def __init__(
+        self,
+        agents_dir: Path = AGENTS_DIR,
+        *,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        client: HTTPClient | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        cache_prompts: bool = True,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.agents_dir = Path(agents_dir)
+        api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise APIError("ANTHROPIC_API_KEY is not set")
+        self.base_url = (base_url or os.environ.get("ANTHROPIC_BASE_URL") or API_URL).rstrip("/")
+        self.max_tokens = max_tokens
+        self.cache_prompts = cache_prompts
+        self.poll_interval = poll_interval
+        self.headers = {"x-api-key": api_key, "anthropic-version": API_VERSION,
+                        "Content-Type": "application/json"}
+        self._owns_client = client is None
+        self.client = client or HTTPClient(timeout=600.0)
+
+    async def __aenter__(self) -> AgentRunner:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self.client.close()
+
+    # -- requests ---------------------------------------------------------- #
+
+    def agent(self, name: str) -> dict[str, Any]:
+        """The parsed definition of agent ``name``; raises APIError if it is missing."""
+        try:
+            return load_agent(self.agents_dir / f"{name}.md")
+        except FileNotFoundError:
+            raise APIError(f"unknown agent {name!r} (no {self.agents_dir}/{name}.md)") from None
+        except AgentParseError as e:
+            raise APIError(f"agent {name!r}: {e}") from e
+
+    def params(self, job: Job) -> dict[str, Any]:
+        """Messages API parameters for ``job``."""
+        agent = self.agent(job.agent)
+        model = job.model or agent.get("model") or DEFAULT_MODEL
+        if model == "inherit":
+            model = DEFAULT_MODEL
+        system: dict[str, Any] = {"type": "text", "text": agent["_body"].strip()}
+        if self.cache_prompts:
+            system["cache_control"] = {"type": "ephemeral"}
+        return {
+            "model": MODEL_MAP.get(model, model),
+            "max_tokens": job.max_tokens or self.max_tokens,
+            "system": [system],
+            "messages": [{"role": "user", "content": job.task}],
+        }
+
+    async def _call(self, method: str, url: str, payload: Any = None) -> dict[str, Any]:
+        body = None if payload is None else json.dumps(payload).encode()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, body=body)
+        except HTTPError as e:
+            raise APIError(str(e)) from e
+        if not response.ok:
+            raise APIError(f"{method} {url}: {_error_message(response.status, response.body)}")
+        return response.json()
+
+    async def run(self, agent: str, task: str, *, model: str | None = None,
+                  max_tokens: int | None = None) -> Completion:
+        """Run one agent on ``task`` and return its reply."""
+        job = Job(agent, agent, task, model, max_tokens)
+        message = await self._call("POST", f"{self.base_url}/v1/messages", self.params(job))
+        return Completion.from_message(job.custom_id, message)
+
+    # -- batches ----------------------------------------------------------- #
+
+    async def submit_batch(self, jobs: Iterable[Job]) -> dict[str, Any]:
+        """Create one Message Batch for ``jobs``; returns the batch object."""
+        requests, seen = [], set()
+        for job in jobs:
+            if not _CUSTOM_ID.match(job.custom_id) or job.custom_id in seen:
+                raise APIError(f"invalid or duplicate custom_id {job.custom_id!r}")
+            seen.add(job.custom_id)
+            requests.append({"custom_id": job.custom_id, "params": self.params(job)})
+        if not requests:
+            raise APIError("a batch needs at least one job")
+        return await self._call("POST", f"{self.base_url}/v1/messages/batches",
+                                {"requests": requests})
+
+    async def wait_batch(self, batch: dict[str, Any]) -> dict[str, Any]:
+        """Poll until ``batch`` has ended; returns the final batch object."""
+        while batch.get("processing_status") != "ended":
+            await asyncio.sleep(self.poll_interval)
+            batch = await self._call("GET", f"{self.base_url}/v1/messages/batches/{batch['id']}")
+        return batch
+
+    async def batch_results(self, batch: dict[str, Any]) -> AsyncIterator[Completion]:
+        """Yield the results of an ended batch as the results file streams in.
+
+        Results come in no particular order; match them up by ``custom_id``.
+        """
+        url = batch.get("results_url")
+        if not url:
+            raise APIError(f"batch {batch.get('id')} has no results yet")
+        try:
+            async for line in self.client.lines("GET", url, headers=self.headers):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                result = entry["result"]
+                if result["type"] == "succeeded":
+                    yield Completion.from_message(entry["custom_id"], result["message"])
+                else:
+                    error = result.get("error", {}).get("error", {})
+                    yield Completion(entry["custom_id"],
+                                     error=error.get("message") or result["type"])
+        except HTTPError as e:
+            raise APIError(str(e)) from e
+
+    async def run_batch(self, jobs: Iterable[Job]) -> AsyncIterator[Completion]:
+        """Submit ``jobs`` as one batch, wait for it, and stream the results."""
+        batch = await self.wait_batch(await self.submit_batch(jobs))
+        async for completion in self.batch_results(batch):
+            yield completion
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def read_jobs(lines: Iterable[str], agent: str | None = None) -> list[Job]:
+    """Parse a JSONL job file: ``{"custom_id", "task", "agent"?, "model"?, "max_tokens"?}``."""
+    jobs = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            jobs.append(Job(entry["custom_id"], entry.get("agent") or agent, entry["task"],
+                            entry.get("model"), entry.get("max_tokens")))
+        except (ValueError, KeyError, TypeError) as e:
+            raise APIError(f"line {number}: {type(e).__name__}: {e}") from None
+        if not jobs[-1].agent:
+            raise APIError(f"line {number}: no agent (pass --agent or set it per job)")
+    return jobs
+
+
+def _usage_line(completion: Completion) -> str:
+    usage = completion.usage
+    return (f"# {completion.model}: input={usage.get('input_tokens', 0)} "
+            f"cache_write={usage.get('cache_creation_input_tokens', 0)} "
+            f"cache_read={usage.get('cache_read_input_tokens', 0)} "
+            f"output={usage.get('output_tokens', 0)}")
+
+
+async def _main(args: argparse.Namespace) -> int:
+    async with AgentRunner(args.agents_dir, base_url=args.base_url, max_tokens=args.max_tokens,
+                           cache_prompts=not args.no_cache,
+                           poll_interval=args.poll_interval) as runner:
+        if args.command == "run":
+            task = sys.stdin.read() if args.task == "-" else args.task
+            completion = await runner.run(args.agent, task, model=args.model)
+            print(completion.text)
+            print(_usage_line(completion), file=sys.stderr)
+            return 0
+
+        if args.jobs == "-":
+            jobs = read_jobs(sys.stdin, args.agent)
+        else:
+            with open(args.jobs) as source:
+                jobs = read_jobs(source, args.agent)
+        batch = await runner.submit_batch(jobs)
+        print(f"# batch {batch['id']}: {len(jobs)} job(s) submitted", file=sys.stderr)
+        batch = await runner.wait_batch(batch)
+        failed = 0
+        async for completion in runner.batch_results(batch):
+            failed += not completion.ok
+            print(json.dumps(completion.to_json()), flush=True)
+        return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.sdk_runner")
+    parser.add_argument("--agents-dir", type=Path, default=AGENTS_DIR)
+    parser.add_argument("--base-url", help="API base URL (default: $ANTHROPIC_BASE_URL or "
+                                           f"{API_URL})")
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not mark agent instructions as a cacheable prefix")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="seconds between batch status checks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run one agent and print its reply")
+    run.add_argument("agent")
+    run.add_argument("task", help="the user message, or - to read it from stdin")
+    run.add_argument("--model", help="override the agent's model")
+    batch = sub.add_parser("batch", help="run a JSONL file of jobs as one batch, "
+                                         "printing results as JSONL as they stream in")
+    batch.add_argument("jobs", help="JSONL job file, or - for stdin")
+    batch.add_argument("--agent", help="agent for jobs that do not name one")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_main(args))
+    except (APIError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+"""Protocol-level probes for the Docker services behind the health check.
+
+An open port only proves that *something* is listening.  Each probe here
+connects and then speaks just enough of the service's own protocol to tell a
+ready server from a stray process, or from one that is still starting:
+
+  postgres   SSLRequest (upgrading to TLS when the server offers it), then a
+             StartupMessage; any authentication request (or a non-fatal
+             error such as an unknown role) means ready
+  mongodb    ``hello`` as an OP_MSG against ``admin``
+  dragonfly  Redis-protocol ``PING``; ``+PONG`` or ``-NOAUTH`` means ready
+
+All endpoints are probed concurrently, each bounded by its own timeout.
+Connect and handshake latencies are accumulated into per-service histograms
+on disk, so the health report can show tail latency and not just the last
+sample.
+
+Run with:  python -m jade_monolith.service_probe [--host HOST] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import ssl
+import struct
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .cache import atomic_write_bytes, cache_dir
+
+DEFAULT_SERVICES = {"postgres": 5432, "mongodb": 27017, "dragonfly": 6379}
+DEFAULT_TIMEOUT = 2.0
+HISTORY_FILENAME = "service-latency.json"
+# Upper bounds of the histogram buckets, in milliseconds; the last bucket is open.
+BUCKETS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2000.0)
+
+
+class ProbeError(Exception):
+    """The peer answered, but not like the expected service."""
+
+
+class NotReadyError(Exception):
+    """The service answered in its own protocol that it cannot serve yet."""
+
+
+# --------------------------------------------------------------------------- #
+# PostgreSQL                                                                   #
+# --------------------------------------------------------------------------- #
+
+PG_SSL_REQUEST = struct.pack("!ii", 8, 80877103)
+PG_PROTOCOL_3 = 196608
+# SQLSTATE classes meaning "up, but not accepting sessions": 53 insufficient
+# resources (too many connections), 57 operator intervention (starting up,
+# shutting down, in recovery).
+PG_NOT_READY_CLASSES = ("53", "57")
+
+
+def pg_startup_message(user: str, database: str) -> bytes:
+    params = f"user\0{user}\0database\0{database}\0\0".encode()
+    return struct.pack("!ii", 8 + len(params), PG_PROTOCOL_3) + params
+
+
+def pg_tls_context() -> ssl.SSLContext:
+    """TLS for the probe's own connection: readiness only, so no certificate check."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def pg_error_fields(payload: bytes) -> dict[str, str]:
+    """Fields of an ErrorResponse body, keyed by their one-letter type."""
+    fields = {}
+    for part in payload.split(b"\0"):
+        if part:
+            fields[chr(part[0])] = part[1:].decode(errors="replace")
+    return fields
+
+
+async def probe_postgres(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> str:
+    writer.write(PG_SSL_REQUEST)
+    await writer.drain()
+    answer = await reader.readexactly(1)
+    if answer == b"S":
+        # "S" only says the server supports TLS; readiness is still unproven
+        await writer.start_tls(pg_tls_context())
+    elif answer != b"N":
+        raise ProbeError(f"unexpected SSLRequest answer {answer!r}")
+    over = " over TLS" if answer == b"S" else ""
+    user = os.environ.get("PGUSER") or "postgres"
+    writer.write(pg_startup_message(user, os.environ.get("PGDATABASE") or user))
+    await writer.drain()
+    kind, length = struct.unpack("!ci", await reader.readexactly(5))
+    if not 4 <= length <= 1 << 16:
+        raise ProbeError(f"implausible message length {length}")
+    payload = await reader.readexactly(length - 4)
+    if kind == b"R":
+        return f"authentication requested{over}"
+    if kind == b"E":
+        error = pg_error_fields(payload)
+        code = error.get("C", "")
+        if code[:2] in PG_NOT_READY_CLASSES:
+            raise NotReadyError(f"{code} {error.get('M', '')}".strip())
+        return f"{code} {error.get('M', '')}{over}".strip()
+    raise ProbeError(f"unexpected startup reply {kind!r}")
+
+
+# --------------------------------------------------------------------------- #
+# MongoDB                                                                      #
+# --------------------------------------------------------------------------- #
+
+MONGO_OP_MSG = 2013
+_MAX_MONGO_MESSAGE = 16 * 1024 * 1024
+
+
+def _cstring(name: str) -> bytes:
+    return name.encode() + b"\0"
+
+
+def bson_encode(doc: dict[str, Any]) -> bytes:
+    """A BSON document of bool / int / float / str values."""
+    body = bytearray()
+    for key, value in doc.items():
+        if isinstance(value, bool):
+            body += b"\x08" + _cstring(key) + (b"\x01" if value else b"\x00")
+        elif isinstance(value, int):
+            body += b"\x10" + _cstring(key) + struct.pack("<i", value)
+        elif isinstance(value, float):
+            body += b"\x01" + _cstring(key) + struct.pack("<d", value)
+        elif isinstance(value, str):
+            data = value.encode() + b"\0"
+            body += b"\x02" + _cstring(key) + struct.pack("<i", len(data)) + data
+        else:
+            raise TypeError(f"cannot encode {type(value).__name__} for {key!r}")
+    return struct.pack("<i", len(body) + 5) + bytes(body) + b"\0"
+
+
+# type byte -> fixed payload size, for values skipped without decoding
+_BSON_FIXED = {0x07: 12, 0x09: 8, 0x0A: 0, 0x11: 8, 0x13: 16, 0x7F: 0, 0xFF: 0}
+
+
+def bson_decode(data: bytes) -> dict[str, Any]:
+    """Top-level scalar fields of a BSON document; nested documents are skipped."""
+    (total,) = struct.unpack_from("<i", data)
+    if total != len(data) or data[-1:] != b"\0":
+        raise ProbeError("malformed BSON document")
+    doc: dict[str, Any] = {}
+    pos = 4
+    while data[pos] != 0:
+        kind = data[pos]
+        end = data.index(b"\0", pos + 1)
+        key = data[pos + 1:end].decode()
+        pos = end + 1
+        if kind == 0x01:
+            (doc[key],) = struct.unpack_from("<d", data, pos)
+            pos += 8
+        elif kind == 0x02:
+            (size,) = struct.unpack_from("<i", data, pos)
+            doc[key] = data[pos + 4:pos + 3 + size].decode(errors="replace")
+            pos += 4 + size
+        elif kind in (0x03, 0x04):
+            (size,) = struct.unpack_from("<i", data, pos)
+            pos += size
+        elif kind == 0x05:
+            (size,) = struct.unpack_from("<i", data, pos)
+            pos += 5 + size
+        elif kind == 0x08:
+            doc[key] = data[pos] == 1
+            pos += 1
+        elif kind == 0x10:
+            (doc[key],) = struct.unpack_from("<i", data, pos)
+            pos += 4
+        elif kind == 0x12:
+            (doc[key],) = struct.unpack_from("<q", data, pos)
+            pos += 8
+        elif kind in _BSON_FIXED:
+            pos += _BSON_FIXED[kind]
+        else:
+            raise ProbeError(f"unsupported BSON type 0x{kind:02x} for {key!r}")
+    return doc
+
+
+def mongo_op_msg(doc: dict[str, Any], request_id: int, response_to: int = 0) -> bytes:
+    body = struct.pack("<I", 0) + b"\x00" + bson_encode(doc)  # flagBits, section kind 0
+    return struct.pack("<iiii", 16 + len(body), request_id, response_to, MONGO_OP_MSG) + body
+
+
+async def read_mongo_op_msg(reader: asyncio.StreamReader) -> tuple[int, dict[str, Any]]:
+    """One OP_MSG from ``reader``: (responseTo, the kind-0 body document)."""
+    length, _, response_to, opcode = struct.unpack("<iiii", await reader.readexactly(16))
+    if opcode != MONGO_OP_MSG or not 21 <= length <= _MAX_MONGO_MESSAGE:
+        raise ProbeError(f"not an OP_MSG reply (opcode {opcode}, length {length})")
+    body = await reader.readexactly(length - 16)
+    (flags,) = struct.unpack_from("<I", body)
+    if body[4] != 0:
+        raise ProbeError("OP_MSG reply does not start with a body section")
+    (size,) = struct.unpack_from("<i", body, 5)
+    if 5 + size > len(body) - (4 if flags & 1 else 0):
+        raise ProbeError("OP_MSG body section overruns the message")
+    return response_to, bson_decode(body[5:5 + size])
+
+
+async def probe_mongodb(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> str:
+    request_id = int(time.monotonic_ns() & 0x7FFFFFFF)
+    writer.write(mongo_op_msg({"hello": 1, "$db": "admin"}, request_id))
+    await writer.drain()
+    response_to, reply = await read_mongo_op_msg(reader)
+    if response_to != request_id:
+        raise ProbeError(f"reply is to request {response_to}, not {request_id}")
+    if reply.get("ok") != 1:
+        raise NotReadyError(str(reply.get("errmsg", "hello failed")))
+    role = "primary" if reply.get("isWritablePrimary") else "secondary"
+    return f"{role}, wire version {reply.get('maxWireVersion', '?')}"
+
+
+# --------------------------------------------------------------------------- #
+# Redis protocol (Dragonfly)                                                   #
+# --------------------------------------------------------------------------- #
+
+REDIS_PING = b"*1\r\n$4\r\nPING\r\n"
+
+
+async def probe_redis(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> str:
+    writer.write(REDIS_PING)
+    await writer.drain()
+    line = (await reader.readuntil(b"\r\n"))[:-2].decode(errors="replace")
+    if line == "+PONG":
+        return "PONG"
+    if line.startswith("-NOAUTH") or line.startswith("-WRONGPASS"):
+        return "authentication required"
+    if line.startswith("-LOADING") or line.startswith("-BUSY"):
+        raise NotReadyError(line[1:])
+    raise ProbeError(f"unexpected PING reply {line[:60]!r}")
+
+
+Handshake = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[str]]
+PROTOCOLS: dict[str, Handshake] = {
+    "postgres": probe_postgres,
+    "mongodb": probe_mongodb,
+    "dragonfly": probe_redis,
+}
+
+
+# --------------------------------------------------------------------------- #
+# Probing                                                                      #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class ProbeResult:
+    service: str
+    ok: bool
+    connect_ms: float | None = None  # None: never connected
+    handshake_ms: float | None = None  # None: no complete handshake
+    detail: str = ""
+    error: str | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+async def probe(
+    service: str, host: str, port: int, *, timeout: float = DEFAULT_TIMEOUT,
+    handshake: Handshake | None = None,
+) -> ProbeResult:
+    """Connect to ``host:port`` and run ``service``'s handshake within ``timeout``.
+
+    Services without a known protocol are only checked for an open port.
+    """
+    handshake = handshake or PROTOCOLS.get(service)
+    result = ProbeResult(service, ok=False)
+    deadline = time.perf_counter() + timeout
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, TimeoutError) as e:
+        result.error = "connect timed out" if isinstance(e, TimeoutError) else str(e)
+        return result
+    result.connect_ms = _ms(time.perf_counter() - start)
+    try:
+        if handshake is None:
+            result.ok, result.detail = True, "port open"
+            return result
+        start = time.perf_counter()
+        remaining = max(deadline - start, 0.001)
+        result.detail = await asyncio.wait_for(handshake(reader, writer), remaining)
+        result.handshake_ms = _ms(time.perf_counter() - start)
+        result.ok = True
+    except NotReadyError as e:
+        result.handshake_ms = _ms(time.perf_counter() - start)
+        result.error = f"not ready: {e}"
+    except TimeoutError:
+        result.error = "no handshake reply"
+    except asyncio.IncompleteReadError:
+        result.error = "connection closed during handshake"
+    except (OSError, ValueError, struct.error, ProbeError) as e:
+        result.error = f"handshake failed: {e}"
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError, TimeoutError):
+            await asyncio.wait_for(writer.wait_closed(), 0.1)
+    return result
+
+
+async def probe_all(
+    host: str = "localhost", services: dict[str, int] | None = None,
+    *, timeout: float = DEFAULT_TIMEOUT,
+) -> dict[str, ProbeResult]:
+    """probe() every ``name -> port`` concurrently."""
+    services = DEFAULT_SERVICES if services is None else services
+    results = await asyncio.gather(
+        *(probe(name, host, port, timeout=timeout) for name, port in services.items())
+    )
+    return dict(zip(services, results, strict=True))
+
+
+# --------------------------------------------------------------------------- #
+# Latency histograms                                                           #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class Histogram:
+    """Counts per BUCKETS_MS bucket, plus one open-ended overflow bucket."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, ms: float) -> None:
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile ``q`` (inf for the overflow)."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def summary(self) -> dict[str, Any]:
+        """count and p50 / p95 / p99 upper bounds in ms (null: no samples, or overflow)."""
+        def bound(q: float) -> float | None:
+            value = self.quantile(q)
+            return None if value is None or value == float("inf") else value
+
+        return {"count": self.total, "p50": bound(0.5), "p95": bound(0.95), "p99": bound(0.99)}
+
+
+@dataclass
+class ServiceLatency:
+    connect: Histogram = field(default_factory=Histogram)
+    handshake: Histogram = field(default_factory=Histogram)
+
+    def to_json(self) -> dict[str, list[int]]:
+        return {"connect": self.connect.counts, "handshake": self.handshake.counts}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> ServiceLatency:
+        latency = cls()
+        for name in ("connect", "handshake"):
+            counts = data.get(name)
+            if isinstance(counts, list) and len(counts) == len(BUCKETS_MS) + 1:
+                getattr(latency, name).counts = [int(c) for c in counts]
+        return latency
+
+
+def history_path() -> Path:
+    return cache_dir() / HISTORY_FILENAME
+
+
+def load_histograms(path: Path | None = None) -> dict[str, ServiceLatency]:
+    try:
+        data = json.loads((path or history_path()).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("buckets_ms") != list(BUCKETS_MS):
+        return {}  # bucket layout changed: start over
+    return {name: ServiceLatency.from_json(entry)
+            for name, entry in data.get("services", {}).items() if isinstance(entry, dict)}
+
+
+def record(results: dict[str, ProbeResult], path: Path | None = None) -> dict[str, ServiceLatency]:
+    """Add ``results``' latencies to the histograms at ``path``; returns them."""
+    path = path or history_path()
+    histograms = load_histograms(path)
+    for name, result in results.items():
+        latency = histograms.setdefault(name, ServiceLatency())
+        if result.connect_ms is not None:
+            latency.connect.observe(result.connect_ms)
+        if result.handshake_ms is not None:
+            latency.handshake.observe(result.handshake_ms)
+    data = {"buckets_ms": list(BUCKETS_MS),
+            "services": {name: h.to_json() for name, h in sorted(histograms.items())}}
+    with contextlib.suppress(OSError):
+        atomic_write_bytes(path, json.dumps(data).encode())
+    return histograms
+
+
+def report(
+    results: dict[str, ProbeResult], histograms: dict[str, ServiceLatency] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Per-service JSON: this probe, plus the latency summary when recorded."""
+    out = {}
+    for name, result in results.items():
+        entry = result.to_json()
+        del entry["service"]
+        if histograms is not None and name in histograms:
+            entry["latency_ms"] = {"connect": histograms[name].connect.summary(),
+                                   "handshake": histograms[name].handshake.summary()}
+        out[name] = entry
+    return out
+
+
+async def check_services(
+    host: str = "localhost", services: dict[str, int] | None = None,
+    *, timeout: float = DEFAULT_TIMEOUT, history: Path | None = None,
+) -> dict[str, dict[str, Any]]:
+    """probe_all() as report JSON, recording latencies to ``history`` if given."""
+    results = await probe_all(host, services, timeout=timeout)
+    return report(results, record(results, history) if history is not None else None)
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _service(spec: str) -> tuple[str, int]:
+    name, _, port = spec.partition("=")
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected NAME=PORT, got {spec!r}")
+    return name, int(port)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.service_probe",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="per-service budget in seconds (default: %(default)s)")
+    parser.add_argument("services", nargs="*", type=_service, metavar="NAME=PORT",
+                        help="services to probe (default: postgres=5432 mongodb=27017 "
+                             "dragonfly=6379)")
+    parser.add_argument("--no-record", action="store_true",
+                        help="do not add this run to the latency histograms")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    services = dict(args.services) or None
+    result = asyncio.run(check_services(
+        args.host, services, timeout=args.timeout,
+        history=None if args.no_record else history_path(),
+    ))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for name, entry in result.items():
+            mark = "✓" if entry["ok"] else "✗"
+            timing = " ".join(f"{k.removesuffix('_ms')} {entry[k]:.1f}ms"
+                              for k in ("connect_ms", "handshake_ms") if entry[k] is not None)
+            print(f"{mark} {name:<10} {timing:<32} {entry['error'] or entry['detail']}")
+            if "latency_ms" in entry:
+                for kind, summary in entry["latency_ms"].items():
+                    if summary["count"]:
+                        print(f"    {kind:<9} n={summary['count']} p50<={summary['p50']}ms "
+                              f"p95<={summary['p95']}ms p99<={summary['p99']}ms")
+    return 0 if all(entry["ok"] for entry in result.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
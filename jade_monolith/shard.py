@@ -0,0 +1,263 @@
+"""Run the suite across worker processes, balanced by historical test duration.
+
+The coordinator collects the suite once and assigns node ids to workers
+longest-first (LPT: each test goes to the currently least-loaded worker),
+using durations recorded by earlier sharded runs.  The subprocess-heavy
+contract and compat tests therefore land on different workers and overlap,
+instead of queueing behind each other on one.  Tests without a recorded
+duration are assumed to take the median.
+
+Each worker is a plain pytest process restricted to its shard (see
+jade_monolith.pytest_shard).  Session fixtures marked as shared
+(parsed_agents, claude_version) are computed once per run and handed to the
+other workers through a file-backed FixtureStore in a run directory the
+coordinator owns.  After the run, each worker's per-test durations are
+folded into the durations file for the next run.
+
+Run with:  python -m jade_monolith.shard -n 4 [-- pytest args]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import heapq
+import json
+import os
+import pickle
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from .cache import atomic_write_bytes, cache_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: no sharing, every worker computes
+    fcntl = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+STORE_ENV = "JADE_SHARED_FIXTURES"
+DURATIONS_FILENAME = "test-durations.json"
+DEFAULT_DURATION = 0.05  # seconds, when nothing has been recorded at all
+_SMOOTHING = 0.5  # weight of the newest measurement
+
+
+# --------------------------------------------------------------------------- #
+# Shared fixture store                                                         #
+# --------------------------------------------------------------------------- #
+
+
+class FixtureStore:
+    """Session fixture values shared between the worker processes of one run.
+
+    ``get(name, compute)`` returns the stored value if some worker already
+    computed it, and otherwise computes and stores it under an exclusive
+    file lock, so concurrent workers wait for the first instead of
+    repeating the work.  Without a directory (a plain, unsharded run) it
+    just calls ``compute``.  Values that cannot be pickled are not shared.
+    """
+
+    def __init__(self, directory: Path | None) -> None:
+        self.directory = directory
+
+    @classmethod
+    def from_env(cls) -> FixtureStore:
+        value = os.environ.get(STORE_ENV)
+        return cls(Path(value) if value else None)
+
+    def get(self, name: str, compute: Callable[[], T]) -> T:
+        if self.directory is None or fcntl is None:
+            return compute()
+        path = self.directory / f"{name}.pickle"
+        with open(self.directory / f"{name}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with contextlib.suppress(OSError, pickle.UnpicklingError, EOFError):
+                return pickle.loads(path.read_bytes())
+            value = compute()
+            with contextlib.suppress(pickle.PicklingError, TypeError, AttributeError, OSError):
+                atomic_write_bytes(path, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            return value
+
+
+# --------------------------------------------------------------------------- #
+# Durations and assignment                                                     #
+# --------------------------------------------------------------------------- #
+
+
+def default_durations_path() -> Path:
+    return cache_dir() / DURATIONS_FILENAME
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return {k: float(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+
+def merge_durations(old: dict[str, float], measured: dict[str, float]) -> dict[str, float]:
+    """Fold ``measured`` into ``old``, smoothing so one slow run does not dominate."""
+    merged = dict(old)
+    for nodeid, seconds in measured.items():
+        previous = merged.get(nodeid)
+        merged[nodeid] = seconds if previous is None else (
+            _SMOOTHING * seconds + (1 - _SMOOTHING) * previous)
+    return merged
+
+
+def assign(
+    nodeids: Iterable[str], durations: dict[str, float], workers: int,
+) -> list[list[str]]:
+    """Split ``nodeids`` into ``workers`` shards, longest processing time first.
+
+    Each shard keeps the collection order, so module and class fixtures are
+    set up as few times as pytest allows.
+    """
+    nodeids = list(nodeids)
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+    heap = [(0.0, i) for i in range(max(1, workers))]
+    shards: list[list[str]] = [[] for _ in heap]
+    for nodeid in sorted(nodeids, key=lambda n: -durations.get(n, fallback)):
+        load, i = heapq.heappop(heap)
+        shards[i].append(nodeid)
+        heapq.heappush(heap, (load + durations.get(nodeid, fallback), i))
+    return [sorted(shard, key=order.__getitem__) for shard in shards if shard]
+
+
+# --------------------------------------------------------------------------- #
+# Coordinator                                                                  #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class WorkerResult:
+    index: int
+    tests: int
+    returncode: int
+    elapsed_s: float
+    output: str
+    durations: dict[str, float]
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode in (0, 5)  # 5: nothing collected
+
+
+def _pytest(*args: str) -> list[str]:
+    return [sys.executable, "-m", "pytest", "-p", "jade_monolith.pytest_shard", *args]
+
+
+def collect(pytest_args: list[str], run_dir: Path, cwd: Path | None = None) -> list[str]:
+    """Node ids the given pytest arguments select, in collection order."""
+    out = run_dir / "collected.json"
+    result = subprocess.run(
+        _pytest("--collect-only", "-q", f"--shard-collect={out}", *pytest_args),
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if not out.exists():
+        raise RuntimeError(f"collection failed:\n{result.stdout}{result.stderr}")
+    return json.loads(out.read_text())
+
+
+def run_shards(
+    shards: list[list[str]], pytest_args: list[str], run_dir: Path, cwd: Path | None = None,
+) -> list[WorkerResult]:
+    """Run every shard in its own pytest process, all at once."""
+    env = {**os.environ, STORE_ENV: str(run_dir / "fixtures")}
+    (run_dir / "fixtures").mkdir(exist_ok=True)
+    procs = []
+    results = []
+    # each shard's log stays open until its output is read back, then closes
+    with contextlib.ExitStack() as logs:
+        for i, shard in enumerate(shards):
+            ids = run_dir / f"shard-{i}.json"
+            ids.write_text(json.dumps(shard))
+            log = logs.enter_context(open(run_dir / f"shard-{i}.log", "w+"))
+            proc = subprocess.Popen(
+                _pytest(f"--shard-ids={ids}", f"--shard-report={run_dir / f'report-{i}.json'}",
+                        *pytest_args),
+                cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+            procs.append((i, shard, proc, log, time.monotonic()))
+        for i, shard, proc, log, started in procs:
+            returncode = proc.wait()
+            elapsed = time.monotonic() - started
+            log.seek(0)
+            output = log.read()
+            durations = load_durations(run_dir / f"report-{i}.json")
+            results.append(WorkerResult(i, len(shard), returncode, elapsed, output, durations))
+    return results
+
+
+def _summary_line(output: str) -> str:
+    lines = [line for line in output.strip().splitlines() if line.strip()]
+    return lines[-1].strip("= ") if lines else "no output"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m jade_monolith.shard",
+        usage="%(prog)s [-n WORKERS] [--durations PATH] [-- pytest args]",
+    )
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--durations", type=Path,
+                        help=f"recorded durations (default: cache dir/{DURATIONS_FILENAME})")
+    parser.add_argument("--plan", action="store_true",
+                        help="print the shard assignment and exit without running")
+    args, pytest_args = parser.parse_known_args(argv)
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+    durations_path = args.durations or default_durations_path()
+    durations = load_durations(durations_path)
+
+    run_dir = Path(tempfile.mkdtemp(prefix="jade-shard-"))
+    try:
+        try:
+            nodeids = collect(pytest_args, run_dir)
+        except RuntimeError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 4
+        shards = assign(nodeids, durations, args.workers)
+        fallback = statistics.median(durations.values()) if durations else DEFAULT_DURATION
+        for i, shard in enumerate(shards):
+            expected = sum(durations.get(n, fallback) for n in shard)
+            print(f"shard {i}: {len(shard)} tests, ~{expected:.1f}s expected")
+            if args.plan:
+                for nodeid in shard:
+                    print(f"  {nodeid}")
+        if args.plan or not shards:
+            return 0
+
+        start = time.monotonic()
+        results = run_shards(shards, pytest_args, run_dir)
+        for result in results:
+            print(f"shard {result.index}: {_summary_line(result.output)} "
+                  f"({result.elapsed_s:.1f}s)")
+            if not result.ok:
+                print(result.output)
+        measured = {k: v for r in results for k, v in r.durations.items()}
+        with contextlib.suppress(OSError):
+            atomic_write_bytes(durations_path, json.dumps(
+                merge_durations(durations, measured), indent=1, sort_keys=True).encode())
+        print(f"{len(nodeids)} tests on {len(shards)} workers in "
+              f"{time.monotonic() - start:.1f}s")
+        failed = [r for r in results if not r.ok]
+        return max((r.returncode for r in failed), default=0)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Standalone smoke check — the smoke and schema tests without pytest.
+
+Runs the rules in jade_monolith.rules behind tests/test_team_smoke.py
+and tests/test_agent_schema.py, once each, and reports them the way
+``pytest -q`` would: a progress line, ``FAILED <node id> - <message>`` for
+each failing test, a summary line, and pytest's exit codes (0 all passed,
+1 some failed, 4 usage error).
+
+Meant for pre-commit hooks, where pytest's own start-up, plugin loading and
+collection cost far more than the checks.  Nothing heavier than the rules
+is imported, and PyYAML only when an agent file is not in the loader cache,
+so a warm run finishes well under 200 ms.
+
+Run with:  python -m jade_monolith.smoke [--root PATH] [-v]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+EXIT_OK = 0
+EXIT_TESTS_FAILED = 1
+EXIT_USAGE_ERROR = 4
+
+USAGE = "usage: python -m jade_monolith.smoke [--root PATH] [-v | -q]"
+
+
+def run(root: Path) -> dict[str, list[str]]:
+    """Map each smoke/schema test node id to its failure messages, in pytest order."""
+    from . import rules
+    from .watch import Workspace
+
+    files = (rules.SCHEMA, rules.SMOKE)
+    results: dict[str, list[str]] = {}
+    for rule in sorted(rules.RULES, key=lambda r: r.nodeid.split("::")[0]):
+        if rule.nodeid.split("::")[0] in files:
+            results.setdefault(rule.nodeid, [])
+    workspace = Workspace(root)
+    for nodeid, message in workspace.full_check().failures:
+        if nodeid in results:
+            results[nodeid].append(message)
+    for rule in rules.rules_for("repo"):
+        results[rule.nodeid] += rule.check(root)
+    return results
+
+
+def _parse_args(argv: list[str]) -> tuple[Path, int]:
+    root, verbosity = Path.cwd(), 0
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            sys.exit(EXIT_OK)
+        elif arg == "-v":
+            verbosity += 1
+        elif arg == "-q":
+            verbosity -= 1
+        elif arg == "--root" or arg.startswith("--root="):
+            value = arg.partition("=")[2] or next(args, "")
+            if not value:
+                raise ValueError("--root expects a path")
+            root = Path(value)
+        else:
+            raise ValueError(f"unrecognized argument: {arg}")
+    return root, verbosity
+
+
+def main(argv: list[str] | None = None) -> int:
+    start = time.perf_counter()
+    try:
+        root, verbosity = _parse_args(sys.argv[1:] if argv is None else argv)
+    except ValueError as e:
+        print(f"{USAGE}\nerror: {e}", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+    if not root.is_dir():
+        print(f"error: {root} is not a directory", file=sys.stderr)
+        return EXIT_USAGE_ERROR
+
+    results = run(root.resolve())
+    failed = [nodeid for nodeid, messages in results.items() if messages]
+    if verbosity > 0:
+        for nodeid, messages in results.items():
+            print(f"{nodeid} {'FAILED' if messages else 'PASSED'}")
+    elif verbosity == 0:
+        marks = "".join("F" if messages else "." for messages in results.values())
+        print(f"{marks:<72} [100%]")
+    if failed:
+        print(" short test summary info ".center(80, "="))
+        for nodeid in failed:
+            for message in results[nodeid]:
+                print(f"FAILED {nodeid} - {message}")
+    counts = [f"{len(failed)} failed"] if failed else []
+    counts.append(f"{len(results) - len(failed)} passed")
+    print(f"{', '.join(counts)} in {time.perf_counter() - start:.2f}s")
+    return EXIT_TESTS_FAILED if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
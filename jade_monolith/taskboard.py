@@ -0,0 +1,460 @@
+"""Local task-board simulator: Agent Teams task coordination under load.
+
+Every teammate holds TaskCreate / TaskList / TaskUpdate / TaskGet.  This
+provides the same four operations over a SQLite task store shared by worker
+processes, and scripted teammates that follow each role's part of the
+workflow in docs/team-setup.md:
+
+  architect    claims a ``plan`` task, then creates the feature's tests,
+               implement and review tasks (each blocked by the one before)
+  test-writer  claims unblocked ``tests`` tasks
+  implementer  claims unblocked ``implement`` tasks
+  reviewer     claims unblocked ``review`` tasks
+
+Teammates poll TaskList like the real ones do, pick a claimable task and try
+to claim it with a conditional TaskUpdate, which fails if another teammate
+got there first.  A run reports throughput, how often claims were lost,
+how long writers waited for the database lock, and per-operation tail
+latency, so team size can be sized against task count before paying for
+real sessions.
+
+Run with:  python -m jade_monolith.taskboard --sizes 4,8,20 --features 10,50
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from queue import Empty
+from typing import Any
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+# role -> the kind of task it claims, in workflow order
+ROLE_KINDS = {
+    "architect": "plan",
+    "test-writer": "tests",
+    "implementer": "implement",
+    "reviewer": "review",
+}
+ROLES = tuple(ROLE_KINDS)
+TASKS_PER_FEATURE = len(ROLE_KINDS)
+# Simulated seconds of work per task, before --work-scale.
+WORK_SECONDS = {"architect": 0.02, "test-writer": 0.04, "implementer": 0.06, "reviewer": 0.02}
+DEFAULT_POLL_INTERVAL = 0.01
+DEFAULT_DEADLINE = 300.0
+RESULT_GRACE = 30.0  # how long past the deadline a teammate may take to report
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    subject TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    kind TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    task INTEGER NOT NULL REFERENCES tasks(id),
+    blocker INTEGER NOT NULL REFERENCES tasks(id),
+    PRIMARY KEY (task, blocker)
+);
+"""
+
+
+# --------------------------------------------------------------------------- #
+# Task store                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass(frozen=True)
+class Task:
+    id: int
+    subject: str
+    description: str
+    kind: str
+    status: str
+    owner: str | None
+    blocked_by: tuple[int, ...] = ()
+
+
+class TaskBoard:
+    """The four task tools over one SQLite file, safe across processes.
+
+    Reads run on WAL snapshots and never wait; every write takes the
+    database write lock up front (``BEGIN IMMEDIATE``) and the time spent
+    waiting for it is appended to ``lock_waits``.
+    """
+
+    def __init__(self, path: Path, *, timeout: float = 30.0) -> None:
+        self.path = path
+        self.lock_waits: list[float] = []
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        start = time.perf_counter()
+        self._db.execute("BEGIN IMMEDIATE")
+        self.lock_waits.append(time.perf_counter() - start)
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def create(
+        self, subject: str, *, description: str = "", kind: str = "",
+        blocked_by: Iterable[int] = (),
+    ) -> int:
+        """TaskCreate: add a pending task; returns its id."""
+        with self._write() as db:
+            task_id = db.execute(
+                "INSERT INTO tasks (subject, description, kind) VALUES (?, ?, ?)",
+                (subject, description, kind),
+            ).lastrowid
+            db.executemany("INSERT INTO blocks (task, blocker) VALUES (?, ?)",
+                           [(task_id, blocker) for blocker in blocked_by])
+        return task_id
+
+    def list(self) -> list[Task]:
+        """TaskList: every task, with the ids blocking it."""
+        rows = self._db.execute(
+            "SELECT t.id, t.subject, t.description, t.kind, t.status, t.owner, "
+            "group_concat(b.blocker) FROM tasks t LEFT JOIN blocks b ON b.task = t.id "
+            "GROUP BY t.id ORDER BY t.id"
+        ).fetchall()
+        return [Task(*row[:6], tuple(int(b) for b in row[6].split(",")) if row[6] else ())
+                for row in rows]
+
+    def get(self, task_id: int) -> Task | None:
+        """TaskGet: one task, or None."""
+        row = self._db.execute(
+            "SELECT id, subject, description, kind, status, owner FROM tasks WHERE id = ?",
+            (task_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        blockers = self._db.execute("SELECT blocker FROM blocks WHERE task = ? ORDER BY blocker",
+                                    (task_id,)).fetchall()
+        return Task(*row, tuple(b for (b,) in blockers))
+
+    def update(self, task_id: int, *, status: str | None = None,
+               owner: str | None = None) -> bool:
+        """TaskUpdate: set status and/or owner; False if there is no such task."""
+        changes = {k: v for k, v in (("status", status), ("owner", owner)) if v is not None}
+        if not changes:
+            return self.get(task_id) is not None
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        with self._write() as db:
+            cursor = db.execute(f"UPDATE tasks SET {assignments} WHERE id = ?",
+                                (*changes.values(), task_id))
+        return cursor.rowcount == 1
+
+    def claim(self, task_id: int, owner: str) -> bool:
+        """TaskUpdate to in_progress with ``owner`` — only if still claimable.
+
+        Fails (returns False) when another teammate claimed it first or a
+        blocker is not completed yet.
+        """
+        with self._write() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = ?, owner = ? "
+                "WHERE id = ? AND status = ? AND owner IS NULL AND NOT EXISTS ("
+                "  SELECT 1 FROM blocks b JOIN tasks t ON t.id = b.blocker"
+                "  WHERE b.task = ? AND t.status != ?)",
+                (IN_PROGRESS, owner, task_id, PENDING, task_id, COMPLETED),
+            )
+        return cursor.rowcount == 1
+
+
+# --------------------------------------------------------------------------- #
+# Scripted teammates                                                           #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class WorkerStats:
+    name: str
+    role: str
+    completed: int = 0
+    claims: int = 0
+    lost_claims: int = 0
+    idle_polls: int = 0
+    finished_at: float = 0.0
+    timed_out: bool = False
+    ops: dict[str, list[float]] = field(default_factory=dict)  # tool -> latencies
+    lock_waits: list[float] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    work_scale: float = 1.0
+    poll_interval: float = DEFAULT_POLL_INTERVAL
+    pick: str = "first"  # "first" claimable task (as agents tend to) or "random"
+    deadline: float = DEFAULT_DEADLINE
+
+
+def team(size: int) -> list[tuple[str, str]]:
+    """``(name, role)`` for a team of ``size``, roles assigned round-robin."""
+    if size < len(ROLES):
+        raise ValueError(f"a team needs at least {len(ROLES)} members, one per role")
+    return [(f"{ROLES[i % len(ROLES)]}-{i // len(ROLES) + 1}", ROLES[i % len(ROLES)])
+            for i in range(size)]
+
+
+def _follow_ups(board: TaskBoard, plan: Task) -> None:
+    feature = plan.subject.removeprefix("plan ")
+    blocker = plan.id
+    for kind in list(ROLE_KINDS.values())[1:]:
+        blocker = board.create(f"{kind} {feature}", kind=kind, blocked_by=[blocker])
+
+
+def run_worker(
+    path: Path, name: str, role: str, total: int, config: SimConfig, seed: int,
+) -> WorkerStats:
+    """Play one teammate until all ``total`` tasks are completed."""
+    board = TaskBoard(path)
+    rng = random.Random(seed)
+    stats = WorkerStats(name, role)
+    kind = ROLE_KINDS[role]
+    deadline = time.monotonic() + config.deadline
+
+    def timed(op: str, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.ops.setdefault(op, []).append(time.perf_counter() - start)
+
+    try:
+        while True:
+            tasks = timed("TaskList", board.list)
+            done = {t.id for t in tasks if t.status == COMPLETED}
+            if len(done) >= total:
+                break
+            if time.monotonic() > deadline:
+                stats.timed_out = True
+                break
+            claimable = [t for t in tasks if t.kind == kind and t.status == PENDING
+                         and t.owner is None and done.issuperset(t.blocked_by)]
+            if not claimable:
+                stats.idle_polls += 1
+                time.sleep(config.poll_interval)
+                continue
+            task = claimable[0] if config.pick == "first" else rng.choice(claimable)
+            stats.claims += 1
+            if not timed("TaskUpdate", board.claim, task.id, name):
+                stats.lost_claims += 1
+                continue
+            timed("TaskGet", board.get, task.id)
+            work = WORK_SECONDS[role] * config.work_scale
+            time.sleep(work * rng.uniform(0.5, 1.5))
+            if kind == "plan":
+                _follow_ups(_TimedCreate(board, timed), task)
+            timed("TaskUpdate", board.update, task.id, status=COMPLETED)
+            stats.completed += 1
+    finally:
+        stats.finished_at = time.time()
+        stats.lock_waits = board.lock_waits
+        board.close()
+    return stats
+
+
+class _TimedCreate:
+    """A board whose ``create`` calls are timed as TaskCreate."""
+
+    def __init__(self, board: TaskBoard, timed: Any) -> None:
+        self._board, self._timed = board, timed
+
+    def create(self, *args: Any, **kwargs: Any) -> int:
+        return self._timed("TaskCreate", self._board.create, *args, **kwargs)
+
+
+def _worker_main(queue: Any, go: Any, args: tuple[Any, ...]) -> None:
+    go.wait()
+    try:
+        queue.put(run_worker(*args))
+    except Exception as e:  # report, don't hang the coordinator
+        queue.put(e)
+
+
+# --------------------------------------------------------------------------- #
+# Simulation                                                                   #
+# --------------------------------------------------------------------------- #
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    """p50 / p95 / p99 / max in milliseconds."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        cuts = [ordered[0]] * 99
+    else:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    return {"p50": round(cuts[49] * 1000, 3), "p95": round(cuts[94] * 1000, 3),
+            "p99": round(cuts[98] * 1000, 3), "max": round(ordered[-1] * 1000, 3)}
+
+
+@dataclass
+class SimResult:
+    team_size: int
+    features: int
+    tasks: int
+    completed: int
+    elapsed_s: float
+    throughput: float  # completed tasks per second
+    claims: int
+    lost_claims: int
+    contention: float  # lost / attempted claims
+    idle_polls: int
+    lock_wait_ms: dict[str, float]
+    op_latency_ms: dict[str, dict[str, float]]
+    timed_out: bool
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def simulate(
+    team_size: int, features: int, *, config: SimConfig | None = None,
+    directory: Path | None = None, seed: int = 0,
+) -> SimResult:
+    """Run one team of ``team_size`` through ``features`` features to completion.
+
+    Raises queue.Empty if a teammate has not reported ``RESULT_GRACE``
+    seconds after the deadline; the hung teammates are killed.
+    """
+    config = config or SimConfig()
+    members = team(team_size)
+    total = features * TASKS_PER_FEATURE
+    with tempfile.TemporaryDirectory(prefix="jade-taskboard-", dir=directory) as tmp:
+        path = Path(tmp) / "tasks.db"
+        board = TaskBoard(path)
+        for i in range(features):
+            board.create(f"plan feature-{i + 1}", kind="plan")
+        board.close()
+
+        ctx = multiprocessing.get_context("fork" if sys.platform != "win32" else "spawn")
+        queue, go = ctx.Queue(), ctx.Event()
+        procs = [ctx.Process(target=_worker_main, daemon=True,
+                             args=(queue, go, (path, name, role, total, config, seed + i)))
+                 for i, (name, role) in enumerate(members)]
+        for proc in procs:
+            proc.start()
+        started = time.time()
+        go.set()
+        try:
+            results = [queue.get(timeout=config.deadline + RESULT_GRACE) for _ in procs]
+        except Empty:
+            for proc in procs:
+                proc.kill()
+            raise
+        for proc in procs:
+            proc.join()
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        raise RuntimeError(f"teammate failed: {errors[0]!r}") from errors[0]
+    stats: list[WorkerStats] = results  # type: ignore[assignment]
+
+    elapsed = max(s.finished_at for s in stats) - started
+    completed = sum(s.completed for s in stats)
+    claims = sum(s.claims for s in stats)
+    lost = sum(s.lost_claims for s in stats)
+    ops: dict[str, list[float]] = {}
+    for s in stats:
+        for op, latencies in s.ops.items():
+            ops.setdefault(op, []).extend(latencies)
+    return SimResult(
+        team_size=team_size, features=features, tasks=total, completed=completed,
+        elapsed_s=round(elapsed, 3), throughput=round(completed / elapsed, 2) if elapsed else 0.0,
+        claims=claims, lost_claims=lost, contention=round(lost / claims, 3) if claims else 0.0,
+        idle_polls=sum(s.idle_polls for s in stats),
+        lock_wait_ms=_summary([w for s in stats for w in s.lock_waits]),
+        op_latency_ms={op: _summary(values) for op, values in sorted(ops.items())},
+        timed_out=any(s.timed_out for s in stats),
+    )
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _ints(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _print_table(results: list[SimResult]) -> None:
+    print(f"{'TEAM':>4} {'TASKS':>6} {'TIME':>8} {'TASKS/S':>8} {'LOST':>7} "
+          f"{'LOCK p95':>9} {'LOCK p99':>9} {'LIST p99':>9} {'CLAIM p99':>10}")
+    for r in results:
+        claim = r.op_latency_ms.get("TaskUpdate", {}).get("p99", 0.0)
+        listing = r.op_latency_ms.get("TaskList", {}).get("p99", 0.0)
+        flag = "  TIMED OUT" if r.timed_out else ""
+        print(f"{r.team_size:>4} {r.tasks:>6} {r.elapsed_s:>7.2f}s {r.throughput:>8.1f} "
+              f"{r.contention:>6.1%} {r.lock_wait_ms['p95']:>7.2f}ms "
+              f"{r.lock_wait_ms['p99']:>7.2f}ms {listing:>7.2f}ms {claim:>8.2f}ms{flag}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.taskboard",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_ints, default=[4, 8, 12, 20],
+                        help="team sizes to simulate (default: 4,8,12,20)")
+    parser.add_argument("--features", type=_ints, default=[25],
+                        help=f"features per run, {TASKS_PER_FEATURE} tasks each (default: 25)")
+    parser.add_argument("--work-scale", type=float, default=1.0,
+                        help="multiply simulated work time (0: coordination overhead only)")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument("--pick", choices=["first", "random"], default="first",
+                        help="which claimable task a teammate goes for")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    config = SimConfig(work_scale=args.work_scale, poll_interval=args.poll_interval,
+                       pick=args.pick)
+    results = []
+    hung = False
+    try:
+        for features in args.features:
+            for size in args.sizes:
+                results.append(simulate(size, features, config=config, seed=args.seed))
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except Empty:
+        print(f"error: team of {size} ({features} features) timed out: a teammate "
+              f"did not report within {config.deadline + RESULT_GRACE:g}s", file=sys.stderr)
+        hung = True
+    if args.json:
+        json.dump([r.to_json() for r in results], sys.stdout, indent=2)
+        print()
+    else:
+        _print_table(results)
+    return 1 if hung or any(r.timed_out for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
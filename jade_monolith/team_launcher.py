@@ -0,0 +1,471 @@
+"""Start the four-agent tmux session with every pane coming up at once.
+
+The Python counterpart of scripts/start-team.sh (which runs this when it can).
+Same session, window and pane layout:
+
+  +--------------+---------------+
+  |  Architect   |  Implementer  |
+  +--------------+---------------+
+  | Test Writer  |   Reviewer    |
+  +--------------+---------------+
+
+- The whole layout is built by one tmux command, with ``claude --agent ...``
+  as each pane's own command instead of keystrokes typed into a shell, so
+  the four CLI cold starts overlap rather than run one after another.
+- Each pane gets a readiness probe: its screen is polled until the CLI shows
+  its input prompt, and the time from launch to ready is recorded (see
+  ``status``; history in the cache dir).  When ``start`` attaches to the
+  session it does so at once and a detached ``probe`` process does the
+  polling and recording; ``--wait`` blocks until every pane is ready first.
+- ``--warm`` also keeps a hidden ``pool`` window with one spare, already
+  started agent per role.  ``restart ROLE`` swaps the spare into the role's
+  pane (no cold start) and starts a new spare in the background.
+- Re-running ``start`` while the session exists re-attaches instead of
+  rebuilding it; ``--fresh`` rebuilds.
+
+Every pane gets ``CLAUDE_CODE_EXPERIMENTAL_AGENT_TEAMS=1``, whatever the
+tmux server's own environment.
+
+Run with:  python -m jade_monolith.team_launcher [start] [--warm] [--fresh]
+           python -m jade_monolith.team_launcher restart reviewer
+           python -m jade_monolith.team_launcher status | stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .cache import atomic_write_bytes, cache_dir
+
+SESSION = "jade-team"
+WINDOW = "agents"
+POOL_WINDOW = "pool"
+TEAM_ENV = {"CLAUDE_CODE_EXPERIMENTAL_AGENT_TEAMS": "1"}
+# The interactive UI is ready for input once it draws its prompt / hint line.
+READY_PATTERN = re.compile(r"\? for shortcuts|^\s*>\s", re.MULTILINE)
+DEFAULT_TIMEOUT = 60.0
+POLL_INTERVAL = 0.025
+HISTORY_FILENAME = "team-launch.json"
+HISTORY_LIMIT = 50
+ROLE_OPTION = "@jade-role"
+
+
+@dataclass(frozen=True)
+class Role:
+    name: str
+    title: str
+    slot: str  # tmux pane position token in the agents window
+    args: tuple[str, ...] = ()
+
+
+ROLES = (
+    Role("architect", "ARCHITECT (read-only)", "{top-left}", ("--permission-mode", "plan")),
+    Role("implementer", "IMPLEMENTER", "{top-right}"),
+    Role("test-writer", "TEST WRITER", "{bottom-left}"),
+    Role("reviewer", "REVIEWER (read-only)", "{bottom-right}", ("--permission-mode", "plan")),
+)
+ROLES_BY_NAME = {role.name: role for role in ROLES}
+
+
+class TmuxError(RuntimeError):
+    """A tmux command failed."""
+
+
+class Tmux:
+    """Thin wrapper over the ``tmux`` binary.
+
+    ``socket_name`` selects a separate server (``tmux -L``), which the tests
+    use; ``config`` is passed as ``-f`` when this starts the server.
+    """
+
+    def __init__(
+        self, *, socket_name: str | None = None, config: Path | None = None,
+        binary: str = "tmux",
+    ) -> None:
+        self.socket_name = socket_name
+        self.prefix = [binary]
+        if socket_name:
+            self.prefix += ["-L", socket_name]
+        if config is not None and config.exists():
+            self.prefix += ["-f", str(config)]
+
+    def run(self, *args: str, check: bool = True) -> str:
+        result = subprocess.run([*self.prefix, *args], capture_output=True, text=True)
+        if check and result.returncode != 0:
+            raise TmuxError(f"tmux {args[0]}: {result.stderr.strip() or result.returncode}")
+        return result.stdout
+
+    def sequence(self, commands: list[list[str]]) -> str:
+        """Run several tmux commands as one invocation (``cmd1 ; cmd2 ...``)."""
+        argv: list[str] = []
+        for i, command in enumerate(commands):
+            argv += [";", *command] if i else command
+        return self.run(*argv)
+
+    def has_session(self, session: str) -> bool:
+        return subprocess.run([*self.prefix, "has-session", "-t", f"={session}"],
+                              capture_output=True).returncode == 0
+
+    def capture(self, pane: str) -> str:
+        return self.run("capture-pane", "-p", "-t", pane, check=False)
+
+
+# --------------------------------------------------------------------------- #
+# Reports                                                                      #
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class PaneReady:
+    role: str
+    pane: str  # tmux pane id, e.g. %3
+    window: str
+    ready_s: float | None = None  # seconds from launch to ready; None if it never was
+
+
+@dataclass
+class LaunchReport:
+    action: str  # start, reattach or restart
+    session: str
+    started_at: float
+    panes: list[PaneReady] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return all(p.ready_s is not None for p in self.panes)
+
+    def to_json(self) -> dict[str, Any]:
+        return {**asdict(self), "ready": self.ready}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> LaunchReport:
+        return cls(data["action"], data["session"], data["started_at"],
+                   [PaneReady(**pane) for pane in data["panes"]], data.get("elapsed_s", 0.0))
+
+
+def history_path() -> Path:
+    return cache_dir() / HISTORY_FILENAME
+
+
+def load_history(path: Path | None = None) -> list[dict[str, Any]]:
+    try:
+        data = json.loads((path or history_path()).read_text())
+    except (OSError, ValueError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def record(report: LaunchReport, path: Path | None = None) -> None:
+    path = path or history_path()
+    history = (load_history(path) + [report.to_json()])[-HISTORY_LIMIT:]
+    with contextlib.suppress(OSError):
+        atomic_write_bytes(path, json.dumps(history, indent=1).encode())
+
+
+# --------------------------------------------------------------------------- #
+# Launcher                                                                     #
+# --------------------------------------------------------------------------- #
+
+
+class TeamLauncher:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        tmux: Tmux | None = None,
+        session: str = SESSION,
+        claude: str = "claude",
+        ready_pattern: re.Pattern[str] = READY_PATTERN,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.root = root
+        self.tmux = tmux or Tmux(config=root / ".tmux.conf")
+        self.session = session
+        self.claude = claude
+        self.ready_pattern = ready_pattern
+        self.timeout = timeout
+
+    # -- commands ---------------------------------------------------------- #
+
+    def agent_command(self, role: Role) -> str:
+        """The pane command: the agent, then a shell once it exits (as before)."""
+        cli = shlex.join([self.claude, "--agent", role.name, *role.args])
+        return f'{cli}; exec "${{SHELL:-/bin/sh}}"'
+
+    def _spawn_options(self) -> list[str]:
+        options = ["-c", str(self.root)]
+        for key, value in TEAM_ENV.items():
+            options += ["-e", f"{key}={value}"]
+        return options
+
+    def _tag(self, target: str, role: Role) -> list[list[str]]:
+        return [["select-pane", "-t", target, "-T", role.title],
+                ["set-option", "-p", "-t", target, ROLE_OPTION, role.name]]
+
+    def _spare_commands(self, role: Role, *, new_window: bool = False) -> list[list[str]]:
+        """Start a spare ``role`` agent in the pool window.
+
+        The new pane becomes the pool's active pane, which is how the
+        following ``set-option`` finds it.
+        """
+        pool = f"{self.session}:{POOL_WINDOW}"
+        if new_window:
+            spawn = ["new-window", "-d", "-t", f"{self.session}:", "-n", POOL_WINDOW]
+        else:
+            spawn = ["split-window", "-t", pool]
+        return [
+            [*spawn, *self._spawn_options(), self.agent_command(role)],
+            ["set-option", "-p", "-t", pool, ROLE_OPTION, role.name],
+            ["select-layout", "-t", pool, "tiled"],
+        ]
+
+    def panes(self, window: str = WINDOW) -> dict[str, str]:
+        """Role name -> pane id for the panes of ``window``."""
+        out = self.tmux.run("list-panes", "-t", f"{self.session}:{window}",
+                            "-F", f"#{{pane_id}} #{{{ROLE_OPTION}}}", check=False)
+        panes = {}
+        for line in out.splitlines():
+            pane, _, role = line.partition(" ")
+            if role:
+                panes[role] = pane
+        return {role.name: panes[role.name] for role in ROLES if role.name in panes}
+
+    # -- readiness --------------------------------------------------------- #
+
+    def wait_ready(self, targets: list[PaneReady], started: float) -> None:
+        """Poll every pending pane until it shows the ready prompt or times out."""
+        pending = list(targets)
+        deadline = started + self.timeout
+        while pending and time.monotonic() < deadline:
+            for pane in list(pending):
+                if self.ready_pattern.search(self.tmux.capture(pane.pane)):
+                    pane.ready_s = round(time.monotonic() - started, 3)
+                    pending.remove(pane)
+            if pending:
+                time.sleep(POLL_INTERVAL)
+
+    # -- actions ----------------------------------------------------------- #
+
+    def probe(self, report: LaunchReport) -> LaunchReport:
+        """Wait for ``report``'s pending panes, timing them from its ``started_at``."""
+        started = time.monotonic() - (time.time() - report.started_at)
+        self.wait_ready([p for p in report.panes if p.ready_s is None], started)
+        report.elapsed_s = round(time.monotonic() - started, 3)
+        return report
+
+    def start(self, *, warm: bool = False, fresh: bool = False, wait: bool = True) -> LaunchReport:
+        """Build the session (or find it already running).
+
+        With ``wait`` false the report comes back as soon as tmux has the
+        panes, none of them ready yet; ``probe`` finishes it.
+        """
+        wall, started = time.time(), time.monotonic()
+        if self.tmux.has_session(self.session):
+            if not fresh:
+                report = LaunchReport("reattach", self.session, wall)
+                report.panes = [PaneReady(role, pane, WINDOW, 0.0)
+                                for role, pane in self.panes().items()]
+                return report
+            self.stop()
+
+        agents = f"{self.session}:{WINDOW}"
+        architect, implementer, test_writer, reviewer = ROLES
+        commands = [
+            ["new-session", "-d", "-s", self.session, "-n", WINDOW, "-x", "200", "-y", "50",
+             *self._spawn_options(), self.agent_command(architect)],
+            ["split-window", "-h", "-t", f"{agents}.{{top-left}}", *self._spawn_options(),
+             self.agent_command(implementer)],
+            ["split-window", "-v", "-t", f"{agents}.{{top-left}}", *self._spawn_options(),
+             self.agent_command(test_writer)],
+            ["split-window", "-v", "-t", f"{agents}.{{top-right}}", *self._spawn_options(),
+             self.agent_command(reviewer)],
+            ["set-option", "-w", "-t", agents, "pane-border-status", "top"],
+            ["set-option", "-w", "-t", agents, "pane-border-format", " #{pane_title} "],
+        ]
+        for role in ROLES:
+            commands += self._tag(f"{agents}.{role.slot}", role)
+        commands.append(["select-pane", "-t", f"{agents}.{{top-left}}"])
+        if warm:
+            for i, role in enumerate(ROLES):
+                commands += self._spare_commands(role, new_window=i == 0)
+        self.tmux.sequence(commands)
+
+        report = LaunchReport("start", self.session, wall)
+        report.panes = [PaneReady(role, pane, WINDOW) for role, pane in self.panes().items()]
+        if warm:
+            report.panes += [PaneReady(role, pane, POOL_WINDOW)
+                             for role, pane in self.panes(POOL_WINDOW).items()]
+        if wait:
+            self.wait_ready(report.panes, started)
+        report.elapsed_s = round(time.monotonic() - started, 3)
+        return report
+
+    def restart(self, name: str) -> LaunchReport:
+        """Replace a role's agent: from the warm pool if it has a ready spare."""
+        role = ROLES_BY_NAME[name]
+        wall, started = time.time(), time.monotonic()
+        current = self.panes().get(name)
+        if current is None:
+            raise TmuxError(f"no {name} pane in session {self.session}")
+        spare = self.panes(POOL_WINDOW).get(name)
+        report = LaunchReport("restart", self.session, wall)
+        if spare is not None and self.ready_pattern.search(self.tmux.capture(spare)):
+            # The spare takes over the role's slot; the old agent, now in the
+            # pool, is killed and a new spare started in its place.
+            self.tmux.sequence([
+                ["swap-pane", "-d", "-s", spare, "-t", current],
+                *self._tag(spare, role),
+                ["kill-pane", "-t", current],
+                *self._spare_commands(role),
+            ])
+            report.panes = [PaneReady(name, spare, WINDOW,
+                                      round(time.monotonic() - started, 3))]
+        else:
+            self.tmux.run("respawn-pane", "-k", "-t", current, *self._spawn_options(),
+                          self.agent_command(role))
+            report.panes = [PaneReady(name, current, WINDOW)]
+            self.wait_ready(report.panes, started)
+        report.elapsed_s = round(time.monotonic() - started, 3)
+        return report
+
+    def stop(self) -> None:
+        self.tmux.run("kill-session", "-t", f"={self.session}", check=False)
+
+    def spawn_probe(self, report: LaunchReport) -> None:
+        """Probe and record ``report`` from a detached process (this one may exec tmux)."""
+        args = [sys.executable, "-m", "jade_monolith.team_launcher", "--root", str(self.root),
+                "--session", self.session, "--timeout", str(self.timeout)]
+        if self.tmux.socket_name:
+            args += ["--socket", self.tmux.socket_name]
+        args += ["probe", json.dumps(report.to_json())]
+        package_root = str(Path(__file__).resolve().parents[1])
+        pythonpath = os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))
+        subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True,
+            env={**os.environ, "PYTHONPATH": pythonpath},
+        )
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _print_report(report: LaunchReport, *, pending: bool = False) -> None:
+    if pending:
+        print(f"{report.action} {report.session}: panes up in {report.elapsed_s:.2f}s, "
+              f"readiness is recorded in the background (see status)")
+        return
+    print(f"{report.action} {report.session}: "
+          f"{'all panes ready' if report.ready else 'NOT READY'} in {report.elapsed_s:.2f}s")
+    for pane in report.panes:
+        ready = "timed out" if pane.ready_s is None else f"ready in {pane.ready_s:.2f}s"
+        print(f"  {pane.window}/{pane.role:<12} {pane.pane:<5} {ready}")
+
+
+def _attach(tmux: Tmux, session: str) -> int:
+    if not sys.stdout.isatty():
+        return 0
+    command = "switch-client" if os.environ.get("TMUX") else "attach-session"
+    print("Detach: Ctrl+B, D | Switch panes: Ctrl+B, Arrow keys", flush=True)
+    os.execvp(tmux.prefix[0], [*tmux.prefix, command, "-t", f"={session}:{WINDOW}"])
+    return 0  # pragma: no cover - exec does not return
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.team_launcher",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=Path.cwd(),
+                        help="repo root (default: cwd)")
+    parser.add_argument("--session", default=SESSION)
+    parser.add_argument("--socket", help="tmux server socket name (tmux -L)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds to wait for each pane to become ready")
+    sub = parser.add_subparsers(dest="command")
+    start = sub.add_parser("start", help="start (or re-attach to) the team session")
+    start.add_argument("--warm", action="store_true",
+                       help="keep a pool of pre-started spare agents for restarts")
+    start.add_argument("--fresh", action="store_true",
+                       help="rebuild the session even if it is running")
+    start.add_argument("--no-attach", action="store_true")
+    start.add_argument("--wait", action="store_true",
+                       help="wait for every pane to be ready before attaching")
+    restart = sub.add_parser("restart", help="replace one role's agent")
+    restart.add_argument("role", choices=list(ROLES_BY_NAME))
+    status = sub.add_parser("status", help="show panes and recent launch times")
+    status.add_argument("--json", action="store_true")
+    sub.add_parser("stop", help="kill the team session")
+    probe = sub.add_parser("probe", help=argparse.SUPPRESS)  # spawn_probe's worker
+    probe.add_argument("report", type=json.loads)
+    args = parser.parse_args(argv)
+    command = args.command or "start"
+
+    if shutil.which("tmux") is None:
+        print("tmux required: sudo apt install tmux", file=sys.stderr)
+        return 1
+    root = args.root.resolve()
+    launcher = TeamLauncher(root, tmux=Tmux(socket_name=args.socket, config=root / ".tmux.conf"),
+                            session=args.session, timeout=args.timeout)
+
+    if command == "stop":
+        launcher.stop()
+        return 0
+    if command == "probe":
+        record(launcher.probe(LaunchReport.from_json(args.report)))
+        return 0
+    if command == "status":
+        history = [h for h in load_history() if h["session"] == args.session]
+        if args.json:
+            json.dump({"panes": launcher.panes(), "pool": launcher.panes(POOL_WINDOW),
+                       "history": history}, sys.stdout, indent=2)
+            print()
+            return 0
+        running = launcher.tmux.has_session(args.session)
+        print(f"{args.session}: {'running' if running else 'not running'}")
+        for entry in history[-5:]:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["started_at"]))
+            times = ", ".join(f"{p['role']} {p['ready_s']}s" for p in entry["panes"]
+                              if p["window"] == WINDOW)
+            print(f"  {when} {entry['action']:<8} {times}")
+        return 0
+
+    if shutil.which("claude") is None:
+        print("claude required: npm install -g @anthropic-ai/claude-code", file=sys.stderr)
+        return 1
+    attach = command == "start" and not args.no_attach and sys.stdout.isatty()
+    wait = not attach or args.wait
+    try:
+        if command == "restart":
+            report = launcher.restart(args.role)
+        else:
+            report = launcher.start(warm=args.warm, fresh=args.fresh, wait=wait)
+    except TmuxError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    pending = report.action != "reattach" and not wait
+    _print_report(report, pending=pending)
+    if pending:
+        launcher.spawn_probe(report)
+    elif report.action != "reattach":
+        record(report)
+    if attach:
+        return _attach(launcher.tmux, args.session)
+    return 0 if report.ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
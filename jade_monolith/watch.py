@@ -0,0 +1,338 @@
+"""Watch mode — re-validate only the agent files that changed.
+
+Holds the parsed agents and settings.json in memory and listens for file
+events (inotify on Linux, mtime polling elsewhere).  Each change re-runs only
+the rules in jade_monolith.rules that the changed file can affect:
+
+  agent edit       per-agent rules for that file, plus the team rules when the
+                   file is (or was) a team member
+  agent add/del    per-agent rules for that file plus all team rules
+  settings.json    settings rules
+
+Run with:  python -m jade_monolith.watch [--root PATH] [--once]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import rules
+from .agents import AgentLoader, AgentParseError
+from .index import AgentIndex, tool_list
+
+Failure = tuple[str, str]  # (rule node id, message)
+
+TEAM_SUBJECT = "<team>"
+SETTINGS_SUBJECT = "<settings>"
+
+
+@dataclass
+class ChangeReport:
+    """Outcome of re-validating after one batch of file events."""
+
+    changed: list[Path]
+    rules_run: int = 0
+    failures: list[Failure] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+def _tool_fields(agent: dict[str, Any]) -> tuple[list[str], list[str]]:
+    return tool_list(agent.get("tools")), tool_list(agent.get("disallowedTools"))
+
+
+class Workspace:
+    """In-memory view of ``.claude/agents`` and ``.claude/settings.json``.
+
+    ``failures`` maps each subject (an agent path, TEAM_SUBJECT or
+    SETTINGS_SUBJECT) to the failures from its last check, so a change only
+    replaces the results of the rules it re-ran.
+    """
+
+    def __init__(self, root: Path, loader: AgentLoader | None = None) -> None:
+        self.root = root
+        self.agents_dir = root / ".claude" / "agents"
+        self.settings_path = root / ".claude" / "settings.json"
+        self.loader = loader or AgentLoader()
+        self.agents: dict[Path, dict[str, Any]] = {}
+        self.settings: Any = None
+        self.failures: dict[str, list[Failure]] = {}
+
+    # -- loading ----------------------------------------------------------- #
+
+    def _load_agent(self, path: Path) -> list[Failure]:
+        """(Re)load one agent; returns a parse failure if it has one."""
+        self.agents.pop(path, None)
+        if not path.exists():
+            return []
+        try:
+            self.agents[path] = self.loader.load(path)
+        except AgentParseError as e:
+            return [(rules.PARSE_RULE, f"{path.name}: {e}")]
+        return []
+
+    def _check_agent(self, path: Path) -> int:
+        failures = self._load_agent(path)
+        count = 0
+        agent = self.agents.get(path)
+        if agent is not None:
+            for rule in rules.rules_for("agent"):
+                failures += [(rule.nodeid, msg) for msg in rule.check(agent)]
+                count += 1
+        if path.exists():
+            self.failures[str(path)] = failures
+        else:
+            self.failures.pop(str(path), None)
+        return count
+
+    def _check_team(self) -> int:
+        index = AgentIndex(sorted(self.agents.values(), key=lambda a: Path(a["_path"]).name))
+        failures = []
+        team_rules = rules.rules_for("team")
+        for rule in team_rules:
+            failures += [(rule.nodeid, msg) for msg in rule.check(index)]
+        self.failures[TEAM_SUBJECT] = failures
+        return len(team_rules)
+
+    def _check_settings(self, required: bool = True) -> int:
+        failures: list[Failure] = []
+        try:
+            self.settings = json.loads(self.settings_path.read_text())
+        except FileNotFoundError as e:
+            self.settings = None
+            if required:
+                failures.append((rules.SETTINGS_RULE, f"settings.json missing: {e}"))
+        except json.JSONDecodeError as e:
+            self.settings = None
+            failures.append((rules.SETTINGS_RULE, f"settings.json is not valid JSON: {e}"))
+        settings_rules = rules.rules_for("settings")
+        if self.settings is not None:
+            for rule in settings_rules:
+                failures += [(rule.nodeid, msg) for msg in rule.check(self.settings)]
+        self.failures[SETTINGS_SUBJECT] = failures
+        return len(settings_rules)
+
+    def full_check(self, *, team: bool = True, settings_required: bool = True) -> ChangeReport:
+        """Load everything and run every rule once.
+
+        ``team=False`` skips the team rules, for catalogues that are not the
+        four-agent team; ``settings_required=False`` lets settings.json be absent.
+        """
+        start = time.perf_counter()
+        self.agents.clear()
+        self.failures.clear()
+        paths = sorted(self.agents_dir.glob("*.md"))
+        report = ChangeReport(changed=paths)
+        for path in paths:
+            report.rules_run += self._check_agent(path)
+        if team:
+            report.rules_run += self._check_team()
+        report.rules_run += self._check_settings(settings_required)
+        self.loader.flush()
+        report.failures = self.all_failures()
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    # -- incremental ------------------------------------------------------- #
+
+    def _touches_team(self, path: Path, existed: bool, old: dict[str, Any]) -> bool:
+        if existed != path.exists():
+            return True  # membership of the catalogue changed
+        agent = self.agents.get(path) or {}
+        if _tool_fields(agent) != _tool_fields(old):
+            return True  # the catalogue-wide capability rules see every agent's tools
+        return bool({path.stem, old.get("name"), agent.get("name")} & rules.TEAM.keys())
+
+    def on_change(self, paths: list[Path]) -> ChangeReport:
+        """Re-run only the rules affected by ``paths`` changing."""
+        start = time.perf_counter()
+        report = ChangeReport(changed=paths)
+        rerun_team = False
+        for path in dict.fromkeys(paths):
+            if path == self.settings_path:
+                report.rules_run += self._check_settings()
+                continue
+            if path.parent != self.agents_dir or path.suffix != ".md":
+                continue
+            existed = str(path) in self.failures
+            old = self.agents.get(path) or {}
+            report.rules_run += self._check_agent(path)
+            rerun_team |= self._touches_team(path, existed, old)
+        if rerun_team:
+            report.rules_run += self._check_team()
+        report.failures = [
+            f for p in paths for f in self.failures.get(str(p), [])
+        ]
+        if rerun_team:
+            report.failures += self.failures[TEAM_SUBJECT]
+        if self.settings_path in paths:
+            report.failures += self.failures.get(SETTINGS_SUBJECT, [])
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    def all_failures(self) -> list[Failure]:
+        return [f for failures in self.failures.values() for f in failures]
+
+
+# --------------------------------------------------------------------------- #
+# File events                                                                  #
+# --------------------------------------------------------------------------- #
+
+# IN_CREATE is deliberately not watched: editors create then write, and the
+# IN_CLOSE_WRITE that follows is the event worth re-validating on.
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Minimal inotify binding via ctypes — no third-party dependency."""
+
+    def __init__(self, directories: list[Path]) -> None:
+        import ctypes  # only the long-running watcher needs it, not --once
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+            self._dirs[wd] = directory
+
+    def poll(self, timeout: float | None = None) -> list[Path]:
+        """Block up to ``timeout`` seconds; return the paths that changed."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        changed: list[Path] = []
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, _mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+                offset += _EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name and wd in self._dirs:
+                    changed.append(self._dirs[wd] / os.fsdecode(name))
+        return list(dict.fromkeys(changed))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: compare mtimes on a timer."""
+
+    def __init__(self, directories: list[Path], interval: float = 0.1) -> None:
+        self._dirs = directories
+        self._interval = interval
+        self._seen = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, int]:
+        seen = {}
+        for directory in self._dirs:
+            for path in directory.iterdir():
+                with contextlib.suppress(FileNotFoundError):
+                    seen[path] = path.stat().st_mtime_ns
+        return seen
+
+    def poll(self, timeout: float | None = None) -> list[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            changed = [p for p in current.keys() | self._seen.keys()
+                       if current.get(p) != self._seen.get(p)]
+            self._seen = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return sorted(changed)
+            time.sleep(self._interval)
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(directories: list[Path]) -> InotifyWatcher | PollingWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directories)
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                          #
+# --------------------------------------------------------------------------- #
+
+
+def _print_report(report: ChangeReport, total_failing: int) -> None:
+    names = ", ".join(p.name for p in report.changed[:5])
+    if len(report.changed) > 5:
+        names += f", … ({len(report.changed)} files)"
+    stamp = time.strftime("%H:%M:%S")
+    print(f"[{stamp}] {names or 'no files'}: {report.rules_run} rules in "
+          f"{report.elapsed_ms:.1f} ms")
+    for nodeid, message in report.failures:
+        print(f"FAILED {nodeid} - {message}")
+    status = "all rules pass" if total_failing == 0 else f"{total_failing} failing"
+    print(f"  {status}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade_monolith.watch",
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=Path.cwd(),
+                        help="repo root containing .claude/ (default: cwd)")
+    parser.add_argument("--once", action="store_true",
+                        help="validate everything once and exit")
+    args = parser.parse_args(argv)
+
+    workspace = Workspace(args.root.resolve())
+    report = workspace.full_check()
+    _print_report(report, len(report.failures))
+    if args.once:
+        return 1 if report.failures else 0
+
+    directories = [d for d in (workspace.agents_dir, workspace.settings_path.parent)
+                   if d.is_dir()]
+    if not directories:
+        print(f"error: {workspace.settings_path.parent} does not exist", file=sys.stderr)
+        return 2
+    watcher = make_watcher(directories)
+    try:
+        while True:
+            changed = watcher.poll(timeout=None)
+            relevant = [p for p in changed
+                        if p == workspace.settings_path or p.parent == workspace.agents_dir]
+            if relevant:
+                report = workspace.on_change(relevant)
+                _print_report(report, len(workspace.all_failures()))
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+        workspace.loader.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
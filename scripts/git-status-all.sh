@@ -1,10 +1,11 @@
 #!/usr/bin/env bash
 # git-status-all.sh — Token-efficient JSON status for all jadecli repos
-# Usage: git-status-all.sh [--json|--table]
+# Usage: git-status-all.sh [--json|--table|--ndjson]
 set -euo pipefail
 
 PROJECTS_DIR="$HOME/projects"
 FORMAT="${1:---table}"
+MONOLITH_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 
 REPOS=(
   claude-objects dotfiles jade-claude-settings jade-cli jade-dev-assist
@@ -13,6 +14,15 @@ REPOS=(
   jadeflow-dev-scaffold
 )
 
+# The Python collector (jade_monolith.git_status) makes two git calls per repo
+# instead of ten, runs repos in parallel and routes fetches through the state
+# daemon when it is up.  Set JADE_GIT_STATUS_ENGINE=bash to use the loop below.
+if [[ "${JADE_GIT_STATUS_ENGINE:-python}" != "bash" ]] && command -v python3 &>/dev/null \
+    && [[ -d "$MONOLITH_ROOT/jade_monolith" ]]; then
+  PYTHONPATH="$MONOLITH_ROOT${PYTHONPATH:+:$PYTHONPATH}" \
+    exec python3 -m jade_monolith.git_status --projects-dir "$PROJECTS_DIR" "$FORMAT"
+fi
+
 get_repo_status() {
   local dir="$PROJECTS_DIR/$1"
   [[ -d "$dir/.git" ]] || { echo '{}'; return; }
@@ -23,6 +23,21 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+# Delegate to the concurrent engine (jade_monolith.health): parallel git
+# fetches, pooled GitHub requests with ETag revalidation, protocol handshakes
+# with the Docker services instead of port checks.  Same output and exit
+# codes.  The sequential implementation below is the fallback when Python is
+# unavailable, or when forced with JADE_HEALTH_ENGINE=bash.
+PY_ROOT="$(dirname "$SCRIPT_DIR")"
+if [[ "${JADE_HEALTH_ENGINE:-python}" != "bash" ]] && command -v python3 &>/dev/null \
+  && PYTHONPATH="$PY_ROOT" python3 -c 'import jade_monolith.health' 2>/dev/null; then
+  engine_args=(--root "$MONOLITH_DIR")
+  if [[ "$JSON_OUTPUT" == true ]]; then
+    engine_args+=(--json)
+  fi
+  PYTHONPATH="$PY_ROOT${PYTHONPATH:+:$PYTHONPATH}" exec python3 -m jade_monolith.health "${engine_args[@]}"
+fi
+
 # GitHub org and repos
 ORG="jadecli"
 REPOS=(
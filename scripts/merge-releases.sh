@@ -42,6 +42,21 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+# Delegate to the rate-limit-aware scheduler (jade_monolith.github): repos
+# scanned concurrently, merges paced to stay clear of secondary rate limits.
+# Same output.  The gh loop below is the fallback when Python is unavailable,
+# or when forced with JADE_GITHUB_ENGINE=bash.
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PY_ROOT="$(dirname "$SCRIPT_DIR")"
+if [[ "${JADE_GITHUB_ENGINE:-python}" != "bash" ]] && command -v python3 &>/dev/null \
+  && PYTHONPATH="$PY_ROOT" python3 -c 'import jade_monolith.github' 2>/dev/null; then
+  engine_args=(merge-releases)
+  if [[ "$DRY_RUN" == true ]]; then
+    engine_args+=(--dry-run)
+  fi
+  PYTHONPATH="$PY_ROOT${PYTHONPATH:+:$PYTHONPATH}" exec python3 -m jade_monolith.github "${engine_args[@]}"
+fi
+
 if [[ "$DRY_RUN" == true ]]; then
   echo "DRY RUN MODE - no merges will be performed"
   echo ""
@@ -5,6 +5,17 @@ set -euo pipefail
 
 FORMAT="${1:---table}"
 
+# Delegate to the rate-limit-aware scheduler (jade_monolith.github): every repo
+# fetched concurrently, within GitHub's rate limits.  Same output.  The gh loop
+# below is the fallback when Python is unavailable, or when forced with
+# JADE_GITHUB_ENGINE=bash.
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PY_ROOT="$(dirname "$SCRIPT_DIR")"
+if [[ "${JADE_GITHUB_ENGINE:-python}" != "bash" ]] && command -v python3 &>/dev/null \
+  && PYTHONPATH="$PY_ROOT" python3 -c 'import jade_monolith.github' 2>/dev/null; then
+  PYTHONPATH="$PY_ROOT${PYTHONPATH:+:$PYTHONPATH}" exec python3 -m jade_monolith.github pr-health "$FORMAT"
+fi
+
 REPOS=(
   claude-objects dotfiles jade-claude-settings jade-cli jade-dev-assist
   jade-docker jade-ecosystem-assist jade-ide jade-index jade-swarm
@@ -9,12 +9,23 @@ SESSION_NAME="jade-team"
 command -v tmux >/dev/null 2>&1 || { echo "tmux required: sudo apt install tmux"; exit 1; }
 command -v claude >/dev/null 2>&1 || { echo "claude required: npm install -g @anthropic-ai/claude-code"; exit 1; }
 
-# Kill existing session if present
-tmux kill-session -t "$SESSION_NAME" 2>/dev/null || true
-
 # Ensure Agent Teams is enabled
 export CLAUDE_CODE_EXPERIMENTAL_AGENT_TEAMS=1
 
+# Prefer the Python launcher: same layout, but all four agents start at once,
+# each pane is probed for readiness, and `--warm` keeps spare agents for
+# instant restarts. Re-running re-attaches to a running session (`--fresh`
+# rebuilds it). JADE_LEGACY_LAUNCH=1 forces the plain tmux sequence below.
+export PYTHONPATH="${REPO_ROOT}${PYTHONPATH:+:$PYTHONPATH}"
+if [ "${JADE_LEGACY_LAUNCH:-0}" != "1" ] && command -v python3 >/dev/null 2>&1 \
+    && python3 -c 'import jade_monolith.team_launcher' 2>/dev/null; then
+    cd "$REPO_ROOT"
+    exec python3 -m jade_monolith.team_launcher --session "$SESSION_NAME" start "$@"
+fi
+
+# Kill existing session if present
+tmux kill-session -t "$SESSION_NAME" 2>/dev/null || true
+
 # Source project tmux config if available
 TMUX_CONF="${REPO_ROOT}/.tmux.conf"
 if [ -f "$TMUX_CONF" ]; then
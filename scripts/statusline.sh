@@ -4,9 +4,23 @@
 set -euo pipefail
 
 MONOLITH="$HOME/projects/jade-monolith"
-CACHE_FILE="/tmp/jade-monolith-statusline-cache"
+CACHE_FILE="${JADE_STATUSLINE_CACHE:-/tmp/jade-monolith-statusline-cache}"
 CACHE_TTL=300  # 5 minutes
 
+# Written by the ecosystem state daemon (jade_monolith.daemon) after every
+# GitHub refresh: "<epoch> <ttl> <issues>i <prs>pr", where <ttl> is the
+# daemon's GitHub refresh interval.  Reading it needs no fork.
+JADE_CACHE="${JADE_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/jade-monolith}"
+SNAPSHOT="$JADE_CACHE/statusline"
+SNAPSHOT_GRACE=60   # a snapshot older than <ttl> + this: the daemon is not running
+# Touched on every render so the daemon does not exit while the statusline shows.
+HEARTBEAT="$JADE_CACHE/statusline.heartbeat"
+# Epoch of the last daemon start.  A start followed by no snapshot within
+# SPAWN_GRACE means the daemon cannot run here: use gh until SPAWN_RETRY.
+SPAWN_MARKER="$JADE_CACHE/statusline.spawned"
+SPAWN_GRACE=30
+SPAWN_RETRY=600
+
 # --- Git state (always live, fast) ---
 git_info() {
   cd "$MONOLITH"
@@ -25,8 +39,42 @@ git_info() {
   fi
 }
 
-# --- Ecosystem counts (cached, gh API) ---
+# --- Ecosystem counts (daemon snapshot, else cached gh API) ---
+_start_daemon() {
+  mkdir -p "$JADE_CACHE" && printf '%s\n' "$1" > "$SPAWN_MARKER" || return 1
+  # serve --detach is a no-op when a daemon is already running or starting
+  PYTHONPATH="$MONOLITH${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 -m jade_monolith.daemon serve --detach --root "$MONOLITH" >/dev/null 2>&1 &
+}
+
 ecosystem_counts() {
+  local now=${EPOCHSECONDS:-$(date +%s)} stamp=0 ttl="" counts="" spawned=0
+  : 2>/dev/null > "$HEARTBEAT" || true
+  if [[ -r "$SNAPSHOT" ]] && read -r stamp ttl counts < "$SNAPSHOT" \
+      && [[ $stamp =~ ^[0-9]+$ && $ttl =~ ^[0-9]+$ ]]; then
+    if (( now - stamp <= ttl + SNAPSHOT_GRACE )); then
+      echo "$counts"
+      return
+    fi
+  else
+    stamp=0 counts=""
+  fi
+
+  if [[ -d "$MONOLITH/jade_monolith" ]] && command -v python3 &>/dev/null; then
+    [[ -r "$SPAWN_MARKER" ]] && read -r spawned < "$SPAWN_MARKER" || true
+    [[ $spawned =~ ^[0-9]+$ ]] || spawned=0
+    # Start a daemon unless one was started since the last snapshot
+    if (( spawned <= stamp || now - spawned > SPAWN_RETRY )) && _start_daemon "$now"; then
+      echo "${counts:-...}"  # the daemon is fetching
+      return
+    fi
+    if (( now - spawned <= SPAWN_GRACE )); then
+      echo "${counts:-...}"  # started moments ago, still fetching
+      return
+    fi
+    # Started, but no snapshot since: fall back to gh below
+  fi
+
   # Return cached if fresh enough
   if [[ -f "$CACHE_FILE" ]]; then
     local age=$(( $(date +%s) - $(stat -c %Y "$CACHE_FILE" 2>/dev/null || echo 0) ))
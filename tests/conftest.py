@@ -2,46 +2,118 @@
 
 from __future__ import annotations
 
-import subprocess
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import Any
 
 import pytest
-import yaml
+
+from jade_monolith import releases, rules
+from jade_monolith.agents import load_agents
+from jade_monolith.claude_cli import cli_version
+from jade_monolith.fakes.claude import FakeClaude, FakeClaudeConfig
+from jade_monolith.fakes.registry import FakeRegistry
+from jade_monolith.index import AgentIndex
+from jade_monolith.shard import FixtureStore
+
+# --timing / --timing-json / --timing-openmetrics: where the suite's time goes
+# --impact-record / --impact-since REF: run only the tests a diff affects
+# --shard-*: worker side of `python -m jade_monolith.shard -n N`
+pytest_plugins = [
+    "jade_monolith.pytest_timing", "jade_monolith.pytest_impact", "jade_monolith.pytest_shard",
+]
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 AGENTS_DIR = REPO_ROOT / ".claude" / "agents"
 SETTINGS_PATH = REPO_ROOT / ".claude" / "settings.json"
 
+# Claude Code known tool/model/mode contracts live in jade_monolith.rules so the
+# watch mode and other non-pytest runners share them; update them there.
+KNOWN_TOOLS = rules.KNOWN_TOOLS
+KNOWN_MODELS = rules.KNOWN_MODELS
+KNOWN_PERMISSION_MODES = rules.KNOWN_PERMISSION_MODES
+REQUIRED_FRONTMATTER_FIELDS = rules.REQUIRED_FRONTMATTER_FIELDS
+
+
+TASK_TOOLS = "TaskCreate, TaskList, TaskUpdate, TaskGet"
+
+
+def agent_md(name: str, readonly: bool, model: str = "opus") -> str:
+    """Return a team-conformant agent file for ``name``, read-only or writable."""
+    if readonly:
+        tools = f"Read, Grep, Glob, {TASK_TOOLS}"
+        extra = "disallowedTools: [Write, Edit, NotebookEdit]\n"
+        desc = f"Read-only {name} for the team"
+    else:
+        tools = f"Read, Write, Edit, Bash, {TASK_TOOLS}"
+        extra = ""
+        desc = f"Writable {name} for the team"
+    return (
+        f"---\nname: {name}\ndescription: {desc}\nmodel: {model}\n"
+        f"tools: [{tools}]\n{extra}---\n\n# {name}\n\n"
+        "## Responsibilities\nDo the job described above, thoroughly.\n\n"
+        "## Constraints\nMUST NOT leave scope.\n"
+    )
+
+
+def assert_rule(check: Callable[[Any], list[str]], subjects: Iterable[Any]) -> None:
+    """Fail with every message ``check`` reports for the first failing subject.
+
+    The schema, smoke and compat tests are thin wrappers over the checks in
+    jade_monolith.rules, so pytest, watch mode and the smoke runner agree.
+    """
+    for subject in subjects:
+        problems = check(subject)
+        assert not problems, "\n".join(problems)
+
+
 # --------------------------------------------------------------------------- #
-# Claude Code known tool/model/mode contracts (update when Claude Code ships  #
-# breaking changes — the compat tests will catch drift automatically).        #
+# Offline mode: --fake-claude puts the stand-in CLI first on PATH and points  #
+# release lookups at the stand-in npm registry                                 #
 # --------------------------------------------------------------------------- #
 
-KNOWN_TOOLS: set[str] = {
-    # Core read
-    "Read", "Glob", "Grep",
-    # Core write
-    "Write", "Edit", "NotebookEdit",
-    # Execution
-    "Bash",
-    # Web
-    "WebSearch", "WebFetch",
-    # Task / subagent
-    "Task",
-    # Agent Teams task management
-    "TaskCreate", "TaskList", "TaskUpdate", "TaskGet",
-    # User interaction
-    "AskUserQuestion",
-    # MCP tools are dynamic — validated separately
-}
-
-KNOWN_MODELS: set[str] = {"opus", "sonnet", "haiku", "inherit"}
-
-KNOWN_PERMISSION_MODES: set[str] = {
-    "default", "acceptEdits", "dontAsk", "bypassPermissions", "plan",
-}
-
-REQUIRED_FRONTMATTER_FIELDS: set[str] = {"name", "description"}
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("jade", "jade-monolith options")
+    group.addoption(
+        "--fake-claude", action="store_true",
+        help="run against the offline stand-in claude/npm and npm registry "
+             "(jade_monolith.fakes)",
+    )
+    group.addoption(
+        "--fake-claude-config", metavar="PATH", type=Path,
+        help="JSON FakeClaudeConfig for --fake-claude (latency, errors, ...)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not config.getoption("fake_claude"):
+        return
+    config_path = config.getoption("fake_claude_config")
+    fake_config = (
+        FakeClaudeConfig.from_dict(json.loads(config_path.read_text()))
+        if config_path else FakeClaudeConfig()
+    )
+    bin_dir = Path(tempfile.mkdtemp(prefix="fake-claude-"))
+    config._fake_claude = FakeClaude(bin_dir, fake_config)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+    latest = fake_config.latest_version or fake_config.version
+    registry = FakeRegistry({releases.PACKAGE: latest})
+    config._fake_registry = registry.start()
+    os.environ[releases.REGISTRY_ENV] = registry.url
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    fake = getattr(config, "_fake_claude", None)
+    if fake is not None:
+        shutil.rmtree(fake.bin_dir, ignore_errors=True)
+    registry = getattr(config, "_fake_registry", None)
+    if registry is not None:
+        registry.stop()
 
 
 # --------------------------------------------------------------------------- #
@@ -66,36 +138,50 @@ def agent_files() -> list[Path]:
 
 
 @pytest.fixture(scope="session")
-def parsed_agents(agent_files: list[Path]) -> list[dict]:
-    """Parse YAML frontmatter + body from every agent .md file."""
-    agents = []
-    for path in agent_files:
-        content = path.read_text()
-        parts = content.split("---", 2)
-        if len(parts) >= 3:
-            meta = yaml.safe_load(parts[1]) or {}
-            body = parts[2].strip()
-        else:
-            meta = {}
-            body = content
-        meta["_path"] = path
-        meta["_body"] = body
-        agents.append(meta)
-    return agents
+def parsed_agents(agent_files: list[Path], shared_fixtures: FixtureStore) -> list[dict]:
+    """Parse YAML frontmatter + body from every agent .md file.
+
+    Goes through the shared cached loader, so unchanged files are not
+    re-parsed across tests or across runs, and is computed once per
+    sharded run rather than once per worker.
+    """
+    return shared_fixtures.get("parsed_agents", lambda: load_agents(agent_files))
+
+
+@pytest.fixture(scope="session")
+def agent_index(parsed_agents: list[dict]) -> AgentIndex:
+    """Lookup tables and tool-capability bitsets over parsed_agents, built once."""
+    return AgentIndex(parsed_agents)
 
 
 @pytest.fixture(scope="session")
-def claude_version() -> str | None:
-    """Return installed Claude Code CLI version, or None if not installed."""
-    try:
-        result = subprocess.run(
-            ["claude", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
-    return None
+def claude_version(shared_fixtures: FixtureStore) -> str | None:
+    """Return installed Claude Code CLI version, or None if not installed.
+
+    Read through the on-disk CLI probe cache: an unchanged install is only
+    spawned once across runs, workers and CI jobs.
+    """
+    return shared_fixtures.get("claude_version", cli_version)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch,
+) -> Path:
+    """Point JADE_CACHE_DIR at a fresh directory for every test.
+
+    Caches written by a test (throwaway package roots, CLI shims) never reach
+    the developer's ~/.cache.  Session fixtures are set up before this one,
+    so they keep the real cache and its cross-run reuse.
+    """
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("JADE_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def fake_claude(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeClaude:
+    """Offline claude/npm stand-ins, first on PATH for this test only."""
+    fake = FakeClaude(tmp_path / "fake-bin")
+    monkeypatch.setenv("PATH", fake.env()["PATH"])
+    return fake
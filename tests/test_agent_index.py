@@ -0,0 +1,110 @@
+"""Tests for the indexed team model used by team-level checks.
+
+Run with:  pytest tests/test_agent_index.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import rules
+from jade_monolith.index import DECLARED, DISALLOWED, EFFECTIVE, AgentIndex
+
+
+def _agent(name: str, tools, disallowed=None, **extra) -> dict:
+    agent = {"name": name, "tools": tools, "_path": Path(f"/agents/{name}.md"), **extra}
+    if disallowed is not None:
+        agent["disallowedTools"] = disallowed
+    return agent
+
+
+@pytest.fixture
+def index() -> AgentIndex:
+    return AgentIndex([
+        _agent("architect", ["Read", "Grep", "Write"], ["Write", "Edit", "NotebookEdit"],
+               model="opus", permissionMode="plan"),
+        _agent("implementer", ["Read", "Write", "Edit", "mcp__github__create_pr"],
+               model="opus"),
+        _agent("researcher", "Read, WebFetch", model="sonnet"),
+    ])
+
+
+@pytest.mark.tooling
+class TestAgentIndex:
+    """Verify lookups and the capability bitsets in both directions."""
+
+    def test_lookup_by_name_model_and_mode(self, index: AgentIndex):
+        assert index.get("implementer")["name"] == "implementer"
+        assert index.get("missing") is None
+        assert "architect" in index and len(index) == 3
+        assert [a["name"] for a in index.by_model("opus")] == ["architect", "implementer"]
+        assert [a["name"] for a in index.by_permission_mode("plan")] == ["architect"]
+        assert index.for_file("researcher")["name"] == "researcher"
+
+    def test_effective_tools_subtract_disallowed(self, index: AgentIndex):
+        arch = index.get("architect")
+        assert index.tools(arch, DECLARED) == {"Read", "Grep", "Write"}
+        assert index.tools(arch, EFFECTIVE) == {"Read", "Grep"}
+        assert index.overlap(arch, DECLARED, DISALLOWED) == {"Write"}
+        assert index.agents_with_overlap(DECLARED, DISALLOWED) == [arch]
+
+    def test_comma_separated_and_mcp_tools(self, index: AgentIndex):
+        assert index.tools(index.get("researcher")) == {"Read", "WebFetch"}
+        holders = index.with_tool("mcp__github__create_pr")
+        assert [a["name"] for a in holders] == ["implementer"]
+
+    def test_team_invariants_as_set_operations(self, index: AgentIndex):
+        writers = index.agents_with_any({"Write", "Edit"})
+        assert [a["name"] for a in index.members(writers)] == ["implementer"]
+        web_and_write = index.agents_with_any({"WebFetch"}) & writers
+        assert web_and_write == 0
+        readers = index.agents_with_all({"Read"})
+        assert readers == index.all
+
+    def test_queries_do_not_allocate_tool_bits(self, index: AgentIndex):
+        bits = dict(index._bit)
+        arch = index.get("architect")
+        assert not index.has_all(arch, {"Read", "mcp__jira__search"})
+        assert index.has_any(arch, {"Read", "mcp__jira__search"})
+        assert not index.has_any(arch, {"mcp__jira__search"})
+        assert index.mask({"mcp__jira__search"}) is None
+        assert index._bit == bits
+
+    def test_catalogue_rules_use_effective_tools(self):
+        index = AgentIndex([
+            _agent("scout", f"Read, WebFetch, Write, {', '.join(rules.TASK_TOOLS)}", "Write"),
+            _agent("porter", ["Read", "WebSearch", "Edit", "mcp__gh__pr"], ["Read"]),
+        ])
+        assert rules.no_web_and_write(index) == [
+            "porter: has both web access ({'WebSearch'}) and write access ({'Edit'}). "
+            "This is a prompt injection risk."
+        ]
+        assert rules.has_read_access(index) == ["porter: every agent must have Read tool access"]
+        assert [m.split(":")[0] for m in rules.has_task_tools(index)] == ["porter"]
+
+    def test_team_rules_take_an_index(self, index: AgentIndex):
+        failures = {
+            rule.nodeid.rsplit("::", 1)[1]: rule.check(index)
+            for rule in rules.rules_for("team")
+        }
+        assert failures["test_architect_is_readonly"] == []
+        assert failures["test_reviewer_is_readonly"] == ["reviewer agent not found"]
+        assert failures["test_all_four_agents_defined"] == [
+            "Missing agent definition: test-writer.md",
+            "Missing agent definition: reviewer.md",
+        ]
+
+    def test_agent_rules_parse_tools_like_the_index(self):
+        agent = _agent("auditor", "Read, Write, Edit", "Write",
+                       description="Read-only auditor of the codebase")
+        index = AgentIndex([agent])
+        assert rules.readonly_cannot_write(agent) == [
+            f"auditor.md: described as read-only but has unblocked write tools: "
+            f"{index.tools(agent) & rules.WRITE_TOOLS}"
+        ]
+        assert rules.no_tool_both_allowed_and_disallowed(agent) == [
+            "auditor.md: tools in BOTH allowed and disallowed: {'Write'}"
+        ]
+        assert rules.has_read_access(index) == []
@@ -0,0 +1,147 @@
+"""Tests for the shared, cached agent-definition loader.
+
+Run with:  pytest tests/test_agent_loader.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import agents
+from jade_monolith.agents import AgentLoader, AgentParseError
+
+ARCHITECT = """---
+name: architect
+description: Plans and designs, read-only
+model: opus
+tools: [Read, Grep]
+---
+
+# Architect
+
+## Responsibilities
+Plan the work.
+"""
+
+
+@pytest.fixture
+def agent_path(tmp_path: Path) -> Path:
+    path = tmp_path / "architect.md"
+    path.write_text(ARCHITECT)
+    return path
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "agents.pickle"
+
+
+def _forbid_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    def boom(text: str) -> dict:
+        raise AssertionError("frontmatter was re-parsed")
+
+    monkeypatch.setattr(agents, "_parse_frontmatter", boom)
+
+
+@pytest.mark.tooling
+class TestAgentLoader:
+    """Verify parsing, error reporting and both cache layers."""
+
+    def test_parses_frontmatter_and_body(self, agent_path: Path, cache_path: Path):
+        meta = AgentLoader(cache_path).load(agent_path)
+        assert meta["name"] == "architect"
+        assert meta["tools"] == ["Read", "Grep"]
+        assert meta["_path"] == agent_path
+        assert meta["_has_frontmatter"] is True
+        assert meta["_body"].startswith("# Architect")
+
+    def test_file_without_frontmatter(self, tmp_path: Path, cache_path: Path):
+        path = tmp_path / "plain.md"
+        path.write_text("Just a prompt.")
+        meta = AgentLoader(cache_path).load(path)
+        assert meta["_has_frontmatter"] is False
+        assert meta["_body"] == "Just a prompt."
+
+    @pytest.mark.parametrize("frontmatter, message", [
+        ("name: [unclosed", "invalid YAML"),
+        ("- a\n- b", "must be a mapping"),
+    ])
+    def test_invalid_frontmatter_raises(
+        self, tmp_path: Path, cache_path: Path, frontmatter: str, message: str,
+    ):
+        path = tmp_path / "broken.md"
+        path.write_text(f"---\n{frontmatter}\n---\nbody")
+        with pytest.raises(AgentParseError, match=message):
+            AgentLoader(cache_path).load(path)
+
+    @pytest.mark.parametrize("frontmatter", ["", "# just a comment"])
+    def test_empty_frontmatter_is_an_empty_mapping(
+        self, tmp_path: Path, cache_path: Path, frontmatter: str,
+    ):
+        path = tmp_path / "empty.md"
+        path.write_text(f"---\n{frontmatter}\n---\nbody")
+        meta = AgentLoader(cache_path).load(path)
+        assert meta["_has_frontmatter"] is True
+        assert "name" not in meta
+        assert meta["_body"] == "body"
+
+    def test_repeat_loads_are_memoised(
+        self, agent_path: Path, cache_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ):
+        loader = AgentLoader(cache_path)
+        first = loader.load(agent_path)
+        _forbid_parsing(monkeypatch)
+        second = loader.load(agent_path)
+        assert first == second
+        assert first is not second
+
+    def test_warm_cache_skips_yaml(
+        self, agent_path: Path, cache_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ):
+        AgentLoader(cache_path).load_many([agent_path])
+        assert cache_path.exists()
+        _forbid_parsing(monkeypatch)
+        meta = AgentLoader(cache_path).load(agent_path)
+        assert meta["name"] == "architect"
+
+    def test_parse_errors_are_cached_too(
+        self, tmp_path: Path, cache_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ):
+        path = tmp_path / "broken.md"
+        path.write_text("---\nname: [unclosed\n---\nbody")
+        with pytest.raises(AgentParseError):
+            AgentLoader(cache_path).load_many([path])
+        _forbid_parsing(monkeypatch)
+        with pytest.raises(AgentParseError, match="invalid YAML"):
+            AgentLoader(cache_path).load(path)
+
+    def test_content_change_invalidates_cache(self, agent_path: Path, cache_path: Path):
+        AgentLoader(cache_path).load_many([agent_path])
+        agent_path.write_text(ARCHITECT.replace("model: opus", "model: sonnet"))
+        meta = AgentLoader(cache_path).load(agent_path)
+        assert meta["model"] == "sonnet"
+
+    def test_dash_line_inside_a_yaml_value(self, tmp_path: Path, cache_path: Path):
+        path = tmp_path / "reviewer.md"
+        path.write_text('---\nname: reviewer\ndescription: "before --- after"\n'
+                        "notes: |\n  a\n  ---x\n---\nBody\n\n---\n\nMore body\n")
+        meta = AgentLoader(cache_path).load(path)
+        assert meta["description"] == "before --- after"
+        assert meta["notes"] == "a\n---x\n"
+        assert meta["_body"] == "Body\n\n---\n\nMore body"
+
+    def test_records_are_compact_and_read_the_body_once(
+        self, agent_path: Path, cache_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ):
+        meta = AgentLoader(cache_path).load(agent_path)
+        assert not hasattr(meta, "__dict__")
+        agent_path.write_text(ARCHITECT.replace("Plan the work.", "Plan it well."))
+        assert meta["_body"].endswith("Plan it well.")  # read on first use
+        monkeypatch.setattr("builtins.open", None)
+        assert dict(meta)["_body"] == meta["_body"]  # then kept
+        monkeypatch.undo()
+        with pytest.raises(TypeError):
+            meta["name"] = "other"  # type: ignore[index]
+
@@ -0,0 +1,83 @@
+"""Tests for the agent-validation scale benchmarks.
+
+Run with:  pytest tests/test_bench.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import bench, rules
+from jade_monolith.agents import AgentLoader
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.tooling
+class TestBenchmarks:
+    """Verify synthetic catalogues are realistic and budgets are enforced."""
+
+    def test_synthetic_agents_pass_every_agent_rule(self, tmp_path: Path):
+        paths = bench.synthesize_catalogue(tmp_path, 12, body_kb=2)
+        loader = AgentLoader(tmp_path / "cache.pickle")
+        for agent in loader.load_many(paths):
+            assert len(agent["_body"]) > 2048
+            for rule in rules.rules_for("agent"):
+                assert rule.check(agent) == [], rule.nodeid
+
+    def test_run_reports_every_benched_rule(self, tmp_path: Path):
+        report = bench.run_benchmarks([20], tmp_path, body_kb=1)
+        result = report["results"]["20"]
+        assert result["agents"] == 20
+        assert result["rule_failures"] == 0
+        assert set(result["rules_s"]) == {r.nodeid for r in bench.benched_rules()}
+        assert result["peak_rss_mb"] > 0
+        json.dumps(report)  # serialisable as-is
+
+    def test_benches_the_rules_the_tests_call(self):
+        nodeids = {r.nodeid for r in bench.benched_rules()}
+        assert f"{rules.SCHEMA}::TestToolPermissions::test_readonly_agents_cannot_write" in nodeids
+        assert f"{rules.COMPAT}::TestAgentTeamWorkflow::test_no_agent_has_web_and_write" in nodeids
+
+    def test_thresholds_flag_regressions_against_the_baseline(self):
+        report = {"results": {"1000": {
+            "agents": 1000, "parse_cold_s": 2.0, "parse_warm_s": 0.01,
+            "rules_total_s": 0.01, "rules_s": {"x::TestAgentBody::test_a": 0.5},
+            "rule_failures": 0, "peak_rss_mb": 900,
+        }}}
+        thresholds = json.loads((REPO_ROOT / "benchmarks" / "thresholds.json").read_text())
+        baseline = {"per_agent_us": {
+            "parse_cold": 200, "parse_warm": 60, "rules_total": 70, "x::TestAgentBody::test_a": 240,
+        }}
+        violations = bench.check_thresholds(report, thresholds, baseline)
+        assert len(violations) == 3
+        assert any("parse_cold 2000.00 µs/agent > budget 405.00" in v for v in violations)
+        assert any("test_a" in v for v in violations)
+        assert any("RSS" in v for v in violations)
+
+    def test_advisory_timings_gate_on_memory_only(self):
+        report = {"results": {"1000": {
+            "agents": 1000, "parse_cold_s": 2.0, "parse_warm_s": 0.01,
+            "rules_total_s": 0.01, "rules_s": {}, "rule_failures": 0, "peak_rss_mb": 900,
+        }}}
+        thresholds = {"peak_rss_mb": {"1000": 150}}
+        baseline = {"per_agent_us": {"parse_cold": 200}}
+        violations = bench.check_thresholds(report, thresholds, baseline, timings=False)
+        assert len(violations) == 1 and "RSS" in violations[0]
+        assert len(bench.check_timings(report, thresholds, baseline)) == 1
+
+    def test_baseline_keeps_the_slowest_size(self):
+        report = {"meta": {}, "results": {
+            str(n): {"agents": n, "parse_cold_s": n * us, "parse_warm_s": 0.0,
+                     "rules_total_s": 0.0, "rules_s": {}}
+            for n, us in ((10, 9e-3), (1000, 1e-6), (10000, 2e-6))
+        }}
+        baseline = bench.record_baseline(report)
+        assert baseline["per_agent_us"]["parse_cold"] == 2.0  # the 10-agent run is noise
+
+    def test_recorded_baseline_covers_every_benched_rule(self):
+        baseline = json.loads((REPO_ROOT / "benchmarks" / "baseline.json").read_text())
+        assert {r.nodeid for r in bench.benched_rules()} <= set(baseline["per_agent_us"])
@@ -0,0 +1,129 @@
+"""Tests for the CLI probe cache and the concurrent agent-loading probe runner.
+
+Uses a throwaway shell script in place of the real claude binary.
+
+Run with:  pytest tests/test_claude_cli.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.claude_cli import ProbeCache, run_agent_probes
+
+AGENTS = ["architect", "implementer", "test-writer", "reviewer", "helper", "docs"]
+
+
+def _stub(tmp_path: Path, body: str) -> str:
+    script = tmp_path / "claude"
+    script.write_text(f"#!/bin/sh\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.mark.tooling
+class TestAgentProbes:
+    """Verify probes overlap, stream, and time out independently."""
+
+    def test_wall_time_is_set_by_slowest_probe(self, tmp_path: Path):
+        claude = _stub(tmp_path, 'sleep 0.4; echo "{\\"agent\\": \\"$4\\"}"')
+        start = time.perf_counter()
+        results = run_agent_probes(AGENTS, claude=claude, concurrency=len(AGENTS))
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.4 * 3, f"probes did not overlap ({elapsed:.2f}s)"
+        assert list(results) == AGENTS
+        for name, result in results.items():
+            assert result.returncode == 0
+            assert f'"agent": "{name}"' in result.stdout
+
+    def test_concurrency_is_bounded(self, tmp_path: Path):
+        claude = _stub(tmp_path, "sleep 0.2")
+        start = time.perf_counter()
+        run_agent_probes(AGENTS[:4], claude=claude, concurrency=2)
+        assert time.perf_counter() - start >= 0.4
+
+    def test_output_is_streamed_per_line(self, tmp_path: Path):
+        claude = _stub(tmp_path, "echo one; echo two >&2")
+        lines: list[tuple[str, str, str]] = []
+        run_agent_probes(["architect"], claude=claude,
+                         on_line=lambda *args: lines.append(args))
+        assert sorted(lines) == [
+            ("architect", "stderr", "two"), ("architect", "stdout", "one"),
+        ]
+
+    def test_timeout_kills_only_the_slow_probe(self, tmp_path: Path):
+        claude = _stub(tmp_path, '[ "$4" = reviewer ] && sleep 30; echo ok')
+        results = run_agent_probes(["architect", "reviewer"], claude=claude, timeout=0.5)
+        assert results["reviewer"].timed_out
+        assert not results["architect"].timed_out
+        assert results["architect"].stdout == "ok\n"
+
+    def test_missing_binary(self, tmp_path: Path):
+        results = run_agent_probes(["architect"], claude=str(tmp_path / "nope"))
+        assert results["architect"].missing
+
+
+@pytest.mark.tooling
+class TestProbeCache:
+    """Verify introspection commands spawn once per unchanged binary."""
+
+    @pytest.fixture
+    def counting_claude(self, tmp_path: Path) -> tuple[Path, Path]:
+        calls = tmp_path / "calls"
+        script = Path(_stub(tmp_path, f'echo x >> {calls}; echo "2.1.34 (Claude Code)"'))
+        return script, calls
+
+    def _spawns(self, calls: Path) -> int:
+        return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+    def test_repeat_runs_spawn_nothing(self, tmp_path: Path, counting_claude):
+        claude, calls = counting_claude
+        cache = tmp_path / "probes.json"
+        first = ProbeCache(cache).run(claude, ["--version"], timeout=5)
+        second = ProbeCache(cache).run(claude, ["--version"], timeout=5)
+        assert first == second
+        assert first.stdout.strip() == "2.1.34 (Claude Code)"
+        assert self._spawns(calls) == 1
+
+    def test_command_line_is_part_of_the_key(self, tmp_path: Path, counting_claude):
+        claude, calls = counting_claude
+        cache = ProbeCache(tmp_path / "probes.json")
+        cache.run(claude, ["--version"], timeout=5)
+        cache.run(claude, ["--help"], timeout=5)
+        assert self._spawns(calls) == 2
+
+    def test_reinstalled_binary_is_reprobed(self, tmp_path: Path, counting_claude):
+        claude, calls = counting_claude
+        cache = tmp_path / "probes.json"
+        ProbeCache(cache).run(claude, ["--version"], timeout=5)
+        st = claude.stat()
+        os.utime(claude, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        ProbeCache(cache).run(claude, ["--version"], timeout=5)
+        assert self._spawns(calls) == 2
+
+    def test_entries_for_gone_or_replaced_binaries_are_dropped(
+        self, tmp_path: Path, counting_claude,
+    ):
+        claude, _ = counting_claude
+        cache = tmp_path / "probes.json"
+        (tmp_path / "old").mkdir()
+        gone = Path(_stub(tmp_path / "old", 'echo "2.0.0 (Claude Code)"'))
+        ProbeCache(cache).run(gone, ["--version"], timeout=5)
+        ProbeCache(cache).run(claude, ["--version"], timeout=5)
+        gone.unlink()
+        st = claude.stat()
+        os.utime(claude, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        ProbeCache(cache).run(claude, ["--help"], timeout=5)
+        entries = [json.loads(key) for key in json.loads(cache.read_text())]
+        assert [(entry[0], entry[-1]) for entry in entries] == [(str(claude), ["--help"])]
+
+    def test_failures_are_not_cached(self, tmp_path: Path):
+        claude = Path(_stub(tmp_path, "exit 3"))
+        cache = tmp_path / "probes.json"
+        assert ProbeCache(cache).run(claude, ["--help"], timeout=5).returncode == 3
+        assert not cache.exists()
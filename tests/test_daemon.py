@@ -0,0 +1,201 @@
+"""Tests for the ecosystem state daemon and the scripts that read from it.
+
+Run with:  pytest tests/test_daemon.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import daemon, health
+from jade_monolith.daemon import Section, StateDaemon
+from jade_monolith.fakes.github import FakeGitHub, FakeRepo
+from jade_monolith.repos import REPOS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class _Counter:
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return self.calls
+
+
+@pytest.mark.tooling
+class TestSection:
+    """Verify stale-while-revalidate and single-flight refreshes."""
+
+    def test_concurrent_waiters_share_one_refresh(self):
+        refresh = _Counter(delay=0.05)
+        section = Section("x", ttl=60, refresh=refresh)
+
+        async def run():
+            return await asyncio.gather(*(section.get(wait=True) for _ in range(20)))
+
+        assert asyncio.run(run()) == [1] * 20
+        assert refresh.calls == 1
+
+    def test_stale_value_is_served_while_revalidating(self):
+        refresh = _Counter(delay=0.05)
+        section = Section("x", ttl=0.01, refresh=refresh)
+
+        async def run():
+            first = await section.get(wait=True)
+            await asyncio.sleep(0.02)
+            served = await section.get()  # stale: answers at once, refreshes behind
+            await asyncio.sleep(0.1)
+            return first, served, section.value
+
+        assert asyncio.run(run()) == (1, 1, 2)
+
+    def test_failed_refresh_keeps_last_good_value(self):
+        refresh = _Counter()
+        section = Section("x", ttl=0, refresh=refresh)
+
+        async def run():
+            await section.get(wait=True)
+            refresh.fail = True
+            return await section.get(wait=True)
+
+        assert asyncio.run(run()) == 1
+        assert section.error == "RuntimeError: upstream down"
+
+
+@pytest.fixture
+def running_daemon(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch):
+    base = tmp_path_factory.mktemp("d")
+    socket = base / "s.sock"
+    monkeypatch.setenv("JADE_DAEMON_SOCKET", str(socket))
+    root = base / "monolith"
+    (root / "packages").mkdir(parents=True)
+    with FakeGitHub({repo: FakeRepo(issues=1, prs=1) for repo in REPOS}) as github:
+        state = StateDaemon(root, api=github.url, snapshot=base / "statusline")
+        thread = threading.Thread(target=asyncio.run, args=(state.serve(socket),))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while daemon.query({"op": "ping"}) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        yield state, github
+        daemon.query({"op": "stop"})
+        thread.join(5)
+
+
+@pytest.mark.tooling
+class TestStateDaemon:
+    """Verify the socket protocol, the statusline snapshot and fetch dedupe."""
+
+    def test_get_waits_for_first_refresh(self, running_daemon):
+        state, _ = running_daemon
+        response = daemon.query({"op": "get", "sections": ["github"], "wait": True})
+        counts = response["sections"]["github"]["value"]
+        assert counts["jade-cli"] == {"issues": 1, "prs": 1}
+        stamp, ttl, line = state.snapshot.read_text().split(" ", 2)
+        assert abs(int(stamp) - time.time()) < 60
+        assert int(ttl) == daemon.DEFAULT_TTLS["github"]
+        assert line == f"{len(REPOS)}i {len(REPOS)}pr\n"
+
+    def test_repeated_lookups_do_not_refetch(self, running_daemon):
+        state, github = running_daemon
+        for _ in range(5):
+            daemon.query({"op": "get", "sections": ["github"], "wait": True})
+        assert state.sections["github"].refreshes == 1
+        assert len(github.requests) == 2 * len(REPOS)
+
+    def test_unknown_section_is_an_error(self, running_daemon):
+        assert daemon.query({"op": "get", "sections": ["nope"]}) is None
+
+    def test_fetch_skips_recently_fetched_paths(self, running_daemon, tmp_path: Path):
+        subprocess.run(["git", "init", "-q", str(tmp_path / "repo")], check=True)
+        path = str(tmp_path / "repo")
+        first = daemon.query({"op": "fetch", "paths": [path]}, timeout=30)
+        second = daemon.query({"op": "fetch", "paths": [path]}, timeout=30)
+        assert first["fetched"] == [path]
+        assert second["skipped"] == [path]
+
+    def test_health_check_reads_daemon_state(self, running_daemon):
+        state, github = running_daemon
+        result = health.health_from_daemon(state.root)
+        assert result is not None
+        report, _ = result
+        assert report["github"]["core_prs"] == len(REPOS) - 1
+        before = len(github.requests)
+        health.health_from_daemon(state.root)
+        assert len(github.requests) == before
+        assert health.health_from_daemon(state.root / "elsewhere") is None
+
+    def test_statusline_heartbeat_keeps_the_daemon_alive(self, tmp_path: Path):
+        state = StateDaemon(tmp_path, heartbeat=tmp_path / "heartbeat")
+        state.last_request -= 7200
+        assert state.idle_for() >= 7200  # no heartbeat yet
+        (tmp_path / "heartbeat").touch()
+        assert state.idle_for() < 5
+
+    def test_no_daemon_answers_none(self, tmp_path: Path):
+        assert daemon.query({"op": "ping"}, path=tmp_path / "missing.sock") is None
+
+
+class _Statusline:
+    """statusline.sh against a throwaway monolith, cache dir and gh cache."""
+
+    def __init__(self, tmp_path: Path) -> None:
+        monolith = tmp_path / "projects" / "jade-monolith"
+        subprocess.run(["git", "init", "-q", "-b", "main", str(monolith)], check=True)
+        (monolith / "jade_monolith").mkdir()
+        self.cache = tmp_path / "cache"
+        self.cache.mkdir()
+        self.gh_cache = tmp_path / "gh-cache"
+        self.env = {**os.environ, "HOME": str(tmp_path), "JADE_CACHE_DIR": str(self.cache),
+                    "JADE_STATUSLINE_CACHE": str(self.gh_cache),
+                    "PATH": f"{Path(sys.executable).parent}:/usr/bin:/bin"}
+
+    def run(self) -> str:
+        out = subprocess.run(
+            ["bash", str(REPO_ROOT / "scripts" / "statusline.sh")],
+            capture_output=True, text=True, env=self.env, check=True,
+        )
+        return out.stdout.strip()
+
+
+@pytest.fixture
+def statusline(tmp_path: Path) -> _Statusline:
+    return _Statusline(tmp_path)
+
+
+@pytest.mark.tooling
+class TestStatusline:
+    """statusline.sh reads the daemon's snapshot without touching the network."""
+
+    def test_reads_fresh_snapshot(self, statusline: _Statusline):
+        (statusline.cache / "statusline").write_text(f"{int(time.time())} 300 4i 2pr\n")
+        assert statusline.run() == "jade-monolith main | 4i 2pr"
+        assert (statusline.cache / "statusline.heartbeat").exists()
+
+    def test_stale_snapshot_waits_for_a_recent_start(self, statusline: _Statusline):
+        now = int(time.time())
+        (statusline.cache / "statusline").write_text(f"{now - 400} 300 4i 2pr\n")
+        (statusline.cache / "statusline.spawned").write_text(f"{now - 5}\n")
+        assert statusline.run() == "jade-monolith main | 4i 2pr"
+        assert (statusline.cache / "statusline.spawned").read_text() == f"{now - 5}\n"
+
+    def test_failed_start_falls_back_to_gh_cache(self, statusline: _Statusline):
+        now = int(time.time())
+        (statusline.cache / "statusline.spawned").write_text(f"{now - 100}\n")
+        statusline.gh_cache.write_text("7i 1pr\n")
+        assert statusline.run() == "jade-monolith main | 7i 1pr"
+        assert (statusline.cache / "statusline.spawned").read_text() == f"{now - 100}\n"
@@ -0,0 +1,92 @@
+"""Tests for ecosystem-wide validation of the packages' agent definitions.
+
+Run with:  pytest tests/test_ecosystem.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import rules
+from jade_monolith.ecosystem import discover, main, validate_all
+
+HELPER = (
+    "---\nname: {name}\ndescription: Read-only helper for the package\nmodel: sonnet\n"
+    "tools: [Read, Grep, Glob, TaskCreate, TaskList, TaskUpdate, TaskGet]\n"
+    "disallowedTools: [Write, Edit, NotebookEdit]\n---\n\n# {name}\n\n"
+    "## Responsibilities\nAnswer questions about this package.\n\n"
+    "## Constraints\nMUST NOT edit files.\n"
+)
+
+
+def _package(root: Path, name: str, agents: dict[str, str], settings: str | None = None) -> None:
+    claude = root / name / ".claude"
+    (claude / "agents").mkdir(parents=True)
+    for stem, text in agents.items():
+        (claude / "agents" / f"{stem}.md").write_text(text)
+    if settings is not None:
+        (claude / "settings.json").write_text(settings)
+
+
+@pytest.fixture
+def ecosystem(tmp_path: Path) -> Path:
+    packages = tmp_path / "packages"
+    _package(packages, "jade-swarm", {"swarm-lead": HELPER.format(name="swarm-lead")}, "{}")
+    _package(packages, "jade-dev-assist", {"assist": HELPER.format(name="assistant")})
+    _package(packages, "claude-objects", {"objects": HELPER.format(name="objects")},
+             "{not json")
+    _package(packages / "jade-cli" / "node_modules", "dep", {"x": "---\nbad: [\n---\n"})
+    (packages / "dotfiles").mkdir()
+    return tmp_path
+
+
+@pytest.mark.tooling
+class TestEcosystem:
+    """Discovery and per-package reports, in-process and in the pool."""
+
+    def test_discover_skips_vendored_and_bare_packages(self, ecosystem: Path):
+        assert [p.name for p in discover(ecosystem)] == [
+            "claude-objects", "jade-dev-assist", "jade-swarm"]
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_one_report_per_package(self, ecosystem: Path, workers: int):
+        reports = {r.package: r for r in validate_all(ecosystem, workers=workers)}
+        assert set(reports) == {"packages/jade-swarm", "packages/jade-dev-assist",
+                                "packages/claude-objects"}
+        assert reports["packages/jade-swarm"].ok
+        assert reports["packages/jade-swarm"].agents == 1
+        assert {n.rsplit("::", 1)[-1] for n, _ in reports["packages/jade-dev-assist"].failures
+                } == {"test_name_matches_filename"}
+        assert [n for n, _ in reports["packages/claude-objects"].failures] == [
+            rules.SETTINGS_RULE]
+
+    def test_team_rules_apply_to_the_monolith(self, ecosystem: Path):
+        _package(ecosystem, ".", {"helper": HELPER.format(name="helper")}, "{}")
+        reports = {r.package: r for r in validate_all(ecosystem, workers=1)}
+        assert any("Missing team agents" in m for _, m in reports["."].failures)
+        assert reports["packages/jade-swarm"].ok
+        team = {r.package: r for r in validate_all(ecosystem, workers=1, team=True)}
+        assert not team["packages/jade-swarm"].ok
+
+    def test_cli_json(self, ecosystem: Path, capsys: pytest.CaptureFixture[str]):
+        assert main(["--root", str(ecosystem), "--json", "--workers", "2"]) == 1
+        report = json.loads(capsys.readouterr().out)
+        assert report["failing"] == ["packages/claude-objects", "packages/jade-dev-assist"]
+        assert [p["package"] for p in report["packages"]] == [
+            "packages/claude-objects", "packages/jade-dev-assist", "packages/jade-swarm"]
+
+    def test_caches_of_removed_packages_are_pruned(self, ecosystem: Path, isolated_cache_dir: Path):
+        list(validate_all(ecosystem, workers=1))
+        caches = isolated_cache_dir / "ecosystem"
+        assert len(list(caches.glob("*.pickle"))) == 3
+        shutil.rmtree(ecosystem / "packages" / "jade-swarm")
+        (caches / "0123456789abcdef.pickle").write_bytes(b"")  # left by an older version
+        list(validate_all(ecosystem, workers=1))
+        assert len(list(caches.glob("*.pickle"))) == 2
+        roots = json.loads((caches / "roots.json").read_text())
+        assert sorted(Path(root).name for root in roots.values()) == [
+            "claude-objects", "jade-dev-assist"]
@@ -0,0 +1,98 @@
+"""Tests for the offline claude/npm stand-in.
+
+Run with:  pytest tests/test_fake_claude.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.claude_cli import cli_version, run_agent_probes
+from jade_monolith.fakes.claude import FakeClaude
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    agents = tmp_path / "project" / ".claude" / "agents"
+    agents.mkdir(parents=True)
+    for name in ("architect", "reviewer"):
+        (agents / f"{name}.md").write_text(f"---\nname: {name}\n---\nbody\n")
+    return agents.parent.parent
+
+
+def _run(*args: str, cwd: Path | None = None, timeout: float = 10) -> subprocess.CompletedProcess:
+    return subprocess.run(list(args), capture_output=True, text=True, cwd=cwd,
+                          timeout=timeout, stdin=subprocess.DEVNULL)
+
+
+@pytest.mark.tooling
+class TestFakeClaude:
+    """Verify the stand-in honours the CLI surface and its injected behaviour."""
+
+    def test_version_and_help(self, fake_claude: FakeClaude):
+        fake_claude.configure(version="2.1.99", help_tools=["Read", "TeleportFile"])
+        assert _run("claude", "--version").stdout == "2.1.99 (Claude Code)\n"
+        assert "TeleportFile" in _run("claude", "--help").stdout
+        assert cli_version() == "2.1.99 (Claude Code)"
+
+    def test_reconfigure_invalidates_probe_cache(self, fake_claude: FakeClaude):
+        fake_claude.configure(version="2.1.40")
+        assert cli_version() == "2.1.40 (Claude Code)"
+        fake_claude.configure(version="2.1.41")
+        assert cli_version() == "2.1.41 (Claude Code)"
+
+    def test_json_result(self, fake_claude: FakeClaude, project: Path):
+        fake_claude.configure(result="{agent} says hi")
+        out = _run("claude", "-p", "hello", "--agent", "architect",
+                   "--output-format", "json", cwd=project)
+        assert out.returncode == 0
+        assert json.loads(out.stdout)["result"] == "architect says hi"
+
+    def test_stream_json_cadence(self, fake_claude: FakeClaude, project: Path):
+        fake_claude.configure(result="abcdef", chunks=3, chunk_interval=0.1)
+        proc = subprocess.Popen(
+            ["claude", "-p", "x", "--agent", "reviewer", "--output-format", "stream-json"],
+            stdout=subprocess.PIPE, text=True, cwd=project,
+        )
+        arrivals = []
+        events = []
+        for line in proc.stdout:
+            arrivals.append(time.monotonic())
+            events.append(json.loads(line))
+        proc.wait()
+        assert [e["type"] for e in events] == ["system", "assistant", "assistant",
+                                               "assistant", "result"]
+        assert events[-1]["result"] == "abcdef"
+        assert arrivals[-1] - arrivals[1] >= 0.3
+
+    def test_unknown_agent_fails_like_the_real_cli(self, fake_claude: FakeClaude, project: Path):
+        out = _run("claude", "-p", "x", "--agent", "ghost", cwd=project)
+        assert out.returncode == 1
+        assert "not found" in out.stderr.lower()
+
+    def test_per_agent_error_and_hang(self, fake_claude: FakeClaude, project: Path):
+        fake_claude.configure(agents={
+            "architect": {"error": "API Error: 529 overloaded"},
+            "reviewer": {"hang": True},
+        })
+        results = run_agent_probes(["architect", "reviewer"], cwd=project, timeout=1.0)
+        assert "529" in results["architect"].stderr
+        assert results["architect"].returncode == 1
+        assert results["reviewer"].timed_out
+
+    def test_latency_overlaps_across_probes(self, fake_claude: FakeClaude, project: Path):
+        fake_claude.configure(startup_latency=0.3, response_latency=0.3)
+        start = time.perf_counter()
+        run_agent_probes(["architect", "reviewer"], cwd=project)
+        assert time.perf_counter() - start < 1.2
+
+    def test_npm_view_and_call_log(self, fake_claude: FakeClaude):
+        fake_claude.configure(latest_version="2.2.0")
+        out = _run("npm", "view", "@anthropic-ai/claude-code", "version")
+        assert out.stdout.strip() == "2.2.0"
+        assert fake_claude.calls()[-1]["tool"] == "npm"
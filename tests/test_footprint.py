@@ -0,0 +1,143 @@
+"""Tests for the system-prompt footprint analyzer.
+
+Run with:  pytest tests/test_footprint.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import footprint
+from jade_monolith.agents import AgentLoader
+from jade_monolith.footprint import (
+    Budgets,
+    analyze,
+    budget_problem,
+    estimate_tokens,
+    find_includes,
+    main,
+    measure,
+    split_sections,
+)
+
+PROMPT = """# Reviewer
+
+Intro line.
+
+## Responsibilities
+- Review every change. See @docs/style.md for conventions.
+
+```markdown
+# Not a heading
+@not/an/import.md
+```
+
+## Constraints
+- MUST NOT approve without tests; mail ops@example.com, not `@literal`.
+"""
+
+
+@pytest.fixture
+def tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / "repo"
+    agents_dir = root / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    (agents_dir / "reviewer.md").write_text(
+        f"---\nname: reviewer\ndescription: Reviews\nmodel: haiku\n---\n{PROMPT}")
+    (agents_dir / "docs").mkdir()
+    (agents_dir / "docs" / "style.md").write_text("Use black. @../../../shared.md\n")
+    # imports style.md back: a cycle
+    (root / "shared.md").write_text("word " * 400 + "@.claude/agents/docs/style.md\n")
+    (agents_dir / "tiny.md").write_text(
+        "---\nname: tiny\ndescription: Tiny\npromptBudget: {opus: 5, haiku: 1000}\n"
+        "model: opus\n---\nDo the small job well.\n")
+    return root
+
+
+def _load(root: Path, name: str) -> dict:
+    return AgentLoader(root.parent / "loader.pickle").load(
+        root / ".claude" / "agents" / f"{name}.md")
+
+
+@pytest.mark.tooling
+class TestEstimates:
+    """Token approximation, sections and @imports."""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("Hello, world!") == 6  # Hell o , worl d !
+        assert estimate_tokens("2026-10-18\n\n") == 7  # 202 6 - 10 - 18 \n\n
+        prose = "The reviewer checks every change against the approved plan. " * 50
+        assert 3.0 < len(prose) / estimate_tokens(prose) < 4.5
+
+    def test_sections_skip_code_blocks(self):
+        sections = split_sections(PROMPT, "reviewer.md")
+        assert [s.heading for s in sections] == ["Reviewer", "Responsibilities", "Constraints"]
+        assert sum(s.tokens for s in sections) == estimate_tokens(PROMPT.rstrip("\n"))
+
+    def test_includes_skip_code_mail_and_spans(self):
+        assert find_includes(PROMPT) == ["docs/style.md"]
+
+    def test_includes_resolve_recursively_once(self, tree: Path):
+        result = measure(_load(tree, "reviewer"), Budgets())
+        included = [s for s in result.sections if s.included]
+        assert [Path(s.source).name for s in included] == ["style.md", "shared.md"]
+        assert result.tokens > 400 and not result.missing_includes
+
+    def test_missing_include_is_reported(self, tmp_path: Path):
+        agent = {"_path": tmp_path / "a.md", "_body": "Read @nope.md first.", "name": "a"}
+        assert measure(agent, Budgets()).missing_includes == ["nope.md"]
+
+
+@pytest.mark.tooling
+class TestBudgets:
+    """Frontmatter beats config beats per-model beats the default."""
+
+    BUDGETS = Budgets(models={"haiku": 300}, agents={"reviewer": 200}, default=100)
+
+    @pytest.mark.parametrize("agent, expected", [
+        ({"name": "x", "model": "opus", "promptBudget": 50}, 50),
+        ({"name": "x", "model": "opus", "promptBudget": {"opus": 60}}, 60),
+        ({"name": "x", "model": "opus", "promptBudget": {"haiku": 60}}, 100),
+        ({"name": "reviewer", "model": "haiku"}, 200),
+        ({"name": "x", "model": "haiku"}, 300),
+        ({"name": "x"}, 100),
+    ])
+    def test_precedence(self, agent: dict, expected: int):
+        assert self.BUDGETS.for_agent({"_path": "a.md", **agent}) == expected
+
+    def test_repo_budgets_file(self, tree: Path):
+        reviewer = _load(tree, "reviewer")
+        assert budget_problem(reviewer) is None
+        (tree / footprint.BUDGETS_FILE).parent.mkdir()
+        (tree / footprint.BUDGETS_FILE).write_text(json.dumps({"models": {"haiku": 300}}))
+        assert "over its haiku budget of 300" in budget_problem(reviewer)
+
+    def test_frontmatter_budget_per_model(self, tree: Path):
+        assert "over its opus budget of 5" in budget_problem(_load(tree, "tiny"))
+
+
+@pytest.mark.tooling
+class TestAnalyzer:
+    """Whole catalogues, serially or across processes, and the CLI."""
+
+    def test_parallel_matches_serial(self, tree: Path, monkeypatch: pytest.MonkeyPatch):
+        agents = [_load(tree, "reviewer"), _load(tree, "tiny")] * 3
+        monkeypatch.setattr(footprint, "PARALLEL_MIN_AGENTS", 2)
+        assert analyze(agents, workers=3) == analyze(agents, workers=1)
+
+    def test_cli(self, tree: Path, capsys: pytest.CaptureFixture[str]):
+        assert main(["--root", str(tree), "--json", "--top", "2"]) == 1
+        report = json.loads(capsys.readouterr().out)
+        assert {a["agent"]: a["over_budget"] for a in report["agents"]} == {
+            "reviewer": False, "tiny": True}
+        assert [s["source"].rsplit("/", 1)[-1] for s in report["largest_sections"]] == [
+            "shared.md", "reviewer.md"]
+
+        assert main(["--root", str(tree), "--top", "1"]) == 1
+        out = capsys.readouterr().out
+        assert "tiny" in out and "OVER" in out
+        assert "@" + str(tree / "shared.md") in out
@@ -0,0 +1,126 @@
+"""Tests for the parallel git status collector behind git-status-all.sh.
+
+Run with:  pytest tests/test_git_status.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import git_status
+from jade_monolith.git_status import RepoStatus, parse_status, repo_status
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = REPO_ROOT / "scripts" / "git-status-all.sh"
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True,
+                          text=True).stdout
+
+
+@pytest.fixture(scope="module")
+def projects(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Three repos: clean and tracking, dirty and ahead, detached with extras."""
+    base = tmp_path_factory.mktemp("projects")
+    origin = base / "origin.git"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(origin)], check=True)
+    seed = base / "seed"
+    subprocess.run(["git", "clone", "-q", str(origin), str(seed)], check=True,
+                   capture_output=True)
+    for name in ("a.txt", "b.txt"):
+        (seed / name).write_text("x\n")
+    git(seed, "add", ".")
+    git(seed, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "seed")
+    git(seed, "push", "-q", "origin", "main")
+
+    projects = base / "projects"
+    for name in ("jade-cli", "jade-ide", "dotfiles"):
+        subprocess.run(["git", "clone", "-q", str(origin), str(projects / name)], check=True,
+                       capture_output=True)
+
+    dirty = projects / "jade-ide"
+    git(dirty, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q",
+        "--allow-empty", "-m", "ahead")
+    (dirty / "a.txt").write_text("changed\n")
+    (dirty / "b.txt").write_text("staged\n")
+    git(dirty, "add", "b.txt")
+    (dirty / "new").mkdir()
+    (dirty / "new" / "one").write_text("")
+    (dirty / "new" / "two").write_text("")
+
+    detached = projects / "dotfiles"
+    (detached / "a.txt").write_text("stashed\n")
+    git(detached, "-c", "user.name=t", "-c", "user.email=t@t", "stash", "-q")
+    git(detached, "branch", "scratch")
+    git(detached, "branch", "wip")
+    git(detached, "worktree", "add", "-q", str(base / "wt"), "wip")
+    git(detached, "checkout", "-q", "--detach")
+    return projects
+
+
+@pytest.mark.tooling
+class TestRepoStatus:
+    """Verify the two-call collector against the fields the script reported."""
+
+    def test_clean_tracking_repo(self, projects: Path):
+        status = repo_status(projects / "jade-cli")
+        assert status.to_json() == {
+            "repo": "jade-cli", "branch": "main", "upstream": "origin/main",
+            "ahead": 0, "behind": 0, "untracked": 0, "modified": 0, "staged": 0,
+            "stash": 0, "untracked_branches": "", "worktrees": 0,
+        }
+        assert status.head == status.origin_main
+
+    def test_dirty_repo_ahead_of_upstream(self, projects: Path):
+        status = repo_status(projects / "jade-ide")
+        assert (status.ahead, status.untracked, status.modified, status.staged) == (1, 2, 1, 1)
+        assert status.dirty
+
+    def test_detached_repo_with_stash_branches_and_worktree(self, projects: Path):
+        status = repo_status(projects / "dotfiles")
+        assert status.branch == "DETACHED"
+        assert status.upstream == "none"
+        assert status.stash == 1
+        assert status.untracked_branches == "scratch,wip"
+        assert status.worktrees == 1
+
+    def test_missing_checkout_is_none(self, tmp_path: Path):
+        assert repo_status(tmp_path / "nope") is None
+
+    def test_gone_upstream_reads_as_none(self):
+        status = RepoStatus(repo="r")
+        parse_status("# branch.oid abc\n# branch.head feat\n# branch.upstream origin/feat\n",
+                     status)
+        assert status.upstream == "none"
+
+
+@pytest.mark.tooling
+class TestGitStatusAll:
+    """git-status-all.sh output is unchanged by the Python engine."""
+
+    def _run(self, projects: Path, *args: str, engine: str = "python") -> str:
+        env = {**os.environ, "HOME": str(projects.parent),
+               "JADE_GIT_STATUS_ENGINE": engine, "JADE_DAEMON_SOCKET": "/nonexistent"}
+        return subprocess.run(["bash", str(SCRIPT), *args], capture_output=True, text=True,
+                              env=env, check=True).stdout
+
+    def test_json_matches_bash_engine(self, projects: Path):
+        python = json.loads(self._run(projects, "--json"))
+        bash = json.loads(self._run(projects, "--json", engine="bash"))
+        assert python == bash
+        assert [r.get("repo") for r in python if r] == ["dotfiles", "jade-cli", "jade-ide"]
+
+    def test_table_matches_bash_engine(self, projects: Path):
+        assert self._run(projects, "--table") == self._run(projects, "--table", engine="bash")
+
+    def test_ndjson_streams_present_repos(self, projects: Path, capsys):
+        git_status.main(["--ndjson", "--no-fetch", "--projects-dir", str(projects)])
+        lines = capsys.readouterr().out.splitlines()
+        assert sorted(json.loads(line)["repo"] for line in lines) == [
+            "dotfiles", "jade-cli", "jade-ide"]
@@ -0,0 +1,237 @@
+"""Tests for the rate-limit-aware GitHub scheduler and the commands built on it.
+
+Run with:  pytest tests/test_github.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from jade_monolith import github
+from jade_monolith.fakes.github import FakeGitHub, FakeRepo
+from jade_monolith.github import GitHub, RateLimitExceededError, TokenBucket
+from jade_monolith.http import HTTPClient
+from jade_monolith.repos import REPOS
+
+
+def _pulls(fake: FakeGitHub, repo: str) -> str:
+    return f"{fake.url}/repos/jadecli/{repo}/pulls?state=open&per_page=100"
+
+
+async def _scheduled(fake: FakeGitHub, work, *, max_per_host: int = 6, **options):
+    async with HTTPClient(max_per_host=max_per_host) as client:
+        gh = GitHub(client, api=fake.url, **{"mutation_interval": 0, **options})
+        return await work(gh), gh.stats
+
+
+@pytest.mark.tooling
+class TestTokenBucket:
+    """The bucket follows the headers and sleeps until the reset when empty."""
+
+    def _bucket(self, now: list[float], slept: list[float]) -> TokenBucket:
+        async def sleep(seconds: float) -> None:
+            slept.append(seconds)
+            now[0] += seconds
+
+        return TokenBucket(clock=lambda: now[0], sleep=sleep)
+
+    def test_waits_for_the_reset_once_spent(self):
+        now, slept = [1000.0], []
+        bucket = self._bucket(now, slept)
+        asyncio.run(bucket.acquire(60))  # unknown budget: straight through
+        bucket.release({"x-ratelimit-limit": "2", "x-ratelimit-remaining": "1",
+                        "x-ratelimit-reset": "1010"})
+        assert asyncio.run(bucket.acquire(60)) == 0
+        bucket.release({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1010"})
+        assert asyncio.run(bucket.acquire(60)) == pytest.approx(11.0)
+        assert slept == [pytest.approx(11.0)] and bucket.remaining == 2
+
+    def test_in_flight_requests_count_against_the_budget(self):
+        now, slept = [1000.0], []
+        bucket = self._bucket(now, slept)
+        bucket.release({"x-ratelimit-limit": "5", "x-ratelimit-remaining": "2",
+                        "x-ratelimit-reset": "1100"})
+
+        async def run():
+            await bucket.acquire(1)
+            await bucket.acquire(1)
+            third = asyncio.create_task(bucket.acquire(1))
+            await asyncio.sleep(0)
+            assert not third.done()  # waits for the two in flight to report
+            bucket.release({"x-ratelimit-remaining": "1", "x-ratelimit-reset": "1100"})
+            bucket.release({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1100"})
+            await third
+
+        with pytest.raises(RateLimitExceededError):
+            asyncio.run(run())  # spent, and the reset is 100 s away
+
+    def test_only_one_request_probes_an_unknown_budget(self):
+        bucket = TokenBucket()
+
+        async def run():
+            await bucket.acquire(1)
+            second = asyncio.create_task(bucket.acquire(1))
+            await asyncio.sleep(0)
+            blocked = not second.done()
+            bucket.release({"x-ratelimit-remaining": "10", "x-ratelimit-reset": "9999999999"})
+            await second
+            return blocked
+
+        assert asyncio.run(run()) and bucket.in_flight == 1
+
+    def test_no_rate_limit_headers_stop_the_gating(self):
+        bucket = TokenBucket()
+
+        async def run():
+            await bucket.acquire(1)
+            second = asyncio.create_task(bucket.acquire(1))
+            await asyncio.sleep(0)
+            bucket.release(None)  # a transport error, or GHES with rate limiting disabled
+            await second
+            await asyncio.wait_for(bucket.acquire(1), 1)  # no longer one at a time
+            bucket.release({"x-ratelimit-remaining": "1", "x-ratelimit-reset": "9999999999"})
+            gated = asyncio.create_task(bucket.acquire(1))
+            await asyncio.sleep(0)
+            return not gated.done()
+
+        assert asyncio.run(run())  # a reported budget is followed again
+
+    def test_stale_headers_never_raise_the_budget(self):
+        bucket = TokenBucket()
+        bucket.release({"x-ratelimit-remaining": "3", "x-ratelimit-reset": "2000"})
+        bucket.release({"x-ratelimit-remaining": "7", "x-ratelimit-reset": "2000"})
+        bucket.release({"x-ratelimit-remaining": "9", "x-ratelimit-reset": "1000"})
+        assert (bucket.remaining, bucket.reset) == (3, 2000)
+
+
+@pytest.mark.tooling
+class TestScheduler:
+    """Pacing, dedupe and backoff against the GitHub stand-in."""
+
+    def test_stays_within_the_rate_limit(self):
+        repos = {repo: FakeRepo(prs=1) for repo in REPOS}
+        with FakeGitHub(repos, rate_limit=10, rate_window=1.0) as fake:
+            async def work(gh: GitHub):
+                return await asyncio.gather(*(gh.get(_pulls(fake, r)) for r in REPOS))
+
+            responses, stats = asyncio.run(_scheduled(fake, work))
+        assert all(r.status == 200 for r in responses)
+        assert {r.status for r in fake.requests} == {200}
+        assert stats.waited_s > 0 and stats.requests == len(REPOS)
+
+    def test_unlimited_server_gets_the_pool_concurrency(self):
+        repos = {repo: FakeRepo() for repo in REPOS}
+        with FakeGitHub(repos, latency=0.05, rate_limit=None) as fake:
+            entries, _ = asyncio.run(_scheduled(fake, github.pr_health, max_per_host=4))
+            assert fake.peak_in_flight == 4
+        assert len(entries) == len(REPOS)
+
+    def test_identical_gets_share_one_request(self):
+        with FakeGitHub({"jade-cli": FakeRepo(prs=2)}, latency=0.05) as fake:
+            async def work(gh: GitHub):
+                first = await asyncio.gather(*(gh.get(_pulls(fake, "jade-cli"))
+                                               for _ in range(10)))
+                return first, await gh.get(_pulls(fake, "jade-cli"))
+
+            (first, again), stats = asyncio.run(_scheduled(fake, work))
+        assert len(fake.requests) == 1
+        assert (stats.deduplicated, stats.cached) == (9, 1)
+        assert again.body == first[0].body
+
+    def test_mutations_invalidate_the_repo_reads(self):
+        with FakeGitHub({"jade-cli": FakeRepo(release_prs=1)}) as fake:
+            async def work(gh: GitHub):
+                before = await gh.json(_pulls(fake, "jade-cli"))
+                await gh.request("PUT", "/repos/jadecli/jade-cli/pulls/1/merge",
+                                 json_body={"merge_method": "merge"})
+                return before, await gh.json(_pulls(fake, "jade-cli"))
+
+            (before, after), _ = asyncio.run(_scheduled(fake, work))
+        assert (len(before), len(after)) == (1, 0)
+
+    def test_secondary_limit_is_retried_after_the_advertised_delay(self):
+        with FakeGitHub({"jade-cli": FakeRepo()}) as fake:
+            fake.secondary_limit(2, retry_after=0)
+            response, stats = asyncio.run(_scheduled(
+                fake, lambda gh: gh.get(_pulls(fake, "jade-cli"))))
+        assert response.status == 200
+        assert stats.retries == 2 and [r.status for r in fake.requests] == [403, 403, 200]
+
+    def test_secondary_limit_without_retry_after_backs_off(self):
+        with FakeGitHub({"jade-cli": FakeRepo()}) as fake:
+            fake.secondary_limit(5)
+            with pytest.raises(RateLimitExceededError, match="after 2 retries"):
+                asyncio.run(_scheduled(fake, lambda gh: gh.get(_pulls(fake, "jade-cli")),
+                                       backoff=0.01, retries=2))
+        assert len(fake.requests) == 3
+
+    def test_mutations_are_spaced_out(self):
+        with FakeGitHub({"jade-cli": FakeRepo(release_prs=3)}) as fake:
+            async def work(gh: GitHub):
+                start = time.perf_counter()
+                await asyncio.gather(*(
+                    gh.request("PUT", f"/repos/jadecli/jade-cli/pulls/{n}/merge",
+                               json_body={}) for n in (1, 2, 3)))
+                return time.perf_counter() - start
+
+            elapsed, _ = asyncio.run(_scheduled(fake, work, mutation_interval=0.1))
+        assert elapsed >= 0.2
+
+
+@pytest.mark.tooling
+class TestCommands:
+    """pr-health and merge-releases over the scheduler."""
+
+    def test_pr_health_is_concurrent_and_bounded(self):
+        repos = {repo: FakeRepo() for repo in REPOS}
+        repos["jade-cli"] = FakeRepo(prs=2, release_prs=1)
+        with FakeGitHub(repos, latency=0.05) as fake:
+            entries, _ = asyncio.run(_scheduled(fake, github.pr_health, max_per_host=3))
+            assert fake.peak_in_flight == 3
+        by_repo = {e["repo"]: e for e in entries}
+        assert len(entries) == len(REPOS)
+        cli = by_repo["jade-cli"]
+        assert (cli["total"], cli["unlinked"], cli["release_please"]) == (3, 2, 1)
+        table = github.render_pr_health(entries).splitlines()
+        assert table[2].split() == ["jade-cli", "3", "2", "1", "!"]
+        assert table[-1].split() == ["TOTALS", "3", "2"]
+
+    def test_merge_releases_merges_and_syncs_pre_main(self):
+        repos = {"jade-cli": FakeRepo(prs=1, release_prs=2, conflicting=frozenset({3}),
+                                      pre_main=True),
+                 "jade-ide": FakeRepo(release_prs=1)}
+        with FakeGitHub(repos) as fake:
+            async def work(gh: GitHub):
+                return await github.merge_releases(gh, repos=tuple(repos))
+
+            (cli, ide), _ = asyncio.run(_scheduled(fake, work))
+            assert fake.ref("jade-cli", "pre-main") == fake.ref("jade-cli", "main")
+        assert (cli.merged, cli.failed) == (1, 1)
+        assert cli.lines == ["✓ jade-cli PR#2: chore(main): release jade-cli 1.2.0",
+                             "⚠ jade-cli PR#3: Not mergeable (state: CONFLICTING)",
+                             "  ✓ Synced pre-main to match main"]
+        assert ide.lines[-1] == "  Info: pre-main branch does not exist in jade-ide, skipping sync"
+
+    def test_cli_dry_run_merges_nothing(self, capsys, monkeypatch, tmp_path):
+        monkeypatch.setenv("GH_TOKEN", "test-token")
+        monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path))
+        repos = {repo: FakeRepo() for repo in REPOS}
+        repos["dotfiles"] = FakeRepo(release_prs=1)
+        with FakeGitHub(repos) as fake:
+            assert github.main(["--api", fake.url, "merge-releases", "--dry-run"]) == 0
+            assert {r.method for r in fake.requests} == {"GET"}
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "DRY RUN MODE - no merges will be performed"
+        assert "Would merge dotfiles PR#1: chore(main): release dotfiles 1.1.0" in out
+        assert out[-1] == "Merged: 1 release PRs across 1 repos. Failed: 0"
+
+    def test_cli_pr_health_json(self, capsys, monkeypatch, tmp_path):
+        monkeypatch.setenv("GH_TOKEN", "test-token")
+        monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path))
+        with FakeGitHub({}) as fake:  # every repo 404s
+            assert github.main(["--api", fake.url, "pr-health", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out) == [{}] * len(REPOS)
@@ -0,0 +1,167 @@
+"""Tests for the health-check engine, its HTTP client and the GitHub stand-in.
+
+Run with:  pytest tests/test_health.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import health
+from jade_monolith.fakes.github import FakeGitHub, FakeRepo
+from jade_monolith.http import MAX_REDIRECTS, ETagCache, HTTPClient, HTTPError
+from jade_monolith.repos import REPOS
+
+_GIT = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+        "-c", "init.defaultBranch=main"]
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run([*_GIT, *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.fixture
+def github():
+    repos = {repo: FakeRepo() for repo in REPOS}
+    repos["jade-cli"] = FakeRepo(issues=2, prs=1)
+    repos["jadeflow-dev-scaffold"] = FakeRepo(issues=3)  # not a core repo
+    with FakeGitHub(repos) as fake:
+        yield fake
+
+
+@pytest.fixture
+def monolith(tmp_path: Path) -> Path:
+    """packages/ with one checkout up to date, one behind, one off main."""
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    _git(origin, "init", "--bare", "-q")
+    seed = tmp_path / "seed"
+    _git(tmp_path, "clone", "-q", str(origin), str(seed))
+    _git(seed, "commit", "-q", "--allow-empty", "-m", "one")
+    _git(seed, "push", "-q", "origin", "HEAD:main")
+
+    root = tmp_path / "monolith"
+    for name in ("current", "stale", "feature"):
+        _git(tmp_path, "clone", "-q", "-b", "main", str(origin), str(root / "packages" / name))
+    _git(root / "packages" / "feature", "checkout", "-q", "-b", "wip")
+    _git(seed, "commit", "-q", "--allow-empty", "-m", "two")
+    _git(seed, "push", "-q", "origin", "HEAD:main")
+    _git(root / "packages" / "current", "pull", "-q")
+    return root
+
+
+@pytest.mark.tooling
+class TestGitHubCheck:
+    """Verify counts, connection pooling and ETag revalidation."""
+
+    def test_counts_issues_and_prs(self, github: FakeGitHub):
+        async def run():
+            async with HTTPClient() as client:
+                return await health.check_github(client, api=github.url)
+
+        assert asyncio.run(run()) == {
+            "issues": 5, "prs": 1, "core_issues": 2, "core_prs": 1,
+        }
+
+    def test_requests_share_pooled_connections(self, github: FakeGitHub):
+        async def run():
+            async with HTTPClient(max_per_host=4) as client:
+                await health.check_github(client, api=github.url)
+                return client.stats
+
+        stats = asyncio.run(run())
+        assert stats.requests == 2 * len(REPOS)
+        assert github.connections == stats.connections <= 4
+
+    def test_unchanged_repos_cost_no_rate_limit(self, github: FakeGitHub, tmp_path: Path):
+        cache_path = tmp_path / "etags.json"
+
+        async def run():
+            async with HTTPClient(etag_cache=ETagCache(cache_path)) as client:
+                return await health.check_github(client, api=github.url), client.stats
+
+        first, _ = asyncio.run(run())
+        remaining = github.state.rate_remaining
+        second, stats = asyncio.run(run())
+        assert second == first
+        assert stats.revalidated == 2 * len(REPOS)
+        assert github.state.rate_remaining == remaining
+
+        github.set_repo("jade-ide", issues=1)
+        third, stats = asyncio.run(run())
+        assert third["core_issues"] == first["core_issues"] + 1
+        assert stats.revalidated == 2 * len(REPOS) - 1
+
+    def test_renamed_repos_are_followed(self, github: FakeGitHub):
+        github.set_repo("jade-cli-next", issues=2, prs=1)
+        github.rename("jade-cli", "jade-cli-next")
+
+        async def run():
+            async with HTTPClient(headers={"Authorization": "Bearer t"}) as client:
+                return await health.check_github(client, api=github.url)
+
+        assert asyncio.run(run())["core_prs"] == 1
+        followed = [r for r in github.requests if "jade-cli-next" in r.path]
+        assert len(followed) == 2 and all(r.authorization == "Bearer t" for r in followed)
+
+    def test_cross_host_redirects_drop_credentials(self, github: FakeGitHub):
+        with FakeGitHub({"moved": FakeRepo(prs=3)}) as other:
+            github.rename("jade-cli", "moved", api=other.url)
+
+            async def run():
+                async with HTTPClient(headers={"Authorization": "Bearer t"}) as client:
+                    return await client.get(f"{github.url}/repos/jadecli/jade-cli/pulls")
+
+            response = asyncio.run(run())
+            assert response.ok and len(response.json()) == 3
+            assert response.url == f"{other.url}/repos/jadecli/moved/pulls"
+            assert [r.authorization for r in other.requests] == [None]
+
+    def test_redirect_loops_are_bounded(self, github: FakeGitHub):
+        github.rename("jade-cli", "jade-cli")
+
+        async def run():
+            async with HTTPClient() as client:
+                await client.get(f"{github.url}/repos/jadecli/jade-cli/pulls")
+
+        with pytest.raises(HTTPError, match="redirects"):
+            asyncio.run(run())
+        assert len(github.requests) == MAX_REDIRECTS + 1
+
+    def test_unreachable_api_counts_zero(self):
+        async def run():
+            async with HTTPClient(timeout=1.0) as client:
+                return await health.check_github(client, api="http://127.0.0.1:9", repos=("x",))
+
+        assert asyncio.run(run())["issues"] == 0
+
+
+@pytest.mark.tooling
+class TestHealthEngine:
+    """Verify the submodule check and the --json contract of health-check.sh."""
+
+    def test_submodule_states(self, monolith: Path):
+        report = asyncio.run(health.check_submodules(monolith))
+        assert (report.total, report.on_main, report.behind) == (3, 1, 1)
+        assert report.detached == ["feature"]
+        assert report.behind_list == ["stale"]
+
+    def test_json_contract(self, monolith: Path, github: FakeGitHub, capsys, monkeypatch):
+        monkeypatch.setenv("GH_TOKEN", "test-token")
+        rc = health.main(["--json", "--root", str(monolith), "--api", github.url,
+                          "--no-etag-cache", "--no-latency-history"])
+        report = json.loads(capsys.readouterr().out)
+        assert rc == 1
+        assert list(report) == ["submodules", "github", "docker", "services", "gpu", "healthy"]
+        assert report["submodules"] == {"total": 3, "on_main": 1, "behind": 1}
+        assert set(report["docker"]) == {"postgres", "mongodb", "dragonfly"}
+        assert set(report["services"]) == set(report["docker"])
+        assert all(report["docker"][name] is probe["ok"]
+                   for name, probe in report["services"].items())
+        assert report["healthy"] is False
+        assert {r.authorization for r in github.requests} == {"Bearer test-token"}
@@ -0,0 +1,132 @@
+"""Tests for change-impact test selection.
+
+Run with:  pytest tests/test_impact.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.impact import ImpactMap
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE = '''
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+
+
+@pytest.fixture(scope="session")
+def settings():
+    return (ROOT / "settings.json").read_text()
+
+
+def test_settings_a(settings):
+    assert settings
+
+
+def test_settings_b(settings):  # fixture is cached: no read of its own
+    assert settings
+
+
+def test_agents():
+    assert sorted(p.name for p in (ROOT / "agents").glob("*.md")) == ["a.md"]
+
+
+def test_docs():
+    assert "team" in (ROOT / "docs" / "setup.md").read_text()
+'''
+
+
+@pytest.mark.tooling
+class TestImpactMap:
+    """Verify how changed paths select tests from the map."""
+
+    MAP = ImpactMap({
+        "t.py::test_settings": {".claude/settings.json", "t.py"},
+        "t.py::test_agents": {".claude/agents/", ".claude/agents/a.md", "t.py"},
+        "d.py::test_docs": {"docs/team-setup.md", "d.py"},
+    })
+    ALL = ["t.py::test_settings", "t.py::test_agents", "d.py::test_docs", "n.py::test_new"]
+
+    def test_file_change_selects_its_readers(self):
+        selected, _ = self.MAP.select(self.ALL, ["docs/team-setup.md"])
+        assert selected == ["d.py::test_docs", "n.py::test_new"]  # unknown tests always run
+
+    def test_new_file_in_listed_directory(self):
+        selected, _ = self.MAP.select(self.ALL, [".claude/agents/new.md"])
+        assert selected == ["t.py::test_agents", "n.py::test_new"]
+
+    def test_infrastructure_change_runs_everything(self):
+        for path in ("tests/conftest.py", "jade_monolith/rules.py", "pyproject.toml"):
+            selected, reason = self.MAP.select(self.ALL, [path])
+            assert selected == self.ALL
+            assert path in reason
+
+    def test_empty_map_runs_everything(self):
+        assert ImpactMap().select(self.ALL, ["README.md"])[0] == self.ALL
+
+
+@pytest.fixture(scope="module")
+def sample_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("impact")
+    (root / "agents").mkdir()
+    (root / "docs").mkdir()
+    (root / "agents" / "a.md").write_text("---\nname: a\n---\n")
+    (root / "docs" / "setup.md").write_text("team setup\n")
+    (root / "settings.json").write_text("{}\n")
+    (root / "test_sample.py").write_text(SAMPLE)
+    (root / "pytest.ini").write_text("[pytest]\n")
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "x"],
+                   cwd=root, check=True)
+    return root
+
+
+def run_pytest(root: Path, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT),
+           "JADE_CACHE_DIR": str(root.parent / f"{root.name}-cache")}
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "jade_monolith.pytest_impact",
+         "-p", "no:cacheprovider", f"--impact-map={root.parent / 'map.json'}", *args],
+        cwd=root, env=env, capture_output=True, text=True,
+    )
+
+
+@pytest.mark.tooling
+class TestImpactPlugin:
+    """Record a map, then select against a working-tree diff."""
+
+    def test_record_then_select(self, sample_repo: Path):
+        recorded = run_pytest(sample_repo, "--impact-record")
+        assert recorded.returncode == 0, recorded.stdout
+        impact = ImpactMap.load(sample_repo.parent / "map.json")
+        assert "settings.json" in impact.tests["test_sample.py::test_settings_b"]
+        assert "agents/" in impact.tests["test_sample.py::test_agents"]
+
+        (sample_repo / "settings.json").write_text('{"x": 1}\n')
+        try:
+            selected = run_pytest(sample_repo, "--impact-since", "HEAD", "-v")
+        finally:
+            subprocess.run(["git", "checkout", "-q", "settings.json"], cwd=sample_repo,
+                           check=True)
+        assert selected.returncode == 0
+        assert "test_settings_a PASSED" in selected.stdout
+        assert "test_settings_b PASSED" in selected.stdout
+        assert "test_docs" not in selected.stdout
+        assert "impact: 2 of 4 tests selected" in selected.stdout
+
+    def test_nothing_affected_is_a_pass(self, sample_repo: Path):
+        run_pytest(sample_repo, "--impact-record")
+        result = run_pytest(sample_repo, "--impact-since", "HEAD")
+        assert result.returncode == 0, result.stdout
+        assert "0 of 4 tests selected" in result.stdout
@@ -0,0 +1,122 @@
+"""Tests for the compiled permission-rule matcher and the tree audit.
+
+Run with:  pytest tests/test_permissions.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.permissions import (
+    GlobTrie,
+    PermissionRuleError,
+    Permissions,
+    audit,
+    main,
+    parse_rule,
+)
+
+SETTINGS = {"permissions": {
+    "allow": ["Bash(git:*)", "Bash(npm run test*)", "Read(./**)", "Edit(src/**)"],
+    "ask": ["Bash(git push:*)"],
+    "deny": ["Read(./.env*)", "Read(secrets/)", "Read(*.pem)", "Bash(rm:*)", "Read(~/.ssh/**)"],
+}}
+
+
+@pytest.mark.tooling
+class TestGlobTrie:
+    """gitignore semantics, matched as one automaton."""
+
+    @pytest.mark.parametrize("pattern, path, matches", [
+        ("*.pem", "a/b/c.pem", True),
+        ("./*.pem", "a/c.pem", False),
+        ("/docs/**", "docs/a/b.md", True),
+        ("/docs/**", "docs", False),
+        ("src/*.py", "src/a/b.py", False),
+        ("**/*.py", "b.py", True),
+        ("secrets/", "x/secrets/key", True),
+        (".env*", "pkg/.env.local", True),
+        ("//etc/passwd", "etc/passwd", False),
+    ])
+    def test_patterns(self, pattern: str, path: str, matches: bool):
+        trie = GlobTrie()
+        trie.add(pattern, 0)
+        assert (trie.match(path) == {0}) is matches
+
+    def test_shared_prefixes_report_every_pattern(self):
+        trie = GlobTrie()
+        for i, pattern in enumerate(["./src/**", "src/*.py", "*.py", "src/a.py"]):
+            trie.add(pattern, i)
+        assert trie.match("src/a.py") == {0, 1, 2, 3}
+        assert trie.match("src/lib/a.py") == {0, 2}
+
+
+@pytest.mark.tooling
+class TestPermissions:
+    """Decisions for tool calls: deny beats ask beats allow."""
+
+    PERMS = Permissions.from_settings(SETTINGS)
+
+    @pytest.mark.parametrize("tool, target, effect", [
+        ("Read", ".env", "deny"),
+        ("Read", "./.env.local", "deny"),
+        ("Read", "pkg/.env", "allow"),  # ./.env* is anchored at the root
+        ("Grep", "secrets/a/token", "deny"),
+        ("Read", "certs/site.pem", "deny"),
+        ("Read", "README.md", "allow"),
+        ("Write", "src/app.py", "allow"),
+        ("Edit", "docs/x.md", None),
+        ("Bash", "git status", "allow"),
+        ("Bash", "gitk", None),
+        ("Bash", "git push origin main", "ask"),
+        ("Bash", "git status && rm -rf build", "deny"),
+        ("Bash", "git log | head", None),
+        ("Bash", "npm run test:unit", "allow"),
+        ("WebFetch", "https://example.com", None),
+    ])
+    def test_decide(self, tool: str, target: str, effect: str | None):
+        assert self.PERMS.decide(tool, target)[0] == effect
+
+    def test_unmatchable_rules_and_parse_errors(self):
+        assert [r.raw for r in self.PERMS.unmatchable] == ["Read(~/.ssh/**)"]
+        assert parse_rule("mcp__github__create_issue", "allow").specifier is None
+        with pytest.raises(PermissionRuleError):
+            parse_rule("Read(", "deny")
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / ".claude" / "settings.json").write_text(json.dumps(SETTINGS))
+    for path in [".env", "src/app.py", "secrets/k", "pkg/.env", "certs/a.pem",
+                 "packages/tool/.env", "packages/tool/id_rsa", "packages/tool/src/a.py"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("x")
+    package_settings = tmp_path / "packages" / "tool" / ".claude" / "settings.json"
+    package_settings.parent.mkdir()
+    package_settings.write_text(json.dumps({"permissions": {"deny": ["Read(.env)"]}}))
+    return tmp_path
+
+
+@pytest.mark.tooling
+class TestAudit:
+    """One walk, every settings file, every sensitive path."""
+
+    def test_reports_sensitive_paths_not_denied(self, tree: Path):
+        report = audit(tree)
+        assert report.files == 10  # including the two settings files
+        assert [(f.settings, f.path, f.effect) for f in report.findings] == [
+            (".claude/settings.json", "packages/tool/.env", "allow"),
+            (".claude/settings.json", "packages/tool/id_rsa", "allow"),
+            (".claude/settings.json", "pkg/.env", "allow"),
+            ("packages/tool/.claude/settings.json", "id_rsa", None),
+        ]
+
+    def test_cli(self, tree: Path, capsys: pytest.CaptureFixture[str]):
+        assert main(["--root", str(tree), "audit", "--json"]) == 1
+        assert len(json.loads(capsys.readouterr().out)["findings"]) == 4
+        assert main(["--root", str(tree), "check", "Bash", "git diff"]) == 0
+        assert capsys.readouterr().out.strip() == "allow (Bash(git:*))"
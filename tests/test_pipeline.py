@@ -0,0 +1,126 @@
+"""Tests for the streaming headless team pipeline, against the offline fake CLI.
+
+Run with:  pytest tests/test_pipeline.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import pipeline
+from jade_monolith.fakes.claude import FakeClaude
+from jade_monolith.pipeline import (
+    TEAM_PIPELINE,
+    PipelineError,
+    Stage,
+    load_stages,
+    plan_items,
+    render,
+    run_pipeline,
+    validate,
+)
+
+PLAN = "Plan:\n1. parse tokens\n2. verify signature\n   - detail, not an item\n3. expiry"
+
+
+@pytest.fixture
+def project(tmp_path: Path, fake_claude: FakeClaude) -> Path:
+    agents = tmp_path / "project" / ".claude" / "agents"
+    agents.mkdir(parents=True)
+    for stage in TEAM_PIPELINE:
+        (agents / f"{stage.agent}.md").write_text(f"---\nname: {stage.agent}\n---\n")
+    fake_claude.configure(result="{agent} done: {prompt}",
+                          agents={"architect": {"result": PLAN}})
+    return tmp_path / "project"
+
+
+@pytest.mark.tooling
+class TestPipelineDeclaration:
+    """Verify DAG validation, plan splitting and prompt templating."""
+
+    def test_team_pipeline_order(self):
+        assert [s.name for s in validate(TEAM_PIPELINE)] == [
+            "architect", "test-writer", "implementer", "reviewer"]
+
+    def test_cycles_and_unknown_stages_are_rejected(self):
+        with pytest.raises(PipelineError, match="cycle: a -> b -> a"):
+            validate([Stage("a", "x", "", needs=("b",)), Stage("b", "x", "", needs=("a",))])
+        with pytest.raises(PipelineError, match="unknown stage 'c'"):
+            validate([Stage("a", "x", "", needs=("c",))])
+
+    def test_plan_items(self):
+        assert plan_items(PLAN) == ["parse tokens", "verify signature", "expiry"]
+        assert plan_items("no list here") == ["no list here"]
+
+    def test_render_leaves_foreign_braces(self):
+        assert render("{task} {x} {architect}", {"task": "t", "architect": "p"}) == "t {x} p"
+
+
+@pytest.mark.tooling
+class TestPipelineRunner:
+    """Run the team pipeline end to end against the fake claude."""
+
+    def test_fan_out_and_handoff(self, project: Path):
+        results = run_pipeline("Add JWT auth", cwd=project)
+        assert [r.status for r in results.values()] == ["ok"] * 4
+        writers = results["test-writer"].runs
+        assert [r.item for r in writers] == ["parse tokens", "verify signature", "expiry"]
+        assert "test-writer done" in results["implementer"].result
+        assert "parse tokens" in results["implementer"].result
+        assert results["reviewer"].result.startswith("reviewer done")
+
+    def test_plan_items_run_concurrently(self, project: Path, fake_claude: FakeClaude):
+        fake_claude.configure(agents={"architect": {"result": PLAN},
+                                      "test-writer": {"response_latency": 0.4}})
+        results = run_pipeline("t", cwd=project)
+        starts = [r.started for r in results["test-writer"].runs]
+        assert max(starts) - min(starts) < 0.3
+        stage = results["test-writer"]
+        assert stage.finished - stage.started < 0.4 * 3
+
+    def test_result_is_handed_on_before_the_process_exits(
+        self, project: Path, fake_claude: FakeClaude,
+    ):
+        fake_claude.configure(agents={"architect": {"result": PLAN, "linger": 1.0}})
+        results = run_pipeline("t", cwd=project)
+        (architect,) = results["architect"].runs
+        assert architect.exited_at - architect.result_at >= 0.9
+        assert results["test-writer"].started < architect.exited_at - 0.5
+
+    def test_stage_timeout_skips_dependants(self, project: Path, fake_claude: FakeClaude):
+        fake_claude.configure(agents={"architect": {"result": PLAN},
+                                      "implementer": {"hang": True}})
+        stages = [Stage(**{**s.__dict__, "timeout": 1.0}) for s in TEAM_PIPELINE]
+        results = run_pipeline("t", stages, cwd=project)
+        assert results["test-writer"].status == "ok"
+        assert results["implementer"].status == "timeout"
+        assert results["reviewer"].status == "skipped"
+        assert "implementer" in results["reviewer"].error
+
+    def test_cli_error_fails_the_stage(self, project: Path, fake_claude: FakeClaude):
+        fake_claude.configure(agents={"architect": {"error": "API Error: overloaded"}})
+        results = run_pipeline("t", cwd=project)
+        assert results["architect"].status == "failed"
+        assert results["architect"].error == "API Error: overloaded"
+        assert results["test-writer"].status == "skipped"
+
+    def test_overlong_line_fails_the_stage(
+        self, project: Path, fake_claude: FakeClaude, monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(pipeline, "STREAM_LIMIT", 1024)
+        fake_claude.configure(agents={"architect": {"result": "x" * 4096}})
+        results = run_pipeline("t", cwd=project)
+        assert results["architect"].status == "failed"
+        assert "over 1024 bytes" in results["architect"].error
+        assert results["test-writer"].status == "skipped"
+
+    def test_empty_stage_file_is_rejected(self, tmp_path: Path,
+                                          capsys: pytest.CaptureFixture[str]):
+        path = tmp_path / "stages.json"
+        path.write_text('{"stages": []}')
+        with pytest.raises(PipelineError, match="no stages"):
+            load_stages(path)
+        assert pipeline.main(["t", "--pipeline", str(path)]) == 2
+        assert "no stages" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+"""Tests for the --timing pytest plugin.
+
+Run with:  pytest tests/test_pytest_timing.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.pytest_timing import Recorder, TimedTest, to_openmetrics
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE = '''
+import subprocess
+from pathlib import Path
+
+import pytest
+import yaml
+
+
+@pytest.mark.schema
+def test_parses(tmp_path):
+    path = tmp_path / "a.yaml"
+    path.write_text("name: a\\n")
+    assert yaml.safe_load(path.read_text()) == {"name": "a"}
+
+
+@pytest.mark.contract
+def test_spawns():
+    subprocess.run(["true"], check=True)
+
+
+def test_unmarked():
+    pass
+'''
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory: pytest.TempPathFactory) -> tuple[dict, str]:
+    base = tmp_path_factory.mktemp("timing")
+    (base / "test_sample.py").write_text(SAMPLE)
+    (base / "pytest.ini").write_text("[pytest]\nmarkers =\n  schema\n  contract\n")
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "jade_monolith.pytest_timing",
+         "--timing-json", "t.json", "--timing-openmetrics", "t.om", "test_sample.py"],
+        cwd=base, env=env, check=True, capture_output=True,
+    )
+    return json.loads((base / "t.json").read_text()), (base / "t.om").read_text()
+
+
+@pytest.mark.tooling
+class TestTimingPlugin:
+    """Verify per-test phases, marker grouping, attribution and both exports."""
+
+    def test_tests_grouped_by_marker(self, report):
+        data, _ = report
+        assert data["markers"]["schema"]["tests"] == 1
+        assert data["markers"]["contract"]["tests"] == 1
+        assert data["markers"]["unmarked"]["tests"] == 1
+        for test in data["tests"]:
+            assert set(test["phases"]) == {"setup", "call", "teardown"}
+
+    def test_calls_attributed_to_their_phase(self, report):
+        data, _ = report
+        tests = {t["nodeid"].rsplit("::", 1)[1]: t for t in data["tests"]}
+        parse = tests["test_parses"]["attributed"]["call"]
+        assert parse["yaml"]["calls"] == 1  # safe_load -> load counted once
+        assert parse["read"]["calls"] == 1
+        spawn = tests["test_spawns"]["attributed"]["call"]
+        assert spawn["subprocess:true"]["calls"] == 1  # one process, however often waited on
+        assert tests["test_unmarked"]["attributed"] == {}
+
+    def test_openmetrics_export(self, report):
+        _, text = report
+        assert text.endswith("# EOF\n")
+        assert "# TYPE jade_test_duration_seconds gauge" in text
+        assert 'jade_marker_tests{marker="schema"} 1' in text
+        assert 'jade_attributed_calls_total{category="yaml"} 1' in text
+
+    def test_label_values_are_escaped(self):
+        recorder = Recorder()
+        recorder.tests.append(TimedTest('t.py::test["a"]', ["smoke"], phases={"call": 0.5}))
+        assert 'test="t.py::test[\\"a\\"]"' in to_openmetrics(recorder)
@@ -0,0 +1,87 @@
+"""Tests for the cached npm release-metadata source used by the drift checks.
+
+Run with:  pytest tests/test_releases.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.fakes.registry import FakeRegistry
+from jade_monolith.releases import PACKAGE, ReleaseLookupError, ReleaseSource
+
+
+@pytest.fixture
+def registry():
+    with FakeRegistry({PACKAGE: "2.1.34"}) as fake:
+        yield fake
+
+
+def source(registry: FakeRegistry, tmp_path: Path, **kwargs) -> ReleaseSource:
+    return ReleaseSource(registry.url, path=tmp_path / "releases.json", **kwargs)
+
+
+@pytest.mark.tooling
+class TestReleaseSource:
+    """Verify TTL caching, ETag revalidation, offline mode and stale fallback."""
+
+    def test_warm_cache_skips_the_network(self, registry: FakeRegistry, tmp_path: Path):
+        releases = source(registry, tmp_path)
+        assert releases.dist_tags().source == "network"
+        start = time.perf_counter()
+        info = releases.dist_tags()
+        assert time.perf_counter() - start < 0.05
+        assert (info.latest, info.source) == ("2.1.34", "cache")
+        assert len(registry.requests) == 1
+
+    def test_expired_entry_is_revalidated(self, registry: FakeRegistry, tmp_path: Path):
+        releases = source(registry, tmp_path, ttl=0)
+        releases.dist_tags()
+        assert releases.dist_tags().source == "revalidated"
+        assert [r.status for r in registry.requests] == [200, 304]
+        registry.publish(PACKAGE, "2.2.0")
+        assert releases.dist_tags().latest == "2.2.0"
+
+    def test_fetch_from_a_running_event_loop(self, registry: FakeRegistry, tmp_path: Path):
+        async def lookup():
+            releases = source(registry, tmp_path)
+            return [await releases.fetch_dist_tags(), await releases.fetch_dist_tags()]
+
+        fetched, cached = asyncio.run(lookup())
+        assert (fetched.source, cached.source) == ("network", "cache")
+        assert cached.latest == "2.1.34"
+
+    def test_offline_serves_any_cached_answer(self, registry: FakeRegistry, tmp_path: Path):
+        source(registry, tmp_path).dist_tags()
+        offline = source(registry, tmp_path, ttl=0, offline=True)
+        assert offline.dist_tags().latest == "2.1.34"
+        assert len(registry.requests) == 1
+
+    def test_offline_without_cache_is_an_error(self, registry: FakeRegistry, tmp_path: Path):
+        with pytest.raises(ReleaseLookupError, match="offline"):
+            source(registry, tmp_path, offline=True).dist_tags()
+        assert registry.requests == []
+
+    def test_outage_falls_back_to_stale_entry(self, registry: FakeRegistry, tmp_path: Path):
+        releases = source(registry, tmp_path, ttl=0)
+        releases.dist_tags()
+        registry.set_down()
+        info = releases.dist_tags()
+        assert (info.latest, info.source) == ("2.1.34", "stale")
+
+    def test_unreachable_registry_without_cache(self, tmp_path: Path):
+        releases = ReleaseSource("http://127.0.0.1:9", path=tmp_path / "r.json", timeout=1)
+        with pytest.raises(ReleaseLookupError):
+            releases.dist_tags()
+
+    def test_cache_file_is_shared_by_url(self, registry: FakeRegistry, tmp_path: Path):
+        source(registry, tmp_path).dist_tags()
+        entries = json.loads((tmp_path / "releases.json").read_text())
+        (entry,) = entries.values()
+        assert entry["dist_tags"] == {"latest": "2.1.34"}
+        assert entry["etag"]
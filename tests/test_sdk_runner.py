@@ -0,0 +1,146 @@
+"""Tests for the API agent runner, against the local stand-in API.
+
+Run with:  pytest tests/test_sdk_runner.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.fakes.anthropic import FakeAnthropic
+from jade_monolith.http import HTTPClient
+from jade_monolith.sdk_runner import MODEL_MAP, AgentRunner, APIError, Job, main, read_jobs
+
+INSTRUCTIONS = "You review diffs for correctness and security. " * 40
+
+
+@pytest.fixture
+def agents_dir(tmp_path: Path) -> Path:
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    (agents / "reviewer.md").write_text(f"---\nname: reviewer\nmodel: sonnet\n---\n\n"
+                                        f"{INSTRUCTIONS}\n")
+    (agents / "architect.md").write_text("---\nname: architect\nmodel: opus\n---\nPlan it.\n")
+    return agents
+
+
+@pytest.fixture
+def api():
+    with FakeAnthropic() as fake:
+        yield fake
+
+
+def runner_for(api: FakeAnthropic, agents_dir: Path, **kwargs) -> AgentRunner:
+    return AgentRunner(agents_dir, api_key=api.api_key, base_url=api.url,
+                       poll_interval=0.05, **kwargs)
+
+
+@pytest.mark.tooling
+class TestAgentRunner:
+    """Single calls: request shape, prompt caching and connection reuse."""
+
+    def test_agent_becomes_a_cached_system_prefix(self, api: FakeAnthropic, agents_dir: Path):
+        async def go():
+            async with runner_for(api, agents_dir) as runner:
+                return [await runner.run("reviewer", f"diff {i}") for i in range(3)]
+
+        first, *rest = asyncio.run(go())
+        assert first.text == f"{MODEL_MAP['sonnet']}: diff 0"
+        assert first.usage["cache_creation_input_tokens"] > 0
+        assert all(c.usage["cache_read_input_tokens"] == first.usage[
+            "cache_creation_input_tokens"] for c in rest)
+        params = api.requests[0].body
+        assert params["system"] == [{"type": "text", "text": INSTRUCTIONS.strip(),
+                                     "cache_control": {"type": "ephemeral"}}]
+        assert params["messages"] == [{"role": "user", "content": "diff 0"}]
+
+    def test_no_cache_and_model_override(self, api: FakeAnthropic, agents_dir: Path):
+        runner = runner_for(api, agents_dir, cache_prompts=False)
+        params = runner.params(Job("x", "architect", "t", model="haiku"))
+        assert params["model"] == MODEL_MAP["haiku"]
+        assert "cache_control" not in params["system"][0]
+        assert runner.params(Job("x", "architect", "t"))["model"] == MODEL_MAP["opus"]
+
+    def test_one_pooled_connection(self, api: FakeAnthropic, agents_dir: Path):
+        async def go():
+            async with HTTPClient(max_per_host=1) as client:
+                runner = runner_for(api, agents_dir, client=client)
+                for i in range(5):
+                    await runner.run("architect", str(i))
+                return client.stats.connections
+
+        assert asyncio.run(go()) == 1
+
+    def test_errors(self, api: FakeAnthropic, agents_dir: Path):
+        async def go(runner: AgentRunner, agent: str):
+            async with runner:
+                await runner.run(agent, "t")
+
+        bad_key = AgentRunner(agents_dir, api_key="wrong", base_url=api.url)
+        with pytest.raises(APIError, match="401 authentication_error"):
+            asyncio.run(go(bad_key, "reviewer"))
+        with pytest.raises(APIError, match="unknown agent 'nobody'"):
+            asyncio.run(go(runner_for(api, agents_dir), "nobody"))
+
+
+@pytest.mark.tooling
+class TestBatchMode:
+    """Many jobs as one batch, with results streamed back."""
+
+    JOBS = [Job(f"review-{i}", "reviewer", f"diff {i}") for i in range(4)] + [
+        Job("plan", "architect", "plan it")]
+
+    def test_one_batch_for_all_jobs(self, api: FakeAnthropic, agents_dir: Path):
+        async def go():
+            async with runner_for(api, agents_dir) as runner:
+                return [c async for c in runner.run_batch(self.JOBS)]
+
+        api.fail("review-2")
+        results = {c.custom_id: c for c in asyncio.run(go())}
+        assert set(results) == {job.custom_id for job in self.JOBS}
+        assert results["plan"].text == f"{MODEL_MAP['opus']}: plan it"
+        assert results["review-2"].error == "review-2 failed"
+        posts = [r for r in api.requests if r.method == "POST"]
+        assert len(posts) == 1 and len(posts[0].body["requests"]) == 5
+
+    def test_results_stream_as_they_arrive(self, agents_dir: Path):
+        async def go(api: FakeAnthropic):
+            async with runner_for(api, agents_dir) as runner:
+                batch = await runner.wait_batch(await runner.submit_batch(self.JOBS))
+                start = time.monotonic()
+                return [time.monotonic() - start async for _ in runner.batch_results(batch)]
+
+        with FakeAnthropic(batch_latency=0.1, result_interval=0.2) as api:
+            arrivals = asyncio.run(go(api))
+        assert len(arrivals) == 5
+        assert arrivals[0] < 0.15 < 0.6 < arrivals[-1]
+
+    def test_invalid_custom_ids_are_rejected(self, api: FakeAnthropic, agents_dir: Path):
+        async def go(jobs):
+            async with runner_for(api, agents_dir) as runner:
+                await runner.submit_batch(jobs)
+
+        with pytest.raises(APIError, match="duplicate"):
+            asyncio.run(go([Job("a", "reviewer", "t"), Job("a", "reviewer", "u")]))
+        with pytest.raises(APIError, match="invalid"):
+            asyncio.run(go([Job("a b", "reviewer", "t")]))
+        assert api.requests == []
+
+    def test_cli_batch(self, api: FakeAnthropic, agents_dir: Path, tmp_path: Path,
+                       capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", api.api_key)
+        jobs = tmp_path / "jobs.jsonl"
+        jobs.write_text('{"custom_id": "r1", "task": "diff"}\n'
+                        '{"custom_id": "p1", "agent": "architect", "task": "plan"}\n')
+        assert [j.agent for j in read_jobs(jobs.read_text().splitlines(), "reviewer")] == [
+            "reviewer", "architect"]
+        code = main(["--agents-dir", str(agents_dir), "--base-url", api.url,
+                     "--poll-interval", "0.05", "batch", str(jobs), "--agent", "reviewer"])
+        assert code == 0
+        out = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert {o["custom_id"] for o in out} == {"r1", "p1"}
@@ -0,0 +1,177 @@
+"""Tests for the protocol-level service probes, against the fake services.
+
+Run with:  pytest tests/test_service_probe.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+import socket
+import ssl
+import subprocess
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import health, service_probe
+from jade_monolith.fakes.services import FakeService
+from jade_monolith.service_probe import (
+    BUCKETS_MS,
+    Histogram,
+    ProbeResult,
+    bson_decode,
+    bson_encode,
+    load_histograms,
+    probe_all,
+    record,
+)
+
+HOST = "127.0.0.1"
+PROTOCOL_OF = {"postgres": "postgres", "mongodb": "mongodb", "dragonfly": "redis"}
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def fakes(request: pytest.FixtureRequest) -> Iterator[dict[str, FakeService]]:
+    mode, latency = getattr(request, "param", ("ready", 0.0))
+    running = {name: FakeService(protocol, mode=mode, latency=latency).start()
+               for name, protocol in PROTOCOL_OF.items()}
+    yield running
+    for fake in running.values():
+        fake.stop()
+
+
+@pytest.fixture(scope="module")
+def server_tls(tmp_path_factory: pytest.TempPathFactory) -> ssl.SSLContext:
+    """A server context with a throwaway self-signed certificate."""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl not installed")
+    cert = tmp_path_factory.mktemp("tls") / "server.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=localhost", "-keyout", str(cert), "-out", str(cert)],
+                   check=True, capture_output=True)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert)
+    return context
+
+
+def _ports(fakes: dict[str, FakeService]) -> dict[str, int]:
+    return {name: fake.port for name, fake in fakes.items()}
+
+
+@pytest.mark.tooling
+class TestHandshakes:
+    """Each probe tells a ready service from a starting one and from a stray port."""
+
+    def test_ready_services(self, fakes: dict[str, FakeService]):
+        results = asyncio.run(probe_all(HOST, _ports(fakes), timeout=1.0))
+        assert all(r.ok and r.error is None for r in results.values()), results
+        assert results["postgres"].detail == "authentication requested"
+        assert results["mongodb"].detail == "primary, wire version 21"
+        assert results["dragonfly"].detail == "PONG"
+        assert all(r.connect_ms is not None and r.handshake_ms is not None
+                   for r in results.values())
+        assert all(fake.handshakes == 1 for fake in fakes.values())
+
+    @pytest.mark.parametrize("fakes", [("starting", 0.0)], indirect=True)
+    def test_starting_services_are_not_ready(self, fakes: dict[str, FakeService]):
+        results = asyncio.run(probe_all(HOST, _ports(fakes), timeout=1.0))
+        assert not any(r.ok for r in results.values())
+        assert results["postgres"].error == "not ready: 57P03 the database system is starting up"
+        assert results["mongodb"].error == "not ready: node is recovering"
+        assert results["dragonfly"].error.startswith("not ready: LOADING")
+
+    @pytest.mark.parametrize("fakes", [("garbage", 0.0)], indirect=True)
+    def test_another_protocol_on_the_port_fails(self, fakes: dict[str, FakeService]):
+        results = asyncio.run(probe_all(HOST, _ports(fakes), timeout=1.0))
+        assert all(not r.ok and r.error.startswith("handshake failed")
+                   for r in results.values()), results
+        assert all(r.connect_ms is not None for r in results.values())
+
+    @pytest.mark.parametrize("fakes", [("silent", 0.0)], indirect=True)
+    def test_silent_ports_time_out_concurrently(self, fakes: dict[str, FakeService]):
+        start = time.perf_counter()
+        results = asyncio.run(probe_all(HOST, _ports(fakes), timeout=0.3))
+        assert time.perf_counter() - start < 0.3 * 2  # one after another: 3x
+        assert all(r.error == "no handshake reply" for r in results.values())
+
+    def test_postgres_upgrades_to_tls_when_offered(self, server_tls: ssl.SSLContext):
+        with FakeService("postgres", tls=server_tls) as fake:
+            [result] = asyncio.run(probe_all(HOST, {"postgres": fake.port})).values()
+        assert result.ok, result
+        assert result.detail == "authentication requested over TLS"
+
+    def test_postgres_over_tls_still_reports_not_ready(self, server_tls: ssl.SSLContext):
+        with FakeService("postgres", mode="starting", tls=server_tls) as fake:
+            [result] = asyncio.run(probe_all(HOST, {"postgres": fake.port})).values()
+        assert not result.ok
+        assert result.error == "not ready: 57P03 the database system is starting up"
+
+    def test_closed_port(self):
+        [result] = asyncio.run(probe_all(HOST, {"postgres": _closed_port()})).values()
+        assert not result.ok and result.connect_ms is None and result.error
+
+    @pytest.mark.parametrize("fakes", [("ready", 0.05)], indirect=True)
+    def test_handshake_latency_is_measured_apart_from_connect(self, fakes):
+        results = asyncio.run(probe_all(HOST, _ports(fakes), timeout=1.0))
+        for r in results.values():
+            assert r.handshake_ms >= 50 > r.connect_ms
+
+    def test_bson_round_trip(self):
+        doc = {"ok": 1.0, "hello": 1, "$db": "admin", "isWritablePrimary": True}
+        assert bson_decode(bson_encode(doc)) == doc
+
+
+@pytest.mark.tooling
+class TestLatencyHistograms:
+    """Latencies accumulate across runs into bounded histograms."""
+
+    def test_quantiles_are_bucket_bounds(self):
+        hist = Histogram()
+        for ms in [0.3] * 90 + [7.0] * 9 + [5000.0]:
+            hist.observe(ms)
+        assert hist.total == 100
+        assert hist.summary() == {"count": 100, "p50": 0.5, "p95": 10.0, "p99": 10.0}
+        assert hist.quantile(1.0) == float("inf")
+        assert Histogram().summary()["p50"] is None
+
+    def test_record_accumulates_and_ignores_missing_samples(self, tmp_path: Path):
+        path = tmp_path / "latency.json"
+        up = ProbeResult("postgres", True, connect_ms=0.4, handshake_ms=3.0)
+        down = ProbeResult("mongodb", False)
+        record({"postgres": up, "mongodb": down}, path)
+        histograms = record({"postgres": up}, path)
+        assert histograms["postgres"].handshake.summary()["count"] == 2
+        assert load_histograms(path)["postgres"].connect.counts[0] == 2
+        assert load_histograms(path)["mongodb"].connect.total == 0
+
+    def test_changed_bucket_layout_starts_over(self, tmp_path: Path):
+        path = tmp_path / "latency.json"
+        path.write_text(json.dumps({"buckets_ms": [1, 2], "services": {"x": {}}}))
+        assert load_histograms(path) == {}
+        assert len(BUCKETS_MS) + 1 == len(Histogram().counts)
+
+    def test_health_report_carries_probe_details(self, fakes, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path))
+        services = asyncio.run(health.check_services(
+            HOST, _ports(fakes), latency_history=service_probe.history_path()))
+        assert health.docker_status(services) == {name: True for name in PROTOCOL_OF}
+        assert services["dragonfly"]["latency_ms"]["handshake"]["count"] == 1
+        assert (tmp_path / service_probe.HISTORY_FILENAME).is_file()
+
+    def test_cli_json_exit_status(self, fakes, tmp_path: Path, monkeypatch, capsys):
+        monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path))
+        specs = [f"{name}={port}" for name, port in _ports(fakes).items()]
+        assert service_probe.main(["--host", HOST, "--json", *specs]) == 0
+        assert json.loads(capsys.readouterr().out)["mongodb"]["ok"] is True
+        specs.append(f"postgres={_closed_port()}")
+        assert service_probe.main(["--host", HOST, "--no-record", *specs]) == 1
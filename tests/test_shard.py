@@ -0,0 +1,145 @@
+"""Tests for duration-balanced sharding and the shared fixture store.
+
+Run with:  pytest tests/test_shard.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.shard import STORE_ENV, FixtureStore, assign, merge_durations
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CONFTEST = '''
+from pathlib import Path
+
+import pytest
+
+pytest_plugins = ["jade_monolith.pytest_shard"]
+
+
+@pytest.fixture(scope="session")
+def catalogue(shared_fixtures):
+    def compute():
+        with open(Path(__file__).parent / "computed.log", "a") as log:
+            log.write("x")
+        return {"agents": 4}
+    return shared_fixtures.get("catalogue", compute)
+'''
+
+SAMPLE = '''
+import time
+
+
+def test_slow_a(catalogue):
+    time.sleep(0.3)
+    assert catalogue == {"agents": 4}
+
+
+def test_slow_b(catalogue):
+    time.sleep(0.3)
+    assert catalogue == {"agents": 4}
+
+
+def test_fast_c(catalogue):
+    assert catalogue["agents"] == 4
+
+
+def test_fast_d():
+    pass
+'''
+
+
+@pytest.mark.tooling
+class TestAssignment:
+    """Longest processing time first, collection order within a shard."""
+
+    def test_lpt_balances_load(self):
+        durations = {"a": 5, "b": 4, "c": 3, "d": 3, "e": 2, "f": 1}
+        shards = assign(list("abcdef"), durations, 2)
+        loads = sorted(sum(durations[n] for n in shard) for shard in shards)
+        assert loads == [9, 9]
+        assert all(shard == sorted(shard) for shard in shards)
+
+    def test_unknown_tests_cost_the_median(self):
+        # median of the known durations is 2.0, so new2 and new3 share a worker
+        shards = assign(["slow", "new1", "new2", "new3"], {"slow": 3.0, "new1": 1.0}, 2)
+        assert shards == [["slow", "new1"], ["new2", "new3"]]
+
+    def test_more_workers_than_tests(self):
+        assert assign(["a", "b"], {}, 8) == [["a"], ["b"]]
+
+    def test_merge_smooths(self):
+        assert merge_durations({"a": 1.0, "b": 2.0}, {"a": 3.0, "c": 1.0}) == {
+            "a": 2.0, "b": 2.0, "c": 1.0}
+
+
+@pytest.mark.tooling
+class TestFixtureStore:
+    """Computed once per run, whichever worker gets there first."""
+
+    def test_plain_run_passes_through(self):
+        calls = []
+        assert FixtureStore(None).get("x", lambda: calls.append(1) or 7) == 7
+        assert FixtureStore(None).get("x", lambda: calls.append(1) or 7) == 7
+        assert len(calls) == 2
+
+    def test_concurrent_workers_compute_once(self, tmp_path: Path):
+        script = (
+            "import sys, time\n"
+            "from pathlib import Path\n"
+            "from jade_monolith.shard import FixtureStore\n"
+            "def compute():\n"
+            "    time.sleep(0.2)\n"
+            "    with open(sys.argv[1], 'a') as log: log.write('x')\n"
+            "    return [1, 2, 3]\n"
+            "print(FixtureStore.from_env().get('value', compute))\n"
+        )
+        env = {**os.environ, STORE_ENV: str(tmp_path), "PYTHONPATH": str(REPO_ROOT)}
+        log = tmp_path / "computed.log"
+        procs = [subprocess.Popen([sys.executable, "-c", script, str(log)], env=env,
+                                  stdout=subprocess.PIPE, text=True) for _ in range(4)]
+        outputs = [proc.communicate()[0].strip() for proc in procs]
+        assert outputs == ["[1, 2, 3]"] * 4
+        assert log.read_text() == "x"
+
+
+@pytest.mark.tooling
+class TestShardedRun:
+    """End to end: plan from recorded durations, run, record again."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        (tmp_path / "conftest.py").write_text(CONFTEST)
+        (tmp_path / "test_sample.py").write_text(SAMPLE)
+        (tmp_path / "pytest.ini").write_text("[pytest]\n")
+        return tmp_path
+
+    def run(self, project: Path, *args: str) -> subprocess.CompletedProcess:
+        env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+        return subprocess.run(
+            [sys.executable, "-m", "jade_monolith.shard", "-n", "2",
+             f"--durations={project / 'durations.json'}", *args, "--", "-p",
+             "no:cacheprovider"],
+            cwd=project, env=env, capture_output=True, text=True,
+        )
+
+    def test_slow_tests_land_on_different_workers(self, project: Path):
+        first = self.run(project)
+        assert first.returncode == 0, first.stdout + first.stderr
+        assert (project / "computed.log").read_text() == "x"
+        durations = json.loads((project / "durations.json").read_text())
+        assert len(durations) == 4
+        assert durations["test_sample.py::test_slow_a"] >= 0.3
+
+        plan = self.run(project, "--plan").stdout
+        shards = plan.split("shard ")[1:]
+        assert len(shards) == 2
+        assert all(("test_slow_a" in s) != ("test_slow_b" in s) for s in shards)
@@ -0,0 +1,84 @@
+"""Tests for the standalone smoke entry point.
+
+Run with:  pytest tests/test_smoke.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import rules
+from jade_monolith.smoke import EXIT_TESTS_FAILED, EXIT_USAGE_ERROR, main, run
+
+from .conftest import REPO_ROOT, agent_md
+
+
+@pytest.fixture
+def tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / "repo"
+    agents_dir = root / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    for name, spec in rules.TEAM.items():
+        (agents_dir / f"{name}.md").write_text(agent_md(name, spec["readonly"]))
+    (root / ".claude" / "settings.json").write_text(json.dumps({"env": {}}))
+    (root / "docs").mkdir()
+    (root / "docs" / "team-setup.md").write_text(", ".join(rules.TEAM))
+    (root / "docs" / "api-usage.md").write_text("# API usage\n")
+    return root
+
+
+@pytest.mark.tooling
+class TestSmoke:
+    """Same node ids, output and exit codes as the pytest run it replaces."""
+
+    def test_covers_every_smoke_and_schema_test(self, tree: Path):
+        collected = subprocess.run(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider",
+             rules.SMOKE, rules.SCHEMA],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        ).stdout
+        nodeids = {line for line in collected.splitlines() if "::" in line}
+        assert set(run(tree)) == nodeids
+
+    def test_passing_tree(self, tree: Path, capsys: pytest.CaptureFixture[str]):
+        assert main(["--root", str(tree)]) == 0
+        progress, summary = capsys.readouterr().out.splitlines()
+        assert progress.startswith("." * len(run(tree)) + " ")
+        assert summary.startswith(f"{len(run(tree))} passed in ")
+
+    def test_failures_are_reported_like_pytest(
+        self, tree: Path, capsys: pytest.CaptureFixture[str],
+    ):
+        (tree / ".claude" / "agents" / "reviewer.md").write_text(agent_md("reviewer", False))
+        (tree / "docs" / "api-usage.md").unlink()
+        assert main(["--root", str(tree), "-q"]) == EXIT_TESTS_FAILED
+        out = capsys.readouterr().out
+        assert f"FAILED {rules.SMOKE}::TestDocumentation::test_api_usage_doc_exists - " \
+               "docs/api-usage.md missing" in out
+        assert "FAILED tests/test_agent_schema.py::TestToolPermissions::" \
+               "test_readonly_agents_cannot_write" not in out  # not described read-only
+        assert "test_readonly_agents_have_correct_disallowed_tools - reviewer:" in out
+        assert out.splitlines()[-1].startswith(f"2 failed, {len(run(tree)) - 2} passed in ")
+
+    def test_usage_error(self, capsys: pytest.CaptureFixture[str]):
+        assert main(["--bogus"]) == EXIT_USAGE_ERROR
+        assert "unrecognized argument: --bogus" in capsys.readouterr().err
+
+    def test_warm_run_imports_neither_yaml_nor_pytest(self, tree: Path):
+        script = (
+            "import sys\n"
+            "from jade_monolith.smoke import main\n"
+            f"assert main(['--root', {str(tree)!r}, '-q']) == 0\n"
+            "print(sorted(m for m in ('yaml', 'pytest') if m in sys.modules))\n"
+        )
+        env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+        runs = [subprocess.run([sys.executable, "-c", script], env=env,
+                               capture_output=True, text=True) for _ in range(2)]
+        assert [r.stdout.splitlines()[-1] for r in runs] == ["['yaml']", "[]"]
@@ -0,0 +1,116 @@
+"""Tests for the local task-board simulator.
+
+Run with:  pytest tests/test_taskboard.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from queue import Empty
+
+import pytest
+
+from jade_monolith import taskboard
+from jade_monolith.taskboard import (
+    COMPLETED,
+    IN_PROGRESS,
+    PENDING,
+    TASKS_PER_FEATURE,
+    SimConfig,
+    TaskBoard,
+    main,
+    simulate,
+    team,
+)
+
+
+@pytest.fixture
+def board(tmp_path: Path) -> Iterator[TaskBoard]:
+    board = TaskBoard(tmp_path / "tasks.db")
+    yield board
+    board.close()
+
+
+@pytest.mark.tooling
+class TestTaskBoard:
+    """TaskCreate / TaskList / TaskUpdate / TaskGet over SQLite."""
+
+    def test_create_list_get_update(self, board: TaskBoard):
+        plan = board.create("plan login", kind="plan", description="design it")
+        tests = board.create("tests login", kind="tests", blocked_by=[plan])
+        assert [t.id for t in board.list()] == [plan, tests]
+        task = board.get(tests)
+        assert task.status == PENDING and task.owner is None and task.blocked_by == (plan,)
+        assert board.get(plan).description == "design it"
+        assert board.update(plan, status=COMPLETED)
+        assert board.get(plan).status == COMPLETED
+        assert board.get(999) is None and not board.update(999, status=COMPLETED)
+
+    def test_claim_is_exclusive_and_respects_blockers(self, tmp_path: Path, board: TaskBoard):
+        plan = board.create("plan", kind="plan")
+        tests = board.create("tests", kind="tests", blocked_by=[plan])
+        assert not board.claim(tests, "test-writer-1")  # blocked
+
+        other = TaskBoard(tmp_path / "tasks.db")  # a second teammate, own connection
+        try:
+            assert board.claim(plan, "architect-1")
+            assert not other.claim(plan, "architect-2")
+        finally:
+            other.close()
+        task = board.get(plan)
+        assert (task.status, task.owner) == (IN_PROGRESS, "architect-1")
+
+        board.update(plan, status=COMPLETED)
+        assert board.claim(tests, "test-writer-1")
+        assert len(board.lock_waits) == 6  # every write took the lock, lost claims included
+
+
+@pytest.mark.tooling
+class TestSimulation:
+    """Scripted teammates work the board to completion."""
+
+    def test_team_assigns_every_role(self):
+        names = [name for name, _ in team(6)]
+        assert names[:4] == ["architect-1", "test-writer-1", "implementer-1", "reviewer-1"]
+        assert names[4:] == ["architect-2", "test-writer-2"]
+        with pytest.raises(ValueError, match="one per role"):
+            team(3)
+
+    def test_simulate_completes_every_task(self, tmp_path: Path):
+        result = simulate(8, 5, config=SimConfig(work_scale=0, pick="random"),
+                          directory=tmp_path)
+        assert not result.timed_out
+        assert result.tasks == result.completed == 5 * TASKS_PER_FEATURE
+        assert result.claims == result.completed + result.lost_claims
+        assert 0 <= result.contention < 1 and result.throughput > 0
+        assert set(result.op_latency_ms) == {"TaskCreate", "TaskGet", "TaskList", "TaskUpdate"}
+        waits = result.lock_wait_ms
+        assert waits["p50"] <= waits["p95"] <= waits["p99"] <= waits["max"]
+
+    def test_hung_teammate_times_the_run_out(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys,
+    ):
+        monkeypatch.setattr(taskboard, "run_worker", lambda *args: time.sleep(60))
+        monkeypatch.setattr(taskboard, "RESULT_GRACE", 0.0)
+        started = time.monotonic()
+        with pytest.raises(Empty):
+            simulate(4, 1, config=SimConfig(deadline=0.5), directory=tmp_path)
+        assert time.monotonic() - started < 10
+
+        def hang(*args, **kwargs):
+            raise Empty
+        monkeypatch.setattr(taskboard, "simulate", hang)
+        assert main(["--sizes", "4", "--features", "1"]) == 1
+        assert "team of 4 (1 features) timed out" in capsys.readouterr().err
+
+    def test_cli_json(self, capsys):
+        assert main(["--sizes", "4", "--features", "2", "--work-scale", "0", "--json"]) == 0
+        [result] = json.loads(capsys.readouterr().out)
+        assert (result["team_size"], result["tasks"], result["completed"]) == (4, 8, 8)
+
+    def test_cli_rejects_a_team_too_small(self, capsys):
+        assert main(["--sizes", "2", "--features", "1"]) == 2
+        assert "one per role" in capsys.readouterr().err
@@ -0,0 +1,148 @@
+"""Tests for the concurrent tmux team launcher, against the fake claude CLI.
+
+Each test runs its own tmux server (``tmux -L``), so nothing touches a real
+session.
+
+Run with:  pytest tests/test_team_launcher.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import time
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from jade_monolith.fakes.claude import FakeClaude, FakeClaudeConfig
+from jade_monolith.team_launcher import (
+    HISTORY_LIMIT,
+    POOL_WINDOW,
+    ROLES,
+    LaunchReport,
+    PaneReady,
+    TeamLauncher,
+    Tmux,
+    load_history,
+    record,
+)
+
+STARTUP = 1.0  # seconds each fake agent takes to become ready
+
+pytestmark = pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+
+
+@pytest.fixture
+def fake(tmp_path: Path) -> FakeClaude:
+    return FakeClaude(tmp_path / "bin", FakeClaudeConfig(response_latency=STARTUP))
+
+
+@pytest.fixture
+def launcher(tmp_path: Path, fake: FakeClaude) -> Iterator[TeamLauncher]:
+    root = tmp_path / "repo"
+    (root / ".claude" / "agents").mkdir(parents=True)
+    for role in ROLES:
+        (root / ".claude" / "agents" / f"{role.name}.md").write_text(
+            f"---\nname: {role.name}\ndescription: The {role.name}\n---\nBody.\n")
+    tmux = Tmux(socket_name=f"jade-test-{uuid.uuid4().hex[:8]}")
+    launcher = TeamLauncher(root, tmux=tmux, claude=str(fake.bin_dir / "claude"), timeout=15)
+    yield launcher
+    tmux.run("kill-server", check=False)
+
+
+def _positions(launcher: TeamLauncher) -> dict[str, tuple[int, int]]:
+    out = launcher.tmux.run("list-panes", "-t", f"{launcher.session}:agents",
+                            "-F", "#{@jade-role} #{pane_left} #{pane_top}")
+    return {role: (int(x), int(y)) for role, x, y in (line.split() for line in out.splitlines())}
+
+
+@pytest.mark.tooling
+class TestTeamLauncher:
+    """One tmux call, four concurrent cold starts, readiness per pane."""
+
+    def test_start_brings_panes_up_concurrently(self, launcher: TeamLauncher, fake: FakeClaude):
+        report = launcher.start()
+        assert report.ready, report
+        assert [p.role for p in report.panes] == [r.name for r in ROLES]
+        assert all(p.ready_s >= STARTUP for p in report.panes)
+        assert max(p.ready_s for p in report.panes) < 2.5 * STARTUP  # one after another: 4x
+
+        pos = _positions(launcher)
+        assert pos["architect"][0] == pos["test-writer"][0] < pos["implementer"][0]
+        assert pos["architect"][1] == pos["implementer"][1] < pos["reviewer"][1]
+
+        calls = fake.calls()
+        assert len(calls) == 4
+        assert all(c["env"]["CLAUDE_CODE_EXPERIMENTAL_AGENT_TEAMS"] == "1" for c in calls)
+        assert all(c["cwd"] == str(launcher.root) for c in calls)
+        plan = {c["argv"][1] for c in calls if "plan" in c["argv"]}
+        assert plan == {"architect", "reviewer"}
+
+    def test_start_without_wait_returns_before_readiness(self, launcher: TeamLauncher):
+        report = launcher.start(wait=False)
+        assert report.elapsed_s < STARTUP
+        assert len(report.panes) == 4 and all(p.ready_s is None for p in report.panes)
+        launcher.probe(report)
+        assert report.ready and all(p.ready_s >= STARTUP for p in report.panes)
+
+    def test_background_probe_records_readiness(
+        self, launcher: TeamLauncher, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setenv("JADE_CACHE_DIR", str(tmp_path / "cache"))
+        report = launcher.start(wait=False)
+        launcher.spawn_probe(report)
+        path = tmp_path / "cache" / "team-launch.json"
+        deadline = time.monotonic() + 10 * STARTUP
+        while not load_history(path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        (entry,) = load_history(path)
+        assert entry["ready"] and entry["started_at"] == report.started_at
+        assert all(p["ready_s"] >= STARTUP for p in entry["panes"])
+
+    def test_second_start_reattaches(self, launcher: TeamLauncher, fake: FakeClaude):
+        first = launcher.start()
+        again = launcher.start()
+        assert again.action == "reattach"
+        assert [p.pane for p in again.panes] == [p.pane for p in first.panes]
+        assert len(fake.calls()) == 4
+
+    def test_warm_restart_swaps_in_a_ready_spare(self, launcher: TeamLauncher):
+        report = launcher.start(warm=True)
+        assert report.ready and len(report.panes) == 8
+        spare = launcher.panes(POOL_WINDOW)["reviewer"]
+        old = launcher.panes()["reviewer"]
+        layout = _positions(launcher)
+
+        restart = launcher.restart("reviewer")
+        assert restart.panes[0].ready_s < 0.5 * STARTUP
+        assert launcher.panes()["reviewer"] == spare
+        assert _positions(launcher) == layout
+        pool = launcher.panes(POOL_WINDOW)
+        assert set(pool) == {r.name for r in ROLES}
+        assert old not in pool.values() and pool["reviewer"] != spare
+
+    def test_cold_restart_waits_for_readiness(self, launcher: TeamLauncher):
+        launcher.start()
+        pane = launcher.panes()["implementer"]
+        restart = launcher.restart("implementer")
+        assert restart.panes[0].pane == pane
+        assert restart.panes[0].ready_s >= STARTUP
+
+    def test_pane_that_never_gets_ready_times_out(self, launcher: TeamLauncher):
+        launcher.timeout = 0.3
+        launcher.ready_pattern = re.compile(r"never printed")
+        report = launcher.start()
+        assert not report.ready
+        assert all(p.ready_s is None for p in report.panes)
+
+    def test_history_is_bounded(self, tmp_path: Path):
+        path = tmp_path / "history.json"
+        pane = PaneReady("architect", "%0", "agents", 1.0)
+        for i in range(HISTORY_LIMIT + 3):
+            record(LaunchReport("start", "s", float(i), [pane]), path)
+        history = load_history(path)
+        assert len(history) == HISTORY_LIMIT
+        assert history[-1]["started_at"] == HISTORY_LIMIT + 2 and history[-1]["ready"]
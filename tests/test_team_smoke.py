@@ -9,15 +9,14 @@ Run with:  pytest tests/test_team_smoke.py -v -m smoke
 from __future__ import annotations
 
 import json
-import os
-import stat
-from pathlib import Path
 
 import pytest
-import yaml
 
-from .conftest import AGENTS_DIR, REPO_ROOT, SETTINGS_PATH
+from jade_monolith import rules
+from jade_monolith.agents import AgentParseError, load_agent
+from jade_monolith.index import AgentIndex
 
+from .conftest import AGENTS_DIR, REPO_ROOT, SETTINGS_PATH, assert_rule
 
 # --------------------------------------------------------------------------- #
 # File integrity                                                               #
@@ -31,33 +30,19 @@ class TestFileIntegrity:
     def test_settings_json_is_valid(self):
         content = SETTINGS_PATH.read_text()
         data = json.loads(content)
-        assert isinstance(data, dict), "settings.json root must be an object"
+        assert_rule(rules.settings_is_object, [data])
 
     def test_agent_files_have_valid_yaml(self):
         for path in AGENTS_DIR.glob("*.md"):
-            content = path.read_text()
-            parts = content.split("---", 2)
-            assert len(parts) >= 3, (
-                f"{path.name}: must have YAML frontmatter delimited by ---"
-            )
             try:
-                meta = yaml.safe_load(parts[1])
-            except yaml.YAMLError as e:
-                pytest.fail(f"{path.name}: invalid YAML frontmatter: {e}")
-            assert isinstance(meta, dict), (
-                f"{path.name}: YAML frontmatter must be a mapping"
-            )
+                meta = load_agent(path)
+            except AgentParseError as e:
+                pytest.fail(f"{path.name}: {e}")
+            assert_rule(rules.has_frontmatter, [meta])
 
     def test_no_trailing_whitespace_in_agent_names(self):
         for path in AGENTS_DIR.glob("*.md"):
-            content = path.read_text()
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                meta = yaml.safe_load(parts[1]) or {}
-                name = meta.get("name", "")
-                assert name == name.strip(), (
-                    f"{path.name}: agent name has trailing whitespace: '{name}'"
-                )
+            assert_rule(rules.name_has_no_whitespace, [load_agent(path)])
 
 
 # --------------------------------------------------------------------------- #
@@ -67,53 +52,19 @@ class TestFileIntegrity:
 
 @pytest.mark.smoke
 class TestTeamCompleteness:
-    """Verify the 4-agent team is fully defined and consistent."""
-
-    TEAM = {
-        "architect": {"readonly": True, "model": "opus"},
-        "implementer": {"readonly": False, "model": "opus"},
-        "test-writer": {"readonly": False, "model": "opus"},
-        "reviewer": {"readonly": True, "model": "opus"},
-    }
-
-    def _load_agent(self, name: str) -> dict:
-        path = AGENTS_DIR / f"{name}.md"
-        content = path.read_text()
-        parts = content.split("---", 2)
-        return yaml.safe_load(parts[1]) if len(parts) >= 3 else {}
-
-    def test_all_four_agents_defined(self):
-        for name in self.TEAM:
-            path = AGENTS_DIR / f"{name}.md"
-            assert path.exists(), f"Missing agent definition: {name}.md"
-
-    def test_readonly_agents_have_correct_disallowed_tools(self):
-        write_tools = {"Write", "Edit", "NotebookEdit"}
-        for name, spec in self.TEAM.items():
-            if spec["readonly"]:
-                meta = self._load_agent(name)
-                disallowed = set(meta.get("disallowedTools") or [])
-                assert write_tools <= disallowed, (
-                    f"{name}: read-only agent must disallow {write_tools}, "
-                    f"has {disallowed}"
-                )
-
-    def test_writable_agents_have_write_tools(self):
-        for name, spec in self.TEAM.items():
-            if not spec["readonly"]:
-                meta = self._load_agent(name)
-                tools = set(meta.get("tools") or [])
-                assert "Write" in tools and "Edit" in tools, (
-                    f"{name}: writable agent must have Write and Edit tools"
-                )
-
-    def test_all_agents_use_expected_model(self):
-        for name, spec in self.TEAM.items():
-            meta = self._load_agent(name)
-            model = meta.get("model", "inherit")
-            assert model == spec["model"], (
-                f"{name}: expected model '{spec['model']}', got '{model}'"
-            )
+    """Verify the 4-agent team (rules.TEAM) is fully defined and consistent."""
+
+    def test_all_four_agents_defined(self, agent_index: AgentIndex):
+        assert_rule(rules.all_four_agents_defined, [agent_index])
+
+    def test_readonly_agents_have_correct_disallowed_tools(self, agent_index: AgentIndex):
+        assert_rule(rules.readonly_agents_disallow_writes, [agent_index])
+
+    def test_writable_agents_have_write_tools(self, agent_index: AgentIndex):
+        assert_rule(rules.writable_agents_have_write_tools, [agent_index])
+
+    def test_all_agents_use_expected_model(self, agent_index: AgentIndex):
+        assert_rule(rules.team_uses_expected_model, [agent_index])
 
 
 # --------------------------------------------------------------------------- #
@@ -126,19 +77,12 @@ class TestDocumentation:
     """Verify docs reference the correct agents and configuration."""
 
     def test_team_setup_doc_exists(self):
-        doc = REPO_ROOT / "docs" / "team-setup.md"
-        assert doc.exists(), "docs/team-setup.md missing"
+        assert_rule(rules.team_setup_doc_exists, [REPO_ROOT])
 
     def test_team_setup_references_all_agents(self):
-        doc = REPO_ROOT / "docs" / "team-setup.md"
-        if not doc.exists():
+        if not (REPO_ROOT / rules.TEAM_SETUP_DOC).exists():
             pytest.skip("docs/team-setup.md not found")
-        content = doc.read_text().lower()
-        for agent in ["architect", "implementer", "test-writer", "reviewer"]:
-            assert agent in content, (
-                f"docs/team-setup.md missing reference to '{agent}'"
-            )
+        assert_rule(rules.team_setup_references_all_agents, [REPO_ROOT])
 
     def test_api_usage_doc_exists(self):
-        doc = REPO_ROOT / "docs" / "api-usage.md"
-        assert doc.exists(), "docs/api-usage.md missing"
+        assert_rule(rules.api_usage_doc_exists, [REPO_ROOT])
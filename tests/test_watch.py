@@ -0,0 +1,137 @@
+"""Tests for the incremental watch mode and the shared rule set.
+
+Run with:  pytest tests/test_watch.py -v -m tooling
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from jade_monolith import rules
+from jade_monolith.agents import AgentLoader
+from jade_monolith.watch import InotifyWatcher, Workspace
+
+from .conftest import TASK_TOOLS, agent_md
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Workspace:
+    agents_dir = tmp_path / ".claude" / "agents"
+    agents_dir.mkdir(parents=True)
+    for name, spec in rules.TEAM.items():
+        (agents_dir / f"{name}.md").write_text(agent_md(name, spec["readonly"]))
+    (agents_dir / "helper.md").write_text(agent_md("helper", readonly=True))
+    (tmp_path / ".claude" / "settings.json").write_text(json.dumps({"env": {}}))
+    return Workspace(tmp_path, loader=AgentLoader(tmp_path / "cache.pickle"))
+
+
+def _failing_rules(failures: list[tuple[str, str]]) -> set[str]:
+    return {nodeid.rsplit("::", 1)[-1] for nodeid, _ in failures}
+
+
+@pytest.mark.tooling
+class TestWorkspace:
+    """Verify incremental re-validation picks the right rules."""
+
+    def test_full_check_passes_on_valid_team(self, workspace: Workspace):
+        report = workspace.full_check()
+        assert report.failures == []
+        assert report.rules_run > 0
+
+    def test_team_member_edit_reruns_team_rules(self, workspace: Workspace):
+        workspace.full_check()
+        path = workspace.agents_dir / "architect.md"
+        path.write_text(agent_md("architect", readonly=False, model="sonnet"))
+        report = workspace.on_change([path])
+        assert _failing_rules(report.failures) == {
+            "test_readonly_agents_have_correct_disallowed_tools",
+            "test_all_agents_use_expected_model",
+            "test_architect_is_readonly",
+        }
+        assert report.elapsed_ms < 100
+
+    def test_non_member_edit_skips_team_rules(self, workspace: Workspace):
+        workspace.full_check()
+        path = workspace.agents_dir / "helper.md"
+        path.write_text(agent_md("helper", readonly=True, model="gpt-4"))
+        report = workspace.on_change([path])
+        assert _failing_rules(report.failures) == {"test_model_is_valid"}
+        assert report.rules_run == len(rules.rules_for("agent"))
+
+    def test_non_member_tool_edit_reruns_catalogue_rules(self, workspace: Workspace):
+        workspace.full_check()
+        path = workspace.agents_dir / "helper.md"
+        path.write_text(agent_md("helper", readonly=True).replace("Read, Grep", "Grep"))
+        report = workspace.on_change([path])
+        assert _failing_rules(report.failures) == {"test_all_agents_have_read_access"}
+
+    def test_deleting_member_fails_team_rules(self, workspace: Workspace):
+        workspace.full_check()
+        path = workspace.agents_dir / "reviewer.md"
+        path.unlink()
+        report = workspace.on_change([path])
+        assert "test_reviewer_is_readonly" in _failing_rules(report.failures)
+        assert str(path) not in workspace.failures
+
+    def test_parse_error_then_fix(self, workspace: Workspace):
+        workspace.full_check()
+        path = workspace.agents_dir / "helper.md"
+        path.write_text("---\nname: [broken\n---\nbody")
+        report = workspace.on_change([path])
+        assert report.failures[0][0] == rules.PARSE_RULE
+        path.write_text(agent_md("helper", readonly=True))
+        assert workspace.on_change([path]).failures == []
+        assert workspace.all_failures() == []
+
+    def test_settings_change_only_runs_settings_rules(self, workspace: Workspace):
+        workspace.full_check()
+        workspace.settings_path.write_text("[1, 2]")
+        report = workspace.on_change([workspace.settings_path])
+        assert report.rules_run == len(rules.rules_for("settings"))
+        assert report.failures == [(rules.SETTINGS_RULE, "settings.json root must be an object")]
+
+
+@pytest.mark.tooling
+class TestRuleParity:
+    """The rules are the tests' own checks, so every runner gives pytest's verdict."""
+
+    @pytest.mark.parametrize("rule", rules.RULES, ids=lambda rule: rule.nodeid)
+    def test_test_calls_its_rule(self, rule: rules.Rule):
+        path, cls, name = rule.nodeid.split("::")
+        module = importlib.import_module(path.removesuffix(".py").replace("/", "."))
+        source = inspect.getsource(getattr(getattr(module, cls), name))
+        assert f"rules.{rule.check.__name__}" in source
+
+    def test_comma_separated_tools(self, workspace: Workspace):
+        workspace.full_check()
+        path = workspace.agents_dir / "helper.md"
+        path.write_text(agent_md("helper", readonly=True).replace(
+            "tools: [Read, Grep, Glob, ", "tools: Read, Write, Grep, Glob, ").replace(
+            f"{TASK_TOOLS}]", TASK_TOOLS).replace("[Write, Edit, NotebookEdit]", "Edit"))
+        report = workspace.on_change([path])
+        assert _failing_rules(report.failures) == {"test_readonly_agents_cannot_write"}
+        assert "unblocked write tools: {'Write'}" in report.failures[0][1]
+
+
+@pytest.mark.tooling
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestInotifyWatcher:
+
+    def test_reports_written_and_renamed_files(self, tmp_path: Path):
+        watcher = InotifyWatcher([tmp_path])
+        try:
+            (tmp_path / "a.md").write_text("x")
+            tmp = tmp_path / ".b.md.swp"
+            tmp.write_text("y")
+            tmp.rename(tmp_path / "b.md")
+            changed = watcher.poll(timeout=1.0)
+        finally:
+            watcher.close()
+        assert tmp_path / "a.md" in changed
+        assert tmp_path / "b.md" in changed